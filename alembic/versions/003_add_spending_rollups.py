@@ -0,0 +1,54 @@
+"""add_spending_rollups
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-03-15 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "spending_rollups",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("type", sa.String(length=10), nullable=False),
+        sa.Column("total", sa.Numeric(precision=16, scale=2), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("sum_sq", sa.Numeric(precision=30, scale=4), nullable=False),
+        sa.Column("min_amount", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("max_amount", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "date", "category", "type"),
+    )
+
+    # Backfill from existing transactions
+    op.execute(
+        """
+        INSERT INTO spending_rollups
+            (user_id, date, category, type, total, count, sum_sq, min_amount, max_amount)
+        SELECT user_id, date, category, type,
+               SUM(amount), COUNT(id), SUM(amount * amount), MIN(amount), MAX(amount)
+        FROM transactions
+        WHERE deleted_at IS NULL
+        GROUP BY user_id, date, category, type
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("spending_rollups")
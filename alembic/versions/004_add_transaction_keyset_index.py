@@ -0,0 +1,40 @@
+"""add_transaction_keyset_index
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-04-10 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so existing transactions stay writable meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_transactions_user_keyset",
+            "transactions",
+            ["user_id", "date", "created_at", "id"],
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_transactions_user_keyset",
+            table_name="transactions",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,58 @@
+"""add_transaction_search_indexes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-04-24 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so existing transactions stay writable meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_transactions_description_fts",
+            "transactions",
+            [sa.text("to_tsvector('simple', description)")],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+        # Typo-tolerant search needs pg_trgm, which not every server ships
+        available = (
+            op.get_bind()
+            .execute(sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"))
+            .scalar()
+        )
+        if available:
+            op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            op.create_index(
+                "idx_transactions_description_trgm",
+                "transactions",
+                ["description"],
+                postgresql_using="gin",
+                postgresql_ops={"description": "gin_trgm_ops"},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_transactions_description_trgm")
+        op.drop_index(
+            "idx_transactions_description_fts",
+            table_name="transactions",
+            postgresql_concurrently=True,
+        )
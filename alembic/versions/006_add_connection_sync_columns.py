@@ -0,0 +1,63 @@
+"""add_connection_sync_columns
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-05-08 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nullable columns without defaults; adding them doesn't rewrite the tables
+    op.add_column(
+        "connections",
+        sa.Column(
+            "sync_cursor",
+            sa.Text(),
+            nullable=True,
+            comment="Provider cursor after the last synced change",
+        ),
+    )
+    op.add_column(
+        "transactions",
+        sa.Column(
+            "external_id",
+            sa.String(length=100),
+            nullable=True,
+            comment="Transaction identifier from the connection's API provider",
+        ),
+    )
+    # Empty until the first sync, but built concurrently like the other
+    # transaction indexes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_transactions_connection_external",
+            "transactions",
+            ["connection_id", "external_id"],
+            unique=True,
+            postgresql_where=sa.text("external_id IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_transactions_connection_external",
+            table_name="transactions",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("transactions", "external_id")
+    op.drop_column("connections", "sync_cursor")
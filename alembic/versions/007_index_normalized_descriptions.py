@@ -0,0 +1,58 @@
+"""index_normalized_descriptions
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-05-15 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The parser keeps hosts, URLs and e-mail addresses whole ("amazon.com",
+    # "www.starbucks.com"), so their words couldn't be searched; index the
+    # description with punctuation replaced by spaces instead
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_transactions_description_words",
+            "transactions",
+            [
+                sa.text(
+                    "to_tsvector('simple', regexp_replace(description, '[^[:alnum:]]+', ' ', 'g'))"
+                )
+            ],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_transactions_description_fts",
+            table_name="transactions",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_transactions_description_fts",
+            "transactions",
+            [sa.text("to_tsvector('simple', description)")],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_transactions_description_words",
+            table_name="transactions",
+            postgresql_concurrently=True,
+        )
@@ -1,21 +1,101 @@
-"""Redis cache configuration and utilities."""
+"""Redis cache configuration and utilities.
 
+Values are cached in two tiers: a small in-process LRU (LocalCache) in
+front of Redis. Every write is published on a Redis pub/sub channel so
+other processes evict their local copies; while that subscription is
+down the local tier is bypassed entirely. Values are stored in Redis in
+the versioned binary format from app.cache_codec.
+"""
+
+import asyncio
 import hashlib
 import json
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
 
 import redis.asyncio as aioredis
 from redis.asyncio import Redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
+from app.cache_codec import CacheSerializer, CodecError
 from app.config import settings
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+_MISSING = object()
+
+
+class LocalCache:
+    """Bounded in-process LRU cache with per-entry expiry.
+
+    Holds decoded values, so callers must treat cached objects as
+    read-only. None is stored too, which lets known misses (e.g. a token
+    that isn't blacklisted) skip Redis as well.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        """Initialize local cache.
+
+        Args:
+            max_entries: Maximum number of entries before evicting the LRU one
+            ttl: Default entry lifetime in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: str, default: Any = _MISSING) -> Any:
+        """Get a value, or default (_MISSING unless given) if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self._stats["misses"] += 1
+            return default
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value for at most ttl seconds (capped at the default TTL)."""
+        if self.max_entries <= 0:
+            return
+        lifetime = min(ttl, self.ttl) if ttl else self.ttl
+        self._entries[key] = (time.monotonic() + lifetime, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def delete(self, key: str) -> None:
+        """Remove a value if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all values."""
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """Get local tier statistics."""
+        stats = self._stats.copy()
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] / total * 100) if total > 0 else 0
+        stats["entries"] = len(self._entries)
+        return stats
+
+
 class CacheManager:
-    """Redis cache manager for the application."""
+    """Two-tier (in-process + Redis) cache manager for the application."""
 
     # Default TTLs in seconds
     DEFAULT_TTL = 300  # 5 minutes
@@ -25,10 +105,47 @@ class CacheManager:
     # Key prefixes for namespacing
     PREFIX = "ai_finance:"
 
+    # Per-user generation counters outlive every cached value, so a counter
+    # that expires can't resurrect keys from an earlier generation
+    GENERATION_TTL = 7 * 24 * 3600  # 1 week
+
+    # Pub/sub channel carrying local-tier invalidations between processes
+    INVALIDATION_CHANNEL = f"{PREFIX}invalidate"
+    RESUBSCRIBE_DELAY = 1.0  # seconds
+
+    # XFetch weight for probabilistic early refresh in get_or_set();
+    # higher values refresh earlier
+    EARLY_REFRESH_BETA = 1.0
+
     def __init__(self) -> None:
         """Initialize cache manager."""
         self.redis: Optional[Redis] = None
-        self._stats = {"hits": 0, "misses": 0, "errors": 0}
+        self.local = LocalCache(settings.cache_local_max_entries, settings.cache_local_ttl)
+        self.serializer = CacheSerializer(
+            codec=settings.cache_codec,
+            compress_min_bytes=settings.cache_compress_min_bytes,
+            compression=settings.cache_compression,
+        )
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "errors": 0,
+            "redis_hits": 0,
+            "redis_misses": 0,
+            "coalesced": 0,
+            "early_refreshes": 0,
+            "invalidations": 0,
+        }
+        self._origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        # True while subscribed to invalidations; the local tier is only
+        # used then, since otherwise other processes' writes go unnoticed
+        self._tracking = False
+        # Bumped on every received invalidation; a Redis read that raced
+        # one is not copied into the local tier
+        self._invalidation_epoch = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._invalidation_listeners: List[Callable[[Optional[List[str]]], None]] = []
 
     async def connect(self) -> None:
         """Connect to Redis."""
@@ -36,8 +153,8 @@ class CacheManager:
             self.redis = await aioredis.from_url(
                 settings.redis_url,
                 max_connections=settings.redis_max_connections,
-                encoding="utf-8",
-                decode_responses=True,
+                # Values are binary (see app.cache_codec)
+                decode_responses=False,
             )
             # Test connection
             await self.redis.ping()
@@ -46,19 +163,156 @@ class CacheManager:
             logger.error("Failed to connect to Redis", error=str(e), exc_info=True)
             raise
 
+        if self.local.max_entries > 0:
+            self.start_listener()
+
     async def disconnect(self) -> None:
         """Disconnect from Redis."""
+        await self.stop_listener()
         if self.redis:
             await self.redis.close()
             logger.info("Disconnected from Redis")
 
+    def start_listener(self) -> None:
+        """Start consuming invalidations, which enables the local tier."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop_listener(self) -> None:
+        """Stop consuming invalidations and disable the local tier."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._set_tracking(False)
+
+    @property
+    def tracking(self) -> bool:
+        """Whether other processes' writes are being received."""
+        return self._tracking
+
+    def add_invalidation_listener(
+        self, callback: Callable[[Optional[List[str]]], None]
+    ) -> None:
+        """Get notified of other processes' writes, e.g. to keep a local index.
+
+        The callback receives the namespaced keys written elsewhere, or None
+        when anything may have changed unseen (subscription started or lost,
+        pattern clears). It runs on the event loop and must not block.
+
+        Args:
+            callback: Function taking a list of keys or None
+        """
+        self._invalidation_listeners.append(callback)
+
+    def _notify(self, keys: Optional[List[str]]) -> None:
+        for callback in self._invalidation_listeners:
+            try:
+                callback(keys)
+            except Exception as e:
+                logger.error("Cache invalidation listener failed", error=str(e))
+
+    def _set_tracking(self, tracking: bool) -> None:
+        # Whatever the local tier holds may have missed invalidations
+        self._tracking = tracking
+        self.local.clear()
+        self._notify(None)
+
+    async def _listen(self) -> None:
+        """Evict local entries named by other processes' invalidations.
+
+        Resubscribes after connection errors; the local tier is off until
+        the subscription is back.
+        """
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.INVALIDATION_CHANNEL)
+                self._set_tracking(True)
+                logger.info("Cache invalidation listener subscribed")
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._handle_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Cache invalidation listener error", error=str(e))
+            finally:
+                self._set_tracking(False)
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+            await asyncio.sleep(self.RESUBSCRIBE_DELAY)
+
+    def _handle_invalidation(self, data: str) -> None:
+        """Apply one invalidation message to the local tier."""
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning("Malformed cache invalidation message")
+            return
+        if message.get("origin") == self._origin:
+            return
+
+        self._invalidation_epoch += 1
+        self._stats["invalidations"] += 1
+        if message.get("flush"):
+            self.local.clear()
+            self._notify(None)
+            return
+        keys = message.get("keys", [])
+        for key in keys:
+            self.local.delete(key)
+        self._notify(keys)
+
+    def _publish(self, pipe: Any, keys: Iterable[str] = (), flush: bool = False) -> None:
+        """Queue an invalidation message for other processes on a pipeline."""
+        message: Dict[str, Any] = {"origin": self._origin}
+        if flush:
+            message["flush"] = True
+        else:
+            message["keys"] = list(keys)
+        pipe.publish(self.INVALIDATION_CHANNEL, json.dumps(message))
+
+    def _local_get(self, full_key: str) -> Any:
+        if not self._tracking:
+            return _MISSING
+        return self.local.get(full_key)
+
+    def _local_set(
+        self, full_key: str, value: Any, epoch: int, ttl: Optional[float] = None
+    ) -> None:
+        # Skip values read from Redis before an invalidation that may cover them
+        if self._tracking and epoch == self._invalidation_epoch:
+            self.local.set(full_key, value, ttl)
+
     def _make_key(self, key: str) -> str:
         """Create namespaced cache key."""
         return f"{self.PREFIX}{key}"
 
+    def _decode(self, key: str, raw: Optional[bytes]) -> Any:
+        """Decode a Redis value; unreadable entries count as misses."""
+        if not raw:
+            return None
+        try:
+            return self.serializer.loads(raw)
+        except CodecError as e:
+            logger.debug("Unreadable cache entry", key=key, error=str(e))
+            return None
+
+    def _record(self, value: Any) -> Any:
+        self._stats["hits" if value is not None else "misses"] += 1
+        return value
+
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache.
 
+        Checks the local tier first, then Redis.
+
         Args:
             key: Cache key
 
@@ -69,13 +323,18 @@ class CacheManager:
             logger.warning("Redis not connected, skipping cache get")
             return None
 
+        full_key = self._make_key(key)
+        value = self._local_get(full_key)
+        if value is not _MISSING:
+            return self._record(value)
+
         try:
-            value = await self.redis.get(self._make_key(key))
-            if value:
-                self._stats["hits"] += 1
-                return json.loads(value)
-            self._stats["misses"] += 1
-            return None
+            epoch = self._invalidation_epoch
+            raw = await self.redis.get(full_key)
+            value = self._decode(key, raw)
+            self._stats["redis_hits" if value is not None else "redis_misses"] += 1
+            self._local_set(full_key, value, epoch)
+            return self._record(value)
         except Exception as e:
             self._stats["errors"] += 1
             logger.error("Cache get error", key=key, error=str(e))
@@ -89,41 +348,60 @@ class CacheManager:
             value: Value to cache
             expire: Expiration time in seconds (optional, defaults to DEFAULT_TTL)
 
+        Returns:
+            True if successful, False otherwise
+        """
+        return await self.set_many({key: value}, expire)
+
+    async def delete(self, key: str) -> bool:
+        """Delete value from cache.
+
+        Args:
+            key: Cache key
+
         Returns:
             True if successful, False otherwise
         """
         if not self.redis:
-            logger.warning("Redis not connected, skipping cache set")
+            logger.warning("Redis not connected, skipping cache delete")
             return False
 
+        full_key = self._make_key(key)
+        self.local.delete(full_key)
         try:
-            serialized = json.dumps(value, default=str)
-            ttl = expire or self.DEFAULT_TTL
-            await self.redis.setex(self._make_key(key), ttl, serialized)
+            pipe = self.redis.pipeline()
+            pipe.delete(full_key)
+            self._publish(pipe, [full_key])
+            await pipe.execute()
             return True
         except Exception as e:
-            self._stats["errors"] += 1
-            logger.error("Cache set error", key=key, error=str(e))
+            logger.error("Cache delete error", key=key, error=str(e))
             return False
 
-    async def delete(self, key: str) -> bool:
-        """Delete value from cache.
+    async def delete_many(self, keys: Iterable[str]) -> bool:
+        """Delete several values from cache in one round-trip.
 
         Args:
-            key: Cache key
+            keys: Cache keys
 
         Returns:
             True if successful, False otherwise
         """
-        if not self.redis:
-            logger.warning("Redis not connected, skipping cache delete")
+        keys = list(keys)
+        full_keys = [self._make_key(key) for key in keys]
+        if not self.redis or not full_keys:
             return False
 
+        for full_key in full_keys:
+            self.local.delete(full_key)
         try:
-            await self.redis.delete(self._make_key(key))
+            pipe = self.redis.pipeline()
+            pipe.delete(*full_keys)
+            self._publish(pipe, full_keys)
+            await pipe.execute()
             return True
         except Exception as e:
-            logger.error("Cache delete error", key=key, error=str(e))
+            logger.error("Cache delete error", keys=list(keys), error=str(e))
             return False
 
     async def get_many(self, keys: list[str]) -> dict[str, Any]:
@@ -138,25 +416,39 @@ class CacheManager:
         if not self.redis or not keys:
             return {}
 
+        result = {}
+        remote = []
+        for key in keys:
+            value = self._local_get(self._make_key(key))
+            if value is _MISSING:
+                remote.append(key)
+            elif self._record(value) is not None:
+                result[key] = value
+        if not remote:
+            return result
+
         try:
-            prefixed_keys = [self._make_key(k) for k in keys]
+            epoch = self._invalidation_epoch
+            prefixed_keys = [self._make_key(k) for k in remote]
             values = await self.redis.mget(prefixed_keys)
-            result = {}
-            for key, value in zip(keys, values):
-                if value:
-                    result[key] = json.loads(value)
-                    self._stats["hits"] += 1
-                else:
-                    self._stats["misses"] += 1
+            for key, full_key, raw in zip(remote, prefixed_keys, values):
+                value = self._decode(key, raw)
+                self._stats["redis_hits" if value is not None else "redis_misses"] += 1
+                self._local_set(full_key, value, epoch)
+                if self._record(value) is not None:
+                    result[key] = value
             return result
         except Exception as e:
             self._stats["errors"] += 1
             logger.error("Cache get_many error", error=str(e))
-            return {}
+            return result
 
     async def set_many(self, items: dict[str, Any], expire: Optional[int] = None) -> bool:
         """Set multiple values in cache.
 
+        Writes and the invalidation for other processes' local tiers go
+        out in one pipeline.
+
         Args:
             items: Dict of key-value pairs
             expire: Expiration time in seconds
@@ -164,25 +456,41 @@ class CacheManager:
         Returns:
             True if successful
         """
-        if not self.redis or not items:
+        if not self.redis:
+            logger.warning("Redis not connected, skipping cache set")
+            return False
+        if not items:
             return False
 
+        serialized: Dict[str, str] = {}
         try:
             ttl = expire or self.DEFAULT_TTL
             pipe = self.redis.pipeline()
             for key, value in items.items():
-                serialized = json.dumps(value, default=str)
-                pipe.setex(self._make_key(key), ttl, serialized)
+                serialized[self._make_key(key)] = self.serializer.dumps(value)
+            for full_key, data in serialized.items():
+                pipe.setex(full_key, ttl, data)
+            self._publish(pipe, serialized)
             await pipe.execute()
+            for full_key, data in serialized.items():
+                # Keep what a Redis read would return, not the caller's object
+                self._local_set(
+                    full_key, self.serializer.loads(data), self._invalidation_epoch, ttl
+                )
             return True
         except Exception as e:
+            for full_key in serialized:
+                self.local.delete(full_key)
             self._stats["errors"] += 1
-            logger.error("Cache set_many error", error=str(e))
+            logger.error("Cache set error", keys=list(items), error=str(e))
             return False
 
     async def clear_pattern(self, pattern: str) -> int:
         """Clear all keys matching a pattern.
 
+        Local tiers are flushed in every process, since matching keys
+        there would need a scan of their own.
+
         Args:
             pattern: Key pattern (e.g., "user:*")
 
@@ -193,14 +501,20 @@ class CacheManager:
             logger.warning("Redis not connected, skipping cache clear")
             return 0
 
+        self.local.clear()
         try:
             full_pattern = self._make_key(pattern)
             keys = []
             async for key in self.redis.scan_iter(match=full_pattern):
                 keys.append(key)
 
+            pipe = self.redis.pipeline()
+            if keys:
+                pipe.delete(*keys)
+            self._publish(pipe, flush=True)
+            results = await pipe.execute()
             if keys:
-                deleted = await self.redis.delete(*keys)
+                deleted = results[0]
                 logger.info("Cleared cache keys", pattern=pattern, count=deleted)
                 return deleted
             return 0
@@ -208,11 +522,175 @@ class CacheManager:
             logger.error("Cache clear error", pattern=pattern, error=str(e))
             return 0
 
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        expire: Optional[int] = None,
+    ) -> Any:
+        """Get a value, computing and caching it on a miss.
+
+        Protects expensive loaders against stampedes:
+
+        - Concurrent misses for the same key in this process share one
+          loader call (request coalescing).
+        - Hits are refreshed early with a probability that grows as expiry
+          nears, scaled by how long the loader took (XFetch), so a popular
+          key is usually recomputed by a single caller before it expires.
+          Callers that arrive during such a refresh get the current value.
+
+        None results are not cached. Values are stored in an envelope with
+        the refresh metadata, so keys used here shouldn't be read with get().
+
+        Args:
+            key: Cache key
+            loader: Async callable producing the value
+            expire: TTL in seconds (defaults to DEFAULT_TTL)
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        entry = await self.get(key)
+        if not (isinstance(entry, dict) and entry.keys() == {"value", "delta", "expires"}):
+            entry = None
+
+        if entry is not None:
+            # XFetch: -log(U) is exponentially distributed, so early refreshes
+            # concentrate just before expiry
+            early_by = -entry["delta"] * self.EARLY_REFRESH_BETA * math.log(1.0 - random.random())
+            if time.time() + early_by < entry["expires"]:
+                return entry["value"]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            if entry is not None:
+                return entry["value"]
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        if entry is not None:
+            self._stats["early_refreshes"] += 1
+        task = asyncio.ensure_future(self._load(key, loader, expire or self.DEFAULT_TTL))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one cancelled caller doesn't fail the others waiting on it
+        return await asyncio.shield(task)
+
+    async def _load(
+        self, key: str, loader: Callable[[], Awaitable[Any]], expire: int
+    ) -> Any:
+        start = time.perf_counter()
+        value = await loader()
+        delta = time.perf_counter() - start
+        if value is not None:
+            await self.set(
+                key,
+                {"value": value, "delta": delta, "expires": time.time() + expire},
+                expire,
+            )
+        return value
+
+    def _generation_key(self, user_id: UUID) -> str:
+        """Create the key holding a user's cache generation."""
+        return self._make_key(f"gen:{user_id}")
+
+    async def get_generation(self, user_id: UUID) -> int:
+        """Get a user's current cache generation.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Generation number (0 if never bumped or Redis unavailable)
+        """
+        if not self.redis:
+            return 0
+
+        key = self._generation_key(user_id)
+        generation = self._local_get(key)
+        if generation is not _MISSING:
+            return generation
+
+        try:
+            epoch = self._invalidation_epoch
+            value = await self.redis.get(key)
+            generation = int(value) if value else 0
+            self._local_set(key, generation, epoch)
+            return generation
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error("Cache generation get error", user_id=str(user_id), error=str(e))
+            return 0
+
+    async def bump_generation(self, *user_ids: UUID) -> bool:
+        """Invalidate everything cached for the given users.
+
+        Increments each user's generation atomically (INCR), so keys built
+        by user_key() before the bump are never read again and simply
+        expire. O(1) per user, no key scanning.
+
+        Args:
+            *user_ids: Users whose cached values are stale
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.redis or not user_ids:
+            return False
+
+        keys = [self._generation_key(user_id) for user_id in user_ids]
+        for key in keys:
+            self.local.delete(key)
+        try:
+            pipe = self.redis.pipeline()
+            for key in keys:
+                pipe.incr(key)
+                pipe.expire(key, self.GENERATION_TTL)
+            self._publish(pipe, keys)
+            await pipe.execute()
+            logger.debug("Cache generations bumped", users=len(user_ids))
+            return True
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error("Cache generation bump error", error=str(e))
+            return False
+
+    async def user_key(self, user_id: UUID, key: str) -> str:
+        """Build a cache key scoped to a user's current generation.
+
+        Args:
+            user_id: User ID
+            key: Key within the user's namespace (e.g., "advice:3")
+
+        Returns:
+            Cache key for use with get()/set()
+        """
+        generation = await self.get_generation(user_id)
+        return f"user:{user_id}:g{generation}:{key}"
+
     async def get_stats(self) -> dict:
-        """Get cache statistics."""
-        stats = self._stats.copy()
+        """Get cache statistics, overall and per tier."""
+        stats = {
+            name: self._stats[name]
+            for name in ("hits", "misses", "errors", "coalesced", "early_refreshes")
+        }
         total = stats["hits"] + stats["misses"]
         stats["hit_rate"] = (stats["hits"] / total * 100) if total > 0 else 0
+
+        local = self.local.get_stats()
+        local["enabled"] = self._tracking
+        local["invalidations"] = self._stats["invalidations"]
+        redis_total = self._stats["redis_hits"] + self._stats["redis_misses"]
+        stats["tiers"] = {
+            "local": local,
+            "redis": {
+                "hits": self._stats["redis_hits"],
+                "misses": self._stats["redis_misses"],
+                "hit_rate": (
+                    self._stats["redis_hits"] / redis_total * 100 if redis_total > 0 else 0
+                ),
+            },
+        }
         return stats
 
 
@@ -225,6 +703,8 @@ def cached(
 ):
     """Decorator for caching async function results.
 
+    Uses CacheManager.get_or_set(), so results get its stampede protection.
+
     Args:
         key_prefix: Prefix for the cache key
         expire: TTL in seconds
@@ -249,23 +729,103 @@ def cached(
                 key_hash = hashlib.md5(":".join(key_parts).encode()).hexdigest()[:16]
                 cache_key = f"{key_prefix}:{key_hash}"
 
-            # Try cache first
-            cached_value = await cache_manager.get(cache_key)
-            if cached_value is not None:
-                return cached_value
-
-            # Call function and cache result
-            result = await func(*args, **kwargs)
-            if result is not None:
-                await cache_manager.set(cache_key, result, expire)
-
-            return result
+            # Concurrent misses share one call; hot keys refresh before expiry
+            return await cache_manager.get_or_set(
+                cache_key, lambda: func(*args, **kwargs), expire
+            )
 
         return wrapper
 
     return decorator
 
 
+_STALE_USERS_KEY = "stale_cache_users"
+_STALE_KEYS_KEY = "stale_cache_keys"
+_PENDING_KEY = "pending_cache_invalidations"
+
+# Keeps scheduled invalidation tasks referenced until they finish
+_pending_bumps: Set[asyncio.Task] = set()
+
+
+def invalidate_user_cache(session: Session, user_id: UUID) -> None:
+    """Mark a user's cached values stale once the session commits.
+
+    Services call this after writing user data. The generation is bumped
+    after commit rather than immediately, so a concurrent reader can't
+    cache pre-commit data under the new generation. Rolled back sessions
+    bump nothing.
+
+    Args:
+        session: Session (sync or async) the write was made in
+        user_id: Owner of the changed data
+    """
+    sync_session = getattr(session, "sync_session", session)
+    sync_session.info.setdefault(_STALE_USERS_KEY, set()).add(user_id)
+
+
+def invalidate_cache_key(session: Session, key: str) -> None:
+    """Delete a single cache key once the session commits.
+
+    For values cached outside a user's generation (see user_key()), with
+    the same after-commit semantics as invalidate_user_cache().
+
+    Args:
+        session: Session (sync or async) the write was made in
+        key: Cache key holding data derived from the write
+    """
+    sync_session = getattr(session, "sync_session", session)
+    sync_session.info.setdefault(_STALE_KEYS_KEY, set()).add(key)
+
+
+def _schedule(session: Session, coro: Awaitable[Any]) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.debug("No event loop, skipping cache invalidation")
+        coro.close()
+        return
+
+    task = loop.create_task(coro)
+    _pending_bumps.add(task)
+    task.add_done_callback(_pending_bumps.discard)
+    # Also tracked per session, so a request waits only for its own commits
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    pending.add(task)
+    task.add_done_callback(pending.discard)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_users(session: Session) -> None:
+    """Invalidate cached values derived from what this commit changed."""
+    user_ids = session.info.pop(_STALE_USERS_KEY, None)
+    if user_ids:
+        _schedule(session, cache_manager.bump_generation(*user_ids))
+    keys = session.info.pop(_STALE_KEYS_KEY, None)
+    if keys:
+        _schedule(session, cache_manager.delete_many(keys))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale_users(session: Session) -> None:
+    """Forget invalidations for writes that were rolled back."""
+    session.info.pop(_STALE_USERS_KEY, None)
+    session.info.pop(_STALE_KEYS_KEY, None)
+
+
+async def wait_for_invalidations(session: Optional[Session] = None) -> None:
+    """Wait until scheduled cache invalidations have reached Redis.
+
+    Args:
+        session: Only wait for those of this session's commits (default: all)
+    """
+    if session is None:
+        pending = _pending_bumps
+    else:
+        pending = getattr(session, "sync_session", session).info.get(_PENDING_KEY, ())
+    if pending:
+        await asyncio.gather(*list(pending), return_exceptions=True)
+
+
 async def get_cache() -> CacheManager:
     """Dependency for getting cache manager.
 
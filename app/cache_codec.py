@@ -0,0 +1,318 @@
+"""Serialization of cached values.
+
+Cache entries are stored as a small header followed by the encoded value:
+
+    byte 0  format version (FORMAT_VERSION)
+    byte 1  codec id (CODEC_MSGPACK or CODEC_JSON)
+    byte 2  compression id (COMPRESSION_NONE, COMPRESSION_ZLIB or COMPRESSION_ZSTD)
+
+Both codecs round-trip Decimal, UUID, date, datetime and registered
+dataclasses through typed hooks instead of flattening them to strings.
+Entries written before the header existed are plain JSON text, which never
+starts with a version byte, and are still read. Entries from a newer format
+version raise CodecError, which the cache treats as a miss.
+"""
+
+import dataclasses
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Type
+from uuid import UUID
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Optional faster backends
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    logger.debug("msgpack not installed - cache uses the JSON codec")
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+FORMAT_VERSION = 1
+
+CODEC_MSGPACK = 1
+CODEC_JSON = 2
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+
+class CodecError(ValueError):
+    """Raised when a cached entry can't be decoded by this process."""
+
+
+@dataclasses.dataclass(frozen=True)
+class TypeHook:
+    """How to store one Python type the codecs don't support natively.
+
+    Scalar hooks encode to a str, stored as-is. Structured hooks encode to
+    a value the codecs store recursively, so it may contain hooked types.
+    decode rebuilds the original object from the encoded form.
+    """
+
+    cls: type
+    code: int  # msgpack ext type code, also the JSON tag
+    encode: Callable[[Any], Any]
+    decode: Callable[[Any], Any]
+    structured: bool = False
+
+
+_hooks: List[TypeHook] = []
+_hooks_by_type: Dict[type, TypeHook] = {}
+_hooks_by_code: Dict[int, TypeHook] = {}
+
+
+def register_type(
+    cls: type,
+    code: int,
+    encode: Callable[[Any], Any],
+    decode: Callable[[Any], Any],
+    structured: bool = False,
+) -> None:
+    """Register a typed hook so cls survives a trip through the cache.
+
+    Args:
+        cls: Type to handle (subclasses are handled too)
+        code: Unique ext code, 1-127
+        encode: Converts an instance into a str (or storable data if structured)
+        decode: Rebuilds an instance from that data
+        structured: Whether encode returns data to serialize recursively
+
+    Raises:
+        ValueError: If the code is out of range or already used by another type
+    """
+    if not 1 <= code <= 127:
+        raise ValueError(f"Type hook code must be 1-127, got {code}")
+    existing = _hooks_by_code.get(code)
+    if existing is not None and existing.cls is not cls:
+        raise ValueError(f"Type hook code {code} already used by {existing.cls.__name__}")
+
+    hook = TypeHook(cls, code, encode, decode, structured)
+    _hooks[:] = [h for h in _hooks if h.cls is not cls] + [hook]
+    _hooks_by_type[cls] = hook
+    _hooks_by_code[code] = hook
+
+
+def register_dataclass(code: int) -> Callable[[Type], Type]:
+    """Class decorator registering a dataclass for typed caching.
+
+    Example:
+        @register_dataclass(20)
+        @dataclass
+        class Forecast:
+            ...
+    """
+
+    def decorator(cls: Type) -> Type:
+        names = [f.name for f in dataclasses.fields(cls)]
+        register_type(
+            cls,
+            code,
+            lambda obj: {name: getattr(obj, name) for name in names},
+            lambda data: cls(**data),
+            structured=True,
+        )
+        return cls
+
+    return decorator
+
+
+# datetime before date: a datetime is also a date
+register_type(Decimal, 1, str, Decimal)
+register_type(UUID, 2, str, UUID)
+register_type(datetime, 3, datetime.isoformat, datetime.fromisoformat)
+register_type(date, 4, date.isoformat, date.fromisoformat)
+
+
+def _find_hook(obj: Any) -> Optional[TypeHook]:
+    hook = _hooks_by_type.get(type(obj))
+    if hook is not None:
+        return hook
+    for candidate in _hooks:
+        if isinstance(obj, candidate.cls):
+            return candidate
+    return None
+
+
+def _fallback(obj: Any) -> Any:
+    """Storable form for types without a hook, matching the old behaviour."""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    return str(obj)
+
+
+class MsgpackCodec:
+    """msgpack with hooked types stored as ext types."""
+
+    id = CODEC_MSGPACK
+
+    def _default(self, obj: Any) -> Any:
+        hook = _find_hook(obj)
+        if hook is None:
+            return _fallback(obj)
+        if hook.structured:
+            data = self.encode(hook.encode(obj))
+        else:
+            data = hook.encode(obj).encode()
+        # ExtType() validates its arguments in Python, which dominates the
+        # cost of Decimal-heavy payloads; these are known to be valid
+        return tuple.__new__(msgpack.ExtType, (hook.code, data))
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        hook = _hooks_by_code.get(code)
+        if hook is None:
+            raise CodecError(f"Unknown cache ext type {code}")
+        if hook.structured:
+            return hook.decode(self.decode(data))
+        return hook.decode(data.decode())
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=self._default, datetime=False)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, ext_hook=self._ext_hook, strict_map_key=False)
+
+
+class JsonCodec:
+    """Standard library JSON with hooked types stored as tagged objects."""
+
+    id = CODEC_JSON
+    # Kept short: forecasts hold thousands of tagged Decimals
+    TAG = "$t"
+
+    def _default(self, obj: Any) -> Any:
+        hook = _find_hook(obj)
+        if hook is None:
+            return _fallback(obj)
+        return {self.TAG: hook.code, "v": hook.encode(obj)}
+
+    def _object_hook(self, obj: dict) -> Any:
+        code = obj.get(self.TAG)
+        if code is None or len(obj) != 2:
+            return obj
+        hook = _hooks_by_code.get(code)
+        if hook is None:
+            raise CodecError(f"Unknown cache type tag {code}")
+        return hook.decode(obj["v"])
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, default=self._default, separators=(",", ":")).encode()
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data, object_hook=self._object_hook)
+
+
+class CacheSerializer:
+    """Turns cached values into versioned, optionally compressed bytes."""
+
+    def __init__(
+        self,
+        codec: str = "msgpack",
+        compress_min_bytes: int = 1024,
+        compression: str = "zstd",
+    ) -> None:
+        """Initialize serializer.
+
+        Args:
+            codec: "msgpack" or "json"; msgpack falls back to json if not installed
+            compress_min_bytes: Compress encoded values at least this large (0 disables)
+            compression: "zstd" or "zlib"; zstd falls back to zlib if not installed
+        """
+        if codec not in ("msgpack", "json"):
+            raise ValueError(f"Unknown cache codec: {codec}")
+        if compression not in ("zstd", "zlib"):
+            raise ValueError(f"Unknown cache compression: {compression}")
+
+        self._json = JsonCodec()
+        self._codecs: Dict[int, Any] = {CODEC_JSON: self._json}
+        if MSGPACK_AVAILABLE:
+            self._codecs[CODEC_MSGPACK] = MsgpackCodec()
+        if codec == "msgpack":
+            self.codec = self._codecs.get(CODEC_MSGPACK, self._json)
+        else:
+            self.codec = self._json
+
+        self.compress_min_bytes = compress_min_bytes
+        self.compression = (
+            COMPRESSION_ZSTD if compression == "zstd" and ZSTD_AVAILABLE else COMPRESSION_ZLIB
+        )
+        if ZSTD_AVAILABLE:
+            self._zstd_compressor = zstandard.ZstdCompressor(level=3)
+            self._zstd_decompressor = zstandard.ZstdDecompressor()
+
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value with its header."""
+        payload = self.codec.encode(value)
+        compression = COMPRESSION_NONE
+        if self.compress_min_bytes and len(payload) >= self.compress_min_bytes:
+            compression = self.compression
+            if compression == COMPRESSION_ZSTD:
+                payload = self._zstd_compressor.compress(payload)
+            else:
+                payload = zlib.compress(payload, 1)
+        return bytes((FORMAT_VERSION, self.codec.id, compression)) + payload
+
+    def loads(self, data: bytes) -> Any:
+        """Decode a value written by dumps() or by the pre-header JSON cache.
+
+        Raises:
+            CodecError: If the entry uses a format, codec or compression
+                this process can't read
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        if not data:
+            raise CodecError("Empty cache entry")
+
+        version = data[0]
+        if version >= 0x20:
+            # Legacy entry: JSON text from json.dumps(default=str). Versions
+            # are control bytes, which JSON text never starts with
+            try:
+                return json.loads(data)
+            except ValueError as e:
+                raise CodecError(f"Corrupt legacy cache entry: {e}") from e
+        if version != FORMAT_VERSION or len(data) < 3:
+            raise CodecError(f"Unsupported cache entry version {version}")
+
+        codec = self._codecs.get(data[1])
+        if codec is None:
+            raise CodecError(f"Cache codec {data[1]} not available")
+
+        payload = data[3:]
+        compression = data[2]
+        if compression == COMPRESSION_ZLIB:
+            payload = zlib.decompress(payload)
+        elif compression == COMPRESSION_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise CodecError("zstandard not installed")
+            payload = self._zstd_decompressor.decompress(payload)
+        elif compression != COMPRESSION_NONE:
+            raise CodecError(f"Unknown cache compression {compression}")
+
+        try:
+            return codec.decode(payload)
+        except CodecError:
+            raise
+        except Exception as e:
+            raise CodecError(f"Corrupt cache entry: {e}") from e
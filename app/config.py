@@ -48,17 +48,42 @@ class Settings(BaseSettings):
     )
     database_pool_size: int = Field(default=20, alias="DATABASE_POOL_SIZE")
     database_max_overflow: int = Field(default=10, alias="DATABASE_MAX_OVERFLOW")
+    # Read aggregates from the spending_rollups table instead of raw transactions
+    use_spending_rollup: bool = Field(default=True, alias="USE_SPENDING_ROLLUP")
 
     # Redis
     redis_url: str = Field(default="redis://localhost:6379/0", alias="REDIS_URL")
     redis_max_connections: int = Field(default=50, alias="REDIS_MAX_CONNECTIONS")
+    # In-process near-cache in front of Redis (0 entries disables it)
+    cache_local_max_entries: int = Field(default=10000, alias="CACHE_LOCAL_MAX_ENTRIES")
+    cache_local_ttl: int = Field(default=5, alias="CACHE_LOCAL_TTL")  # seconds
+    # Cached value encoding: "msgpack" (falls back to "json" if not installed)
+    cache_codec: str = Field(default="msgpack", alias="CACHE_CODEC")
+    cache_compress_min_bytes: int = Field(default=1024, alias="CACHE_COMPRESS_MIN_BYTES")
+    cache_compression: str = Field(default="zstd", alias="CACHE_COMPRESSION")  # or "zlib"
 
     # Security
     secret_key: str = Field(default="change-me-in-production", alias="SECRET_KEY")
     algorithm: str = Field(default="HS256", alias="ALGORITHM")
     access_token_expire_minutes: int = Field(default=30, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
     refresh_token_expire_days: int = Field(default=7, alias="REFRESH_TOKEN_EXPIRE_DAYS")
+    # Auth fast path: decoded token claims kept in-process, user principals
+    # (id, is_active) in the cache, revoked tokens in a local bloom filter
+    auth_claims_cache_size: int = Field(default=10000, alias="AUTH_CLAIMS_CACHE_SIZE")
+    auth_principal_ttl: int = Field(default=300, alias="AUTH_PRINCIPAL_TTL")  # seconds
+    token_blacklist_capacity: int = Field(default=100000, alias="TOKEN_BLACKLIST_CAPACITY")
+    # Password hashing: bcrypt work factor (stored hashes are upgraded on login)
+    # and the worker pool that keeps it off the event loop
+    bcrypt_rounds: int = Field(default=12, alias="BCRYPT_ROUNDS")
+    password_hash_workers: int = Field(default=2, alias="PASSWORD_HASH_WORKERS")
+    password_hash_max_pending: int = Field(default=32, alias="PASSWORD_HASH_MAX_PENDING")
+    password_hash_executor: str = Field(default="process", alias="PASSWORD_HASH_EXECUTOR")
     encryption_key: str = Field(default="change-me-in-production", alias="ENCRYPTION_KEY")
+    # Retired encryption keys still accepted for decryption during a rotation (JSON list)
+    encryption_old_keys: List[str] = Field(default=[], alias="ENCRYPTION_OLD_KEYS")
+
+    # Accounts allowed to use admin endpoints (JSON list)
+    admin_emails: List[str] = Field(default=[], alias="ADMIN_EMAILS")
 
     # CORS
     allowed_origins: List[str] = Field(
@@ -69,10 +94,10 @@ class Settings(BaseSettings):
         alias="ALLOWED_ORIGIN_REGEX",
     )
 
-    @field_validator("allowed_origins", mode="before")
+    @field_validator("allowed_origins", "admin_emails", "encryption_old_keys", mode="before")
     @classmethod
     def parse_cors_origins(cls, v: str | List[str]) -> List[str]:
-        """Parse CORS origins from comma-separated string or list."""
+        """Parse CORS origins (or other lists) from comma-separated string or list."""
         if isinstance(v, str):
             raw = v.strip()
             if not raw:
@@ -112,6 +137,13 @@ class Settings(BaseSettings):
         default=50, alias="MIN_TRANSACTIONS_FOR_USER_MODEL"
     )
     min_corrections_for_user_model: int = Field(default=10, alias="MIN_CORRECTIONS_FOR_USER_MODEL")
+    # Background training of user models: "memory" (per process) or "redis" (shared) queue,
+    # trainings run at once per worker, finished jobs kept for the admin listing, and
+    # trained model files kept per user
+    training_queue_backend: str = Field(default="memory", alias="TRAINING_QUEUE_BACKEND")
+    training_workers: int = Field(default=1, alias="TRAINING_WORKERS")
+    training_job_history: int = Field(default=200, alias="TRAINING_JOB_HISTORY")
+    training_model_versions: int = Field(default=5, alias="TRAINING_MODEL_VERSIONS")
 
     # AI Brain (LLM Service)
     ai_brain_mode: str = Field(default="http", alias="AI_BRAIN_MODE")  # "http" or "direct"
@@ -129,10 +161,15 @@ class Settings(BaseSettings):
     plaid_client_id: str | None = Field(default=None, alias="PLAID_CLIENT_ID")
     plaid_secret: str | None = Field(default=None, alias="PLAID_SECRET")
     plaid_env: str = Field(default="sandbox", alias="PLAID_ENV")
+    sync_concurrency: int = Field(default=4, alias="SYNC_CONCURRENCY")  # connections at once
+    sync_page_size: int = Field(default=500, alias="SYNC_PAGE_SIZE")  # changes per provider call
 
     # Performance
     max_workers: int = Field(default=4, alias="MAX_WORKERS")
     request_timeout: int = Field(default=30, alias="REQUEST_TIMEOUT")
+    advice_stage_timeout: float = Field(
+        default=2.0, alias="ADVICE_STAGE_TIMEOUT"
+    )  # seconds per dashboard advice stage
 
 
 # Global settings instance
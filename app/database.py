@@ -6,6 +6,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
+from app.cache import wait_for_invalidations
 from app.config import settings
 from app.logging_config import get_logger
 
@@ -68,6 +69,8 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         try:
             yield session
             await session.commit()
+            # Make this request's writes visible to cached reads before returning
+            await wait_for_invalidations(session)
         except Exception as e:
             await session.rollback()
             logger.error("Database session error", error=str(e), exc_info=True)
@@ -76,6 +79,15 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def get_session_factory() -> async_sessionmaker:
+    """Dependency for services opening their own sessions, e.g. to query concurrently.
+
+    Returns:
+        async_sessionmaker: Async session factory
+    """
+    return AsyncSessionLocal
+
+
 def get_sync_db() -> Session:
     """Get a synchronous database session.
 
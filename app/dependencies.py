@@ -5,30 +5,32 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
-from app.services.auth_service import AuthService, AuthenticationError, TokenError
+from app.services.auth_service import AuthService, AuthenticationError, Principal, TokenError
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-async def get_current_user(
+async def get_current_principal(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
-) -> User:
+) -> Principal:
     """
-    Extract and validate the current user from the JWT token.
+    Authenticate the request and return the caller's principal (id, is_active).
 
-    Checks token blacklist (Redis), validates JWT, verifies user is active.
-    Returns the full User ORM object so routes can access user.id,
-    user.email, etc. without any additional DB queries.
+    Checks the token blacklist, validates the JWT, verifies the user is
+    active. In the common case this needs no network hop or DB query: the
+    blacklist is checked against a local bloom filter, decoded claims are
+    cached per token, and principals are cached per user.
 
     Raises HTTPException 401 if token is invalid/expired/revoked.
     Raises HTTPException 403 if account is deactivated.
     """
     auth_service = AuthService(db)
 
-    # Check blacklist first (fast Redis lookup)
+    # Check blacklist first (local filter, Redis only on a possible hit)
     if await auth_service.is_token_blacklisted(token):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -37,22 +39,7 @@ async def get_current_user(
         )
 
     try:
-        user = await auth_service.get_current_user(token)
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        if hasattr(user, 'is_active') and not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Account is deactivated",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return user
-    except HTTPException:
-        raise
+        principal = await auth_service.get_principal(token)
     except (AuthenticationError, TokenError) as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -66,12 +53,60 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account is deactivated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
+
+
+async def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """
+    Load the full User row for the authenticated caller.
+
+    Returns the User ORM object so routes can access user.email, etc.
+    Costs one DB query; use get_current_user_id when only the id is needed.
+
+    Raises HTTPException 401/403 as get_current_principal does.
+    """
+    user = await db.get(User, principal.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
 
 async def get_current_user_id(
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
 ) -> UUID:
     """
     Shorthand dependency that returns just the user's UUID.
     Use this when you only need the ID, not the full user object.
     """
-    return current_user.id
+    return principal.id
+
+
+async def get_current_admin_user(
+    user: User = Depends(get_current_user),
+) -> User:
+    """
+    Load the authenticated caller and require them to be an administrator.
+
+    Administrators are the accounts listed in ADMIN_EMAILS.
+
+    Raises HTTPException 403 for other accounts.
+    """
+    if user.email.lower() not in {email.lower() for email in settings.admin_emails}:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return user
@@ -18,6 +18,8 @@ from app.config import settings
 from app.database import close_db, init_db
 from app.logging_config import configure_logging, get_logger, bind_contextvars, clear_contextvars
 from app.middleware.security import SecurityMiddleware
+from app.services.password_hasher import password_hasher
+from app.services.token_blacklist import token_blacklist
 
 # Configure logging
 configure_logging()
@@ -116,6 +118,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         except Exception as e:
             logger.warning("GPU metrics not available", error=str(e))
 
+        # Train user categorization models in the background
+        from app.routes.ml import get_categorization_engine
+        from app.services.training_jobs import start_training_jobs
+
+        await start_training_jobs(get_categorization_engine(), cache_manager.redis)
+
         logger.info("Application started successfully")
 
         yield
@@ -132,6 +140,24 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         except Exception:
             pass
 
+        # Stop password hashing workers
+        password_hasher.shutdown()
+
+        # Stop background training before the engine saves its models
+        from app.services.training_jobs import stop_training_jobs
+
+        await stop_training_jobs()
+
+        # Save categorization models with pending updates
+        from app.routes.ml import close_categorization_engine
+
+        close_categorization_engine()
+
+        # Flush logged category corrections
+        from app.services.feedback_collector import close_feedback_collector
+
+        close_feedback_collector()
+
         # Close database connections
         await close_db()
 
@@ -330,9 +356,12 @@ async def cache_stats() -> dict:
     """Get cache statistics.
 
     Returns:
-        Cache hit/miss stats
+        Cache hit/miss stats, overall and per tier (local LRU and Redis),
+        plus how often token blacklist checks were answered locally
     """
-    return await cache_manager.get_stats()
+    stats = await cache_manager.get_stats()
+    stats["token_blacklist"] = token_blacklist.get_stats()
+    return stats
 
 
 @app.get("/metrics/gpu")
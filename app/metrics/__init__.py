@@ -1,16 +1,25 @@
 """Metrics module for observability."""
 
+from app.metrics.advice_metrics import AdviceMetrics, advice_metrics
 from app.metrics.ai_brain_metrics import (
     AIBrainMetrics,
     ai_metrics,
     track_ai_request,
 )
+from app.metrics.auth_metrics import PasswordHashMetrics, password_hash_metrics
 from app.metrics.gpu_metrics import GPUMetrics, gpu_metrics
+from app.metrics.sync_metrics import SyncMetrics, sync_metrics
 
 __all__ = [
+    "AdviceMetrics",
+    "advice_metrics",
     "AIBrainMetrics",
     "ai_metrics",
     "track_ai_request",
+    "PasswordHashMetrics",
+    "password_hash_metrics",
     "GPUMetrics",
     "gpu_metrics",
+    "SyncMetrics",
+    "sync_metrics",
 ]
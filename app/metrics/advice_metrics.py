@@ -0,0 +1,43 @@
+"""Dashboard advice metrics for Prometheus.
+
+Tracks how long each stage of the dashboard advice pipeline takes and how
+it ended (success, timeout or error), along with the whole dashboard's
+latency, so a slow stage shows up before it degrades the dashboard.
+"""
+
+from prometheus_client import Histogram, REGISTRY, CollectorRegistry
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class AdviceMetrics:
+    """Custom Prometheus metrics for dashboard advice generation."""
+
+    def __init__(self, registry: CollectorRegistry = REGISTRY):
+        """Initialize dashboard advice metrics.
+
+        Args:
+            registry: Prometheus registry to use
+        """
+        self.registry = registry
+
+        self.stage_duration = Histogram(
+            "advice_stage_duration_seconds",
+            "Time taken by one dashboard advice stage",
+            labelnames=["stage", "outcome"],
+            buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+            registry=registry,
+        )
+
+        self.dashboard_duration = Histogram(
+            "advice_dashboard_duration_seconds",
+            "Time to generate dashboard advice, all stages included",
+            buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+            registry=registry,
+        )
+
+
+# Singleton instance
+advice_metrics = AdviceMetrics()
@@ -204,6 +204,16 @@ class AIBrainMetrics:
             registry=registry,
         )
 
+        # -------------------------------------------------------------------------
+        # AI / ML Cross-Validation Metrics
+        # -------------------------------------------------------------------------
+        self.ml_agreement = Counter(
+            "ai_brain_ml_agreement_total",
+            "AI categories cross-validated against the local ML model, by agreement",
+            labelnames=["agreement"],
+            registry=registry,
+        )
+
     def set_model_info(
         self,
         model_name: str,
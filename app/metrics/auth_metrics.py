@@ -0,0 +1,60 @@
+"""Authentication metrics for Prometheus.
+
+Tracks the password hashing pool: how long hashes take, how many are
+waiting for a worker, and how many were shed under load.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY, CollectorRegistry
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class PasswordHashMetrics:
+    """Custom Prometheus metrics for password hashing."""
+
+    def __init__(self, registry: CollectorRegistry = REGISTRY):
+        """Initialize password hashing metrics.
+
+        Args:
+            registry: Prometheus registry to use
+        """
+        self.registry = registry
+
+        self.duration = Histogram(
+            "password_hash_duration_seconds",
+            "Time from submitting a password hash or check until it completes",
+            labelnames=["operation"],
+            buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+            registry=registry,
+        )
+
+        self.queue_depth = Gauge(
+            "password_hash_queue_depth",
+            "Password hashes waiting for a free worker",
+            registry=registry,
+        )
+
+        self.in_flight = Gauge(
+            "password_hash_in_flight",
+            "Password hashes queued or running",
+            registry=registry,
+        )
+
+        self.rejected_total = Counter(
+            "password_hash_rejected_total",
+            "Password hashes refused because the queue was full",
+            labelnames=["operation"],
+            registry=registry,
+        )
+
+        self.rehash_total = Counter(
+            "password_rehash_total",
+            "Stored hashes upgraded to the current work factor on login",
+            registry=registry,
+        )
+
+
+# Singleton instance
+password_hash_metrics = PasswordHashMetrics()
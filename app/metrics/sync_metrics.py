@@ -0,0 +1,57 @@
+"""Bank connection sync metrics for Prometheus.
+
+Tracks how long connection syncs take, how many provider calls they make
+and how many transactions they add, modify and remove. Per-connection
+figures are logged with each sync rather than labelled here, to keep the
+series count independent of the number of connections.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY, CollectorRegistry
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class SyncMetrics:
+    """Custom Prometheus metrics for connection syncs."""
+
+    def __init__(self, registry: CollectorRegistry = REGISTRY):
+        """Initialize connection sync metrics.
+
+        Args:
+            registry: Prometheus registry to use
+        """
+        self.registry = registry
+
+        self.duration = Histogram(
+            "connection_sync_duration_seconds",
+            "Time to sync one connection, provider calls and writes included",
+            labelnames=["provider", "outcome"],
+            buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+            registry=registry,
+        )
+
+        self.provider_calls = Counter(
+            "connection_sync_provider_calls_total",
+            "Pages requested from sync providers",
+            labelnames=["provider"],
+            registry=registry,
+        )
+
+        self.transactions = Counter(
+            "connection_sync_transactions_total",
+            "Synced transaction changes written, by kind",
+            labelnames=["provider", "change"],
+            registry=registry,
+        )
+
+        self.in_flight = Gauge(
+            "connection_sync_in_flight",
+            "Connections being synced",
+            registry=registry,
+        )
+
+
+# Singleton instance
+sync_metrics = SyncMetrics()
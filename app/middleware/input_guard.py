@@ -17,14 +17,87 @@ Usage:
         raise HTTPException(400, result.rejection_reason)
 """
 
+import hashlib
+import importlib
 import re
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from enum import IntEnum
-from typing import List, Optional, Tuple
+from itertools import islice
+from typing import Any, FrozenSet, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# CPython's regex parser, used only to derive literal prefilters; without it
+# (another interpreter or a changed internal API) every pattern simply runs
+sre_parse: Any
+try:
+    sre_parse = importlib.import_module("re._parser")
+except ImportError:  # pragma: no cover
+    sre_parse = None
+
+# Characters whose regex IGNORECASE match differs from str.lower(). Folding
+# them first makes a substring test on the folded text agree with re.I for
+# ASCII literals (dotted/dotless i and long s), see _fold_case.
+_CASE_FOLD_FIXES = {0x130: "i", 0x131: "i", 0x17F: "s"}
+
+_REPEATED_CHAR_RE = re.compile(r"(.)\1{10,}")
+_INVISIBLE_CHARS_RE = re.compile(r"[\u200b-\u200f\u2060-\u206f]")
+_EXCESS_WHITESPACE_RE = re.compile(r"\s{3,}")
+_TEMPLATE_MARKER_RE = re.compile(r"\{\{[^}]*\}\}")
+_LOG_INJECTION_RE = re.compile(r"[\n\r\t]")
+
+
+def _fold_case(text: str) -> str:
+    """Lowercase text so ASCII literal substring tests match like re.IGNORECASE."""
+    if text.isascii():
+        return text.lower()
+    return text.translate(_CASE_FOLD_FIXES).lower()
+
+
+def _required_literals(parsed: Any) -> List[FrozenSet[str]]:
+    """
+    Find literal sets that every match must contain.
+
+    Walks a parsed regex and returns a list of clauses: any match contains at
+    least one literal (lowercased) from each clause. An empty list means no
+    ASCII literal is required.
+    """
+    clauses: List[FrozenSet[str]] = []
+    run: List[str] = []
+
+    def flush() -> None:
+        if run:
+            clauses.append(frozenset(["".join(run)]))
+            run.clear()
+
+    for op, av in parsed:
+        if op is sre_parse.LITERAL and av < 128:
+            run.append(chr(av).lower())
+            continue
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            clauses.extend(_required_literals(av[-1]))
+        elif op is sre_parse.BRANCH:
+            # Each branch contributes its most selective clause
+            best = [_most_selective(_required_literals(branch)) for branch in av[1]]
+            if all(best):
+                clauses.append(frozenset().union(*(b for b in best if b)))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, sre_parse.POSSESSIVE_REPEAT):
+            low, _high, sub = av
+            if low >= 1:
+                clauses.extend(_required_literals(sub))
+    flush()
+    return clauses
+
+
+def _most_selective(clauses: List[FrozenSet[str]]) -> Optional[FrozenSet[str]]:
+    """Pick the clause whose shortest literal is longest."""
+    if not clauses:
+        return None
+    return max(clauses, key=lambda literals: min(len(lit) for lit in literals))
+
 
 class ThreatLevel(IntEnum):
     """Threat level classification for detected issues.
@@ -84,10 +157,18 @@ class InputGuard:
     Detects and blocks prompt injection attacks, jailbreaks,
     and other malicious input patterns.
 
+    Each pattern is guarded by the literals it requires (e.g. "ignore" for
+    the instruction override rule). Cheap substring checks over the
+    case-folded input select the candidate patterns, and only those run
+    their regex. Unless ``detailed`` is set, scanning stops as soon as the
+    input is certain to be rejected, so the threats and risk score of a
+    rejected input are a lower bound.
+
     Attributes:
         max_input_length: Maximum allowed input length
         risk_threshold: Score above which input is rejected (0-100)
         strict_mode: If True, any detected threat blocks input
+        detailed: If True, always scan every pattern and collect all threats
     """
 
     # Instruction override patterns - attempts to change AI behavior
@@ -290,6 +371,8 @@ class InputGuard:
         risk_threshold: float = 25.0,
         strict_mode: bool = False,
         log_threats: bool = True,
+        detailed: bool = False,
+        cache_size: int = 256,
     ):
         """
         Initialize InputGuard.
@@ -299,14 +382,25 @@ class InputGuard:
             risk_threshold: Score above which input is rejected (0-100)
             strict_mode: If True, any HIGH/CRITICAL threat blocks input
             log_threats: Whether to log detected threats
+            detailed: If True, collect every threat instead of stopping early
+            cache_size: Number of recent results cached by input hash (0 disables)
         """
         self.max_input_length = max_input_length
         self.risk_threshold = risk_threshold
         self.strict_mode = strict_mode
         self.log_threats = log_threats
+        self.detailed = detailed
+        self.cache_size = cache_size
 
         # Compile all patterns for efficiency
         self._compiled_patterns = self._compile_patterns()
+        # Literal prefilter per pattern: each clause must have a literal present
+        # in the input (empty = no literal required, always run)
+        self._pattern_literals: List[List[FrozenSet[str]]] = [
+            self._extract_literals(pattern) for pattern, _, _, _ in self._compiled_patterns
+        ]
+
+        self._result_cache: "OrderedDict[Tuple[bytes, bool], InputValidationResult]" = OrderedDict()
 
     def _compile_patterns(self) -> List[Tuple[re.Pattern, str, ThreatLevel, int]]:
         """Compile all regex patterns for efficient matching."""
@@ -331,16 +425,73 @@ class InputGuard:
 
         return compiled
 
-    def validate(self, input_text: str) -> InputValidationResult:
+    @staticmethod
+    def _extract_literals(pattern: re.Pattern) -> List[FrozenSet[str]]:
+        """Get the prefilter clauses for a compiled pattern."""
+        if sre_parse is None:
+            return []
+        try:
+            return _required_literals(sre_parse.parse(pattern.pattern, pattern.flags))
+        except Exception as e:  # Unknown regex construct: always run the pattern
+            logger.debug(f"No literal prefilter for pattern '{pattern.pattern}': {e}")
+            return []
+
+    def validate(self, input_text: str, detailed: Optional[bool] = None) -> InputValidationResult:
         """
         Validate input text for potential threats.
 
         Args:
             input_text: The user input to validate
+            detailed: Override the guard's ``detailed`` setting for this call
 
         Returns:
             InputValidationResult with safety status and details
         """
+        detailed = self.detailed if detailed is None else detailed
+        if not self.cache_size or not input_text:
+            result = self._validate(input_text, detailed)
+        else:
+            encoded = input_text.encode("utf-8", "surrogatepass")
+            digest = hashlib.blake2b(encoded, digest_size=16).digest()
+            key = (digest, detailed)
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                self._result_cache.move_to_end(key)
+            else:
+                cached = self._validate(input_text, detailed)
+                self._result_cache[key] = cached
+                if len(self._result_cache) > self.cache_size:
+                    self._result_cache.popitem(last=False)
+            # Callers get their own copy, so they can't alter the cached result
+            result = replace(cached, detected_threats=[replace(t) for t in cached.detected_threats])
+
+        self._log_threats(result)
+        return result
+
+    def _log_threats(self, result: InputValidationResult) -> None:
+        """Log the threats found in an input, if configured."""
+        if self.log_threats and result.detected_threats:
+            logger.warning(
+                "Input threats detected",
+                extra={
+                    "threat_count": len(result.detected_threats),
+                    "max_threat_level": result.threat_level.value,
+                    "risk_score": result.risk_score,
+                    "is_blocked": not result.is_safe,
+                    "patterns": [t.pattern_name for t in result.detected_threats[:5]],
+                },
+            )
+
+    def _is_decided(self, risk_score: float, max_threat: ThreatLevel) -> bool:
+        """Whether further matches can no longer change the outcome (rejection)."""
+        return (
+            risk_score >= self.risk_threshold
+            or max_threat == ThreatLevel.CRITICAL
+            or (self.strict_mode and max_threat >= ThreatLevel.HIGH)
+        )
+
+    def _validate(self, input_text: str, detailed: bool) -> InputValidationResult:
+        """Run validation without the result cache."""
         if not input_text:
             return InputValidationResult(
                 is_safe=True,
@@ -363,32 +514,37 @@ class InputGuard:
             )
 
         # Check for excessive repetition (often used in attacks)
+        max_threat = ThreatLevel.NONE
         repetition_threat = self._check_repetition(input_text)
         if repetition_threat:
             detected_threats.append(repetition_threat)
             total_risk_score += 15.0
-
-        # Run all pattern checks
-        for pattern, name, level, score in self._compiled_patterns:
-            matches = pattern.findall(input_text)
-            if matches:
-                for match in matches[:3]:  # Limit matches to prevent DoS
-                    match_text = match if isinstance(match, str) else match[0]
-                    detected_threats.append(
-                        DetectedThreat(
-                            pattern_name=name,
-                            matched_text=match_text[:50],  # Truncate for safety
-                            threat_level=level,
-                            description=f"Detected {name} pattern",
-                        )
+            max_threat = repetition_threat.threat_level
+
+        # Run the pattern checks whose required literals occur in the input
+        folded = _fold_case(input_text)
+        for (pattern, name, level, score), clauses in zip(
+            self._compiled_patterns, self._pattern_literals
+        ):
+            if not detailed and self._is_decided(total_risk_score, max_threat):
+                break
+            if not all(any(lit in folded for lit in clause) for clause in clauses):
+                continue
+            # Limit matches to prevent DoS
+            for match in islice(pattern.finditer(input_text), 3):
+                # Same text findall() reports: the first group if there is one
+                match_text = (match.group(1) or "") if pattern.groups else match.group(0)
+                detected_threats.append(
+                    DetectedThreat(
+                        pattern_name=name,
+                        matched_text=match_text[:50],  # Truncate for safety
+                        threat_level=level,
+                        description=f"Detected {name} pattern",
                     )
-                    total_risk_score += score
-
-        # Determine overall threat level
-        max_threat = ThreatLevel.NONE
-        for threat in detected_threats:
-            if threat.threat_level > max_threat:
-                max_threat = threat.threat_level
+                )
+                total_risk_score += score
+                if level > max_threat:
+                    max_threat = level
 
         # Determine if input should be blocked
         is_safe = True
@@ -406,19 +562,6 @@ class InputGuard:
             is_safe = False
             rejection_reason = f"Critical threat detected: {detected_threats[0].pattern_name}"
 
-        # Log threats if configured
-        if self.log_threats and detected_threats:
-            logger.warning(
-                "Input threats detected",
-                extra={
-                    "threat_count": len(detected_threats),
-                    "max_threat_level": max_threat.value,
-                    "risk_score": total_risk_score,
-                    "is_blocked": not is_safe,
-                    "patterns": [t.pattern_name for t in detected_threats[:5]],
-                },
-            )
-
         # Create sanitized version (remove detected patterns)
         sanitized = input_text
         if detected_threats and is_safe:
@@ -453,7 +596,7 @@ class InputGuard:
                     )
 
         # Check for repeated characters
-        if re.search(r"(.)\1{10,}", text):
+        if _REPEATED_CHAR_RE.search(text):
             return DetectedThreat(
                 pattern_name="char_repetition",
                 matched_text="Repeated characters",
@@ -473,13 +616,13 @@ class InputGuard:
         sanitized = text
 
         # Remove invisible characters
-        sanitized = re.sub(r"[\u200b-\u200f\u2060-\u206f]", "", sanitized)
+        sanitized = _INVISIBLE_CHARS_RE.sub("", sanitized)
 
         # Normalize excessive whitespace
-        sanitized = re.sub(r"\s{3,}", "  ", sanitized)
+        sanitized = _EXCESS_WHITESPACE_RE.sub("  ", sanitized)
 
         # Remove potential template markers
-        sanitized = re.sub(r"\{\{[^}]*\}\}", "[removed]", sanitized)
+        sanitized = _TEMPLATE_MARKER_RE.sub("[removed]", sanitized)
 
         return sanitized.strip()
 
@@ -491,7 +634,7 @@ class InputGuard:
         if len(text) > max_length:
             preview += "..."
         # Remove potential log injection characters
-        preview = re.sub(r"[\n\r\t]", " ", preview)
+        preview = _LOG_INJECTION_RE.sub(" ", preview)
         return preview
 
 
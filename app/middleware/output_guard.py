@@ -16,16 +16,73 @@ Usage:
     if not result.is_safe:
         # Use filtered version or reject
         response_text = result.filtered_content or "Unable to provide response"
+
+    # Chunked responses are filtered incrementally
+    stream = guard.stream()
+    for chunk in chunks:
+        send(stream.feed(chunk))
+    send(stream.close())
+    result = stream.result()
 """
 
 import re
 from dataclasses import dataclass, field
 from enum import IntEnum
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Set, Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Characters held back between stream chunks so boundary-spanning matches are seen
+DEFAULT_STREAM_WINDOW = 256
+
+# The longest masked match, an e-mail address (RFC 5321 allows 254 characters); a
+# smaller window lets the start of a match be emitted before the rest arrives
+MIN_STREAM_WINDOW = 254
+
+
+def _mask_matches(
+    pattern: re.Pattern,
+    text: str,
+    replacement: Union[None, str, Callable[[re.Match], str]],
+) -> Tuple[str, List[re.Match]]:
+    """
+    Find every match of a pattern and replace it in the same pass.
+
+    Args:
+        pattern: Compiled pattern to scan for
+        text: Text to scan
+        replacement: None to leave the text unchanged, a literal string,
+            or a callable building the replacement from the match
+
+    Returns:
+        Tuple of (possibly replaced text, matches found)
+    """
+    matches = []
+    pieces = []
+    last = 0
+    for match in pattern.finditer(text):
+        matches.append(match)
+        if replacement is not None:
+            pieces.append(text[last : match.start()])
+            pieces.append(replacement if isinstance(replacement, str) else replacement(match))
+            last = match.end()
+
+    if not pieces:
+        return text, matches
+    pieces.append(text[last:])
+    return "".join(pieces), matches
+
+
+def _findall_item(match: re.Match):
+    """Return what re.findall would yield for this match."""
+    groups = match.re.groups
+    if groups == 0:
+        return match.group()
+    if groups == 1:
+        return match.group(1) or ""
+    return match.groups(default="")
+
 
 class ContentIssueType(IntEnum):
     """Types of content issues detected."""
@@ -434,23 +491,9 @@ class OutputGuard:
             )
 
         issues: List[ContentIssue] = []
-        filtered = content
-        pii_detected = False
-        content_modified = False
 
-        # Check for PII and mask if configured
-        filtered, pii_issues = self._check_and_mask_pii(filtered)
-        issues.extend(pii_issues)
-        if pii_issues:
-            pii_detected = True
-            content_modified = True
-
-        # Check for profanity
-        if self.filter_profanity:
-            filtered, profanity_issues = self._check_profanity(filtered)
-            issues.extend(profanity_issues)
-            if profanity_issues:
-                content_modified = True
+        # Mask PII and filter profanity
+        filtered, pii_detected, content_modified = self._filter_content(content, issues)
 
         # Check for harmful financial advice
         harmful_issues = self._check_harmful_advice(content)
@@ -469,6 +512,70 @@ class OutputGuard:
                 filtered += self.FINANCIAL_DISCLAIMER
                 content_modified = True
 
+        return self._build_result(
+            original_content=content,
+            filtered_content=filtered if content_modified else content,
+            issues=issues,
+            needs_disclaimer=needs_disclaimer,
+            pii_detected=pii_detected,
+            content_modified=content_modified,
+        )
+
+    def stream(
+        self,
+        context: Optional[dict] = None,
+        window: int = DEFAULT_STREAM_WINDOW,
+        add_disclaimer: bool = True,
+    ) -> "OutputStream":
+        """
+        Start incremental validation of a chunked response.
+
+        Args:
+            context: Optional context about the request (user data provided, etc.)
+            window: Characters held back between chunks for boundary matches
+            add_disclaimer: Whether close() may append the disclaimer; turn off
+                for structured bodies such as JSON that text can't follow
+
+        Returns:
+            OutputStream to feed chunks through
+
+        Raises:
+            ValueError: If window is below MIN_STREAM_WINDOW
+        """
+        return OutputStream(self, context=context, window=window, add_disclaimer=add_disclaimer)
+
+    def _filter_content(
+        self, content: str, issues: List[ContentIssue], offset: int = 0
+    ) -> Tuple[str, bool, bool]:
+        """
+        Mask PII and filter profanity, collecting issues.
+
+        Returns:
+            Tuple of (filtered content, pii_detected, content_modified)
+        """
+        filtered, pii_issues = self._check_and_mask_pii(content, offset)
+        issues.extend(pii_issues)
+        pii_detected = bool(pii_issues)
+        content_modified = pii_detected
+
+        if self.filter_profanity:
+            filtered, profanity_issues = self._check_profanity(filtered, offset)
+            issues.extend(profanity_issues)
+            if profanity_issues:
+                content_modified = True
+
+        return filtered, pii_detected, content_modified
+
+    def _build_result(
+        self,
+        original_content: str,
+        filtered_content: str,
+        issues: List[ContentIssue],
+        needs_disclaimer: bool,
+        pii_detected: bool,
+        content_modified: bool,
+    ) -> OutputValidationResult:
+        """Compute severity and safety for the collected issues."""
         # Calculate max severity
         max_severity = Severity.NONE
         for issue in issues:
@@ -497,8 +604,8 @@ class OutputGuard:
 
         return OutputValidationResult(
             is_safe=is_safe,
-            original_content=content,
-            filtered_content=filtered if content_modified else content,
+            original_content=original_content,
+            filtered_content=filtered_content,
             issues=issues,
             max_severity=max_severity,
             needs_disclaimer=needs_disclaimer,
@@ -506,13 +613,13 @@ class OutputGuard:
             content_modified=content_modified,
         )
 
-    def _check_and_mask_pii(self, content: str) -> Tuple[str, List[ContentIssue]]:
-        """Check for PII and mask it if configured."""
+    def _check_and_mask_pii(self, content: str, offset: int = 0) -> Tuple[str, List[ContentIssue]]:
+        """Check for PII and mask it if configured (one pass per pattern)."""
         issues = []
         masked = content
 
         for pattern, name, issue_type, severity, replacement in self._pii_patterns:
-            matches = list(pattern.finditer(masked))
+            masked, matches = _mask_matches(pattern, masked, replacement if self.mask_pii else None)
             for match in matches:
                 issues.append(
                     ContentIssue(
@@ -520,23 +627,21 @@ class OutputGuard:
                         severity=severity,
                         description=f"PII detected: {name}",
                         matched_text=match.group()[:20] + "...",  # Truncate for safety
-                        position=(match.start(), match.end()),
+                        position=(match.start() + offset, match.end() + offset),
                         remediation=f"Masked with {replacement}",
                     )
                 )
 
-            if self.mask_pii and matches:
-                masked = pattern.sub(replacement, masked)
-
         return masked, issues
 
-    def _check_profanity(self, content: str) -> Tuple[str, List[ContentIssue]]:
-        """Check for profanity and filter if configured."""
+    def _check_profanity(self, content: str, offset: int = 0) -> Tuple[str, List[ContentIssue]]:
+        """Check for profanity and filter if configured (one pass per pattern)."""
         issues = []
         filtered = content
 
         for pattern, name, issue_type, severity, _ in self._profanity_patterns:
-            matches = list(pattern.finditer(filtered))
+            # Replace with asterisks
+            filtered, matches = _mask_matches(pattern, filtered, lambda m: "*" * len(m.group()))
             for match in matches:
                 issues.append(
                     ContentIssue(
@@ -544,25 +649,35 @@ class OutputGuard:
                         severity=severity,
                         description=f"Inappropriate language: {name}",
                         matched_text="[PROFANITY]",  # Don't log actual word
-                        position=(match.start(), match.end()),
+                        position=(match.start() + offset, match.end() + offset),
                     )
                 )
 
-            if matches:
-                # Replace with asterisks
-                filtered = pattern.sub(lambda m: "*" * len(m.group()), filtered)
-
         return filtered, issues
 
-    def _check_harmful_advice(self, content: str) -> List[ContentIssue]:
-        """Check for potentially harmful financial advice."""
+    def _check_harmful_advice(
+        self, content: str, seen: Optional[Set[str]] = None
+    ) -> List[ContentIssue]:
+        """
+        Check for potentially harmful financial advice.
+
+        Args:
+            content: Text to check
+            seen: Pattern names already reported; matching names are skipped
+                and newly reported ones are added
+        """
         issues = []
 
         for pattern, name, issue_type, severity, description in self._harmful_patterns:
-            matches = pattern.findall(content)
-            if matches:
-                # Only record first match to avoid spam
-                match_text = matches[0] if isinstance(matches[0], str) else matches[0][0]
+            if seen is not None and name in seen:
+                continue
+            # Only record first match to avoid spam
+            match = pattern.search(content)
+            if match:
+                if seen is not None:
+                    seen.add(name)
+                item = _findall_item(match)
+                match_text = item if isinstance(item, str) else item[0]
                 issues.append(
                     ContentIssue(
                         issue_type=issue_type,
@@ -576,19 +691,24 @@ class OutputGuard:
         return issues
 
     def _check_hallucinations(
-        self, content: str, context: Optional[dict] = None
+        self, content: str, context: Optional[dict] = None, seen: Optional[Set[str]] = None
     ) -> List[ContentIssue]:
         """Check for potential hallucinations (fabricated data)."""
         issues = []
 
         for pattern, name, issue_type, severity, description in self._hallucination_patterns:
-            matches = pattern.findall(content)
-            if matches:
+            if seen is not None and name in seen:
+                continue
+            match = pattern.search(content)
+            if match:
+                if seen is not None:
+                    seen.add(name)
+                first = _findall_item(match)
                 # Check if this data was actually provided in context
                 is_hallucination = True
                 if context:
                     # If context provides relevant data, it's not a hallucination
-                    match_text = matches[0] if isinstance(matches[0], str) else str(matches[0])
+                    match_text = first if isinstance(first, str) else str(first)
                     provided_data = context.get("user_provided_data", "")
                     if match_text in provided_data:
                         is_hallucination = False
@@ -599,7 +719,7 @@ class OutputGuard:
                             issue_type=issue_type,
                             severity=severity,
                             description=description or f"Potential hallucination: {name}",
-                            matched_text=str(matches[0])[:50],
+                            matched_text=str(first)[:50],
                             remediation="Verify this data was actually provided",
                         )
                     )
@@ -664,6 +784,173 @@ class OutputGuard:
         return True
 
 
+class OutputStream:
+    """
+    Incremental OutputGuard filtering for chunked responses.
+
+    Chunks are masked as they arrive instead of buffering the whole response.
+    The last ``window`` characters are carried over to the next chunk, and the
+    cut point is moved back past any PII/profanity match that straddles it,
+    so patterns spanning a chunk boundary are still masked.
+
+    Usage:
+        stream = guard.stream()
+        for chunk in chunks:
+            send(stream.feed(chunk))
+        send(stream.close())
+        result = stream.result()
+    """
+
+    def __init__(
+        self,
+        guard: OutputGuard,
+        context: Optional[dict] = None,
+        window: int = DEFAULT_STREAM_WINDOW,
+        add_disclaimer: bool = True,
+    ):
+        """
+        Initialize OutputStream.
+
+        Args:
+            guard: OutputGuard providing patterns and settings
+            context: Optional context about the request (user data provided, etc.)
+            window: Characters held back between chunks for boundary matches
+            add_disclaimer: Whether close() may append the disclaimer
+
+        Raises:
+            ValueError: If window is below MIN_STREAM_WINDOW
+        """
+        if window < MIN_STREAM_WINDOW:
+            raise ValueError(f"Stream window must be at least {MIN_STREAM_WINDOW} characters")
+        self.guard = guard
+        self.context = context
+        self.window = window
+        self.add_disclaimer = add_disclaimer
+
+        self._carry = ""  # Unprocessed text held back for the next chunk
+        self._tail = ""  # Recent processed text, rescanned by detection checks
+        self._offset = 0
+        self._closed = False
+
+        self._issues: List[ContentIssue] = []
+        self._seen: Set[str] = set()
+        self._needs_disclaimer = False
+        self._pii_detected = False
+        self._content_modified = False
+
+        self._cut_patterns = [p[0] for p in guard._pii_patterns]
+        if guard.filter_profanity:
+            self._cut_patterns.extend(p[0] for p in guard._profanity_patterns)
+
+    def feed(self, chunk: str) -> str:
+        """
+        Filter the next chunk.
+
+        Args:
+            chunk: Next piece of the response
+
+        Returns:
+            Filtered text that is safe to emit (may be empty)
+        """
+        if self._closed:
+            raise ValueError("Cannot feed a closed OutputStream")
+
+        text = self._carry + chunk
+        cut = self._find_cut(text)
+        if cut <= 0:
+            self._carry = text
+            return ""
+
+        self._carry = text[cut:]
+        return self._process(text[:cut])
+
+    def close(self) -> str:
+        """
+        Flush the carried-over text and finish validation.
+
+        Returns:
+            Remaining filtered text, plus the disclaimer if configured and
+            add_disclaimer is set
+        """
+        if self._closed:
+            return ""
+        self._closed = True
+
+        text, self._carry = self._carry, ""
+        filtered = self._process(text) if text else ""
+
+        if self._needs_disclaimer and self.add_disclaimer and self.guard.auto_add_disclaimer:
+            filtered += self.guard.FINANCIAL_DISCLAIMER
+            self._content_modified = True
+
+        return filtered
+
+    def result(self) -> OutputValidationResult:
+        """
+        Get the validation result for everything fed so far.
+
+        The content itself is not retained, so original_content and
+        filtered_content are empty.
+        """
+        return self.guard._build_result(
+            original_content="",
+            filtered_content="",
+            issues=self._issues,
+            needs_disclaimer=self._needs_disclaimer,
+            pii_detected=self._pii_detected,
+            content_modified=self._content_modified,
+        )
+
+    def _find_cut(self, text: str) -> int:
+        """Find how much of the text can be processed without splitting a match."""
+        cut = len(text) - self.window
+        if cut <= 0:
+            return 0
+
+        # Prefer cutting after whitespace so word boundaries are unchanged
+        space = max(text.rfind(" ", 0, cut), text.rfind("\n", 0, cut), text.rfind("\t", 0, cut))
+        if space >= 0:
+            cut = space + 1
+
+        moved = True
+        while moved and cut > 0:
+            moved = False
+            for pattern in self._cut_patterns:
+                for match in pattern.finditer(text, max(0, cut - self.window)):
+                    if match.start() >= cut:
+                        break
+                    if match.end() > cut:
+                        cut = match.start()
+                        moved = True
+                        break
+
+        if cut <= 0 and len(text) > 4 * self.window:
+            # A runaway match would grow the carry without bound
+            return len(text) - self.window
+        return cut
+
+    def _process(self, segment: str) -> str:
+        """Filter a segment and run the detection checks over it."""
+        guard = self.guard
+
+        filtered, pii_detected, content_modified = guard._filter_content(
+            segment, self._issues, self._offset
+        )
+        self._pii_detected |= pii_detected
+        self._content_modified |= content_modified
+
+        # Rescan the recent tail so detection patterns spanning the cut match
+        scan = self._tail + segment
+        self._issues.extend(guard._check_harmful_advice(scan, self._seen))
+        self._issues.extend(guard._check_hallucinations(scan, self.context, self._seen))
+        if not self._needs_disclaimer:
+            self._needs_disclaimer = guard._check_needs_disclaimer(scan)
+
+        self._tail = scan[-self.window :]
+        self._offset += len(segment)
+        return filtered
+
+
 # Convenience function for quick validation
 def validate_output(content: str, **kwargs) -> OutputValidationResult:
     """
@@ -1,23 +1,30 @@
 """Security middleware — input sanitization and output filtering."""
 
+import codecs
 import logging
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response, JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.middleware.input_guard import InputGuard, ThreatLevel
 from app.middleware.output_guard import OutputGuard
 
 logger = logging.getLogger(__name__)
 
 
-class SecurityMiddleware(BaseHTTPMiddleware):
+class SecurityMiddleware:
     """
     Applies InputGuard on POST/PUT/PATCH request bodies,
     and OutputGuard on JSON response bodies for AI endpoints.
+
+    Implemented as pure ASGI so responses are never buffered by the
+    middleware itself: a single-message body is validated as a whole, and
+    a streamed body is filtered chunk by chunk as it is sent.
     """
 
-    def __init__(self, app, input_guard: InputGuard = None, output_guard: OutputGuard = None):
-        super().__init__(app)
+    def __init__(
+        self, app: ASGIApp, input_guard: InputGuard = None, output_guard: OutputGuard = None
+    ):
+        self.app = app
         self.input_guard = input_guard or InputGuard()
         self.output_guard = output_guard or OutputGuard()
         # Paths where output guard should filter responses
@@ -34,49 +41,160 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         "/api/omnibar/process",
     }
 
-    async def dispatch(self, request: Request, call_next):
+    # Response content types the output guard filters
+    FILTERED_CONTENT_TYPES = ("application/json", "text/event-stream")
+    # Streamed content types plain text can be appended to (the disclaimer)
+    APPENDABLE_CONTENT_TYPES = ("text/",)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+
         # INPUT GUARD: Check POST/PUT/PATCH bodies (skip auth endpoints)
-        if request.method in ("POST", "PUT", "PATCH") and request.url.path not in self.EXEMPT_PATHS:
-            try:
-                body = await request.body()
-                if body:
-                    text = body.decode("utf-8", errors="ignore")
-                    result = self.input_guard.validate(text)
-                    if not result.is_safe:
-                        logger.warning(
-                            "Input blocked: threat_level=%s, path=%s",
-                            result.threat_level,
-                            request.url.path,
-                        )
-                        return JSONResponse(
-                            status_code=400,
-                            content={"detail": "Input rejected due to security concerns."},
-                        )
-            except Exception as e:
-                logger.debug("Input guard error: %s", e)  # Don't crash the request on guard errors
-
-        response = await call_next(request)
+        if scope["method"] in ("POST", "PUT", "PATCH") and path not in self.EXEMPT_PATHS:
+            messages, body = await self._read_body(receive)
+            if self._input_rejected(body, path):
+                response = JSONResponse(
+                    status_code=400,
+                    content={"detail": "Input rejected due to security concerns."},
+                )
+                await response(scope, receive, send)
+                return
+            receive = self._replay(messages, receive)
 
         # OUTPUT GUARD: Filter AI response bodies
-        if request.url.path in self.ai_response_paths:
-            # Only filter JSON responses
-            if response.headers.get("content-type", "").startswith("application/json"):
-                # Read and filter the response body
-                body = b""
-                async for chunk in response.body_iterator:
-                    body += chunk
+        if path in self.ai_response_paths:
+            send = self._filter_output(send)
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _read_body(receive: Receive):
+        """Read the request body, keeping the messages for replay."""
+        messages = []
+        chunks = []
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return messages, b"".join(chunks)
+
+    @staticmethod
+    def _replay(messages, receive: Receive) -> Receive:
+        """Build a receive callable that replays already-read messages first."""
+        pending = list(messages)
+
+        async def replay_receive() -> Message:
+            if pending:
+                return pending.pop(0)
+            return await receive()
+
+        return replay_receive
+
+    def _input_rejected(self, body: bytes, path: str) -> bool:
+        """Check whether a request body should be rejected."""
+        if not body:
+            return False
+        try:
+            text = body.decode("utf-8", errors="ignore")
+            result = self.input_guard.validate(text)
+            if not result.is_safe:
+                logger.warning(
+                    "Input blocked: threat_level=%s, path=%s",
+                    result.threat_level,
+                    path,
+                )
+                return True
+        except Exception as e:
+            logger.debug("Input guard error: %s", e)  # Don't crash the request on guard errors
+        return False
+
+    def _filter_output(self, send: Send) -> Send:
+        """
+        Wrap send so response bodies pass through the output guard.
+
+        A body sent as one message keeps the all-or-nothing behaviour: it is
+        replaced by the filtered content only when validation fails. A
+        streamed body cannot be recalled once sent, so each chunk is
+        emitted already masked. Only text streams get the disclaimer
+        appended; a streamed JSON body is masked and otherwise left intact.
+        """
+        start_message: Message = None
+        content_type = ""
+        stream = None
+        decoder = None
+
+        async def filtered_send(message: Message) -> None:
+            nonlocal start_message, content_type, stream, decoder
+
+            if message["type"] == "http.response.start":
+                content_type = MutableHeaders(raw=message["headers"]).get("content-type", "")
+                if content_type.startswith(self.FILTERED_CONTENT_TYPES):
+                    start_message = message  # Held until the body shape is known
+                    return
+                await send(message)
+                return
+
+            if message["type"] != "http.response.body" or (
+                start_message is None and stream is None
+            ):
+                await send(message)
+                return
 
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if stream is None and not more_body:
+                # Complete body in one message
                 text = body.decode("utf-8", errors="ignore")
                 validation = self.output_guard.validate(text)
-
                 if not validation.is_safe and validation.filtered_content:
                     body = validation.filtered_content.encode("utf-8")
+                    headers = MutableHeaders(raw=start_message["headers"])
+                    headers["content-length"] = str(len(body))
+                await send(start_message)
+                start_message = None
+                await send({"type": "http.response.body", "body": body})
+                return
+
+            if stream is None:
+                # Streamed body: length is unknown once content is masked
+                headers = MutableHeaders(raw=start_message["headers"])
+                if "content-length" in headers:
+                    del headers["content-length"]
+                await send(start_message)
+                start_message = None
+                stream = self.output_guard.stream(
+                    add_disclaimer=content_type.startswith(self.APPENDABLE_CONTENT_TYPES)
+                )
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+
+            text = stream.feed(decoder.decode(body, final=not more_body))
+            if more_body:
+                if text:
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": text.encode("utf-8"),
+                            "more_body": True,
+                        }
+                    )
+                return
 
-                return Response(
-                    content=body,
-                    status_code=response.status_code,
-                    headers=dict(response.headers),
-                    media_type=response.media_type,
+            text += stream.close()
+            result = stream.result()
+            if not result.is_safe:
+                logger.warning(
+                    "Streamed output issues: max_severity=%s",
+                    result.max_severity.name,
                 )
+            await send({"type": "http.response.body", "body": text.encode("utf-8")})
 
-        return response
+        return filtered_send
@@ -3,16 +3,19 @@
 import os
 import json
 import asyncio
-from typing import Optional, Tuple, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, List
 from decimal import Decimal
 from dataclasses import dataclass
 from datetime import datetime, timezone
 import joblib
 from sklearn.pipeline import Pipeline
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support
 
+from app.ml.correction_log import CorrectionLog, read_log
 from app.ml.text_preprocessor import preprocess_transaction as preprocess_text
 from app.logging_config import get_logger
 
@@ -28,14 +31,154 @@ class CategoryPrediction:
     model_type: str  # "GLOBAL" or "USER_SPECIFIC"
 
 
+def fit_user_model(
+    corrections: List[Tuple[str, str]], n_features: int
+) -> Tuple[Pipeline, dict]:
+    """
+    Fit a user model on all corrections.
+
+    Args:
+        corrections: List of (description, category) tuples
+        n_features: Size of the hashed feature space
+
+    Returns:
+        Tuple of (model, training metrics)
+    """
+    # Prepare training data
+    descriptions = [preprocess_text(desc) for desc, _ in corrections]
+    categories = [cat for _, cat in corrections]
+    unique_categories = set(categories)
+
+    # Create and train model pipeline
+    # Hashed term counts keep the feature space fixed, so the classifier
+    # can be updated with partial_fit as corrections arrive
+    model = Pipeline(
+        [
+            (
+                "vectorizer",
+                HashingVectorizer(
+                    n_features=n_features,
+                    ngram_range=(1, 2),
+                    alternate_sign=False,
+                    norm=None,
+                ),
+            ),
+            ("classifier", MultinomialNB(alpha=0.1)),
+        ]
+    )
+
+    model.fit(descriptions, categories)
+
+    # Calculate metrics
+    predictions = model.predict(descriptions)
+    accuracy = accuracy_score(categories, predictions)
+    precision, recall, f1, _ = precision_recall_fscore_support(
+        categories, predictions, average="weighted", zero_division=0
+    )
+
+    metrics = {
+        "accuracy": float(accuracy),
+        "precision": float(precision),
+        "recall": float(recall),
+        "f1_score": float(f1),
+        "training_samples": len(corrections),
+        "unique_categories": len(unique_categories),
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+    }
+    return model, metrics
+
+
+def train_user_model_version(
+    model_dir: str, user_id: str, version: str, n_features: int
+) -> dict:
+    """
+    Train a user model from its correction log and save it as a new version.
+
+    Runs in a training worker process, so it only reads the log and writes
+    a versioned model file; the engine swaps the model in afterwards.
+
+    Args:
+        model_dir: Directory containing trained models
+        user_id: User ID
+        version: Version string for the model file name
+        n_features: Size of the hashed feature space
+
+    Returns:
+        Dict with model_path, metrics and seq (last correction trained on)
+
+    Raises:
+        ValueError: If the corrections don't cover at least two categories
+    """
+    records = read_log(os.path.join(model_dir, f"user_{user_id}_corrections.jsonl"))
+    corrections = [(record["description"], record["category"]) for record in records]
+    if len({category for _, category in corrections}) < 2:
+        raise ValueError("Insufficient category diversity for training")
+
+    model, metrics = fit_user_model(corrections, n_features)
+
+    model_path = os.path.join(model_dir, f"user_{user_id}_categorization_model_{version}.pkl")
+    tmp_path = f"{model_path}.tmp"
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, model_path)
+    return {"model_path": model_path, "metrics": metrics, "seq": records[-1]["seq"]}
+
+
+def prune_user_model_versions(model_dir: str, user_id: str, keep: int) -> List[str]:
+    """
+    Delete a user's versioned model files but the newest ones.
+
+    Args:
+        model_dir: Directory containing trained models
+        user_id: User ID
+        keep: Versions to keep (at least one)
+
+    Returns:
+        Paths of the deleted files
+    """
+    prefix = f"user_{user_id}_categorization_model_"
+    paths = [
+        os.path.join(model_dir, name)
+        for name in os.listdir(model_dir)
+        if name.startswith(prefix) and name.endswith(".pkl")
+    ]
+    paths.sort(key=lambda path: (os.path.getmtime(path), path), reverse=True)
+    pruned = paths[max(keep, 1) :]
+    for path in pruned:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    return pruned
+
+
 class CategorizationEngine:
     """
     Engine for automatic transaction categorization.
 
     Uses a pre-trained global model for cold-start users and can learn
     from user corrections to build personalized models.
+
+    User models hash their features instead of fitting a vocabulary, so
+    each correction after the first training is folded in with a
+    partial_fit on its own tokens. Full retraining happens only for a
+    category the model hasn't seen, and periodically in the background.
+    Incrementally updated models are written to disk after a short delay,
+    so a burst of corrections costs one write.
+
+    Full trainings run inline unless a training_scheduler is set (see
+    app.services.training_jobs), in which case they are requested from it
+    and the result is swapped in with install_user_model.
     """
 
+    # Hashed feature space of user models; per-user vocabularies are small
+    USER_MODEL_FEATURES = 2**13
+
+    # Corrections folded in incrementally before a background full rebuild
+    REBUILD_EVERY = 200
+
+    # Seconds an incrementally updated model waits before being saved
+    PERSIST_DELAY = 30.0
+
     def __init__(self, model_dir: str = "models"):
         """
         Initialize the categorization engine.
@@ -46,10 +189,20 @@ class CategorizationEngine:
         self.model_dir = model_dir
         self.global_model: Optional[Pipeline] = None
         self.user_models: dict[str, Pipeline] = {}
-        self.user_corrections: dict[
-            str, List[Tuple[str, str]]
-        ] = {}  # user_id -> [(description, category)]
+        self.correction_logs: dict[str, CorrectionLog] = {}
         self.min_corrections_for_training = 50  # Minimum corrections before training user model
+        self.user_metrics: dict[str, dict] = {}
+
+        # Guards user models and metrics against concurrent updates and rebuilds
+        self._lock = threading.RLock()
+        self._dirty: set[str] = set()
+        self._persist_timer: Optional[threading.Timer] = None
+        self._updates_since_rebuild: dict[str, int] = {}
+        self._rebuilding: set[str] = set()
+        self._rebuild_executor: Optional[ThreadPoolExecutor] = None
+
+        # Called with (user_id, reason) to train a user model in the background
+        self.training_scheduler: Optional[Callable[[str, str], None]] = None
 
         # Load global model on initialization
         self._load_global_model()
@@ -318,8 +471,7 @@ class CategorizationEngine:
         """Synchronous version of should_use_global_model for batch processing."""
         if not user_id:
             return True
-        model_path = os.path.join(self.model_dir, f"user_{user_id}_categorization_model.pkl")
-        return not os.path.exists(model_path)
+        return not self.has_user_model(user_id)
 
     def _load_user_model_sync(self, user_id: str) -> Optional[Pipeline]:
         """Synchronous version of _load_user_model for batch processing."""
@@ -335,6 +487,14 @@ class CategorizationEngine:
         except Exception:
             return None
 
+    def _load_user_metrics_sync(self, user_id: str) -> dict:
+        """Load a user model's saved metrics, empty if there are none."""
+        metrics_path = os.path.join(self.model_dir, f"user_{user_id}_categorization_metrics.pkl")
+        try:
+            return joblib.load(metrics_path)
+        except Exception:
+            return {}
+
     def _categorize_sync(
         self,
         description: str,
@@ -376,8 +536,10 @@ class CategorizationEngine:
         """
         Update user-specific model with a correction.
 
-        This method stores the correction and triggers model retraining
-        when sufficient corrections have been accumulated.
+        This method stores the correction and, once sufficient corrections
+        have been accumulated, folds it into the user's model. The model is
+        trained from scratch the first time, when the correction introduces
+        a new category, or when it predates incremental updates.
 
         Args:
             user_id: User ID
@@ -385,7 +547,7 @@ class CategorizationEngine:
             correct_category: Correct category provided by user
 
         Returns:
-            True if model was retrained, False otherwise
+            True if model was trained or updated, False otherwise
         """
         logger.info(
             "User correction recorded",
@@ -394,41 +556,279 @@ class CategorizationEngine:
             correct_category=correct_category,
         )
 
-        # Load existing corrections for this user
-        corrections = self._load_user_corrections(user_id)
+        with self._lock:
+            # Store the correction
+            log = self._correction_log(user_id)
+            log.append({"description": description, "category": correct_category})
+
+            if log.count < self.min_corrections_for_training:
+                logger.debug(
+                    "Correction stored, waiting for more data",
+                    user_id=user_id,
+                    correction_count=log.count,
+                    required=self.min_corrections_for_training,
+                )
+                return False
 
-        # Add new correction
-        corrections.append((description, correct_category))
+            model = self._load_user_model_sync(user_id)
+            if self._can_update(model, correct_category):
+                self._update_user_model(user_id, model, description, correct_category)
+                return True
 
-        # Save corrections to disk
-        self._save_user_corrections(user_id, corrections)
+            if self.training_scheduler is not None:
+                self.training_scheduler(user_id, "new_category" if model else "threshold")
+                return False
 
-        # Check if we have enough corrections to train/retrain model
-        if len(corrections) >= self.min_corrections_for_training:
             logger.info(
                 "Sufficient corrections accumulated, training user model",
                 user_id=user_id,
-                correction_count=len(corrections),
+                correction_count=log.count,
             )
+            corrections = self._load_user_corrections(user_id)
 
             # Train user-specific model
             success = self._train_user_model(user_id, corrections)
 
-            if success:
-                logger.info("User-specific model trained successfully", user_id=user_id)
-                return True
-            else:
-                logger.warning("Failed to train user-specific model", user_id=user_id)
+        if success:
+            logger.info("User-specific model trained successfully", user_id=user_id)
+            return True
+        else:
+            logger.warning("Failed to train user-specific model", user_id=user_id)
+            return False
+
+    @staticmethod
+    def _can_update(model: Optional[Pipeline], category: str) -> bool:
+        """Whether a correction can be folded into a model without retraining."""
+        # Models trained before hashing features have no fixed feature space
+        return (
+            model is not None
+            and isinstance(model.named_steps.get("vectorizer"), HashingVectorizer)
+            and category in model.classes_
+        )
+
+    def _update_user_model(
+        self, user_id: str, model: Pipeline, description: str, category: str
+    ) -> None:
+        """Fold one correction into a user model (caller holds the lock)."""
+        correct = self._partial_fit(model, description, category)
+
+        metrics = self.user_metrics.get(user_id)
+        if metrics is None:
+            metrics = self.user_metrics[user_id] = self._load_user_metrics_sync(user_id)
+        metrics["training_samples"] = metrics.get("training_samples", 0) + 1
+        metrics["online_updates"] = metrics.get("online_updates", 0) + 1
+        metrics["online_correct"] = metrics.get("online_correct", 0) + int(correct)
+        metrics["online_accuracy"] = metrics["online_correct"] / metrics["online_updates"]
+        metrics["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+        self._schedule_persist(user_id)
+
+        updates = self._updates_since_rebuild.get(user_id, 0) + 1
+        self._updates_since_rebuild[user_id] = updates
+        if updates >= self.REBUILD_EVERY:
+            self._schedule_rebuild(user_id)
+
+        logger.debug("User model updated incrementally", user_id=user_id, category=category)
+
+    def _schedule_persist(self, user_id: str) -> None:
+        """Save a user's model after PERSIST_DELAY, batching later updates."""
+        self._dirty.add(user_id)
+        if self._persist_timer is None:
+            self._persist_timer = threading.Timer(self.PERSIST_DELAY, self.flush)
+            self._persist_timer.daemon = True
+            self._persist_timer.start()
+
+    def flush(self) -> None:
+        """Save user models with pending incremental updates."""
+        with self._lock:
+            if self._persist_timer is not None:
+                self._persist_timer.cancel()
+                self._persist_timer = None
+            dirty, self._dirty = self._dirty, set()
+            for user_id in dirty:
+                model = self.user_models.get(user_id)
+                if model is None:
+                    continue
+                try:
+                    self._save_user_model(user_id, model, self.user_metrics.get(user_id, {}))
+                except Exception as e:
+                    logger.error("Failed to save user model", user_id=user_id, error=str(e))
+
+    def _schedule_rebuild(self, user_id: str) -> None:
+        """Retrain a user model from all corrections on the rebuild thread."""
+        if self.training_scheduler is not None:
+            self._updates_since_rebuild[user_id] = 0
+            self.training_scheduler(user_id, "rebuild")
+            return
+        if user_id in self._rebuilding:
+            return
+        if self._rebuild_executor is None:
+            self._rebuild_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="categorizer-rebuild"
+            )
+        self._rebuilding.add(user_id)
+        self._rebuild_executor.submit(self._rebuild_user_model, user_id)
+
+    def _rebuild_user_model(self, user_id: str) -> None:
+        try:
+            with self._lock:
+                corrections = self._load_user_corrections(user_id)
+            # Fit outside the lock so corrections keep flowing meanwhile
+            model, metrics = self._fit_user_model(corrections)
+            with self._lock:
+                if user_id not in self.user_models:
+                    # Deleted while rebuilding
+                    return
+                # Catch up with corrections that arrived during the fit
+                latest = self._load_user_corrections(user_id)
+                for description, category in latest[len(corrections):]:
+                    if not self._can_update(model, category):
+                        model, metrics = self._fit_user_model(latest)
+                        break
+                    self._partial_fit(model, description, category)
+                metrics["training_samples"] = len(latest)
+                self.user_models[user_id] = model
+                self.user_metrics[user_id] = metrics
+                self._updates_since_rebuild[user_id] = 0
+                self._save_user_model(user_id, model, metrics)
+                self._dirty.discard(user_id)
+            logger.info("User model rebuilt", user_id=user_id, training_samples=len(latest))
+        except Exception as e:
+            logger.error("Failed to rebuild user model", user_id=user_id, error=str(e))
+        finally:
+            self._rebuilding.discard(user_id)
+
+    def install_user_model(
+        self, user_id: str, model_path: str, metrics: dict, trained_seq: int
+    ) -> bool:
+        """
+        Swap in a user model trained in the background.
+
+        Corrections logged after the model's training data are folded in
+        first, so the swap loses none of them.
+
+        Args:
+            user_id: User ID
+            model_path: File the trained model was saved to
+            metrics: Training metrics
+            trained_seq: Sequence number of the last correction trained on
+
+        Returns:
+            True if the model was installed, False if the user's corrections
+            were deleted meanwhile
+        """
+        model = joblib.load(model_path)
+        metrics = dict(metrics)
+        with self._lock:
+            log = self._correction_log(user_id)
+            if log.count == 0:
                 return False
 
-        logger.debug(
-            "Correction stored, waiting for more data",
+            if log.last_seq > trained_seq:
+                for record in log.read():
+                    if record["seq"] <= trained_seq:
+                        continue
+                    if not self._can_update(model, record["category"]):
+                        # The rest is picked up by the next training
+                        if self.training_scheduler is not None:
+                            self.training_scheduler(user_id, "new_category")
+                        break
+                    self._partial_fit(model, record["description"], record["category"])
+                    metrics["training_samples"] += 1
+
+            self.user_models[user_id] = model
+            self.user_metrics[user_id] = metrics
+            self._updates_since_rebuild[user_id] = 0
+            self._save_user_model(user_id, model, metrics)
+            self._dirty.discard(user_id)
+
+        logger.info(
+            "User model installed",
             user_id=user_id,
-            correction_count=len(corrections),
-            required=self.min_corrections_for_training,
+            model_path=model_path,
+            training_samples=metrics["training_samples"],
         )
+        return True
+
+    def reload_user_model(self, user_id: str) -> None:
+        """Drop a cached user model so the next use loads it from disk."""
+        with self._lock:
+            self.user_models.pop(user_id, None)
+            self.user_metrics.pop(user_id, None)
+            self._dirty.discard(user_id)
+
+    @staticmethod
+    def _partial_fit(model: Pipeline, description: str, category: str) -> bool:
+        """Learn one correction; returns whether the model already predicted it."""
+        features = model.named_steps["vectorizer"].transform([preprocess_text(description)])
+        classifier = model.named_steps["classifier"]
+        correct = classifier.predict(features)[0] == category
+        classifier.partial_fit(features, [category])
+        return bool(correct)
+
+    def forget_user_model(self, user_id: str) -> None:
+        """Drop a user's model and correction count from memory, cancelling its pending save."""
+        with self._lock:
+            self.correction_logs.pop(user_id, None)
+            self.user_models.pop(user_id, None)
+            self.user_metrics.pop(user_id, None)
+            self._updates_since_rebuild.pop(user_id, None)
+            self._dirty.discard(user_id)
+
+    def close(self) -> None:
+        """Finish background rebuilds and save pending updates and corrections."""
+        if self._rebuild_executor is not None:
+            self._rebuild_executor.shutdown(wait=True)
+            self._rebuild_executor = None
+        self.flush()
+        for log in list(self.correction_logs.values()):
+            log.sync()
+
+    def _correction_log(self, user_id: str) -> CorrectionLog:
+        """
+        Get a user's correction log, opening it on first use.
 
-        return False
+        Corrections stored as a JSON array by earlier versions are moved
+        into the log the first time it is opened.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            The user's correction log
+        """
+        with self._lock:
+            log = self.correction_logs.get(user_id)
+            if log is not None:
+                return log
+
+            log = CorrectionLog(
+                os.path.join(self.model_dir, f"user_{user_id}_corrections.jsonl")
+            )
+            legacy_path = os.path.join(self.model_dir, f"user_{user_id}_corrections.json")
+            if os.path.exists(legacy_path):
+                try:
+                    with open(legacy_path, "r") as f:
+                        legacy = json.load(f)
+                    # A non-empty log means an earlier migration got this far
+                    if not log.count:
+                        log.rewrite(
+                            [
+                                {"description": item["description"], "category": item["category"]}
+                                for item in legacy
+                            ]
+                        )
+                    os.remove(legacy_path)
+                    logger.info(
+                        "User corrections migrated to log", user_id=user_id, count=len(legacy)
+                    )
+                except Exception as e:
+                    logger.error(
+                        "Failed to migrate user corrections", user_id=user_id, error=str(e)
+                    )
+
+            self.correction_logs[user_id] = log
+            return log
 
     def _load_user_corrections(self, user_id: str) -> List[Tuple[str, str]]:
         """
@@ -440,38 +840,34 @@ class CategorizationEngine:
         Returns:
             List of (description, category) tuples
         """
-        corrections_path = os.path.join(self.model_dir, f"user_{user_id}_corrections.json")
-
-        if not os.path.exists(corrections_path):
-            return []
-
         try:
-            with open(corrections_path, "r") as f:
-                data = json.load(f)
-                return [(item["description"], item["category"]) for item in data]
+            return [
+                (record["description"], record["category"])
+                for record in self._correction_log(user_id).read()
+            ]
         except Exception as e:
             logger.error("Failed to load user corrections", user_id=user_id, error=str(e))
             return []
 
-    def _save_user_corrections(self, user_id: str, corrections: List[Tuple[str, str]]) -> None:
+    def _fit_user_model(self, corrections: List[Tuple[str, str]]) -> Tuple[Pipeline, dict]:
         """
-        Save user corrections to disk.
+        Fit a user model on all corrections.
 
         Args:
-            user_id: User ID
             corrections: List of (description, category) tuples
-        """
-        corrections_path = os.path.join(self.model_dir, f"user_{user_id}_corrections.json")
-
-        try:
-            data = [{"description": desc, "category": cat} for desc, cat in corrections]
 
-            with open(corrections_path, "w") as f:
-                json.dump(data, f, indent=2)
+        Returns:
+            Tuple of (model, training metrics)
+        """
+        return fit_user_model(corrections, self.USER_MODEL_FEATURES)
 
-            logger.debug("User corrections saved", user_id=user_id, count=len(corrections))
-        except Exception as e:
-            logger.error("Failed to save user corrections", user_id=user_id, error=str(e))
+    def _save_user_model(self, user_id: str, model: Pipeline, metrics: dict) -> None:
+        """Write a user model and its metrics, replacing the files atomically."""
+        for name, value in (("model", model), ("metrics", metrics)):
+            path = os.path.join(self.model_dir, f"user_{user_id}_categorization_{name}.pkl")
+            tmp_path = f"{path}.tmp"
+            joblib.dump(value, tmp_path)
+            os.replace(tmp_path, path)
 
     def _train_user_model(self, user_id: str, corrections: List[Tuple[str, str]]) -> bool:
         """
@@ -484,83 +880,44 @@ class CategorizationEngine:
         Returns:
             True if training succeeded, False otherwise
         """
-        try:
-            # Prepare training data
-            descriptions = [preprocess_text(desc) for desc, _ in corrections]
-            categories = [cat for _, cat in corrections]
-
-            # Check if we have enough unique categories
-            unique_categories = set(categories)
-            if len(unique_categories) < 2:
-                logger.warning(
-                    "Insufficient category diversity for training",
-                    user_id=user_id,
-                    unique_categories=len(unique_categories),
-                )
-                return False
-
-            # Create and train model pipeline
-            # Use same architecture as global model for consistency
-            model = Pipeline(
-                [
-                    (
-                        "tfidf",
-                        TfidfVectorizer(
-                            max_features=1000,
-                            ngram_range=(1, 2),
-                            min_df=1,  # Lower threshold for user models
-                            max_df=0.95,
-                        ),
-                    ),
-                    ("classifier", MultinomialNB(alpha=0.1)),
-                ]
+        # Check if we have enough unique categories
+        unique_categories = {cat for _, cat in corrections}
+        if len(unique_categories) < 2:
+            logger.warning(
+                "Insufficient category diversity for training",
+                user_id=user_id,
+                unique_categories=len(unique_categories),
             )
+            return False
 
-            model.fit(descriptions, categories)
-
-            # Calculate metrics
-            predictions = model.predict(descriptions)
-            accuracy = accuracy_score(categories, predictions)
-            precision, recall, f1, _ = precision_recall_fscore_support(
-                categories, predictions, average="weighted", zero_division=0
-            )
+        try:
+            model, metrics = self._fit_user_model(corrections)
+        except Exception as e:
+            logger.error("Failed to train user model", user_id=user_id, error=str(e))
+            return False
 
-            metrics = {
-                "accuracy": float(accuracy),
-                "precision": float(precision),
-                "recall": float(recall),
-                "f1_score": float(f1),
-                "training_samples": len(corrections),
-                "unique_categories": len(unique_categories),
-                "trained_at": datetime.now(timezone.utc).isoformat(),
-            }
-
-            # Save model
-            model_path = os.path.join(self.model_dir, f"user_{user_id}_categorization_model.pkl")
-            joblib.dump(model, model_path)
-
-            # Save metrics
-            metrics_path = os.path.join(
-                self.model_dir, f"user_{user_id}_categorization_metrics.pkl"
-            )
-            joblib.dump(metrics, metrics_path)
+        with self._lock:
+            try:
+                self._save_user_model(user_id, model, metrics)
+            except Exception as e:
+                logger.error("Failed to save user model", user_id=user_id, error=str(e))
+                return False
 
             # Update cache
             self.user_models[user_id] = model
+            self.user_metrics[user_id] = metrics
+            self._updates_since_rebuild[user_id] = 0
+            self._dirty.discard(user_id)
 
-            logger.info(
-                "User model trained successfully",
-                user_id=user_id,
-                accuracy=accuracy,
-                training_samples=len(corrections),
-                unique_categories=len(unique_categories),
-            )
-
-            return True
+        logger.info(
+            "User model trained successfully",
+            user_id=user_id,
+            accuracy=metrics["accuracy"],
+            training_samples=metrics["training_samples"],
+            unique_categories=metrics["unique_categories"],
+        )
 
-        except Exception as e:
-            logger.error("Failed to train user model", user_id=user_id, error=str(e))
-            return False
+        return True
 
     async def get_model_accuracy(self, user_id: str) -> float:
         """
@@ -572,6 +929,10 @@ class CategorizationEngine:
         Returns:
             Model accuracy (0.0 to 1.0), or 0.0 if no user model exists
         """
+        # Metrics of models trained or updated by this process may not be saved yet
+        if user_id in self.user_metrics:
+            return self.user_metrics[user_id].get("accuracy", 0.0)
+
         # Try to load metrics
         metrics_path = os.path.join(self.model_dir, f"user_{user_id}_categorization_metrics.pkl")
 
@@ -608,8 +969,7 @@ class CategorizationEngine:
         Returns:
             Number of corrections
         """
-        corrections = self._load_user_corrections(user_id)
-        return len(corrections)
+        return self._correction_log(user_id).count
 
     def has_user_model(self, user_id: str) -> bool:
         """
@@ -621,5 +981,7 @@ class CategorizationEngine:
         Returns:
             True if user has a personalized model
         """
+        if user_id in self.user_models:
+            return True
         model_path = os.path.join(self.model_dir, f"user_{user_id}_categorization_model.pkl")
         return os.path.exists(model_path)
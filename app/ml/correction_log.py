@@ -0,0 +1,231 @@
+"""Append-only log of category corrections.
+
+Corrections are stored one JSON object per line, each tagged with a
+sequence number. Recording one appends a line, so its cost doesn't depend
+on how many came before. Appends reach the OS immediately and are fsynced
+in batches from a timer thread, at most once per sync interval, so a
+crash loses at most that interval's corrections and requests never wait
+on the disk.
+
+Opening a log reads it once to recover its count and last sequence
+number. A line left half-written by a crash is cut off at that point.
+compact() rewrites the log atomically, keeping only its newest records.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _parse(data: bytes, path: str) -> Iterable[Dict[str, Any]]:
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            logger.warning("Skipping unreadable correction log record", path=path)
+
+
+def read_log(path: str) -> List[Dict[str, Any]]:
+    """
+    Read every record of a log without opening it for writing.
+
+    Safe to call from another process while the log is appended to.
+
+    Args:
+        path: Log file path
+
+    Returns:
+        Records, oldest first (empty if the log doesn't exist)
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    # Ignore a line still being written by a concurrent append
+    return list(_parse(data[: data.rfind(b"\n") + 1], path))
+
+
+class CorrectionLog:
+    """JSON Lines log with batched fsync and crash recovery."""
+
+    # Seconds between an append and the fsync that makes it durable
+    SYNC_INTERVAL = 1.0
+
+    def __init__(self, path: str, sync_interval: Optional[float] = None):
+        """
+        Open (or create on first append) a correction log.
+
+        Args:
+            path: Log file path
+            sync_interval: Seconds between batched fsyncs (defaults to SYNC_INTERVAL)
+        """
+        self.path = path
+        self.sync_interval = self.SYNC_INTERVAL if sync_interval is None else sync_interval
+        self._lock = threading.Lock()
+        self._sync_timer: Optional[threading.Timer] = None
+        self._count = 0
+        self._last_seq = 0
+        self._recover()
+
+    @property
+    def count(self) -> int:
+        """Number of records in the log."""
+        return self._count
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest record, 0 if there are none."""
+        return self._last_seq
+
+    def _recover(self) -> None:
+        """Count the records and cut off a torn final line."""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "rb") as f:
+            data = f.read()
+
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            logger.warning(
+                "Truncating incomplete correction log record",
+                path=self.path,
+                bytes=len(data) - end,
+            )
+            with open(self.path, "rb+") as f:
+                f.truncate(end)
+                os.fsync(f.fileno())
+
+        for record in _parse(data[:end], self.path):
+            self._count += 1
+            self._last_seq = max(self._last_seq, record.get("seq", 0))
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """
+        Append a record.
+
+        Args:
+            record: JSON-serializable correction
+
+        Returns:
+            Sequence number assigned to the record
+        """
+        with self._lock:
+            seq = self._last_seq + 1
+            line = json.dumps({"seq": seq, **record}, separators=(",", ":")) + "\n"
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self._last_seq = seq
+            self._count += 1
+
+            if self._sync_timer is None:
+                self._sync_timer = threading.Timer(self.sync_interval, self.sync)
+                self._sync_timer.daemon = True
+                self._sync_timer.start()
+        return seq
+
+    def read(self) -> List[Dict[str, Any]]:
+        """Read every record, oldest first."""
+        return read_log(self.path)
+
+    def sync(self) -> None:
+        """Flush appended records to stable storage."""
+        with self._lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            try:
+                # Without O_CREAT, so a deleted log stays deleted
+                fd = os.open(self.path, os.O_WRONLY)
+            except FileNotFoundError:
+                return
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def rewrite(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Atomically replace the log's contents.
+
+        Records keep their sequence numbers; those without one are numbered
+        after the current last record.
+
+        Args:
+            records: Records to keep, oldest first
+        """
+        with self._lock:
+            self._rewrite(records)
+
+    def _rewrite(self, records: List[Dict[str, Any]]) -> None:
+        seq = self._last_seq
+        lines = []
+        for record in records:
+            if "seq" not in record:
+                seq += 1
+                record = {"seq": seq, **record}
+            else:
+                seq = max(seq, record["seq"])
+            lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._fsync_directory()
+
+        self._count = len(lines)
+        self._last_seq = seq
+
+    def compact(self, keep: int) -> int:
+        """
+        Drop all but the newest records.
+
+        Args:
+            keep: Number of records to keep
+
+        Returns:
+            Number of records dropped
+        """
+        with self._lock:
+            records = self.read()
+            if len(records) <= keep:
+                return 0
+            self._rewrite(records[-keep:] if keep else [])
+        dropped = len(records) - keep
+        logger.info("Correction log compacted", path=self.path, dropped=dropped, kept=keep)
+        return dropped
+
+    def _fsync_directory(self) -> None:
+        # Make the rename itself durable
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def delete(self) -> None:
+        """Remove the log file."""
+        with self._lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._count = 0
+            self._last_seq = 0
@@ -10,10 +10,9 @@ import pandas as pd
 import numpy as np
 from statsmodels.tsa.stattools import adfuller
 from statsmodels.tsa.arima.model import ARIMA
-from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.transaction import Transaction
+from app.services.rollup_service import RollupService
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -77,40 +76,27 @@ class PredictionEngine:
         end_date = datetime.now(timezone.utc).date()
         start_date = end_date - timedelta(days=lookback_days)
 
-        # Query transactions for category
-        stmt = (
-            select(Transaction)
-            .where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.category == category,
-                    Transaction.type == "EXPENSE",
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date,
-                    Transaction.deleted_at.is_(None),
-                )
-            )
-            .order_by(Transaction.date)
+        # Aggregate transactions for category by date
+        daily = await RollupService(self.db).daily_aggregates(
+            user_id, start_date, end_date, category=category
         )
+        transaction_count = sum(aggregate.count for aggregate in daily.values())
 
-        result = await self.db.execute(stmt)
-        transactions = result.scalars().all()
-
-        if len(transactions) < self.min_data_points:
+        if transaction_count < self.min_data_points:
             logger.warning(
                 "Insufficient data for prediction",
                 user_id=str(user_id),
                 category=category,
-                transaction_count=len(transactions),
+                transaction_count=transaction_count,
                 required=self.min_data_points,
             )
             return None
 
-        # Convert to DataFrame
-        data = pd.DataFrame([{"date": t.date, "amount": float(t.amount)} for t in transactions])
-
-        # Aggregate by date (sum multiple transactions on same day)
-        daily_data = data.groupby("date")["amount"].sum()
+        # Daily totals (sum of multiple transactions on same day)
+        daily_data = pd.Series(
+            [float(aggregate.total) for aggregate in daily.values()],
+            index=pd.to_datetime(list(daily.keys())),
+        )
 
         # Create complete date range and fill missing dates with 0
         date_range = pd.date_range(start=start_date, end=end_date, freq="D")
@@ -349,22 +335,7 @@ class PredictionEngine:
         end_date = datetime.now(timezone.utc).date()
         start_date = end_date - timedelta(days=lookback_days)
 
-        stmt = (
-            select(Transaction.category)
-            .where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == "EXPENSE",
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date,
-                    Transaction.deleted_at.is_(None),
-                )
-            )
-            .distinct()
-        )
-
-        result = await self.db.execute(stmt)
-        categories = [row[0] for row in result.all()]
+        categories = await RollupService(self.db).categories(user_id, start_date, end_date)
 
         # Generate forecasts for each category
         forecasts = {}
@@ -475,26 +446,12 @@ class PredictionEngine:
         start_date = forecast_result.forecast_dates[0]
         end_date = start_date + timedelta(days=actual_days - 1)
 
-        stmt = select(Transaction).where(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.category == category,
-                Transaction.type == "EXPENSE",
-                Transaction.date >= start_date,
-                Transaction.date <= end_date,
-                Transaction.deleted_at.is_(None),
-            )
+        daily = await RollupService(self.db).daily_aggregates(
+            user_id, start_date, end_date, category=category
         )
 
-        result = await self.db.execute(stmt)
-        transactions = result.scalars().all()
-
-        # Aggregate actual spending by date
-        actual_data = {}
-        for t in transactions:
-            if t.date not in actual_data:
-                actual_data[t.date] = Decimal(0)
-            actual_data[t.date] += t.amount
+        # Actual spending by date
+        actual_data = {day: aggregate.total for day, aggregate in daily.items()}
 
         # Calculate MAPE
         errors = []
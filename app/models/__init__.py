@@ -7,6 +7,7 @@ from app.models.budget import Budget
 from app.models.financial_goal import FinancialGoal
 from app.models.ml_model import MLModel
 from app.models.connection import Connection
+from app.models.spending_rollup import SpendingRollup
 
 __all__ = [
     "Base",
@@ -16,4 +17,5 @@ __all__ = [
     "FinancialGoal",
     "MLModel",
     "Connection",
+    "SpendingRollup",
 ]
@@ -50,6 +50,9 @@ class Connection(Base):
     last_sync: Mapped[Optional[datetime]] = mapped_column(
         DateTime, nullable=True, comment="Timestamp of last successful transaction sync"
     )
+    sync_cursor: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True, comment="Provider cursor after the last synced change"
+    )
     status: Mapped[str] = mapped_column(String(20), default="ACTIVE", nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
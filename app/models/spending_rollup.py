@@ -0,0 +1,297 @@
+"""Daily spending rollup model, kept in step with the transactions table.
+
+Rollup rows are maintained on PostgreSQL by an after_flush hook, from the
+Transaction objects each ORM flush writes. Transaction writes must go
+through the session's unit of work: bulk or Core INSERT, UPDATE and DELETE
+statements bypass the hook, so follow them with RollupService.rebuild().
+On other databases the hook does nothing; turn USE_SPENDING_ROLLUP off
+there.
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
+
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    ForeignKey,
+    Insert,
+    Integer,
+    Numeric,
+    Select,
+    String,
+    Table,
+    and_,
+    delete,
+    event,
+    func,
+    inspect,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.orm import Mapped, Session, UOWTransaction, mapped_column
+
+from app.models.base import Base
+from app.models.transaction import Transaction
+
+# Columns identifying a rollup row, in primary key order
+ROLLUP_KEY_FIELDS = ("user_id", "date", "category", "type")
+
+# Transaction attributes whose changes move amounts between rollup rows
+_TRACKED_FIELDS = ROLLUP_KEY_FIELDS + ("amount", "deleted_at")
+
+# Rows per upsert statement (asyncpg allows at most 32767 bind parameters)
+_UPSERT_BATCH_SIZE = 1000
+
+_CENT = Decimal("0.01")
+
+# First key of the two-key advisory locks guarding a user's rollup rows
+ROLLUP_LOCK_NAMESPACE = 0x524F4C4C
+
+RollupKey = Tuple[uuid.UUID, date, str, str]
+
+
+class SpendingRollup(Base):
+    """Per-user daily aggregates of non-deleted transactions.
+
+    One row per (user, date, category, type) holds the sum, count, sum of
+    squares, minimum and maximum of the matching transaction amounts, so
+    aggregate queries scan days x categories instead of transactions.
+    """
+
+    __tablename__ = "spending_rollups"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    category: Mapped[str] = mapped_column(String(50), primary_key=True)
+    type: Mapped[str] = mapped_column(String(10), primary_key=True)
+    total: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False, default=0)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sum_sq: Mapped[Decimal] = mapped_column(Numeric(30, 4), nullable=False, default=0)
+    min_amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(12, 2))
+    max_amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(12, 2))
+
+    def __repr__(self) -> str:
+        """String representation of SpendingRollup."""
+        return (
+            f"<SpendingRollup(user_id={self.user_id}, date={self.date}, "
+            f"category={self.category}, type={self.type}, total={self.total})>"
+        )
+
+
+def rollup_select_from_transactions(*conditions: ColumnElement[bool]) -> Select[Any]:
+    """Build a SELECT aggregating transactions into rollup rows.
+
+    Args:
+        *conditions: Extra WHERE conditions on Transaction
+
+    Returns:
+        Select producing one row per rollup key, columns matching SpendingRollup
+    """
+    return (
+        select(
+            Transaction.user_id,
+            Transaction.date,
+            Transaction.category,
+            Transaction.type,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id),
+            func.sum(Transaction.amount * Transaction.amount),
+            func.min(Transaction.amount),
+            func.max(Transaction.amount),
+        )
+        .where(Transaction.deleted_at.is_(None), *conditions)
+        .group_by(Transaction.user_id, Transaction.date, Transaction.category, Transaction.type)
+    )
+
+
+def rollup_insert_from_select(select_stmt: Select[Any]) -> Insert:
+    """Wrap a rollup SELECT in an INSERT into spending_rollups."""
+    table = cast(Table, SpendingRollup.__table__)
+    return table.insert().from_select(
+        [
+            table.c.user_id,
+            table.c.date,
+            table.c.category,
+            table.c.type,
+            table.c.total,
+            table.c.count,
+            table.c.sum_sq,
+            table.c.min_amount,
+            table.c.max_amount,
+        ],
+        select_stmt,
+    )
+
+
+def rollup_lock(user_id: uuid.UUID, shared: bool = False) -> Select[Any]:
+    """Build a SELECT taking a user's rollup advisory lock until the transaction ends.
+
+    Writers applying deltas share the lock; a rebuild takes it alone, so
+    it never interleaves with deltas computed from the rows it replaces.
+
+    Args:
+        user_id: User whose rollup rows are locked
+        shared: Take the lock in shared mode
+
+    Returns:
+        Select to execute
+    """
+    lock = func.pg_advisory_xact_lock_shared if shared else func.pg_advisory_xact_lock
+    key = int.from_bytes(user_id.bytes[:4], "big", signed=True)
+    return select(lock(ROLLUP_LOCK_NAMESPACE, key))
+
+
+def _transaction_values(obj: Transaction, previous: bool = False) -> Dict[str, Any]:
+    """Get a transaction's tracked values, before or after pending changes."""
+    state = inspect(obj)
+    values = {}
+    for name in _TRACKED_FIELDS:
+        value = getattr(obj, name)
+        if previous:
+            history = state.attrs[name].history
+            if history.deleted:
+                value = history.deleted[0]
+        values[name] = value
+    return values
+
+
+def _collect_rollup_deltas(
+    session: Session,
+) -> Tuple[Dict[RollupKey, List[Any]], Set[RollupKey]]:
+    """Compute rollup changes for the transactions in a flush.
+
+    Returns:
+        Tuple of (key -> [total, count, sum_sq, min, max] deltas, keys that
+        lost a transaction and need their min/max recomputed)
+    """
+    deltas: Dict[RollupKey, List[Any]] = {}
+    shrunk: Set[RollupKey] = set()
+
+    def apply(values: Dict[str, Any], sign: int) -> None:
+        if values["deleted_at"] is not None:
+            return
+        txn_type = values["type"]
+        key = (
+            values["user_id"],
+            values["date"],
+            values["category"],
+            getattr(txn_type, "value", txn_type),
+        )
+        # Round like the NUMERIC(12, 2) column does
+        amount = Decimal(str(values["amount"])).quantize(_CENT, ROUND_HALF_UP)
+        delta = deltas.setdefault(key, [Decimal(0), 0, Decimal(0), None, None])
+        delta[0] += sign * amount
+        delta[1] += sign
+        delta[2] += sign * amount * amount
+        if sign > 0:
+            delta[3] = amount if delta[3] is None else min(delta[3], amount)
+            delta[4] = amount if delta[4] is None else max(delta[4], amount)
+        else:
+            shrunk.add(key)
+
+    for obj in session.new:
+        if isinstance(obj, Transaction):
+            apply(_transaction_values(obj), 1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Transaction):
+            old = _transaction_values(obj, previous=True)
+            new = _transaction_values(obj)
+            if old != new:
+                apply(old, -1)
+                apply(new, 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Transaction):
+            apply(_transaction_values(obj, previous=True), -1)
+
+    return deltas, shrunk
+
+
+def _apply_rollup_deltas(
+    session: Session, deltas: Dict[RollupKey, List[Any]], shrunk: Set[RollupKey]
+) -> None:
+    """Write rollup deltas with additive upserts."""
+    table = cast(Table, SpendingRollup.__table__)
+    # In a fixed order, so writers touching several users can't deadlock a rebuild
+    for user_id in sorted({key[0] for key in deltas} | {key[0] for key in shrunk}):
+        session.execute(rollup_lock(user_id, shared=True))
+
+    rows = [
+        {
+            **dict(zip(ROLLUP_KEY_FIELDS, key)),
+            "total": total,
+            "count": count,
+            "sum_sq": sum_sq,
+            "min_amount": min_amount,
+            "max_amount": max_amount,
+        }
+        for key, (total, count, sum_sq, min_amount, max_amount) in deltas.items()
+        if count or total or min_amount is not None
+    ]
+
+    for start in range(0, len(rows), _UPSERT_BATCH_SIZE):
+        stmt = pg_insert(table).values(rows[start : start + _UPSERT_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[name] for name in ROLLUP_KEY_FIELDS],
+            set_={
+                "total": table.c.total + stmt.excluded.total,
+                "count": table.c.count + stmt.excluded.count,
+                "sum_sq": table.c.sum_sq + stmt.excluded.sum_sq,
+                "min_amount": func.least(table.c.min_amount, stmt.excluded.min_amount),
+                "max_amount": func.greatest(table.c.max_amount, stmt.excluded.max_amount),
+            },
+        )
+        session.execute(stmt)
+
+    if not shrunk:
+        return
+
+    # Removed amounts may have been a row's min or max, which deltas can't undo
+    key_columns = tuple_(*(table.c[name] for name in ROLLUP_KEY_FIELDS))
+    keys = list(shrunk)
+    for start in range(0, len(keys), _UPSERT_BATCH_SIZE):
+        batch = keys[start : start + _UPSERT_BATCH_SIZE]
+        session.execute(delete(table).where(key_columns.in_(batch), table.c.count <= 0))
+
+        matches_row = and_(
+            Transaction.user_id == table.c.user_id,
+            Transaction.date == table.c.date,
+            Transaction.category == table.c.category,
+            Transaction.type == table.c.type,
+            Transaction.deleted_at.is_(None),
+        )
+        min_amount = select(func.min(Transaction.amount)).where(matches_row)
+        max_amount = select(func.max(Transaction.amount)).where(matches_row)
+        session.execute(
+            update(table)
+            .where(key_columns.in_(batch))
+            .values(
+                min_amount=min_amount.scalar_subquery(),
+                max_amount=max_amount.scalar_subquery(),
+            )
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def maintain_spending_rollups(session: Session, flush_context: UOWTransaction) -> None:
+    """Apply the flushed transaction inserts, updates and deletes to the rollups.
+
+    Runs inside the flush, so rollup rows commit or roll back together with
+    the transactions that changed them. PostgreSQL only (see the module
+    docstring).
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    deltas, shrunk = _collect_rollup_deltas(session)
+    if deltas or shrunk:
+        _apply_rollup_deltas(session, deltas, shrunk)
@@ -17,6 +17,7 @@ from sqlalchemy import (
     Index,
     CheckConstraint,
     Text,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -36,24 +37,34 @@ class Transaction(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
     )
+    # active_history loads previous values on change so spending rollups can be adjusted
     user_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        active_history=True,
     )
-    amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
-    date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, active_history=True)
+    date: Mapped[date] = mapped_column(Date, nullable=False, index=True, active_history=True)
     description: Mapped[str] = mapped_column(Text, nullable=False)
-    category: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
-    type: Mapped[str] = mapped_column(String(10), nullable=False)
+    category: Mapped[str] = mapped_column(
+        String(50), nullable=False, index=True, active_history=True
+    )
+    type: Mapped[str] = mapped_column(String(10), nullable=False, active_history=True)
     source: Mapped[str] = mapped_column(String(20), nullable=False)
     confidence_score: Mapped[Optional[float]] = mapped_column(Float)
     connection_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True), ForeignKey("connections.id", ondelete="SET NULL")
     )
+    external_id: Mapped[Optional[str]] = mapped_column(
+        String(100), comment="Transaction identifier from the connection's API provider"
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
-    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, active_history=True)
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="transactions")
@@ -77,6 +88,31 @@ class Transaction(Base):
         Index("idx_transactions_user_category", "user_id", "category"),
         Index("idx_transactions_user_type", "user_id", "type"),
         Index("idx_transactions_deleted", "deleted_at"),
+        # Keyset pagination walks live transactions in (date, created_at, id) order
+        Index(
+            "idx_transactions_user_keyset",
+            "user_id",
+            "date",
+            "created_at",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # One row per provider transaction and connection (see app.services.sync_service)
+        Index(
+            "idx_transactions_connection_external",
+            "connection_id",
+            "external_id",
+            unique=True,
+            postgresql_where=text("external_id IS NOT NULL"),
+        ),
+        # Description search over words, punctuation being a separator (see
+        # app.services.transaction_search); migration 005 adds a trigram index
+        # too where pg_trgm is available
+        Index(
+            "idx_transactions_description_words",
+            text("to_tsvector('simple', regexp_replace(description, '[^[:alnum:]]+', ' ', 'g'))"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
     )
 
     def __repr__(self) -> str:
@@ -8,7 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.cache import cache_manager
-from app.database import get_db
+from app.database import get_db, get_session_factory
 from app.dependencies import get_current_user_id
 from app.schemas.advice import AdviceResponse
 from app.services.advice_generator import AdviceGenerator
@@ -16,14 +16,17 @@ from app.services.advice_generator import AdviceGenerator
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Cache TTL for advice (5 minutes - advice doesn't change frequently)
-ADVICE_CACHE_TTL = 300
+# Cache TTL for advice. Writes to a user's transactions, budgets and goals
+# invalidate it through the user's cache generation, so it can be long.
+ADVICE_CACHE_TTL = 3600
 
 
 # Dependencies
-async def get_advice_generator(db: AsyncSession = Depends(get_db)) -> AdviceGenerator:
-    """Get advice generator instance."""
-    return AdviceGenerator(db)
+async def get_advice_generator(
+    db: AsyncSession = Depends(get_db), session_factory=Depends(get_session_factory)
+) -> AdviceGenerator:
+    """Get advice generator instance, running dashboard stages on pooled sessions."""
+    return AdviceGenerator(db, session_factory=session_factory)
 
 
 # Endpoints
@@ -44,13 +47,13 @@ async def get_personalized_advice(
         List of personalized advice, sorted by priority
     """
     # Try cache first
-    cache_key = f"advice:{user_id}:{max_recommendations}"
+    cache_key = await cache_manager.user_key(user_id, f"advice:{max_recommendations}")
     cached_advice = await cache_manager.get(cache_key)
     if cached_advice:
         return cached_advice
 
     try:
-        advice_list = await generator.generate_dashboard_advice(
+        advice_list, degraded = await generator.dashboard(
             user_id=user_id, max_recommendations=max_recommendations
         )
 
@@ -67,8 +70,11 @@ async def get_personalized_advice(
             for advice in advice_list
         ]
 
-        # Cache the result
-        await cache_manager.set(cache_key, [r.model_dump() for r in result], ADVICE_CACHE_TTL)
+        # Cache the result, unless stages timed out or failed and advice is missing
+        if not degraded:
+            await cache_manager.set(
+                cache_key, [r.model_dump() for r in result], ADVICE_CACHE_TTL
+            )
 
         return result
     except Exception as e:
@@ -343,6 +343,7 @@ async def analyze_finances(
         result = await ai_brain.analyze(
             request=safe_request,
             context=analysis_request.context,
+            user_id=user_id,
         )
 
         # Validate and filter AI output for harmful content, PII, etc.
@@ -447,6 +448,7 @@ async def get_smart_advice(
             user_context=context,
             recent_transactions=transactions,
             goals=goals,
+            user_id=user_id,
         )
 
         # Validate and filter AI output for harmful content, PII, etc.
@@ -483,40 +485,18 @@ async def get_smart_advice(
 # Helper functions
 async def _build_user_context(db: AsyncSession, user_id: UUID) -> dict:
     """Build financial context for a user."""
-    from sqlalchemy import select, func, and_
     from datetime import datetime, timedelta, timezone
-    from app.models.transaction import Transaction
+    from app.services.rollup_service import RollupService
 
     # Get spending by category for last 30 days
     thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    rollup = RollupService(db)
 
-    stmt = (
-        select(Transaction.category, func.sum(Transaction.amount).label("total"))
-        .where(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.type == "EXPENSE",
-                Transaction.date >= thirty_days_ago.date(),
-                Transaction.deleted_at.is_(None),
-            )
-        )
-        .group_by(Transaction.category)
-    )
-
-    result = await db.execute(stmt)
-    spending = {row.category: float(row.total) for row in result.all()}
+    totals = await rollup.category_totals(user_id, thirty_days_ago.date())
+    spending = {category: float(total) for category, total in totals.items()}
 
     # Get income
-    income_stmt = select(func.sum(Transaction.amount)).where(
-        and_(
-            Transaction.user_id == user_id,
-            Transaction.type == "INCOME",
-            Transaction.date >= thirty_days_ago.date(),
-            Transaction.deleted_at.is_(None),
-        )
-    )
-    income_result = await db.execute(income_stmt)
-    monthly_income = income_result.scalar() or 0
+    monthly_income = await rollup.total(user_id, thirty_days_ago.date(), txn_type="INCOME")
 
     return {
         "monthly_income": float(monthly_income),
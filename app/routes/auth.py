@@ -15,6 +15,7 @@ from app.services.auth_service import (
     AuthenticationError,
     TokenError,
 )
+from app.services.password_hasher import PasswordHasherBusy
 from app.schemas.auth import (
     UserRegisterRequest,
     UserLoginRequest,
@@ -37,6 +38,18 @@ router = APIRouter(tags=["auth"])
 # Rate limiter for auth endpoints (stricter limits)
 limiter = Limiter(key_func=get_remote_address)
 
+# Seconds clients are asked to wait when password hashing is saturated
+HASHER_RETRY_AFTER = 1
+
+
+def hasher_busy(e: PasswordHasherBusy) -> HTTPException:
+    """429 response for requests shed by the password hasher."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(e),
+        headers={"Retry-After": str(HASHER_RETRY_AFTER)},
+    )
+
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
 @limiter.limit(f"{settings.auth_rate_limit_per_minute}/minute")
@@ -86,6 +99,8 @@ async def register(
             tokens=TokenResponse(access_token=access_token, refresh_token=refresh_token),
         )
 
+    except PasswordHasherBusy as e:
+        raise hasher_busy(e)
     except PasswordValidationError as e:
         logger.warning("Registration failed: password validation error", error=str(e))
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -142,6 +157,8 @@ async def login(
     except AuthenticationError as e:
         logger.warning("Login failed: authentication error", error=str(e))
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+    except PasswordHasherBusy as e:
+        raise hasher_busy(e)
 
 
 @router.post("/refresh", response_model=TokenResponse)
@@ -198,7 +215,7 @@ async def logout(
     logger.info("User logout request")
 
     auth_service = AuthService(db)
-    await auth_service.blacklist_token(token)
+    await auth_service.logout(token)
 
     return MessageResponse(
         message="Logged out successfully. Token has been revoked."
@@ -252,6 +269,7 @@ async def update_profile(
 
     await db.flush()
     await db.refresh(current_user)
+    AuthService(db).invalidate_principal(current_user.id)
 
     logger.info("Profile updated successfully", user_id=str(current_user.id))
 
@@ -304,3 +322,5 @@ async def change_password(
     except PasswordValidationError as e:
         logger.warning("Password change failed: validation error", error=str(e))
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except PasswordHasherBusy as e:
+        raise hasher_busy(e)
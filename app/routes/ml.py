@@ -1,5 +1,7 @@
 """ML Model Management API endpoints."""
 
+import asyncio
+import glob
 import os
 from typing import Optional
 from uuid import UUID
@@ -8,8 +10,10 @@ from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from pydantic import BaseModel, Field
 
 from app.config import settings
-from app.dependencies import get_current_user_id
+from app.dependencies import get_current_admin_user, get_current_user_id
 from app.ml.categorization_engine import CategorizationEngine
+from app.models.user import User
+from app.services.training_jobs import get_training_job_manager
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -94,6 +98,12 @@ def get_categorization_engine() -> CategorizationEngine:
     return _categorization_engine
 
 
+def close_categorization_engine() -> None:
+    """Save pending user model updates (on application shutdown)."""
+    if _categorization_engine is not None:
+        _categorization_engine.close()
+
+
 # Endpoints
 @router.get("/status")
 async def get_ml_status(engine: CategorizationEngine = Depends(get_categorization_engine)) -> dict:
@@ -312,7 +322,9 @@ async def submit_correction(
     model once enough corrections are collected.
     """
     try:
-        model_trained = engine.learn_from_correction(
+        # Usually a quick incremental update, but the first training fits a model
+        model_trained = await asyncio.to_thread(
+            engine.learn_from_correction,
             user_id=str(user_id),
             description=request.description,
             correct_category=request.correct_category,
@@ -341,7 +353,8 @@ async def train_user_model(
     """
     Manually trigger user model training.
 
-    Requires sufficient corrections unless force=True.
+    Requires sufficient corrections unless force=True. When background
+    training is running, the training is queued instead.
     """
     correction_count = engine.get_correction_count(str(user_id))
 
@@ -351,6 +364,15 @@ async def train_user_model(
             detail=f"Insufficient corrections: {correction_count}/{engine.min_corrections_for_training}",
         )
 
+    manager = get_training_job_manager()
+    if manager is not None:
+        job = await manager.enqueue(str(user_id), "manual")
+        return {
+            "success": True,
+            "queued": True,
+            "job_id": job.id,
+        }
+
     try:
         corrections = engine._load_user_corrections(str(user_id))
         success = engine._train_user_model(str(user_id), corrections)
@@ -370,6 +392,22 @@ async def train_user_model(
         raise HTTPException(status_code=500, detail="An internal error occurred. Please try again later.")
 
 
+@router.get("/training/jobs")
+async def list_training_jobs(
+    admin: User = Depends(get_current_admin_user),
+) -> dict:
+    """List queued, running and recently finished user model training jobs (admin only)."""
+    manager = get_training_job_manager()
+    if manager is None:
+        raise HTTPException(status_code=503, detail="Background training is not running")
+
+    jobs = await manager.list_jobs()
+    return {
+        state: [job.to_dict() for job in state_jobs]
+        for state, state_jobs in jobs.items()
+    }
+
+
 @router.get("/categories")
 async def get_categories() -> dict:
     """Get list of available categories."""
@@ -420,22 +458,29 @@ async def delete_user_model(
 
     model_path = os.path.join(engine.model_dir, f"user_{user_id}_categorization_model.pkl")
     metrics_path = os.path.join(engine.model_dir, f"user_{user_id}_categorization_metrics.pkl")
-    corrections_path = os.path.join(engine.model_dir, f"user_{user_id}_corrections.json")
+    corrections_path = os.path.join(engine.model_dir, f"user_{user_id}_corrections.jsonl")
+    legacy_corrections_path = os.path.join(engine.model_dir, f"user_{user_id}_corrections.json")
 
     deleted = []
 
+    # Drop it from memory first so a pending save can't bring the model back
+    engine.forget_user_model(str(user_id))
+
+    # Versions trained in the background
+    version_paths = glob.glob(
+        os.path.join(engine.model_dir, f"user_{user_id}_categorization_model_*.pkl")
+    )
+
     for path, name in [
         (model_path, "model"),
         (metrics_path, "metrics"),
         (corrections_path, "corrections"),
-    ]:
+        (legacy_corrections_path, "corrections"),
+    ] + [(path, "model_versions") for path in version_paths]:
         if os.path.exists(path):
             os.remove(path)
-            deleted.append(name)
-
-    # Clear from cache
-    if str(user_id) in engine.user_models:
-        del engine.user_models[str(user_id)]
+            if name not in deleted:
+                deleted.append(name)
 
     return {
         "success": True,
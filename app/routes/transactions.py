@@ -13,13 +13,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.dependencies import get_current_user_id
 from app.schemas.transaction import (
+    CountMode,
     TransactionCreate,
     TransactionUpdate as SchemaTransactionUpdate,
     TransactionResponse as SchemaTransactionResponse,
+    TransactionSearchHit,
     TransactionSource,
     TransactionType,
 )
-from app.services.transaction_service import TransactionService
+from app.services.transaction_service import InvalidCursorError, TransactionService
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -32,10 +34,21 @@ class TransactionListResponse(BaseModel):
     items: list[
         SchemaTransactionResponse
     ]  # Changed from 'transactions' to 'items' to match frontend
+    total: Optional[int]
+    page: int
+    page_size: int
+    total_pages: Optional[int]
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
+
+
+class TransactionSearchResponse(BaseModel):
+    """Transaction search results, most relevant first."""
+
+    items: list[TransactionSearchHit]
     total: int
     page: int
     page_size: int
-    total_pages: int
 
 
 # Dependency to get transaction service
@@ -91,10 +104,20 @@ async def list_transactions(
     search: Optional[str] = Query(None, description="Search in description"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from a previous page's next_cursor (page is then ignored)"
+    ),
+    count: Optional[CountMode] = Query(
+        None,
+        description="Total: exact (default for pages), estimate (default for cursors) or none",
+    ),
     service: TransactionService = Depends(get_transaction_service),
 ) -> TransactionListResponse:
     """List transactions with optional filters and pagination.
 
+    Pages can be requested by number or, for cheap deep paging, by the
+    cursor returned as next_cursor with each page.
+
     Args:
         user_id: User ID
         category: Optional category filter
@@ -106,10 +129,15 @@ async def list_transactions(
         search: Optional search term
         page: Page number
         page_size: Page size
+        cursor: Optional keyset cursor
+        count: How to compute the total
         service: Transaction service
 
     Returns:
         Paginated list of transactions
+
+    Raises:
+        HTTPException: If the cursor is invalid
     """
     try:
         from app.schemas.transaction import TransactionFilters, Pagination
@@ -126,26 +154,97 @@ async def list_transactions(
         )
 
         # Build pagination
-        pagination = Pagination(page=page, page_size=page_size)
+        pagination = Pagination(page=page, page_size=page_size, cursor=cursor)
+        if count is None:
+            count = CountMode.ESTIMATE if cursor else CountMode.EXACT
 
-        transactions, total = await service.list_transactions(
-            user_id=user_id, filters=filters, pagination=pagination
+        result = await service.list_transactions_page(
+            user_id=user_id, filters=filters, pagination=pagination, count=count
         )
 
-        total_pages = (total + page_size - 1) // page_size
+        total = result.total
+        total_pages = (total + page_size - 1) // page_size if total is not None else None
 
         return TransactionListResponse(
-            items=[SchemaTransactionResponse.model_validate(t) for t in transactions],
+            items=[SchemaTransactionResponse.model_validate(t) for t in result.items],
             total=total,
             page=page,
             page_size=page_size,
             total_pages=total_pages,
+            total_is_estimate=result.total_is_estimate,
+            next_cursor=result.next_cursor,
         )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to list transactions: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="An internal error occurred. Please try again later.")
 
 
+@router.get("/search", response_model=TransactionSearchResponse)
+async def search_transactions(
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    type: Optional[TransactionType] = Query(None, description="Filter by type"),
+    start_date: Optional[datetime] = Query(None, description="Filter by start date"),
+    end_date: Optional[datetime] = Query(None, description="Filter by end date"),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(20, ge=1, le=100, description="Page size"),
+    user_id: UUID = Depends(get_current_user_id),
+    service: TransactionService = Depends(get_transaction_service),
+) -> TransactionSearchResponse:
+    """Search transaction descriptions, ranked by relevance.
+
+    Query words match as word prefixes, so partial words typed so far
+    match; where the database supports it, near misses (typos) match too.
+    Each hit carries the offsets of the matched text for highlighting.
+
+    Args:
+        q: Search query
+        category: Optional category filter
+        type: Optional type filter
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+        page: Page number
+        page_size: Page size
+        user_id: User ID
+        service: Transaction service
+
+    Returns:
+        Page of search hits
+    """
+    from app.schemas.transaction import TransactionFilters, Pagination
+
+    try:
+        filters = TransactionFilters(
+            category=category,
+            type=type,
+            start_date=start_date.date() if start_date else None,
+            end_date=end_date.date() if end_date else None,
+        )
+        hits, total = await service.search_transactions(
+            user_id, q, Pagination(page=page, page_size=page_size), filters
+        )
+        return TransactionSearchResponse(
+            items=[
+                TransactionSearchHit.model_validate(
+                    {
+                        **SchemaTransactionResponse.model_validate(hit.transaction).model_dump(),
+                        "rank": hit.rank,
+                        "highlights": hit.highlights,
+                    }
+                )
+                for hit in hits
+            ],
+            total=total,
+            page=page,
+            page_size=page_size,
+        )
+    except Exception as e:
+        logger.error(f"Failed to search transactions: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="An internal error occurred. Please try again later.")
+
+
 @router.get("/{transaction_id}", response_model=SchemaTransactionResponse)
 async def get_transaction(
     transaction_id: UUID,
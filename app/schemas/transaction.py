@@ -94,6 +94,16 @@ class TransactionResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class TransactionSearchHit(TransactionResponse):
+    """Schema for a transaction matching a search."""
+
+    rank: float = Field(..., description="Relevance; word matches score above 1, typo matches below")
+    highlights: list[tuple[int, int]] = Field(
+        default_factory=list,
+        description="(start, end) offsets of matched text in the description",
+    )
+
+
 class TransactionFilters(BaseModel):
     """Schema for filtering transactions."""
 
@@ -115,11 +125,24 @@ class TransactionFilters(BaseModel):
         return v
 
 
+class CountMode(str, Enum):
+    """How the total of a paginated listing is computed."""
+
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
 class Pagination(BaseModel):
-    """Schema for pagination parameters."""
+    """Schema for pagination parameters.
+
+    With a cursor, the page starts after the transaction it points at and
+    page is ignored.
+    """
 
     page: int = Field(default=1, ge=1, description="Page number (1-indexed)")
     page_size: int = Field(default=50, ge=1, le=100, description="Number of items per page")
+    cursor: Optional[str] = Field(None, description="Opaque cursor from a previous page")
 
     @property
     def offset(self) -> int:
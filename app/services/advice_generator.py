@@ -1,18 +1,32 @@
-"""Advice generator service for personalized financial recommendations."""
-
+"""Advice generator service for personalized financial recommendations.
+
+Dashboard advice is computed from a snapshot of the user's budgets, goals
+and category spending, fetched in stages. With a session factory the stages
+run concurrently, each on its own pooled session and under a timeout;
+otherwise they run one after another on the generator's session, each in a
+savepoint. A stage that times out or fails leaves its part of the snapshot
+empty, so the dashboard shows the remaining advice instead of failing or
+stalling.
+"""
+
+import asyncio
+import time
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.metrics.advice_metrics import advice_metrics
 from app.models.transaction import Transaction
 from app.models.budget import Budget
 from app.models.financial_goal import FinancialGoal
+from app.services.rollup_service import RollupService
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -40,16 +54,41 @@ class Advice:
     related_id: Optional[UUID] = None  # Budget ID, Goal ID, etc.
 
 
+@dataclass
+class AdviceSnapshot:
+    """User data the dashboard advice is computed from, fetched up front."""
+
+    budget_spending: List[Tuple[Budget, Dict[str, Decimal]]]
+    active_goals: List[FinancialGoal]
+    achieved_goals: List[FinancialGoal]
+    category_spending: Dict[str, Decimal]
+    lookback_months: int
+    degraded: List[str] = field(default_factory=list)  # stages that timed out or failed
+
+
 class AdviceGenerator:
     """Service for generating personalized financial recommendations."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        session_factory=None,
+        stage_timeout: Optional[float] = None,
+    ):
         """Initialize advice generator.
 
         Args:
             db: Database session
+            session_factory: Async session factory; when given, dashboard stages
+                run concurrently, each on its own session
+            stage_timeout: Seconds each dashboard stage on its own session may
+                take (defaults to ADVICE_STAGE_TIMEOUT)
         """
         self.db = db
+        self.session_factory = session_factory
+        self.stage_timeout = (
+            settings.advice_stage_timeout if stage_timeout is None else stage_timeout
+        )
 
     async def generate_dashboard_advice(
         self, user_id: UUID, max_recommendations: int = 3
@@ -63,23 +102,35 @@ class AdviceGenerator:
         Returns:
             List of Advice objects, sorted by priority
         """
-        all_advice = []
+        advice, _ = await self.dashboard(user_id, max_recommendations)
+        return advice
+
+    async def dashboard(
+        self, user_id: UUID, max_recommendations: int = 3
+    ) -> Tuple[List[Advice], List[str]]:
+        """Generate dashboard recommendations, reporting degraded stages.
 
-        # Check spending alerts
-        spending_alerts = await self.check_spending_alerts(user_id)
-        all_advice.extend(spending_alerts)
+        Advice from a degraded stage is missing, so callers shouldn't cache
+        the result for long.
 
-        # Check goal progress
-        goal_advice = await self._check_goal_progress(user_id)
-        all_advice.extend(goal_advice)
+        Args:
+            user_id: User ID
+            max_recommendations: Maximum number of recommendations (default: 3)
 
-        # Check savings opportunities
-        savings_advice = await self.suggest_savings_opportunities(user_id)
-        all_advice.extend(savings_advice)
+        Returns:
+            Tuple of (Advice objects sorted by priority, names of stages that
+            timed out or failed)
+        """
+        start = time.perf_counter()
+        snapshot = await self.fetch_snapshot(user_id)
 
-        # Check for achievements
-        achievement_advice = await self._check_achievements(user_id)
-        all_advice.extend(achievement_advice)
+        all_advice = []
+        all_advice.extend(self._spending_alerts(user_id, snapshot.budget_spending))
+        all_advice.extend(self._goal_progress_advice(snapshot.active_goals))
+        all_advice.extend(
+            self._savings_advice(snapshot.category_spending, snapshot.lookback_months)
+        )
+        all_advice.extend(self._achievement_advice(snapshot.achieved_goals))
 
         # Sort by priority and return top recommendations
         priority_order = {
@@ -94,60 +145,236 @@ class AdviceGenerator:
         # Ensure at least 3 recommendations if possible
         if len(sorted_advice) < max_recommendations:
             # Add general tips if needed
-            general_tips = await self._generate_general_tips(user_id)
+            general_tips = await self._stage(
+                "tips", lambda gen: gen._generate_general_tips(user_id), [], snapshot.degraded
+            )
             sorted_advice.extend(general_tips)
 
-        return sorted_advice[:max_recommendations]
+        advice_metrics.dashboard_duration.observe(time.perf_counter() - start)
+        if snapshot.degraded:
+            logger.warning(
+                "Dashboard advice degraded", user_id=str(user_id), stages=snapshot.degraded
+            )
+        return sorted_advice[:max_recommendations], snapshot.degraded
+
+    async def fetch_snapshot(self, user_id: UUID, lookback_months: int = 3) -> AdviceSnapshot:
+        """Fetch everything the dashboard advice generators need.
 
-    async def check_spending_alerts(
+        Uses a fixed number of queries regardless of how many budgets,
+        categories or goals the user has; the generators then run on the
+        snapshot without touching the database. Each query is a stage with
+        its own timeout; stages that time out or fail are left empty and
+        listed in the snapshot's degraded stages.
+
+        Args:
+            user_id: User ID
+            lookback_months: Months of spending for savings opportunities
+
+        Returns:
+            AdviceSnapshot for the user
+        """
+        degraded: List[str] = []
+        stages = [
+            self._stage(
+                "budgets", lambda gen: gen._fetch_budget_spending(user_id), [], degraded
+            ),
+            self._stage("goals", lambda gen: gen._fetch_goals(user_id), ([], []), degraded),
+            self._stage(
+                "spending",
+                lambda gen: gen._fetch_category_spending(user_id, lookback_months),
+                {},
+                degraded,
+            ),
+        ]
+        if self.session_factory is None:
+            # A session runs one query at a time
+            results = [await stage for stage in stages]
+        else:
+            results = await asyncio.gather(*stages)
+        budget_spending, (active_goals, achieved_goals), category_spending = results
+
+        return AdviceSnapshot(
+            budget_spending=budget_spending,
+            active_goals=active_goals,
+            achieved_goals=achieved_goals,
+            category_spending=category_spending,
+            lookback_months=lookback_months,
+            degraded=degraded,
+        )
+
+    async def _stage(
+        self,
+        name: str,
+        fetch: Callable[["AdviceGenerator"], Awaitable[Any]],
+        default: Any,
+        degraded: List[str],
+    ) -> Any:
+        """Run one dashboard stage, recording its latency.
+
+        Stages on their own sessions run under the stage timeout; stages on
+        the generator's session run in a savepoint, without a timeout.
+
+        Args:
+            name: Stage name, used in metrics and logs
+            fetch: Coroutine function taking the generator to fetch with
+            default: Result when the stage times out or fails
+            degraded: Names of degraded stages, appended to on failure
+
+        Returns:
+            The stage's result, or the default
+        """
+
+        async def run():
+            async with self.session_factory() as db:
+                return await fetch(AdviceGenerator(db, stage_timeout=self.stage_timeout))
+
+        async def run_shared():
+            # A failing stage rolls back to its savepoint, keeping the session usable
+            async with self.db.begin_nested():
+                return await fetch(self)
+
+        outcome = "success"
+        start = time.perf_counter()
+        try:
+            if self.session_factory is None:
+                # Cancelling a query would leave the shared session mid-statement,
+                # so stages on it aren't timed out
+                return await run_shared()
+            # Includes waiting for a pooled connection
+            return await asyncio.wait_for(run(), self.stage_timeout)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            degraded.append(name)
+            logger.warning("Advice stage timed out", stage=name, timeout=self.stage_timeout)
+            return default
+        except Exception as e:
+            outcome = "error"
+            degraded.append(name)
+            logger.error("Advice stage failed", stage=name, error=str(e))
+            return default
+        finally:
+            advice_metrics.stage_duration.labels(stage=name, outcome=outcome).observe(
+                time.perf_counter() - start
+            )
+
+    async def _fetch_budget_spending(
         self, user_id: UUID, budget_id: Optional[UUID] = None
-    ) -> List[Advice]:
-        """Generate warnings for budget overruns.
+    ) -> List[Tuple[Budget, Dict[str, Decimal]]]:
+        """Fetch budgets with their per-category spending in one grouped query.
+
+        Each budget is left-joined to the spending rows inside its period for
+        its allocated categories, so budgets without spending still appear.
 
         Args:
             user_id: User ID
-            budget_id: Optional specific budget ID to check
+            budget_id: Optional specific budget ID (default: current active budgets)
 
         Returns:
-            List of spending alert advice
+            List of (budget, category -> amount spent) pairs
         """
-        advice_list = []
+        spending = RollupService(self.db).source()
+        in_budget = and_(
+            spending.c.user_id == Budget.user_id,
+            spending.c.type == "EXPENSE",
+            spending.c.date >= Budget.period_start,
+            spending.c.date <= Budget.period_end,
+            Budget.allocations.has_key(spending.c.category),
+        )
 
-        # Get active budgets
         if budget_id:
-            stmt = select(Budget).where(and_(Budget.id == budget_id, Budget.user_id == user_id))
+            conditions = [Budget.id == budget_id, Budget.user_id == user_id]
         else:
             # Get current active budgets
             today = datetime.now(timezone.utc).date()
-            stmt = select(Budget).where(
-                and_(
-                    Budget.user_id == user_id,
-                    Budget.period_start <= today,
-                    Budget.period_end >= today,
-                )
-            )
+            conditions = [
+                Budget.user_id == user_id,
+                Budget.period_start <= today,
+                Budget.period_end >= today,
+            ]
 
+        stmt = (
+            select(Budget, spending.c.category, func.sum(spending.c.total).label("spent"))
+            .outerjoin(spending, in_budget)
+            .where(and_(*conditions))
+            .group_by(Budget.id, spending.c.category)
+            .order_by(Budget.created_at, Budget.id)
+        )
         result = await self.db.execute(stmt)
-        budgets = result.scalars().all()
 
-        for budget in budgets:
-            # Calculate spending for each category
-            for category, allocated_amount in budget.allocations.items():
-                allocated = Decimal(str(allocated_amount))
+        budgets: Dict[UUID, Tuple[Budget, Dict[str, Decimal]]] = {}
+        for budget, category, spent in result.all():
+            _, by_category = budgets.setdefault(budget.id, (budget, {}))
+            if category is not None:
+                by_category[category] = Decimal(str(spent))
+
+        return list(budgets.values())
+
+    async def _fetch_goals(
+        self, user_id: UUID
+    ) -> Tuple[List[FinancialGoal], List[FinancialGoal]]:
+        """Fetch active goals and goals achieved within the last 7 days.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Tuple of (active goals, recently achieved goals)
+        """
+        seven_days_ago = datetime.utcnow() - timedelta(days=7)
 
-                # Get actual spending
-                stmt = select(func.sum(Transaction.amount)).where(
+        stmt = select(FinancialGoal).where(
+            and_(
+                FinancialGoal.user_id == user_id,
+                or_(
+                    FinancialGoal.status == "ACTIVE",
                     and_(
-                        Transaction.user_id == user_id,
-                        Transaction.category == category,
-                        Transaction.type == "EXPENSE",
-                        Transaction.date >= budget.period_start,
-                        Transaction.date <= budget.period_end,
-                        Transaction.deleted_at.is_(None),
-                    )
-                )
-                result = await self.db.execute(stmt)
-                spent = result.scalar() or Decimal(0)
+                        FinancialGoal.status == "ACHIEVED",
+                        FinancialGoal.updated_at >= seven_days_ago,
+                    ),
+                ),
+            )
+        )
+        result = await self.db.execute(stmt)
+
+        active, achieved = [], []
+        for goal in result.scalars().all():
+            (active if goal.status == "ACTIVE" else achieved).append(goal)
+        return active, achieved
+
+    async def _fetch_category_spending(
+        self, user_id: UUID, lookback_months: int
+    ) -> Dict[str, Decimal]:
+        """Fetch spending by category over the lookback window."""
+        end_date = datetime.now(timezone.utc).date()
+        start_date = end_date - timedelta(days=lookback_months * 30)
+
+        return await RollupService(self.db).category_totals(user_id, start_date, end_date)
+
+    async def check_spending_alerts(
+        self, user_id: UUID, budget_id: Optional[UUID] = None
+    ) -> List[Advice]:
+        """Generate warnings for budget overruns.
+
+        Args:
+            user_id: User ID
+            budget_id: Optional specific budget ID to check
+
+        Returns:
+            List of spending alert advice
+        """
+        budget_spending = await self._fetch_budget_spending(user_id, budget_id)
+        return self._spending_alerts(user_id, budget_spending)
+
+    def _spending_alerts(
+        self, user_id: UUID, budget_spending: List[Tuple[Budget, Dict[str, Decimal]]]
+    ) -> List[Advice]:
+        """Build budget overrun alerts from per-category spending."""
+        advice_list = []
+
+        for budget, spending in budget_spending:
+            for category, allocated_amount in budget.allocations.items():
+                allocated = Decimal(str(allocated_amount))
+                spent = spending.get(category, Decimal(0))
 
                 # Check for overspending (>10% threshold)
                 if spent > allocated * Decimal("1.1"):
@@ -204,63 +431,43 @@ class AdviceGenerator:
         Returns:
             List of savings opportunity advice
         """
-        advice_list = []
-
-        # Calculate date range
-        end_date = datetime.now(timezone.utc).date()
-        start_date = end_date - timedelta(days=lookback_months * 30)
-
-        # Get spending by category
-        stmt = (
-            select(
-                Transaction.category,
-                func.sum(Transaction.amount).label("total_spent"),
-                func.count(Transaction.id).label("transaction_count"),
-                func.avg(Transaction.amount).label("avg_amount"),
-            )
-            .where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == "EXPENSE",
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date,
-                    Transaction.deleted_at.is_(None),
-                )
-            )
-            .group_by(Transaction.category)
-        )
+        spending_data = await self._fetch_category_spending(user_id, lookback_months)
+        return self._savings_advice(spending_data, lookback_months)
 
-        result = await self.db.execute(stmt)
-        spending_data = result.all()
+    def _savings_advice(
+        self, spending_data: Dict[str, Decimal], lookback_months: int
+    ) -> List[Advice]:
+        """Build savings opportunity advice from spending by category."""
+        advice_list = []
 
         # Calculate total spending
-        total_spending = sum(row.total_spent for row in spending_data)
+        total_spending = sum(spending_data.values())
 
         if total_spending == 0:
             return advice_list
 
         # Identify high-spending categories (>15% of total)
-        for row in spending_data:
-            category_percent = (row.total_spent / total_spending) * 100
+        for category, total_spent in spending_data.items():
+            category_percent = (total_spent / total_spending) * 100
 
             if category_percent > 15:
                 # Suggest savings opportunity
-                potential_savings = row.total_spent * Decimal("0.1")  # 10% reduction
+                potential_savings = total_spent * Decimal("0.1")  # 10% reduction
 
                 advice = Advice(
-                    title=f"Savings Opportunity: {row.category}",
-                    message=f"Consider reducing {row.category} spending",
+                    title=f"Savings Opportunity: {category}",
+                    message=f"Consider reducing {category} spending",
                     explanation=(
-                        f"{row.category} represents {category_percent:.1f}% of your total spending "
-                        f"(${row.total_spent:.2f} over the last {lookback_months} months). "
+                        f"{category} represents {category_percent:.1f}% of your total spending "
+                        f"(${total_spent:.2f} over the last {lookback_months} months). "
                         f"Reducing this by just 10% could save you ${potential_savings:.2f}."
                     ),
                     priority=AdvicePriority.MEDIUM,
-                    category=row.category,
+                    category=category,
                     action_items=[
-                        f"Review your {row.category} transactions for unnecessary expenses",
-                        f"Look for cheaper alternatives in {row.category}",
-                        f"Set a lower budget for {row.category} next period",
+                        f"Review your {category} transactions for unnecessary expenses",
+                        f"Look for cheaper alternatives in {category}",
+                        f"Set a lower budget for {category} next period",
                     ],
                 )
 
@@ -277,14 +484,12 @@ class AdviceGenerator:
         Returns:
             List of goal-related advice
         """
-        advice_list = []
+        active_goals, _ = await self._fetch_goals(user_id)
+        return self._goal_progress_advice(active_goals)
 
-        # Get active goals
-        stmt = select(FinancialGoal).where(
-            and_(FinancialGoal.user_id == user_id, FinancialGoal.status == "ACTIVE")
-        )
-        result = await self.db.execute(stmt)
-        goals = result.scalars().all()
+    def _goal_progress_advice(self, goals: List[FinancialGoal]) -> List[Advice]:
+        """Build at-risk and progress advice for active goals."""
+        advice_list = []
 
         today = datetime.now(timezone.utc).date()
 
@@ -357,20 +562,12 @@ class AdviceGenerator:
         Returns:
             List of achievement advice
         """
-        advice_list = []
-
-        # Check for recently achieved goals (within last 7 days)
-        seven_days_ago = datetime.utcnow() - timedelta(days=7)
+        _, achieved_goals = await self._fetch_goals(user_id)
+        return self._achievement_advice(achieved_goals)
 
-        stmt = select(FinancialGoal).where(
-            and_(
-                FinancialGoal.user_id == user_id,
-                FinancialGoal.status == "ACHIEVED",
-                FinancialGoal.updated_at >= seven_days_ago,
-            )
-        )
-        result = await self.db.execute(stmt)
-        achieved_goals = result.scalars().all()
+    def _achievement_advice(self, achieved_goals: List[FinancialGoal]) -> List[Advice]:
+        """Build celebration advice for recently achieved goals."""
+        advice_list = []
 
         for goal in achieved_goals:
             advice = Advice(
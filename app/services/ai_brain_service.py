@@ -19,11 +19,13 @@ Phase 3 Enhancements:
 
 import asyncio
 import hashlib
+import json
 import os
 import time
 from dataclasses import dataclass, field
 from enum import Enum, IntEnum
 from typing import Any, Dict, List, Optional
+from uuid import UUID
 from contextlib import asynccontextmanager
 
 
@@ -587,6 +589,7 @@ class AIBrainService:
         context: Optional[Dict] = None,
         conversation_history: Optional[List[Dict]] = None,
         use_cache: bool = True,
+        user_id: Optional[UUID] = None,
     ) -> AIBrainResponse:
         """
         Query the AI Brain.
@@ -597,6 +600,8 @@ class AIBrainService:
             context: User financial context
             conversation_history: Previous conversation turns
             use_cache: Whether to use cached responses
+            user_id: Owner of the context; scopes the cached response to the
+                user's cache generation so their data changes invalidate it
 
         Returns:
             AIBrainResponse with the result
@@ -605,7 +610,11 @@ class AIBrainService:
 
         # Check cache first
         if use_cache and mode != AIBrainMode.CHAT:
-            cache_key = f"ai_brain:{mode.value}:{hashlib.sha256(query.encode()).hexdigest()[:16]}"
+            # The response depends on the context as well as the query
+            payload = json.dumps([query, context], sort_keys=True, default=str)
+            cache_key = f"ai_brain:{mode.value}:{hashlib.sha256(payload.encode()).hexdigest()[:16]}"
+            if user_id is not None:
+                cache_key = await cache_manager.user_key(user_id, cache_key)
             cached = await cache_manager.get(cache_key)
             if cached:
                 # Record cache hit
@@ -1169,12 +1178,14 @@ class AIBrainService:
         self,
         request: str,
         context: Dict,
+        user_id: Optional[UUID] = None,
     ) -> AIBrainResponse:
         """Request financial analysis."""
         return await self.query(
             query=request,
             mode=AIBrainMode.ANALYZE,
             context=context,
+            user_id=user_id,
         )
 
     async def parse_transaction(
@@ -1265,6 +1276,7 @@ class AIBrainService:
         user_context: Dict,
         recent_transactions: List[Dict],
         goals: List[Dict],
+        user_id: Optional[UUID] = None,
     ) -> str:
         """Get personalized financial advice using AI Brain."""
         # Build comprehensive context
@@ -1285,6 +1297,7 @@ class AIBrainService:
             query=prompt,
             mode=AIBrainMode.ANALYZE,
             context=context,
+            user_id=user_id,
         )
 
         return result.response
@@ -10,12 +10,17 @@ This service:
 3. Integrates validation with the main app response flow
 """
 
+import asyncio
+import inspect
 import logging
-from typing import Dict, Optional, Any, Tuple
-from dataclasses import dataclass
+from collections import Counter
+from typing import Dict, List, Optional, Any, Sequence, Tuple, Union
+from dataclasses import dataclass, field
 from enum import Enum
 import re
 
+from app.metrics.ai_brain_metrics import ai_metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -73,6 +78,54 @@ for parent, children in CATEGORY_HIERARCHY.items():
     for child in children:
         CATEGORY_TO_PARENT[child.lower()] = parent
 
+# Lowercase parent -> lowercase children, for case-insensitive parent/child checks
+_CHILDREN_LOWER = {
+    parent.lower(): {child.lower() for child in children}
+    for parent, children in CATEGORY_HIERARCHY.items()
+}
+
+
+@dataclass
+class AgreementReport:
+    """Aggregate agreement between AI and ML categories over a batch."""
+
+    total: int = 0
+    full: int = 0
+    partial: int = 0
+    none: int = 0
+    # Items without an ML prediction (counted under "none")
+    ml_missing: int = 0
+    ml_overrides: int = 0
+    # Most frequent (AI category, ML category) disagreements
+    top_disagreements: List[Tuple[str, str, int]] = field(default_factory=list)
+
+    @property
+    def agreement_rate(self) -> float:
+        """Share of items with an ML prediction where AI and ML agree at least partially."""
+        compared = self.total - self.ml_missing
+        return (self.full + self.partial) / compared if compared else 0.0
+
+    @property
+    def override_rate(self) -> float:
+        """Share of items where the ML category replaced the AI one."""
+        return self.ml_overrides / self.total if self.total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "full": self.full,
+            "partial": self.partial,
+            "none": self.none,
+            "ml_missing": self.ml_missing,
+            "ml_overrides": self.ml_overrides,
+            "agreement_rate": round(self.agreement_rate, 4),
+            "override_rate": round(self.override_rate, 4),
+            "top_disagreements": [
+                {"ai_category": ai, "ml_category": ml, "count": count}
+                for ai, ml, count in self.top_disagreements
+            ],
+        }
+
 
 class AIMLCrossValidator:
     """
@@ -144,6 +197,7 @@ class AIMLCrossValidator:
 
         # Determine agreement level
         agreement = self._check_agreement(ai_category, ml_category)
+        ai_metrics.ml_agreement.labels(agreement=agreement.value).inc()
 
         # Decide final category
         final_category, used_override, explanation = self._decide_category(
@@ -164,6 +218,144 @@ class AIMLCrossValidator:
             explanation=explanation,
         )
 
+    async def cross_validate_batch(
+        self,
+        descriptions: Sequence[str],
+        ai_categories: Sequence[str],
+        ai_confidences: Union[float, Sequence[float]],
+        ml_categories: Optional[Sequence[Optional[str]]] = None,
+        ml_confidences: Optional[Sequence[Optional[float]]] = None,
+    ) -> List[CrossValidationResult]:
+        """
+        Cross-validate many AI categories with ML predictions.
+
+        Decides each item like cross_validate, but missing ML predictions
+        come from one batch call to the ML service, and agreement is
+        computed once per distinct category pair.
+
+        Args:
+            descriptions: Original transaction texts
+            ai_categories: Categories from AI Brain, one per description
+            ai_confidences: AI confidence per description, or one for all
+            ml_categories: Pre-computed ML categories (None entries are predicted)
+            ml_confidences: Pre-computed ML confidences, matching ml_categories
+
+        Returns:
+            CrossValidationResults in the order of descriptions
+
+        Raises:
+            ValueError: If the sequences differ in length
+        """
+        n = len(descriptions)
+        if isinstance(ai_confidences, (int, float)):
+            ai_confidences = [float(ai_confidences)] * n
+        ml_categories = list(ml_categories) if ml_categories is not None else [None] * n
+        ml_confidences = list(ml_confidences) if ml_confidences is not None else [None] * n
+        lengths = {len(ai_categories), len(ai_confidences), len(ml_categories), len(ml_confidences)}
+        if lengths - {n}:
+            raise ValueError("Cross-validation batch inputs must have the same length")
+
+        missing = [i for i, category in enumerate(ml_categories) if category is None]
+        if missing and self.ml_service:
+            predictions = await self._ml_predictions([descriptions[i] for i in missing])
+            for i, (category, confidence) in zip(missing, predictions):
+                ml_categories[i] = category
+                ml_confidences[i] = confidence
+
+        agreements = {}
+        results = []
+        for ai_category, ai_confidence, ml_category, ml_confidence in zip(
+            ai_categories, ai_confidences, ml_categories, ml_confidences
+        ):
+            ml_category = ml_category or ""
+            ml_confidence = ml_confidence or 0.0
+            pair = (ai_category, ml_category)
+            agreement = agreements.get(pair)
+            if agreement is None:
+                agreement = agreements[pair] = self._check_agreement(ai_category, ml_category)
+
+            final_category, used_override, explanation = self._decide_category(
+                ai_category=ai_category,
+                ai_confidence=ai_confidence,
+                ml_category=ml_category,
+                ml_confidence=ml_confidence,
+                agreement=agreement,
+            )
+            results.append(
+                CrossValidationResult(
+                    ai_category=ai_category,
+                    ml_category=ml_category,
+                    ml_confidence=ml_confidence,
+                    agreement=agreement,
+                    final_category=final_category,
+                    used_ml_override=used_override,
+                    explanation=explanation,
+                )
+            )
+
+        for level, count in Counter(r.agreement for r in results).items():
+            ai_metrics.ml_agreement.labels(agreement=level.value).inc(count)
+        return results
+
+    async def _ml_predictions(self, descriptions: List[str]) -> List[Tuple[str, float]]:
+        """ML (category, confidence) per description, ("", 0.0) where it fails."""
+        categorize_batch = getattr(self.ml_service, "categorize_batch", None)
+        try:
+            if categorize_batch is None:
+                predictions = await asyncio.gather(
+                    *(self.ml_service.categorize(d) for d in descriptions)
+                )
+            elif inspect.iscoroutinefunction(categorize_batch):
+                predictions = await categorize_batch(descriptions)
+            else:
+                # CategorizationEngine.categorize_batch is CPU-bound and synchronous
+                predictions = await asyncio.to_thread(categorize_batch, descriptions)
+        except Exception as e:
+            logger.warning(f"ML batch categorization failed: {e}")
+            return [("", 0.0)] * len(descriptions)
+
+        pairs = []
+        for prediction in predictions:
+            if isinstance(prediction, dict):
+                pairs.append(
+                    (prediction.get("category", ""), prediction.get("confidence", 0.0))
+                )
+            else:
+                pairs.append((prediction.category, prediction.confidence))
+        return pairs
+
+    @staticmethod
+    def agreement_report(
+        results: Sequence[CrossValidationResult], top_n: int = 10
+    ) -> AgreementReport:
+        """
+        Summarize agreement between AI and ML over cross-validation results.
+
+        Args:
+            results: Results from cross_validate or cross_validate_batch
+            top_n: Number of most frequent disagreements to list
+
+        Returns:
+            AgreementReport with counts and rates
+        """
+        levels = Counter(r.agreement for r in results)
+        disagreements = Counter(
+            (r.ai_category, r.ml_category)
+            for r in results
+            if r.agreement == AgreementLevel.NONE and r.ml_category
+        )
+        return AgreementReport(
+            total=len(results),
+            full=levels[AgreementLevel.FULL],
+            partial=levels[AgreementLevel.PARTIAL],
+            none=levels[AgreementLevel.NONE],
+            ml_missing=sum(1 for r in results if not r.ml_category),
+            ml_overrides=sum(1 for r in results if r.used_ml_override),
+            top_disagreements=[
+                (ai, ml, count) for (ai, ml), count in disagreements.most_common(top_n)
+            ],
+        )
+
     def _check_agreement(self, ai_cat: str, ml_cat: str) -> AgreementLevel:
         """Check agreement level between categories."""
         ai_lower = ai_cat.lower().strip()
@@ -181,12 +373,10 @@ class AIMLCrossValidator:
             return AgreementLevel.PARTIAL
 
         # Check if one is parent of other
-        if ai_lower in CATEGORY_HIERARCHY:
-            if ml_lower in [c.lower() for c in CATEGORY_HIERARCHY.get(ai_lower, [])]:
-                return AgreementLevel.PARTIAL
-        if ml_lower in CATEGORY_HIERARCHY:
-            if ai_lower in [c.lower() for c in CATEGORY_HIERARCHY.get(ml_lower, [])]:
-                return AgreementLevel.PARTIAL
+        if ml_lower in _CHILDREN_LOWER.get(ai_lower, ()):
+            return AgreementLevel.PARTIAL
+        if ai_lower in _CHILDREN_LOWER.get(ml_lower, ()):
+            return AgreementLevel.PARTIAL
 
         return AgreementLevel.NONE
 
@@ -0,0 +1,361 @@
+"""Batch budget and goal alert scanner for scheduled notification runs."""
+
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from datetime import date as date_type
+from decimal import Decimal, ROUND_CEILING
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import and_, func, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.budget import Budget
+from app.models.financial_goal import FinancialGoal
+from app.services.budget_service import BudgetAlert
+from app.services.goal_engine import GoalEngine, GoalRiskAlert
+from app.services.rollup_service import RollupService
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_UUID_SPACE = 1 << 128
+
+
+def shard_bounds(shard_index: int, shard_count: int) -> Tuple[UUID, Optional[UUID]]:
+    """Get the user-id range of a shard.
+
+    The UUID space is split into ``shard_count`` equal ranges, so separate
+    processes can scan disjoint sets of users.
+
+    Args:
+        shard_index: Zero-based shard index
+        shard_count: Total number of shards
+
+    Returns:
+        Tuple of (inclusive lower bound, exclusive upper bound or None for the last shard)
+    """
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"Invalid shard {shard_index} of {shard_count}")
+
+    lower = UUID(int=_UUID_SPACE * shard_index // shard_count)
+    if shard_index == shard_count - 1:
+        return lower, None
+    return lower, UUID(int=_UUID_SPACE * (shard_index + 1) // shard_count)
+
+
+@dataclass
+class ScanCheckpoint:
+    """Progress of a scan, persisted after every page so runs can resume."""
+
+    run_date: date_type
+    shard_index: int = 0
+    shard_count: int = 1
+    last_user_id: Optional[UUID] = None
+    users_scanned: int = 0
+    budget_alerts: int = 0
+    goal_alerts: int = 0
+    completed: bool = False
+
+    def save(self, path: Path) -> None:
+        """Atomically write the checkpoint as JSON."""
+        data = asdict(self)
+        data["run_date"] = self.run_date.isoformat()
+        data["last_user_id"] = str(self.last_user_id) if self.last_user_id else None
+
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(data))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "ScanCheckpoint":
+        """Read a checkpoint written by save()."""
+        data = json.loads(path.read_text())
+        data["run_date"] = date_type.fromisoformat(data["run_date"])
+        if data["last_user_id"]:
+            data["last_user_id"] = UUID(data["last_user_id"])
+        return cls(**data)
+
+
+@dataclass
+class AlertPage:
+    """Alerts found for one page of users."""
+
+    user_ids: List[UUID]
+    budget_alerts: List[Tuple[UUID, UUID, BudgetAlert]] = field(default_factory=list)
+    goal_alerts: List[Tuple[UUID, GoalRiskAlert]] = field(default_factory=list)
+
+
+@dataclass
+class ScanStats:
+    """Totals for a shard scan, including progress restored from a checkpoint."""
+
+    users_scanned: int
+    budget_alerts: int
+    goal_alerts: int
+    users_this_run: int
+    elapsed_seconds: float
+
+    @property
+    def users_per_second(self) -> float:
+        """Users scanned per second by this process (excluding resumed progress)."""
+        return self.users_this_run / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+AlertSink = Callable[[AlertPage], Awaitable[None]]
+
+
+class BatchAlertScanner:
+    """Evaluate budget and goal alerts for every user in set-based batches.
+
+    Users with an active budget or goal are paged through in user-id order
+    (keyset pagination). Per page, three queries load the budgets with their
+    per-category spending, and the active goals; thresholds are then
+    evaluated with NumPy over the whole page (goals through GoalEngine). Results match
+    BudgetService.check_budget_alerts and GoalService.check_goal_risks.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        page_size: int = 500,
+        today: Optional[date_type] = None,
+        goal_history_days: Optional[int] = None,
+    ):
+        """Initialize alert scanner.
+
+        Args:
+            db: Database session
+            page_size: Users per page
+            today: Evaluation date (default: current UTC date)
+            goal_history_days: Project category-linked goals from their
+                contributions over this many days (see GoalEngine)
+        """
+        self.db = db
+        self.page_size = page_size
+        self.today = today or datetime.now(timezone.utc).date()
+        self.goal_history_days = goal_history_days
+
+    def _active_user_ids(self):
+        """Select ids of users with an active budget or goal."""
+        budget_users = select(Budget.user_id).where(
+            and_(Budget.period_start <= self.today, Budget.period_end >= self.today)
+        )
+        goal_users = select(FinancialGoal.user_id).where(FinancialGoal.status == "ACTIVE")
+        return union(budget_users, goal_users).subquery("active_users")
+
+    async def _next_user_page(
+        self, after: Optional[UUID], lower: UUID, upper: Optional[UUID]
+    ) -> List[UUID]:
+        """Fetch the next page of active user ids after a keyset cursor."""
+        users = self._active_user_ids()
+        conditions = [users.c.user_id > after if after else users.c.user_id >= lower]
+        if upper is not None:
+            conditions.append(users.c.user_id < upper)
+
+        stmt = (
+            select(users.c.user_id)
+            .where(and_(*conditions))
+            .order_by(users.c.user_id)
+            .limit(self.page_size)
+        )
+        result = await self.db.execute(stmt)
+        return [row.user_id for row in result.all()]
+
+    async def scan_page(self, user_ids: List[UUID]) -> AlertPage:
+        """Evaluate alerts for a page of users.
+
+        Args:
+            user_ids: Users to evaluate
+
+        Returns:
+            AlertPage with the alerts found
+        """
+        page = AlertPage(user_ids=user_ids)
+        page.budget_alerts = await self._budget_alerts(user_ids)
+        page.goal_alerts = await self._goal_alerts(user_ids)
+        return page
+
+    async def _budget_alerts(self, user_ids: List[UUID]) -> List[Tuple[UUID, UUID, BudgetAlert]]:
+        """Evaluate budget alerts for every active budget of the given users."""
+        budgets_stmt = select(Budget.id, Budget.user_id, Budget.allocations).where(
+            and_(
+                Budget.user_id.in_(user_ids),
+                Budget.period_start <= self.today,
+                Budget.period_end >= self.today,
+            )
+        )
+        budgets = (await self.db.execute(budgets_stmt)).all()
+        if not budgets:
+            return []
+
+        spending = RollupService(self.db).source()
+        spent_stmt = (
+            select(Budget.id, spending.c.category, func.sum(spending.c.total).label("spent"))
+            .join(
+                spending,
+                and_(
+                    spending.c.user_id == Budget.user_id,
+                    spending.c.type == "EXPENSE",
+                    spending.c.date >= Budget.period_start,
+                    spending.c.date <= Budget.period_end,
+                    Budget.allocations.has_key(spending.c.category),
+                ),
+            )
+            .where(Budget.id.in_([budget.id for budget in budgets]))
+            .group_by(Budget.id, spending.c.category)
+        )
+        spent_by_key: Dict[Tuple[UUID, str], Decimal] = {
+            (row.id, row.category): Decimal(str(row.spent))
+            for row in (await self.db.execute(spent_stmt)).all()
+        }
+
+        # Flatten (budget, category) allocations into parallel arrays. The 80%
+        # threshold is precomputed exactly in cents: spent / allocated >= 0.8
+        # holds iff spent_cents >= ceil(allocated * 80)
+        keys: List[Tuple[UUID, UUID, str]] = []
+        allocated_values: List[Decimal] = []
+        warn_cents: List[int] = []
+        for budget in budgets:
+            for category, allocated in budget.allocations.items():
+                allocated = Decimal(str(allocated))
+                keys.append((budget.user_id, budget.id, category))
+                allocated_values.append(allocated)
+                warn_cents.append(int((allocated * 80).to_integral_value(ROUND_CEILING)))
+        spent_values = [
+            spent_by_key.get((budget_id, category), Decimal(0)) for _, budget_id, category in keys
+        ]
+
+        allocated_array = np.array([float(a) for a in allocated_values])
+        spent_cents = np.array([int(s * 100) for s in spent_values], dtype=np.int64)
+        warning = (allocated_array > 0) & (spent_cents >= np.array(warn_cents, dtype=np.int64))
+
+        alerts = []
+        for i in np.flatnonzero(warning):
+            user_id, budget_id, category = keys[i]
+            allocated, spent = allocated_values[i], spent_values[i]
+            percent_used = float((spent / allocated) * 100)
+            percent_over = percent_used - 100
+
+            if percent_used >= 100:
+                severity = "CRITICAL"
+                message = (
+                    f"Budget exceeded for {category}! "
+                    f"Spent ${spent:.2f} of ${allocated:.2f} "
+                    f"({percent_over:+.1f}% over budget)"
+                )
+            else:
+                severity = "WARNING"
+                message = (
+                    f"Approaching budget limit for {category}. "
+                    f"Spent ${spent:.2f} of ${allocated:.2f} "
+                    f"({percent_used:.1f}% used)"
+                )
+
+            alerts.append(
+                (
+                    user_id,
+                    budget_id,
+                    BudgetAlert(
+                        category=category,
+                        allocated=allocated,
+                        spent=spent,
+                        percent_over=percent_over,
+                        severity=severity,
+                        message=message,
+                    ),
+                )
+            )
+
+        return alerts
+
+    async def _goal_alerts(self, user_ids: List[UUID]) -> List[Tuple[UUID, GoalRiskAlert]]:
+        """Evaluate goal risk alerts for every active goal of the given users."""
+        engine = GoalEngine(self.db, today=self.today, history_days=self.goal_history_days)
+        return await engine.risk_alerts(user_ids)
+
+    async def run(
+        self,
+        sink: Optional[AlertSink] = None,
+        shard_index: int = 0,
+        shard_count: int = 1,
+        checkpoint_path: Optional[Path] = None,
+    ) -> ScanStats:
+        """Scan every active user in a shard.
+
+        The checkpoint is written after each page has been handed to the
+        sink, so an interrupted run resumes after the last delivered page
+        (pages may be delivered again if the process dies mid-page).
+
+        Args:
+            sink: Async callable receiving each AlertPage (e.g. to enqueue notifications)
+            shard_index: Zero-based shard to scan
+            shard_count: Total number of shards
+            checkpoint_path: JSON file to resume from and record progress in
+
+        Returns:
+            ScanStats for the shard
+        """
+        lower, upper = shard_bounds(shard_index, shard_count)
+
+        checkpoint = ScanCheckpoint(
+            run_date=self.today, shard_index=shard_index, shard_count=shard_count
+        )
+        if checkpoint_path is not None and checkpoint_path.exists():
+            saved = ScanCheckpoint.load(checkpoint_path)
+            if (saved.run_date, saved.shard_index, saved.shard_count) == (
+                self.today,
+                shard_index,
+                shard_count,
+            ):
+                checkpoint = saved
+                logger.info(
+                    "Resuming alert scan",
+                    shard=shard_index,
+                    users_scanned=saved.users_scanned,
+                    completed=saved.completed,
+                )
+
+        started = time.perf_counter()
+        users_this_run = 0
+        while not checkpoint.completed:
+            user_ids = await self._next_user_page(checkpoint.last_user_id, lower, upper)
+            if not user_ids:
+                checkpoint.completed = True
+            else:
+                page = await self.scan_page(user_ids)
+                if sink is not None:
+                    await sink(page)
+
+                users_this_run += len(user_ids)
+                checkpoint.last_user_id = user_ids[-1]
+                checkpoint.users_scanned += len(user_ids)
+                checkpoint.budget_alerts += len(page.budget_alerts)
+                checkpoint.goal_alerts += len(page.goal_alerts)
+
+            if checkpoint_path is not None:
+                checkpoint.save(checkpoint_path)
+
+        elapsed = time.perf_counter() - started
+        stats = ScanStats(
+            users_scanned=checkpoint.users_scanned,
+            budget_alerts=checkpoint.budget_alerts,
+            goal_alerts=checkpoint.goal_alerts,
+            users_this_run=users_this_run,
+            elapsed_seconds=elapsed,
+        )
+        logger.info(
+            "Alert scan finished",
+            shard=shard_index,
+            shard_count=shard_count,
+            users_scanned=stats.users_scanned,
+            budget_alerts=stats.budget_alerts,
+            goal_alerts=stats.goal_alerts,
+            users_per_second=round(stats.users_per_second, 1),
+        )
+
+        return stats
@@ -1,6 +1,9 @@
 """Authentication service for user registration, login, and token management."""
 
+import hashlib
 import re
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID
@@ -12,11 +15,35 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 from app.config import settings
-from app.cache import cache_manager
+from app.cache import LocalCache, cache_manager, invalidate_cache_key
+from app.cache_codec import register_dataclass
 from app.logging_config import get_logger
+from app.metrics.auth_metrics import password_hash_metrics
+from app.services.password_hasher import PasswordHasherBusy, password_hasher
+from app.services.token_blacklist import token_blacklist
 
 logger = get_logger(__name__)
 
+# Decoded JWT claims by token hash, each kept until its token expires.
+# Claims can't change, so only the blacklist needs checking per request
+_claims_cache = LocalCache(
+    settings.auth_claims_cache_size, settings.refresh_token_expire_days * 24 * 3600
+)
+
+
+@register_dataclass(10)
+@dataclass(frozen=True)
+class Principal:
+    """What authorization needs to know about the caller."""
+
+    id: UUID
+    is_active: bool
+
+
+def principal_key(user_id: UUID) -> str:
+    """Cache key of a user's principal."""
+    return f"principal:{user_id}"
+
 
 class PasswordValidationError(Exception):
     """Exception raised when password doesn't meet requirements."""
@@ -90,6 +117,9 @@ class AuthService:
     def hash_password(self, password: str) -> str:
         """Hash a password using bcrypt.
 
+        Blocks for the whole hash; request handlers go through
+        password_hasher instead.
+
         Args:
             password: Plain text password
 
@@ -98,7 +128,7 @@ class AuthService:
         """
         # Convert password to bytes and hash
         password_bytes = password.encode("utf-8")
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
         hashed = bcrypt.hashpw(password_bytes, salt)
         return hashed.decode("utf-8")
 
@@ -139,6 +169,7 @@ class AuthService:
         Raises:
             PasswordValidationError: If password doesn't meet requirements
             ValueError: If email already exists
+            PasswordHasherBusy: If too many passwords are being hashed
         """
         logger.info("Registering new user", email=email)
 
@@ -155,7 +186,7 @@ class AuthService:
             raise ValueError(f"User with email {email} already exists")
 
         # Hash password
-        password_hash = self.hash_password(password)
+        password_hash = await password_hasher.hash(password)
 
         # Create user
         user = User(
@@ -182,6 +213,7 @@ class AuthService:
 
         Raises:
             AuthenticationError: If authentication fails
+            PasswordHasherBusy: If too many passwords are being hashed
         """
         logger.info("Authenticating user", email=email)
 
@@ -195,14 +227,28 @@ class AuthService:
             raise AuthenticationError("Invalid email or password")
 
         # Verify password
-        if not self.verify_password(password, user.password_hash):
+        if not await password_hasher.verify(password, user.password_hash):
             logger.warning("Authentication failed: invalid password", email=email)
             raise AuthenticationError("Invalid email or password")
 
+        # Upgrade hashes made at an old work factor while we have the password
+        if password_hasher.needs_rehash(user.password_hash):
+            await self._rehash_password(user, password)
+
         logger.info("User authenticated successfully", user_id=str(user.id), email=email)
 
         return user
 
+    async def _rehash_password(self, user: User, password: str) -> None:
+        try:
+            user.password_hash = await password_hasher.hash(password)
+        except PasswordHasherBusy:
+            # The old hash still works; try again on a later login
+            return
+        await self.db.flush()
+        password_hash_metrics.rehash_total.inc()
+        logger.info("Password rehashed", user_id=str(user.id), rounds=password_hasher.rounds)
+
     def create_access_token(self, user_id: UUID, expires_delta: Optional[timedelta] = None) -> str:
         """Create a JWT access token.
 
@@ -253,6 +299,23 @@ class AuthService:
 
         return encoded_jwt
 
+    def _decode_claims(self, token: str) -> dict:
+        """Decode and validate a JWT, reusing earlier decodes of the same token.
+
+        Raises:
+            JWTError: If the token is invalid or expired
+        """
+        key = hashlib.sha256(token.encode()).hexdigest()
+        payload = _claims_cache.get(key, None)
+        if payload is not None:
+            return payload
+
+        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+        ttl = payload.get("exp", 0) - time.time()
+        if ttl > 0:
+            _claims_cache.set(key, payload, ttl)
+        return payload
+
     def verify_token(self, token: str, token_type: str = "access") -> UUID:
         """Verify and decode a JWT token.
 
@@ -267,7 +330,7 @@ class AuthService:
             TokenError: If token is invalid or expired
         """
         try:
-            payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+            payload = self._decode_claims(token)
 
             user_id_str: str = payload.get("sub")
             token_type_in_token: str = payload.get("type")
@@ -354,6 +417,81 @@ class AuthService:
 
         return user
 
+    async def get_principal(self, token: str) -> Principal:
+        """Get the caller's principal from an access token.
+
+        Served from the cache when possible; otherwise loads just the id
+        and active flag. Does not check the blacklist.
+
+        Args:
+            token: JWT access token
+
+        Returns:
+            Principal of the token's user
+
+        Raises:
+            TokenError: If token is invalid
+            AuthenticationError: If user not found
+        """
+        user_id = self.verify_token(token, token_type="access")
+
+        principal = await cache_manager.get(principal_key(user_id))
+        if isinstance(principal, Principal):
+            return principal
+
+        result = await self.db.execute(
+            select(User.id, User.is_active).where(User.id == user_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            logger.warning("Get principal failed: user not found", user_id=str(user_id))
+            raise AuthenticationError("User not found")
+
+        principal = Principal(id=row.id, is_active=row.is_active)
+        await cache_manager.set(principal_key(user_id), principal, settings.auth_principal_ttl)
+        return principal
+
+    def invalidate_principal(self, user_id: UUID) -> None:
+        """Drop a user's cached principal once the current transaction commits.
+
+        Call after changing anything about the user that authorization or
+        the profile depends on.
+
+        Args:
+            user_id: User ID
+        """
+        invalidate_cache_key(self.db, principal_key(user_id))
+
+    async def deactivate_user(self, user_id: UUID) -> User:
+        """Deactivate a user account.
+
+        Existing tokens are rejected with 403 once the transaction commits.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Updated user object
+
+        Raises:
+            AuthenticationError: If user not found
+        """
+        stmt = select(User).where(User.id == user_id)
+        result = await self.db.execute(stmt)
+        user = result.scalar_one_or_none()
+
+        if not user:
+            raise AuthenticationError("User not found")
+
+        user.is_active = False
+        user.updated_at = datetime.utcnow()
+        await self.db.flush()
+        self.invalidate_principal(user_id)
+
+        logger.info("User deactivated", user_id=str(user_id))
+
+        return user
+
     async def change_password(
         self, user_id: UUID, current_password: str, new_password: str
     ) -> None:
@@ -367,6 +505,7 @@ class AuthService:
         Raises:
             AuthenticationError: If current password is incorrect
             PasswordValidationError: If new password doesn't meet requirements
+            PasswordHasherBusy: If too many passwords are being hashed
         """
         logger.info("Changing password", user_id=str(user_id))
 
@@ -379,7 +518,7 @@ class AuthService:
             raise AuthenticationError("User not found")
 
         # Verify current password
-        if not self.verify_password(current_password, user.password_hash):
+        if not await password_hasher.verify(current_password, user.password_hash):
             logger.warning(
                 "Password change failed: incorrect current password", user_id=str(user_id)
             )
@@ -389,7 +528,7 @@ class AuthService:
         self.validate_password(new_password)
 
         # Hash and update password
-        user.password_hash = self.hash_password(new_password)
+        user.password_hash = await password_hasher.hash(new_password)
         user.updated_at = datetime.utcnow()
 
         await self.db.flush()
@@ -400,15 +539,23 @@ class AuthService:
         """Add a token to the blacklist. Token will be auto-removed from Redis when it naturally expires."""
         if expires_in is None:
             try:
-                payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+                payload = self._decode_claims(token)
                 exp = payload.get("exp", 0)
                 expires_in = max(0, exp - int(datetime.now(timezone.utc).timestamp()))
             except JWTError:
                 expires_in = self.DEFAULT_BLACKLIST_TTL
         
-        await cache_manager.set(f"blacklist:{token}", "1", expire=expires_in)
+        await token_blacklist.add(token, expires_in)
 
     async def is_token_blacklisted(self, token: str) -> bool:
         """Check if a token has been blacklisted."""
-        result = await cache_manager.get(f"blacklist:{token}")
-        return result is not None
+        return await token_blacklist.contains(token)
+
+    async def logout(self, token: str) -> None:
+        """Revoke an access token and drop its user's cached principal."""
+        await self.blacklist_token(token)
+        try:
+            user_id = self.verify_token(token, token_type="access")
+        except TokenError:
+            return
+        await cache_manager.delete(principal_key(user_id))
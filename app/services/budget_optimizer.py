@@ -6,11 +6,11 @@ from typing import Dict, List, Optional
 from uuid import UUID
 from dataclasses import dataclass
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.transaction import Transaction
 from app.models.budget import Budget
+from app.services.rollup_service import RollupService
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -68,39 +68,20 @@ class BudgetOptimizer:
         end_date = datetime.now(timezone.utc).date()
         start_date = end_date - timedelta(days=months * 30)
 
-        # Query spending by category
-        stmt = (
-            select(
-                Transaction.category,
-                func.avg(Transaction.amount).label("avg_amount"),
-                func.stddev(Transaction.amount).label("variance"),
-                func.min(Transaction.amount).label("min_amount"),
-                func.max(Transaction.amount).label("max_amount"),
-                func.count(Transaction.id).label("count"),
-            )
-            .where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == "EXPENSE",
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date,
-                    Transaction.deleted_at.is_(None),
-                )
-            )
-            .group_by(Transaction.category)
+        # Aggregate spending by category
+        aggregates = await RollupService(self.db).category_aggregates(
+            user_id, start_date, end_date
         )
 
-        result = await self.db.execute(stmt)
-
         patterns = {}
-        for row in result.all():
-            patterns[row.category] = SpendingPattern(
-                category=row.category,
-                average_spending=Decimal(str(row.avg_amount or 0)),
-                variance=Decimal(str(row.variance or 0)),
-                min_spending=Decimal(str(row.min_amount or 0)),
-                max_spending=Decimal(str(row.max_amount or 0)),
-                transaction_count=row.count,
+        for category, aggregate in aggregates.items():
+            patterns[category] = SpendingPattern(
+                category=category,
+                average_spending=aggregate.average,
+                variance=aggregate.stddev or Decimal(0),
+                min_spending=aggregate.min_amount,
+                max_spending=aggregate.max_amount,
+                transaction_count=aggregate.count,
             )
 
         logger.info(
@@ -134,23 +115,10 @@ class BudgetOptimizer:
         patterns = await self.analyze_spending_patterns(user_id, historical_months)
 
         # Calculate actual spending during budget period
-        stmt = (
-            select(Transaction.category, func.sum(Transaction.amount).label("total_spent"))
-            .where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == "EXPENSE",
-                    Transaction.date >= budget.period_start,
-                    Transaction.date <= budget.period_end,
-                    Transaction.deleted_at.is_(None),
-                )
-            )
-            .group_by(Transaction.category)
+        actual_spending = await RollupService(self.db).category_totals(
+            user_id, budget.period_start, budget.period_end
         )
 
-        result = await self.db.execute(stmt)
-        actual_spending = {row.category: Decimal(str(row.total_spent)) for row in result.all()}
-
         suggestions = []
 
         # Identify over/under spending categories
@@ -6,11 +6,12 @@ from typing import Dict, List, Optional
 from uuid import UUID
 from dataclasses import dataclass
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.budget import Budget
-from app.models.transaction import Transaction
+from app.services.rollup_service import RollupService
+from app.cache import invalidate_user_cache
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -90,6 +91,7 @@ class BudgetService:
 
         self.db.add(budget)
         await self.db.flush()
+        invalidate_user_cache(self.db, user_id)
         await self.db.refresh(budget)
 
         logger.info(
@@ -157,23 +159,10 @@ class BudgetService:
             return {}
 
         # Get actual spending for each category
-        stmt = (
-            select(Transaction.category, func.sum(Transaction.amount).label("total_spent"))
-            .where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == "EXPENSE",
-                    Transaction.date >= budget.period_start,
-                    Transaction.date <= budget.period_end,
-                    Transaction.deleted_at.is_(None),
-                )
-            )
-            .group_by(Transaction.category)
+        spending = await RollupService(self.db).category_totals(
+            user_id, budget.period_start, budget.period_end
         )
 
-        result = await self.db.execute(stmt)
-        spending = {row.category: Decimal(str(row.total_spent)) for row in result.all()}
-
         # Calculate progress for each category
         progress = {}
         for category, allocated_float in budget.allocations.items():
@@ -294,6 +283,7 @@ class BudgetService:
 
         budget.updated_at = datetime.utcnow()
         await self.db.flush()
+        invalidate_user_cache(self.db, user_id)
         await self.db.refresh(budget)
 
         logger.info("Budget updated", budget_id=str(budget_id), user_id=str(user_id))
@@ -316,6 +306,7 @@ class BudgetService:
 
         await self.db.delete(budget)
         await self.db.flush()
+        invalidate_user_cache(self.db, user_id)
 
         logger.info("Budget deleted", budget_id=str(budget_id), user_id=str(user_id))
 
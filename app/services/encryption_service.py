@@ -1,43 +1,151 @@
-"""Encryption service for securing sensitive data."""
+"""Encryption service for securing sensitive data.
 
-from cryptography.fernet import Fernet
+Values are encrypted with Fernet under keys derived from ENCRYPTION_KEY with
+PBKDF2, which is deliberately slow. Keys are derived on first use and shared
+by every EncryptionService in the process, so importing this module or
+building a service costs nothing.
+
+Ciphertexts start with the id of the key that made them. To rotate keys, set
+ENCRYPTION_KEY to the new secret and move the old one to ENCRYPTION_OLD_KEYS,
+then run scripts/rotate_encryption_key.py to re-encrypt stored values under
+the new key; the old key can be dropped afterwards. Values written before key
+ids existed are tried against every key.
+
+Inside secret_cache(), decrypted values are kept in memory until the block
+exits, so a batch (such as a connection sync run) reading the same tokens
+repeatedly decrypts each once.
+"""
+
+import base64
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-import base64
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.logging_config import get_logger
 
+logger = get_logger(__name__)
 
-class EncryptionService:
-    """Service for encrypting and decrypting sensitive data using AES-256."""
+# Separates the key id from the Fernet token, which is URL-safe base64
+_KEY_ID_SEPARATOR = ":"
+
+# Seconds a decrypted value may stay in a secret cache
+SECRET_CACHE_TTL = 60.0
 
-    def __init__(self):
-        """Initialize encryption service with key from settings."""
-        self._cipher = self._create_cipher()
+_secret_cache: ContextVar[Optional["SecretCache"]] = ContextVar("secret_cache", default=None)
 
-    def _create_cipher(self) -> Fernet:
-        """Create Fernet cipher from encryption key in settings.
 
-        Uses PBKDF2HMAC to derive a proper 32-byte key from the encryption_key setting.
+@lru_cache(maxsize=None)
+def derive_key(secret: str) -> bytes:
+    """Derive a Fernet key from a secret with PBKDF2 (once per secret and process)."""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=b"ai_finance_platform_salt",  # Static salt for deterministic key
+        iterations=100000,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(secret.encode()))
+
+
+def key_id(key: bytes) -> str:
+    """Short identifier of a derived key, safe to store next to ciphertexts."""
+    return hashlib.sha256(key).hexdigest()[:8]
+
+
+class SecretCache:
+    """Decrypted values by ciphertext, expiring after a TTL."""
+
+    def __init__(self, ttl: float = SECRET_CACHE_TTL):
         """
-        # Use PBKDF2HMAC to derive a proper key from the encryption_key setting
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=b"ai_finance_platform_salt",  # Static salt for deterministic key
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(settings.encryption_key.encode()))
-        return Fernet(key)
+        Initialize an empty cache.
+
+        Args:
+            ttl: Seconds a value stays cached
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._values: Dict[str, Tuple[float, str]] = {}
+
+    def get(self, ciphertext: str) -> Optional[str]:
+        """Get a cached plaintext, None if missing or expired."""
+        entry = self._values.get(ciphertext)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def put(self, ciphertext: str, plaintext: str) -> None:
+        """Cache a decrypted value."""
+        self._values[ciphertext] = (time.monotonic(), plaintext)
+
+    def clear(self) -> None:
+        """Drop every cached value."""
+        self._values.clear()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class EncryptionService:
+    """Service for encrypting and decrypting sensitive data with rotatable keys."""
+
+    def __init__(self, key: Optional[str] = None, old_keys: Optional[List[str]] = None):
+        """
+        Initialize encryption service; keys are derived on first use.
+
+        Args:
+            key: Secret for new encryptions (defaults to ENCRYPTION_KEY)
+            old_keys: Retired secrets still accepted for decryption
+                (defaults to ENCRYPTION_OLD_KEYS)
+        """
+        self._secrets = [
+            key or settings.encryption_key,
+            *(settings.encryption_old_keys if old_keys is None else old_keys),
+        ]
+        self._lock = threading.Lock()
+        self._primary_id: Optional[str] = None
+        self._ciphers: Dict[str, Fernet] = {}
+        self._multi: Optional[MultiFernet] = None
+
+    def _keyring(self) -> Tuple[str, Dict[str, Fernet], MultiFernet]:
+        """Derive the keys on first use."""
+        if self._multi is None:
+            with self._lock:
+                if self._multi is None:
+                    ciphers = {}
+                    for secret in self._secrets:
+                        key = derive_key(secret)
+                        ciphers.setdefault(key_id(key), Fernet(key))
+                    self._primary_id = key_id(derive_key(self._secrets[0]))
+                    self._ciphers = ciphers
+                    self._multi = MultiFernet(list(ciphers.values()))
+        return self._primary_id, self._ciphers, self._multi
+
+    @property
+    def key_id(self) -> str:
+        """Id of the key new values are encrypted with."""
+        return self._keyring()[0]
 
     def encrypt(self, plaintext: str) -> str:
-        """Encrypt plaintext string using AES-256.
+        """Encrypt plaintext string with the current key.
 
         Args:
             plaintext: The string to encrypt
 
         Returns:
-            Base64-encoded encrypted string
+            Key id and base64-encoded encrypted string
 
         Raises:
             ValueError: If plaintext is empty
@@ -45,14 +153,15 @@ class EncryptionService:
         if not plaintext:
             raise ValueError("Cannot encrypt empty string")
 
-        encrypted_bytes = self._cipher.encrypt(plaintext.encode())
-        return encrypted_bytes.decode()
+        primary_id, ciphers, _ = self._keyring()
+        token = ciphers[primary_id].encrypt(plaintext.encode()).decode()
+        return f"{primary_id}{_KEY_ID_SEPARATOR}{token}"
 
     def decrypt(self, ciphertext: str) -> str:
-        """Decrypt ciphertext string.
+        """Decrypt ciphertext string, from the secret cache if one is active.
 
         Args:
-            ciphertext: The base64-encoded encrypted string
+            ciphertext: The encrypted string
 
         Returns:
             Decrypted plaintext string
@@ -63,12 +172,136 @@ class EncryptionService:
         if not ciphertext:
             raise ValueError("Cannot decrypt empty string")
 
+        cache = _secret_cache.get()
+        if cache is not None:
+            plaintext = cache.get(ciphertext)
+            if plaintext is not None:
+                return plaintext
+
         try:
-            decrypted_bytes = self._cipher.decrypt(ciphertext.encode())
-            return decrypted_bytes.decode()
+            cipher = self._cipher_for(ciphertext)
+            plaintext = cipher.decrypt(self._token(ciphertext).encode()).decode()
         except Exception as e:
             raise ValueError(f"Failed to decrypt data: {str(e)}")
 
+        if cache is not None:
+            cache.put(ciphertext, plaintext)
+        return plaintext
+
+    @staticmethod
+    def _token(ciphertext: str) -> str:
+        return ciphertext.rpartition(_KEY_ID_SEPARATOR)[2]
+
+    def _cipher_for(self, ciphertext: str):
+        """Cipher of the key a value names (every key for values without an id)."""
+        _, ciphers, multi = self._keyring()
+        kid = ciphertext.rpartition(_KEY_ID_SEPARATOR)[0]
+        if not kid:
+            return multi
+        if kid not in ciphers:
+            raise InvalidToken(f"unknown key id {kid}")
+        return ciphers[kid]
+
+    def needs_rotation(self, ciphertext: str) -> bool:
+        """Whether a value was encrypted with a key other than the current one."""
+        kid = ciphertext.rpartition(_KEY_ID_SEPARATOR)[0]
+        return kid != self.key_id
+
+    def rotate(self, ciphertext: str) -> str:
+        """Re-encrypt a value under the current key (unchanged if it already is).
+
+        Args:
+            ciphertext: Value encrypted with the current or a retired key
+
+        Returns:
+            Value encrypted with the current key
+
+        Raises:
+            ValueError: If no known key decrypts the value
+        """
+        if not self.needs_rotation(ciphertext):
+            return ciphertext
+        primary_id, _, multi = self._keyring()
+        try:
+            # Keeps the original timestamp
+            token = multi.rotate(self._token(ciphertext).encode()).decode()
+        except InvalidToken as e:
+            raise ValueError(f"Failed to decrypt data: {str(e)}")
+        return f"{primary_id}{_KEY_ID_SEPARATOR}{token}"
+
+    @contextmanager
+    def secret_cache(self, ttl: float = SECRET_CACHE_TTL) -> Iterator[SecretCache]:
+        """Cache decrypted values until the block exits.
+
+        The cache follows the current context, so tasks started inside the
+        block share it. Nested blocks reuse the outer cache.
+
+        Args:
+            ttl: Seconds a value stays cached
+
+        Yields:
+            The active SecretCache
+        """
+        active = _secret_cache.get()
+        if active is not None:
+            yield active
+            return
+
+        cache = SecretCache(ttl)
+        reset_token = _secret_cache.set(cache)
+        try:
+            yield cache
+        finally:
+            cache.clear()
+            _secret_cache.reset(reset_token)
+
+
+async def reencrypt_connection_tokens(
+    db: AsyncSession, service: Optional[EncryptionService] = None, batch_size: int = 500
+) -> int:
+    """
+    Re-encrypt stored connection access tokens under the current key.
+
+    Runs in the caller's transaction; commit afterwards.
+
+    Args:
+        db: Database session
+        service: Encryption service (defaults to the global one)
+        batch_size: Connections read per query
+
+    Returns:
+        Number of tokens re-encrypted
+    """
+    from app.models.connection import Connection
+
+    service = service or encryption_service
+    rotated = 0
+    last_id = None
+    while True:
+        stmt = (
+            select(Connection.id, Connection._access_token_encrypted)
+            .order_by(Connection.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            stmt = stmt.where(Connection.id > last_id)
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        updates = [
+            {"id": row.id, "_access_token_encrypted": service.rotate(row[1])}
+            for row in rows
+            if service.needs_rotation(row[1])
+        ]
+        if updates:
+            await db.execute(update(Connection), updates)
+            rotated += len(updates)
+
+    logger.info("Connection tokens re-encrypted", rotated=rotated, key_id=service.key_id)
+    return rotated
+
 
 # Global encryption service instance
 encryption_service = EncryptionService()
@@ -10,35 +10,29 @@ Category corrections are used to:
 
 import asyncio
 import json
-from collections import defaultdict
+import os
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional
 from app.logging_config import get_logger
+from app.ml.correction_log import CorrectionLog
 
 logger = get_logger(__name__)
 
 
-def _write_feedback_to_disk(
-    corrections_path: str,
-    aggregates_path: str,
-    corrections_data: Dict,
-    aggregates_data: Dict
-) -> None:
-    """Write feedback data to disk synchronously."""
+def _write_snapshot(aggregates_path: str, aggregates_data: Dict) -> None:
+    """Atomically write the aggregates snapshot synchronously."""
     # Ensure directory exists
-    Path(corrections_path).parent.mkdir(parents=True, exist_ok=True)
-
-    # Save corrections
-    with open(corrections_path, 'w') as f:
-        json.dump(corrections_data, f, indent=2)
-
-    # Save aggregates
     Path(aggregates_path).parent.mkdir(parents=True, exist_ok=True)
 
-    with open(aggregates_path, 'w') as f:
-        json.dump(aggregates_data, f, indent=2)
+    tmp_path = f"{aggregates_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(aggregates_data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, aggregates_path)
 
 
 @dataclass
@@ -120,7 +114,7 @@ class FeedbackCollector:
     Collect and manage user feedback for continuous improvement.
 
     Features:
-    - Store corrections in-memory and persist to JSON
+    - Store corrections in-memory and in an append-only log
     - Aggregate corrections per merchant
     - Auto-update merchant database on consensus
     - Export data for training
@@ -143,6 +137,12 @@ class FeedbackCollector:
     DEFAULT_CORRECTIONS_PATH = "data/feedback/corrections.json"
     DEFAULT_AGGREGATES_PATH = "data/feedback/aggregates.json"
 
+    # Corrections kept in memory and in the log
+    MAX_CORRECTIONS = 10000
+
+    # Corrections between snapshots of the aggregates
+    CHECKPOINT_EVERY = 500
+
     def __init__(
         self,
         corrections_path: Optional[str] = None,
@@ -153,9 +153,15 @@ class FeedbackCollector:
         """
         Initialize the feedback collector.
 
+        Corrections are appended to a log next to corrections_path (with a
+        .jsonl suffix); a JSON file at corrections_path itself is migrated
+        into it. The aggregates file holds a periodic snapshot of the
+        aggregates and statistics; corrections logged after it are
+        replayed on load.
+
         Args:
-            corrections_path: Path to store corrections JSON
-            aggregates_path: Path to store aggregates JSON
+            corrections_path: Path to store corrections
+            aggregates_path: Path to store the aggregates snapshot
             auto_update_merchant_db: Whether to auto-update DB on consensus
             consensus_threshold: Minimum corrections for auto-update
         """
@@ -165,9 +171,12 @@ class FeedbackCollector:
         self.consensus_threshold = consensus_threshold
 
         # In-memory storage
-        self._corrections: List[CategoryCorrection] = []
+        self._corrections: Deque[CategoryCorrection] = deque(maxlen=self.MAX_CORRECTIONS)
         self._aggregates: Dict[str, MerchantCorrectionAgg] = {}
         self._lock = asyncio.Lock()
+        self._log = CorrectionLog(str(Path(self.corrections_path).with_suffix(".jsonl")))
+        # Last log record covered by the aggregates snapshot
+        self._snapshot_seq = 0
 
         # Statistics
         self._stats = {
@@ -180,21 +189,7 @@ class FeedbackCollector:
         self._load_data()
 
     def _load_data(self):
-        """Load corrections from disk."""
-        # Load corrections
-        try:
-            path = Path(self.corrections_path)
-            if path.exists():
-                with open(path, "r") as f:
-                    data = json.load(f)
-                    self._corrections = [
-                        CategoryCorrection.from_dict(c) for c in data.get("corrections", [])
-                    ]
-                    self._stats = data.get("stats", self._stats)
-                logger.info(f"Loaded {len(self._corrections)} corrections from {path}")
-        except Exception as e:
-            logger.warning(f"Failed to load corrections: {e}")
-
+        """Load the aggregates snapshot and replay corrections logged since."""
         # Load aggregates
         try:
             path = Path(self.aggregates_path)
@@ -210,46 +205,113 @@ class FeedbackCollector:
                                 agg.get("last_updated", datetime.now(timezone.utc).isoformat())
                             ),
                         )
+                    self._stats = data.get("stats", self._stats)
+                    self._snapshot_seq = data.get("seq", 0)
                 logger.info(f"Loaded {len(self._aggregates)} merchant aggregates")
         except Exception as e:
             logger.warning(f"Failed to load aggregates: {e}")
 
+        try:
+            self._migrate_legacy_corrections()
+        except Exception as e:
+            logger.warning(f"Failed to migrate corrections: {e}")
+
+        # Load corrections
+        try:
+            replayed = 0
+            for record in self._log.read():
+                correction = CategoryCorrection.from_dict(record)
+                self._corrections.append(correction)
+                if record["seq"] > self._snapshot_seq:
+                    self._apply(correction)
+                    replayed += 1
+            logger.info(
+                f"Loaded {len(self._corrections)} corrections from {self._log.path}",
+                replayed=replayed,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load corrections: {e}")
+
+    def _migrate_legacy_corrections(self):
+        """Move corrections from the JSON file used before the log into it."""
+        legacy_path = Path(self.corrections_path)
+        if not legacy_path.exists() or legacy_path.suffix == ".jsonl" or self._log.count:
+            return
+
+        with open(legacy_path, "r") as f:
+            data = json.load(f)
+        records = [
+            {k: v for k, v in c.items() if k != "seq"}
+            for c in data.get("corrections", [])
+        ]
+
+        # The old aggregates already include these corrections. Snapshot
+        # first, so an interrupted migration just runs again.
+        self._stats = data.get("stats", self._stats)
+        self._snapshot_seq = len(records)
+        _write_snapshot(self.aggregates_path, self._snapshot_data())
+        self._log.rewrite(records)
+        legacy_path.unlink()
+        logger.info(f"Migrated {len(records)} corrections to {self._log.path}")
+
+    def _apply(self, correction: CategoryCorrection) -> MerchantCorrectionAgg:
+        """Add a correction to the statistics and its merchant's aggregate."""
+        self._stats["total_corrections"] += 1
+
+        merchant_key = self._normalize_merchant_key(correction.merchant_raw)
+        if merchant_key not in self._aggregates:
+            self._aggregates[merchant_key] = MerchantCorrectionAgg(merchant_key=merchant_key)
+            self._stats["unique_merchants_corrected"] += 1
+
+        aggregate = self._aggregates[merchant_key]
+        aggregate.add_correction(correction.corrected_category)
+        return aggregate
+
+    def _snapshot_data(self) -> Dict[str, Any]:
+        return {
+            "aggregates": {
+                key: {
+                    "corrections": agg.corrections.copy(),
+                    "total_corrections": agg.total_corrections,
+                    "last_updated": agg.last_updated.isoformat(),
+                }
+                for key, agg in self._aggregates.items()
+            },
+            "stats": self._stats.copy(),
+            "seq": self._snapshot_seq,
+            "last_saved": datetime.now(timezone.utc).isoformat(),
+        }
+
     async def _save_data(self):
-        """Persist corrections to disk."""
+        """Snapshot the aggregates and compact the corrections log."""
         async with self._lock:
             try:
                 # Prepare data in memory (fast)
-                corrections_data = {
-                    "corrections": [c.to_dict() for c in self._corrections[-10000:]],  # Keep last 10k
-                    "stats": self._stats.copy(),
-                    "last_saved": datetime.now(timezone.utc).isoformat(),
-                }
-
-                aggregates_data = {
-                    "aggregates": {
-                        key: {
-                            "corrections": agg.corrections.copy(),
-                            "total_corrections": agg.total_corrections,
-                            "last_updated": agg.last_updated.isoformat(),
-                        }
-                        for key, agg in self._aggregates.items()
-                    },
-                    "last_saved": datetime.now(timezone.utc).isoformat(),
-                }
+                seq = self._log.last_seq
+                self._snapshot_seq, previous_seq = seq, self._snapshot_seq
+                aggregates_data = self._snapshot_data()
 
                 # Run I/O in executor
                 loop = asyncio.get_running_loop()
                 await loop.run_in_executor(
-                    None,
-                    _write_feedback_to_disk,
-                    self.corrections_path,
-                    self.aggregates_path,
-                    corrections_data,
-                    aggregates_data,
+                    None, _write_snapshot, self.aggregates_path, aggregates_data
                 )
-
             except Exception as e:
+                self._snapshot_seq = previous_seq
                 logger.error(f"Failed to save feedback data: {e}")
+                return
+
+        # Only records the snapshot covers may be dropped
+        if self._log.count > 2 * self.MAX_CORRECTIONS:
+            keep = max(self.MAX_CORRECTIONS, self._log.last_seq - seq)
+            try:
+                await loop.run_in_executor(None, self._log.compact, keep)
+            except Exception as e:
+                logger.error(f"Failed to compact corrections log: {e}")
+
+    def close(self):
+        """Flush logged corrections to disk."""
+        self._log.sync()
 
     def _normalize_merchant_key(self, merchant_raw: str) -> str:
         """Normalize merchant name to a key for aggregation."""
@@ -307,21 +369,15 @@ class FeedbackCollector:
 
         async with self._lock:
             # Store correction
+            self._log.append(correction.to_dict())
             self._corrections.append(correction)
-            self._stats["total_corrections"] += 1
 
             # Aggregate by merchant
-            merchant_key = self._normalize_merchant_key(merchant_raw)
-            result["merchant_key"] = merchant_key
-
-            if merchant_key not in self._aggregates:
-                self._aggregates[merchant_key] = MerchantCorrectionAgg(merchant_key=merchant_key)
-                self._stats["unique_merchants_corrected"] += 1
-
-            self._aggregates[merchant_key].add_correction(corrected_category)
+            aggregate = self._apply(correction)
+            result["merchant_key"] = aggregate.merchant_key
 
             # Check for consensus
-            consensus = self._aggregates[merchant_key].get_consensus(self.consensus_threshold)
+            consensus = aggregate.get_consensus(self.consensus_threshold)
 
             if consensus:
                 result["consensus_category"] = consensus
@@ -329,7 +385,7 @@ class FeedbackCollector:
                 # Auto-update merchant database if enabled
                 if self.auto_update_merchant_db:
                     updated = await self._update_merchant_db(
-                        merchant_key,
+                        aggregate.merchant_key,
                         consensus,
                         merchant_normalized,
                     )
@@ -337,8 +393,11 @@ class FeedbackCollector:
                     if updated:
                         self._stats["auto_updates_made"] += 1
 
-        # Save asynchronously
-        asyncio.create_task(self._save_data())
+            checkpoint_due = self._log.last_seq - self._snapshot_seq >= self.CHECKPOINT_EVERY
+
+        # Snapshot aggregates periodically; the log already holds the correction
+        if checkpoint_due:
+            asyncio.create_task(self._save_data())
 
         logger.info(
             f"Recorded correction: {merchant_raw} ({original_category} -> {corrected_category})",
@@ -546,6 +605,12 @@ def get_feedback_collector() -> FeedbackCollector:
     return _feedback_collector
 
 
+def close_feedback_collector() -> None:
+    """Flush logged corrections (on application shutdown)."""
+    if _feedback_collector is not None:
+        _feedback_collector.close()
+
+
 async def record_category_correction(
     user_id: str,
     transaction_id: str,
@@ -0,0 +1,413 @@
+"""Vectorized goal projections and batched goal progress updates.
+
+GoalEngine loads the active goals of one or many users with one query and
+projects all of them with NumPy in one pass: progress, days remaining,
+estimated completion and deadline risk. Amounts are handled in integer
+cents and days to completion are floored exactly. GoalService's former
+per-goal computation divided by a rounded Decimal daily rate, so where the
+exact quotient is a whole number it could land one day earlier; the
+engine intentionally does not reproduce that.
+
+By default a goal's completion is extrapolated from its average daily rate
+since creation. With ``history_days``, goals linked to a category are
+projected from what was contributed over the last ``history_days`` days
+instead (their category's transactions, the ones that feed the goal's
+progress), so a goal that recently stalled or sped up is projected at its
+recent pace. Such a goal with no contributions in that window is at risk.
+
+apply_contributions adds transaction amounts to every matching active goal
+with one UPDATE, marking goals that reach their target as achieved.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from datetime import date as date_type
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import Date, Numeric, and_, case, cast, func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import invalidate_user_cache
+from app.models.financial_goal import FinancialGoal
+from app.services.rollup_service import RollupService
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class GoalProgress:
+    """Goal progress information."""
+
+    goal_id: UUID
+    name: str
+    target_amount: Decimal
+    current_amount: Decimal
+    progress_percent: float
+    remaining_amount: Decimal
+    days_remaining: Optional[int]
+    estimated_completion_date: Optional[date_type]
+    is_at_risk: bool
+    risk_reason: Optional[str]
+
+
+@dataclass
+class GoalRiskAlert:
+    """Goal risk alert."""
+
+    goal_id: UUID
+    name: str
+    severity: str  # WARNING, CRITICAL
+    message: str
+    recommended_action: str
+
+
+@dataclass
+class GoalProjection:
+    """Projections of a sequence of goals, one array element per goal."""
+
+    progress_percent: np.ndarray
+    has_deadline: np.ndarray
+    days_remaining: np.ndarray
+    projected: np.ndarray  # has an estimated completion date
+    days_to_completion: np.ndarray
+    days_behind: np.ndarray
+    stalled: np.ndarray  # no contributions over the rate window
+    rate_days: np.ndarray  # days the rate was measured over
+
+    @property
+    def at_risk(self) -> np.ndarray:
+        """Goals projected to miss their deadline."""
+        return (self.projected & (self.days_behind > 0)) | self.stalled
+
+
+# Columns the engine reads; ORM goals carry them too
+_GOAL_COLUMNS = (
+    FinancialGoal.id,
+    FinancialGoal.user_id,
+    FinancialGoal.name,
+    FinancialGoal.target_amount,
+    FinancialGoal.current_amount,
+    FinancialGoal.deadline,
+    FinancialGoal.category,
+    FinancialGoal.created_at,
+)
+
+
+class GoalEngine:
+    """Project and update many goals at once."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        today: Optional[date_type] = None,
+        history_days: Optional[int] = None,
+    ):
+        """Initialize goal engine.
+
+        Args:
+            db: Database session
+            today: Evaluation date (default: current UTC date)
+            history_days: Project category-linked goals from their contributions
+                over this many days (default: average rate since creation)
+        """
+        if history_days is not None and history_days < 1:
+            raise ValueError("history_days must be positive")
+
+        self.db = db
+        self.today = today or datetime.now(timezone.utc).date()
+        self.history_days = history_days
+
+    async def load_active_goals(self, user_ids: List[UUID], at_risk_only: bool = False) -> list:
+        """Load the active goals of the given users with one query.
+
+        Args:
+            user_ids: Users whose goals to load
+            at_risk_only: Skip goals that can't be at risk (no deadline, or
+                nothing saved when projecting from the rate since creation)
+
+        Returns:
+            Goal rows, newest first per user
+        """
+        conditions = [FinancialGoal.user_id.in_(user_ids), FinancialGoal.status == "ACTIVE"]
+        if at_risk_only:
+            conditions.append(FinancialGoal.deadline.is_not(None))
+            if self.history_days is None:
+                conditions.append(FinancialGoal.current_amount > 0)
+
+        stmt = (
+            select(*_GOAL_COLUMNS)
+            .where(and_(*conditions))
+            .order_by(FinancialGoal.user_id, FinancialGoal.created_at.desc())
+        )
+        return list((await self.db.execute(stmt)).all())
+
+    async def _contributions(self, goals: Sequence) -> Dict[UUID, Decimal]:
+        """Sum each category-linked goal's transactions over its rate window."""
+        goal_ids = [goal.id for goal in goals if goal.category is not None]
+        if self.history_days is None or not goal_ids:
+            return {}
+
+        spending = RollupService(self.db).source()
+        window_start = func.greatest(
+            literal(self.today - timedelta(days=self.history_days - 1), Date),
+            cast(FinancialGoal.created_at, Date) + 1,
+        )
+        stmt = (
+            select(FinancialGoal.id, func.sum(spending.c.total).label("contributed"))
+            .join(
+                spending,
+                and_(
+                    spending.c.user_id == FinancialGoal.user_id,
+                    spending.c.category == FinancialGoal.category,
+                    spending.c.date >= window_start,
+                    spending.c.date <= self.today,
+                ),
+            )
+            .where(FinancialGoal.id.in_(goal_ids))
+            .group_by(FinancialGoal.id)
+        )
+        return {
+            row.id: Decimal(str(row.contributed)) for row in (await self.db.execute(stmt)).all()
+        }
+
+    def project(
+        self, goals: Sequence, contributions: Optional[Dict[UUID, Decimal]] = None
+    ) -> GoalProjection:
+        """Project goals in one vectorized pass.
+
+        Args:
+            goals: Goals or goal rows (see load_active_goals)
+            contributions: Contributions over the rate window by goal ID, used
+                for category-linked goals when the engine has history_days
+
+        Returns:
+            GoalProjection of the goals, in order
+        """
+        today = np.datetime64(self.today, "D")
+        target_cents = np.array([int(g.target_amount * 100) for g in goals], dtype=np.int64)
+        current_cents = np.array([int(g.current_amount * 100) for g in goals], dtype=np.int64)
+        has_deadline = np.array([g.deadline is not None for g in goals], dtype=bool)
+        deadline = np.array([g.deadline or self.today for g in goals], dtype="datetime64[D]")
+        created = np.array([g.created_at.date() for g in goals], dtype="datetime64[D]")
+
+        days_since_creation = (today - created).astype(np.int64)
+        days_remaining = (deadline - today).astype(np.int64)
+        progress_percent = np.divide(
+            current_cents * 100,
+            target_cents,
+            out=np.zeros(len(goals)),
+            where=target_cents > 0,
+        )
+
+        # The rate is an amount saved over a number of days
+        rate_cents, rate_days = current_cents, days_since_creation
+        stalled = np.zeros(len(goals), dtype=bool)
+        if self.history_days is not None:
+            contributions = contributions or {}
+            linked = np.array([g.category is not None for g in goals], dtype=bool)
+            contributed_cents = np.array(
+                [int(contributions.get(g.id, Decimal(0)) * 100) for g in goals], dtype=np.int64
+            )
+            rate_cents = np.where(linked, contributed_cents, current_cents)
+            rate_days = np.where(
+                linked, np.minimum(days_since_creation, self.history_days), days_since_creation
+            )
+            stalled = (
+                linked
+                & has_deadline
+                & (rate_days > 0)
+                & (rate_cents <= 0)
+                & (current_cents < target_cents)
+            )
+
+        # Days to completion at that rate, truncated toward zero:
+        # remaining / (saved / days) == remaining * days / saved
+        projected = has_deadline & (rate_days > 0) & (rate_cents > 0)
+        numerator = (target_cents - current_cents) * rate_days
+        days_to_completion = np.sign(numerator) * (
+            np.abs(numerator) // np.where(projected, rate_cents, 1)
+        )
+
+        return GoalProjection(
+            progress_percent=progress_percent,
+            has_deadline=has_deadline,
+            days_remaining=days_remaining,
+            projected=projected,
+            days_to_completion=days_to_completion,
+            days_behind=days_to_completion - days_remaining,
+            stalled=stalled,
+            rate_days=rate_days,
+        )
+
+    def _progress(self, goal: Any, projection: GoalProjection, i: int) -> GoalProgress:
+        """Build the GoalProgress of the i-th projected goal."""
+        estimated_completion_date = None
+        if projection.projected[i]:
+            estimated_completion_date = self.today + timedelta(
+                days=int(projection.days_to_completion[i])
+            )
+
+        risk_reason = None
+        if projection.stalled[i]:
+            risk_reason = f"No contributions in the last {int(projection.rate_days[i])} days"
+        elif projection.at_risk[i]:
+            risk_reason = (
+                f"Projected to miss deadline by {int(projection.days_behind[i])} days "
+                f"at current rate"
+            )
+
+        return GoalProgress(
+            goal_id=goal.id,
+            name=goal.name,
+            target_amount=goal.target_amount,
+            current_amount=goal.current_amount,
+            progress_percent=float(projection.progress_percent[i]),
+            remaining_amount=goal.target_amount - goal.current_amount,
+            days_remaining=(
+                int(projection.days_remaining[i]) if projection.has_deadline[i] else None
+            ),
+            estimated_completion_date=estimated_completion_date,
+            is_at_risk=risk_reason is not None,
+            risk_reason=risk_reason,
+        )
+
+    async def progress(self, goals: Sequence) -> List[GoalProgress]:
+        """Get progress information for goals.
+
+        Args:
+            goals: Goals or goal rows
+
+        Returns:
+            GoalProgress per goal, in order
+        """
+        if not goals:
+            return []
+        projection = self.project(goals, await self._contributions(goals))
+        return [self._progress(goal, projection, i) for i, goal in enumerate(goals)]
+
+    async def user_progress(self, user_ids: List[UUID]) -> Dict[UUID, List[GoalProgress]]:
+        """Get progress information for every active goal of the given users.
+
+        Args:
+            user_ids: Users to evaluate
+
+        Returns:
+            GoalProgress lists by user ID (users without active goals omitted)
+        """
+        goals = await self.load_active_goals(user_ids)
+        by_user: Dict[UUID, List[GoalProgress]] = {}
+        for goal, progress in zip(goals, await self.progress(goals)):
+            by_user.setdefault(goal.user_id, []).append(progress)
+        return by_user
+
+    async def risk_alerts(self, user_ids: List[UUID]) -> List[Tuple[UUID, GoalRiskAlert]]:
+        """Evaluate risk alerts for every active goal of the given users.
+
+        Only goals at risk are turned into objects, so large batches of
+        users stay cheap.
+
+        Args:
+            user_ids: Users to evaluate
+
+        Returns:
+            List of (user ID, alert) pairs
+        """
+        goals = await self.load_active_goals(user_ids, at_risk_only=True)
+        if not goals:
+            return []
+        projection = self.project(goals, await self._contributions(goals))
+
+        alerts = []
+        for i in np.flatnonzero(projection.at_risk):
+            goal = goals[i]
+            progress = self._progress(goal, projection, i)
+            if progress.days_remaining and progress.days_remaining < 30:
+                severity = "CRITICAL"
+                recommended_action = (
+                    f"Increase contributions significantly to meet deadline in "
+                    f"{progress.days_remaining} days"
+                )
+            else:
+                severity = "WARNING"
+                recommended_action = "Consider increasing your contribution rate to stay on track"
+
+            alerts.append(
+                (
+                    goal.user_id,
+                    GoalRiskAlert(
+                        goal_id=goal.id,
+                        name=goal.name,
+                        severity=severity,
+                        message=progress.risk_reason,
+                        recommended_action=recommended_action,
+                    ),
+                )
+            )
+
+        return alerts
+
+    async def apply_contributions(
+        self, user_id: UUID, contributions: Dict[str, Decimal]
+    ) -> List[FinancialGoal]:
+        """Add amounts to a user's active goals by category, with one UPDATE.
+
+        Goals reaching their target are marked achieved.
+
+        Args:
+            user_id: User ID
+            contributions: Amount to add by goal category
+
+        Returns:
+            Updated goals
+        """
+        if not contributions:
+            return []
+
+        added = cast(
+            case(
+                {category: amount for category, amount in contributions.items()},
+                value=FinancialGoal.category,
+            ),
+            Numeric,
+        )
+        new_amount = FinancialGoal.current_amount + added
+        stmt = (
+            update(FinancialGoal)
+            .where(
+                and_(
+                    FinancialGoal.user_id == user_id,
+                    FinancialGoal.status == "ACTIVE",
+                    FinancialGoal.category.in_(list(contributions)),
+                )
+            )
+            .values(
+                current_amount=new_amount,
+                status=case(
+                    (new_amount >= FinancialGoal.target_amount, "ACHIEVED"),
+                    else_=FinancialGoal.status,
+                ),
+                updated_at=datetime.utcnow(),
+            )
+            .returning(FinancialGoal)
+            .execution_options(populate_existing=True)
+        )
+        goals = list((await self.db.execute(stmt)).scalars())
+        if not goals:
+            return []
+
+        invalidate_user_cache(self.db, user_id)
+        for goal in goals:
+            if goal.status == "ACHIEVED":
+                logger.info(
+                    "Financial goal achieved!",
+                    goal_id=str(goal.id),
+                    user_id=str(user_id),
+                    name=goal.name,
+                    final_amount=str(goal.current_amount),
+                )
+
+        return goals
@@ -1,58 +1,38 @@
 """Goal service for managing financial goals and tracking progress."""
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from datetime import date as date_type
 from decimal import Decimal
 from typing import List, Optional
 from uuid import UUID
-from dataclasses import dataclass
 
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.financial_goal import FinancialGoal
+from app.cache import invalidate_user_cache
+from app.services.goal_engine import GoalEngine, GoalProgress, GoalRiskAlert
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
-@dataclass
-class GoalProgress:
-    """Goal progress information."""
-
-    goal_id: UUID
-    name: str
-    target_amount: Decimal
-    current_amount: Decimal
-    progress_percent: float
-    remaining_amount: Decimal
-    days_remaining: Optional[int]
-    estimated_completion_date: Optional[date_type]
-    is_at_risk: bool
-    risk_reason: Optional[str]
-
-
-@dataclass
-class GoalRiskAlert:
-    """Goal risk alert."""
-
-    goal_id: UUID
-    name: str
-    severity: str  # WARNING, CRITICAL
-    message: str
-    recommended_action: str
-
-
 class GoalService:
     """Service for managing financial goals and tracking progress."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, history_days: Optional[int] = None):
         """Initialize goal service.
 
         Args:
             db: Database session
+            history_days: Project category-linked goals from their contributions
+                over this many days (default: average rate since creation)
         """
         self.db = db
+        self.history_days = history_days
+
+    def _engine(self) -> GoalEngine:
+        return GoalEngine(self.db, history_days=self.history_days)
 
     async def create_goal(
         self,
@@ -97,6 +77,7 @@ class GoalService:
 
         self.db.add(goal)
         await self.db.flush()
+        invalidate_user_cache(self.db, user_id)
         await self.db.refresh(goal)
 
         logger.info(
@@ -160,55 +141,7 @@ class GoalService:
         if not goal:
             return None
 
-        # Calculate progress percentage
-        progress_percent = (
-            float((goal.current_amount / goal.target_amount) * 100) if goal.target_amount > 0 else 0
-        )
-        remaining_amount = goal.target_amount - goal.current_amount
-
-        # Calculate days remaining
-        days_remaining = None
-        if goal.deadline:
-            today = datetime.now(timezone.utc).date()
-            days_remaining = (goal.deadline - today).days
-
-        # Estimate completion date based on progress rate
-        estimated_completion_date = None
-        is_at_risk = False
-        risk_reason = None
-
-        if goal.deadline and goal.current_amount > 0:
-            # Calculate progress rate (amount per day)
-            days_since_creation = (datetime.now(timezone.utc).date() - goal.created_at.date()).days
-            if days_since_creation > 0:
-                daily_rate = goal.current_amount / days_since_creation
-
-                if daily_rate > 0:
-                    days_to_completion = int(remaining_amount / daily_rate)
-                    estimated_completion_date = datetime.now(timezone.utc).date() + timedelta(
-                        days=days_to_completion
-                    )
-
-                    # Check if at risk
-                    if estimated_completion_date > goal.deadline:
-                        is_at_risk = True
-                        days_behind = (estimated_completion_date - goal.deadline).days
-                        risk_reason = (
-                            f"Projected to miss deadline by {days_behind} days at current rate"
-                        )
-
-        return GoalProgress(
-            goal_id=goal.id,
-            name=goal.name,
-            target_amount=goal.target_amount,
-            current_amount=goal.current_amount,
-            progress_percent=progress_percent,
-            remaining_amount=remaining_amount,
-            days_remaining=days_remaining,
-            estimated_completion_date=estimated_completion_date,
-            is_at_risk=is_at_risk,
-            risk_reason=risk_reason,
-        )
+        return (await self._engine().progress([goal]))[0]
 
     async def update_goal_progress(
         self, goal_id: UUID, user_id: UUID, amount: Decimal
@@ -246,6 +179,7 @@ class GoalService:
             )
 
         await self.db.flush()
+        invalidate_user_cache(self.db, user_id)
         await self.db.refresh(goal)
 
         logger.debug(
@@ -273,24 +207,11 @@ class GoalService:
         Returns:
             List of updated goals
         """
-        # Find active goals matching the category
-        stmt = select(FinancialGoal).where(
-            and_(
-                FinancialGoal.user_id == user_id,
-                FinancialGoal.category == transaction_category,
-                FinancialGoal.status == "ACTIVE",
-            )
+        # One UPDATE for every active goal in the category
+        updated_goals = await self._engine().apply_contributions(
+            user_id, {transaction_category: transaction_amount}
         )
 
-        result = await self.db.execute(stmt)
-        goals = list(result.scalars().all())
-
-        updated_goals = []
-        for goal in goals:
-            updated_goal = await self.update_goal_progress(goal.id, user_id, transaction_amount)
-            if updated_goal:
-                updated_goals.append(updated_goal)
-
         if updated_goals:
             logger.info(
                 "Goals auto-updated from transaction",
@@ -311,33 +232,7 @@ class GoalService:
         Returns:
             List of risk alerts
         """
-        # Get all active goals
-        goals = await self.list_goals(user_id, status="ACTIVE")
-
-        alerts = []
-        for goal in goals:
-            progress = await self.get_goal_progress(user_id, goal.id)
-
-            if progress and progress.is_at_risk:
-                # Determine severity
-                if progress.days_remaining and progress.days_remaining < 30:
-                    severity = "CRITICAL"
-                    recommended_action = f"Increase contributions significantly to meet deadline in {progress.days_remaining} days"
-                else:
-                    severity = "WARNING"
-                    recommended_action = (
-                        "Consider increasing your contribution rate to stay on track"
-                    )
-
-                alerts.append(
-                    GoalRiskAlert(
-                        goal_id=goal.id,
-                        name=goal.name,
-                        severity=severity,
-                        message=progress.risk_reason or "Goal at risk of not being met",
-                        recommended_action=recommended_action,
-                    )
-                )
+        alerts = [alert for _, alert in await self._engine().risk_alerts([user_id])]
 
         if alerts:
             logger.warning(
@@ -395,6 +290,7 @@ class GoalService:
 
         goal.updated_at = datetime.utcnow()
         await self.db.flush()
+        invalidate_user_cache(self.db, user_id)
         await self.db.refresh(goal)
 
         logger.info("Goal updated", goal_id=str(goal_id), user_id=str(user_id))
@@ -417,6 +313,7 @@ class GoalService:
 
         await self.db.delete(goal)
         await self.db.flush()
+        invalidate_user_cache(self.db, user_id)
 
         logger.info("Goal deleted", goal_id=str(goal_id), user_id=str(user_id))
 
@@ -0,0 +1,471 @@
+"""
+Precompiled Merchant Database Artifact.
+
+Compiles data/merchants.json into a flat binary file that is opened with
+mmap, so every worker process shares the same read-only pages instead of
+parsing the JSON and building its own alias index.
+
+Layout (little-endian):
+    header      magic, format version, SHA-256 of the source JSON, section table
+    strings     UTF-8 string table, referenced as (offset, length) pairs
+    categories  declared category list
+    cat_names   category names referenced by merchant records (by id)
+    merchants   fixed-size merchant records, in source order
+    m_aliases   per-merchant alias lists (the "aliases" field)
+    aliases     alias -> merchant index entries, in lookup index order
+    alias_hash  open-addressing hash table over aliases (crc32, linear probe)
+    key_hash    open-addressing hash table over merchant keys
+    patterns    (regex, merchant, note) triples
+
+The artifact is rebuilt automatically whenever the JSON's hash changes.
+
+Usage:
+    python -m app.services.merchant_artifact data/merchants.json
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"FHMERCH\x00"
+FORMAT_VERSION = 1
+
+SECTIONS = (
+    "strings",
+    "categories",
+    "cat_names",
+    "merchants",
+    "m_aliases",
+    "aliases",
+    "alias_hash",
+    "key_hash",
+    "patterns",
+)
+
+_HEADER = struct.Struct("<8sH32s")
+_SECTION = struct.Struct("<II")  # byte offset, item count
+_STR_REF = struct.Struct("<II")  # string offset, byte length
+# key, canonical_name, subcategory, other-fields JSON (string refs), category id,
+# is_recurring, alias start/count. Rarely present fields such as typical_amounts
+# go through the JSON blob so their values round-trip exactly.
+_MERCHANT = struct.Struct("<IIIIIIIIHBIH")
+_ALIAS = struct.Struct("<III")  # alias string ref, merchant index
+_PATTERN = struct.Struct("<IIIIII")  # regex, merchant, note string refs
+_SLOT = struct.Struct("<I")  # entry index + 1, 0 means empty
+
+_NONE = 0xFFFFFFFF
+_KNOWN_FIELDS = {"canonical_name", "category", "subcategory", "aliases", "is_recurring"}
+
+
+class ArtifactError(Exception):
+    """Exception raised when an artifact is missing, corrupt or incompatible."""
+
+    pass
+
+
+def source_hash(json_path: str) -> bytes:
+    """Return the SHA-256 digest of a merchants.json file."""
+    with open(json_path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def default_artifact_path(json_path: str) -> str:
+    """Return the artifact path that sits next to a merchants.json file."""
+    return str(Path(json_path).with_suffix(".bin"))
+
+
+def _hash_key(data: bytes) -> int:
+    return zlib.crc32(data)
+
+
+def _table_size(count: int) -> int:
+    """Power-of-two table size with load factor <= 0.5."""
+    size = 8
+    while size < count * 2:
+        size *= 2
+    return size
+
+
+class _ArtifactWriter:
+    """Accumulates sections and serializes them into one buffer."""
+
+    def __init__(self) -> None:
+        self.strings = bytearray()
+        self._interned: Dict[str, Tuple[int, int]] = {}
+
+    def string(self, value: Optional[str]) -> Tuple[int, int]:
+        if value is None:
+            return _NONE, 0
+        if value not in self._interned:
+            data = value.encode("utf-8")
+            self._interned[value] = (len(self.strings), len(data))
+            self.strings += data
+        return self._interned[value]
+
+    def hash_table(self, keys: List[str]) -> bytes:
+        size = _table_size(len(keys))
+        slots = [0] * size
+        for index, key in enumerate(keys):
+            slot = _hash_key(key.encode("utf-8")) & (size - 1)
+            while slots[slot]:
+                slot = (slot + 1) & (size - 1)
+            slots[slot] = index + 1
+        return b"".join(_SLOT.pack(s) for s in slots)
+
+
+def build_artifact(json_path: str, artifact_path: Optional[str] = None) -> str:
+    """
+    Compile a merchants.json file into a binary artifact.
+
+    The file is written to a temporary path and atomically renamed, so
+    concurrent workers never observe a partially written artifact.
+
+    Args:
+        json_path: Path to merchants.json
+        artifact_path: Output path. Defaults to merchants.bin next to the JSON
+
+    Returns:
+        Path of the written artifact
+    """
+    artifact_path = artifact_path or default_artifact_path(json_path)
+    with open(json_path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).digest()
+    data = json.loads(raw)
+
+    merchants: Dict[str, Dict[str, Any]] = data.get("merchants", {})
+    writer = _ArtifactWriter()
+
+    categories = [writer.string(c) for c in data.get("categories", [])]
+
+    cat_ids: Dict[str, int] = {}
+    merchant_records = []
+    merchant_aliases = []
+    for key, m in merchants.items():
+        category = m.get("category", "Other")
+        cat_id = cat_ids.setdefault(category, len(cat_ids))
+
+        aliases = m.get("aliases", [])
+        alias_start = len(merchant_aliases)
+        merchant_aliases.extend(writer.string(a) for a in aliases)
+
+        extra = {k: v for k, v in m.items() if k not in _KNOWN_FIELDS}
+        merchant_records.append(
+            _MERCHANT.pack(
+                *writer.string(key),
+                *writer.string(m.get("canonical_name", key.title())),
+                *writer.string(m.get("subcategory")),
+                *writer.string(json.dumps(extra) if extra else None),
+                cat_id,
+                1 if m.get("is_recurring", False) else 0,
+                alias_start,
+                len(aliases),
+            )
+        )
+
+    # Same insertion order and overwrite semantics as the in-memory alias index
+    alias_index: Dict[str, str] = {}
+    for key, m in merchants.items():
+        alias_index[key.lower()] = key
+        for alias in m.get("aliases", []):
+            alias_index[alias.lower()] = key
+    merchant_pos = {key: i for i, key in enumerate(merchants)}
+    alias_records = [
+        _ALIAS.pack(*writer.string(alias), merchant_pos[key]) for alias, key in alias_index.items()
+    ]
+
+    pattern_records = []
+    for p in data.get("patterns", []):
+        try:
+            re.compile(p["regex"], re.IGNORECASE)
+        except re.error as e:
+            logger.warning(f"Invalid regex pattern '{p['regex']}': {e}")
+            continue
+        pattern_records.append(
+            _PATTERN.pack(
+                *writer.string(p["regex"]),
+                *writer.string(p["merchant"]),
+                *writer.string(p.get("note")),
+            )
+        )
+
+    sections: Dict[str, Tuple[bytes, int]] = {
+        "categories": (b"".join(_STR_REF.pack(*c) for c in categories), len(categories)),
+        "cat_names": (
+            b"".join(_STR_REF.pack(*writer.string(name)) for name in cat_ids),
+            len(cat_ids),
+        ),
+        "merchants": (b"".join(merchant_records), len(merchant_records)),
+        "m_aliases": (b"".join(_STR_REF.pack(*a) for a in merchant_aliases), len(merchant_aliases)),
+        "aliases": (b"".join(alias_records), len(alias_records)),
+        "alias_hash": (
+            writer.hash_table(list(alias_index)),
+            _table_size(len(alias_index)),
+        ),
+        "key_hash": (writer.hash_table(list(merchants)), _table_size(len(merchants))),
+        "patterns": (b"".join(pattern_records), len(pattern_records)),
+    }
+    sections["strings"] = (bytes(writer.strings), len(writer.strings))
+
+    header_size = _HEADER.size + _SECTION.size * len(SECTIONS)
+    body = bytearray()
+    table = []
+    for name in SECTIONS:
+        payload, count = sections[name]
+        table.append(_SECTION.pack(header_size + len(body), count))
+        body += payload
+
+    out_dir = os.path.dirname(os.path.abspath(artifact_path))
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, prefix=".merchants-", suffix=".tmp")
+    try:
+        # Readable by every worker, whichever user built it
+        os.fchmod(fd, 0o644)
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, digest))
+            f.write(b"".join(table))
+            f.write(body)
+        os.replace(tmp_path, artifact_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    logger.info(
+        f"Built merchant artifact {artifact_path}: {len(merchants)} merchants, "
+        f"{len(alias_index)} aliases, {header_size + len(body)} bytes"
+    )
+    return artifact_path
+
+
+class MerchantArtifact:
+    """
+    Read-only, memory-mapped view over a compiled merchant artifact.
+
+    Lookups decode only the records they touch; nothing is parsed up front
+    except the header, the category list and the (small) pattern list.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open and validate an artifact.
+
+        Args:
+            path: Path to the artifact file
+
+        Raises:
+            ArtifactError: If the file is missing, truncated or incompatible
+        """
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise ArtifactError(f"Cannot map merchant artifact {path}: {e}") from e
+
+        header_size = _HEADER.size + _SECTION.size * len(SECTIONS)
+        if len(self._buf) < header_size:
+            raise ArtifactError(f"Merchant artifact {path} is truncated")
+        magic, version, digest = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ArtifactError(f"Merchant artifact {path} has an incompatible format")
+        self.source_hash: bytes = digest
+
+        self._sections: Dict[str, Tuple[int, int]] = {}
+        for i, name in enumerate(SECTIONS):
+            self._sections[name] = _SECTION.unpack_from(self._buf, _HEADER.size + i * _SECTION.size)
+
+        self._strings_base = self._sections["strings"][0]
+        self.categories: List[str] = [
+            self._str(*_STR_REF.unpack_from(self._buf, self._offset("categories", i, _STR_REF)))
+            for i in range(self._count("categories"))
+        ]
+        self._cat_names: List[str] = [
+            self._str(*_STR_REF.unpack_from(self._buf, self._offset("cat_names", i, _STR_REF)))
+            for i in range(self._count("cat_names"))
+        ]
+
+    def close(self) -> None:
+        """Unmap the artifact."""
+        self._buf.close()
+
+    def _count(self, section: str) -> int:
+        return self._sections[section][1]
+
+    def _offset(self, section: str, index: int, record: struct.Struct) -> int:
+        return self._sections[section][0] + index * record.size
+
+    def _str(self, offset: int, length: int) -> Optional[str]:
+        if offset == _NONE:
+            return None
+        start = self._strings_base + offset
+        return self._buf[start : start + length].decode("utf-8")
+
+    def _str_bytes_equal(self, offset: int, length: int, data: bytes) -> bool:
+        start = self._strings_base + offset
+        return length == len(data) and self._buf[start : start + length] == data
+
+    def _probe(self, table: str, data: bytes, entry_ref: Any) -> Optional[int]:
+        """Return the entry index whose string equals data, or None."""
+        base, size = self._sections[table]
+        mask = size - 1
+        slot = _hash_key(data) & mask
+        while True:
+            (value,) = _SLOT.unpack_from(self._buf, base + slot * _SLOT.size)
+            if value == 0:
+                return None
+            if self._str_bytes_equal(*entry_ref(value - 1), data):
+                return value - 1
+            slot = (slot + 1) & mask
+
+    # ------------------------------------------------------------------
+    # Merchants
+    # ------------------------------------------------------------------
+
+    @property
+    def merchant_count(self) -> int:
+        return self._count("merchants")
+
+    def _merchant_record(self, index: int) -> Tuple:
+        return _MERCHANT.unpack_from(self._buf, self._offset("merchants", index, _MERCHANT))
+
+    def merchant_key(self, index: int) -> str:
+        record = self._merchant_record(index)
+        return self._str(record[0], record[1])
+
+    def merchant_index(self, key: str) -> Optional[int]:
+        """Find a merchant by its database key."""
+        return self._probe("key_hash", key.encode("utf-8"), lambda i: self._merchant_record(i)[0:2])
+
+    def merchant(self, index: int) -> Dict[str, Any]:
+        """Decode a merchant record into the same dict shape as merchants.json."""
+        (
+            _k_off,
+            _k_len,
+            c_off,
+            c_len,
+            s_off,
+            s_len,
+            e_off,
+            e_len,
+            cat_id,
+            recurring,
+            alias_start,
+            alias_count,
+        ) = self._merchant_record(index)
+
+        aliases = [
+            self._str(*_STR_REF.unpack_from(self._buf, self._offset("m_aliases", i, _STR_REF)))
+            for i in range(alias_start, alias_start + alias_count)
+        ]
+        entry: Dict[str, Any] = {
+            "canonical_name": self._str(c_off, c_len),
+            "category": self._cat_names[cat_id],
+            "subcategory": self._str(s_off, s_len),
+            "aliases": aliases,
+            "is_recurring": bool(recurring),
+        }
+        if e_off != _NONE:
+            entry.update(json.loads(self._str(e_off, e_len)))
+        return entry
+
+    def merchant_keys(self) -> Iterator[str]:
+        for i in range(self.merchant_count):
+            yield self.merchant_key(i)
+
+    # ------------------------------------------------------------------
+    # Aliases
+    # ------------------------------------------------------------------
+
+    @property
+    def alias_count(self) -> int:
+        return self._count("aliases")
+
+    def _alias_record(self, index: int) -> Tuple[int, int, int]:
+        return _ALIAS.unpack_from(self._buf, self._offset("aliases", index, _ALIAS))
+
+    def alias_lookup(self, alias: str) -> Optional[str]:
+        """Return the merchant key for an exact (lowercase) alias."""
+        index = self._probe(
+            "alias_hash", alias.encode("utf-8"), lambda i: self._alias_record(i)[0:2]
+        )
+        if index is None:
+            return None
+        return self.merchant_key(self._alias_record(index)[2])
+
+    def alias_items(self) -> Iterator[Tuple[str, str]]:
+        """Iterate (alias, merchant key) pairs in index order."""
+        for i in range(self.alias_count):
+            a_off, a_len, merchant = self._alias_record(i)
+            yield self._str(a_off, a_len), self.merchant_key(merchant)
+
+    # ------------------------------------------------------------------
+    # Patterns
+    # ------------------------------------------------------------------
+
+    def patterns(self) -> List[Dict[str, Optional[str]]]:
+        """Return pattern definitions (already validated) in priority order."""
+        result = []
+        for i in range(self._count("patterns")):
+            r_off, r_len, m_off, m_len, n_off, n_len = _PATTERN.unpack_from(
+                self._buf, self._offset("patterns", i, _PATTERN)
+            )
+            result.append(
+                {
+                    "regex": self._str(r_off, r_len),
+                    "merchant": self._str(m_off, m_len),
+                    "note": self._str(n_off, n_len),
+                }
+            )
+        return result
+
+
+def load_artifact(
+    json_path: str, artifact_path: Optional[str] = None
+) -> Optional[MerchantArtifact]:
+    """
+    Open the artifact for a merchants.json file, rebuilding it when stale.
+
+    Args:
+        json_path: Path to merchants.json
+        artifact_path: Artifact path. Defaults to merchants.bin next to the JSON
+
+    Returns:
+        MerchantArtifact, or None if it could neither be opened nor built
+        (e.g. read-only data directory); callers then fall back to the JSON.
+    """
+    artifact_path = artifact_path or default_artifact_path(json_path)
+    digest = source_hash(json_path)
+
+    try:
+        artifact = MerchantArtifact(artifact_path)
+        if artifact.source_hash == digest:
+            return artifact
+        artifact.close()
+        logger.info(f"Merchant artifact {artifact_path} is stale, rebuilding")
+    except ArtifactError:
+        pass
+
+    try:
+        build_artifact(json_path, artifact_path)
+        return MerchantArtifact(artifact_path)
+    except (OSError, ArtifactError) as e:
+        logger.warning(f"Could not build merchant artifact {artifact_path}: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else "data/merchants.json"
+    target = sys.argv[2] if len(sys.argv) > 2 else None
+    logging.basicConfig(level=logging.INFO)
+    print(build_artifact(source, target))
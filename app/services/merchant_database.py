@@ -8,26 +8,65 @@ Uses the comprehensive merchants.json database for accurate category assignments
 import json
 import os
 import re
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from dataclasses import dataclass, replace
 from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 import logging
 
+from prometheus_client import Counter
+
+from .merchant_artifact import MerchantArtifact, load_artifact
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# Descriptor normalization pipeline, applied in order by MerchantDatabase._normalize.
+# Input is lowercased before the pipeline runs.
+_NORMALIZE_STEPS: Tuple[Tuple[re.Pattern, str], ...] = (
+    # Payment processor prefixes
+    (re.compile(r"^(sq\s*\*|tst\s*\*|paypal\s*\*)"), ""),
+    # Reference codes like *AB12CD
+    (re.compile(r"\*[a-z0-9]+", re.I), ""),
+    # Store/reference numbers (4+ digits at end)
+    (re.compile(r"\s*#?\d{4,}.*$"), ""),
+    # Phone numbers
+    (re.compile(r"\s*\d{3}[-.\s]?\d{3}[-.\s]?\d{4}"), ""),
+    # City/state/zip
+    (re.compile(r"\s+[a-z]{2}\s+\d{5}(-\d{4})?$", re.I), ""),
+    (re.compile(r"\s+[a-z]{2}$", re.I), ""),
+    # Company suffixes
+    (re.compile(r"\s+(inc|llc|corp|ltd|co|company)\.?\s*$", re.I), ""),
+    # Collapse whitespace
+    (re.compile(r"\s+"), " "),
+)
+
+# Shared across instances; the singleton is the only one in production.
+LOOKUP_CACHE_REQUESTS = Counter(
+    "merchant_lookup_cache_total",
+    "MerchantDatabase.lookup cache requests by result",
+    labelnames=["result"],
+)
+
+
+@dataclass(frozen=True)
 class MerchantInfo:
-    """Information about a merchant from the database."""
+    """Information about a merchant from the database.
+
+    Instances are immutable so cached lookup results can be shared safely
+    between callers.
+    """
 
     key: str  # Database key (lowercase)
     canonical_name: str  # Display name
     category: str  # Primary category
     subcategory: Optional[str]  # Subcategory if available
-    aliases: List[str]  # Known aliases
+    aliases: Sequence[str]  # Known aliases
     is_recurring: bool  # Whether this is typically recurring
-    typical_amounts: Optional[List[float]] = None  # Expected amounts if known
+    typical_amounts: Optional[Sequence[float]] = None  # Expected amounts if known
     match_type: str = "unknown"  # How the match was found
     match_score: float = 1.0  # Confidence in the match (0-1)
 
@@ -39,12 +78,79 @@ class MerchantInfo:
             "category": self.category,
             "subcategory": self.subcategory,
             "is_recurring": self.is_recurring,
-            "typical_amounts": self.typical_amounts,
+            "typical_amounts": (
+                list(self.typical_amounts) if self.typical_amounts is not None else None
+            ),
             "match_type": self.match_type,
             "match_score": round(self.match_score, 3),
         }
 
 
+class _ArtifactMapping(MutableMapping):
+    """
+    Dict-like view over a memory-mapped artifact table.
+
+    Point lookups are served straight from the shared mmap pages. Writes from
+    add_merchant go to a per-process overlay. Iteration materializes the
+    merged contents once and is re-materialized only after a write.
+    """
+
+    def __init__(
+        self,
+        lookup: Callable[[str], Any],
+        base_items: Callable[[], Iterable[Tuple[str, Any]]],
+        base_keys: Callable[[], Iterable[str]],
+        base_len: Callable[[], int],
+    ):
+        self._lookup = lookup
+        self._base_items = base_items
+        self._base_keys = base_keys
+        self._base_len = base_len
+        self._overlay: Dict[str, Any] = {}
+        self._keys_cache: Optional[List[str]] = None
+        self._items_cache: Optional[List[Tuple[str, Any]]] = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._overlay:
+            return self._overlay[key]
+        value = self._lookup(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._overlay[key] = value
+        self._keys_cache = None
+        self._items_cache = None
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("Entries backed by the merchant artifact cannot be deleted")
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._overlay or (isinstance(key, str) and self._lookup(key) is not None)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._keys_cache is None:
+            keys = dict.fromkeys(self._base_keys())
+            keys.update(dict.fromkeys(self._overlay))
+            self._keys_cache = list(keys)
+        return iter(self._keys_cache)
+
+    def __len__(self) -> int:
+        if not self._overlay:
+            return self._base_len()
+        if self._keys_cache is None:
+            iter(self)
+        return len(self._keys_cache)
+
+    def items(self) -> List[Tuple[str, Any]]:  # type: ignore[override]
+        if self._items_cache is None:
+            merged = dict(self._base_items())
+            merged.update(self._overlay)
+            self._items_cache = list(merged.items())
+        return self._items_cache
+
+
 class MerchantDatabase:
     """
     Production-ready merchant lookup service.
@@ -53,7 +159,8 @@ class MerchantDatabase:
     - Exact alias matching
     - Regex pattern matching for common formats
     - Fuzzy string matching for unknown merchants
-    - Caching for performance
+    - Bounded LRU cache of full lookup results (including misses)
+    - Memory-mapped precompiled artifact shared by all worker processes
 
     Usage:
         db = MerchantDatabase()
@@ -61,13 +168,25 @@ class MerchantDatabase:
         print(info.category)  # "Groceries"
     """
 
-    def __init__(self, db_path: Optional[str] = None):
+    # Maximum number of normalized descriptors kept in the lookup cache
+    LOOKUP_CACHE_SIZE = 10_000
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        cache_size: Optional[int] = None,
+        use_artifact: bool = True,
+    ):
         """
         Initialize the merchant database.
 
         Args:
             db_path: Path to merchants.json. Defaults to data/merchants.json
+            cache_size: Maximum lookup cache entries. Defaults to LOOKUP_CACHE_SIZE
+            use_artifact: Load through the precompiled mmap artifact (rebuilt
+                when the JSON changes) instead of parsing the JSON directly
         """
+        self._artifact: Optional[MerchantArtifact] = None
         if db_path is None:
             # Find the data directory
             base_paths = [
@@ -84,16 +203,33 @@ class MerchantDatabase:
         if db_path is None or not os.path.exists(db_path):
             logger.warning(f"Merchant database not found at {db_path}, using empty database")
             self._merchants: Dict[str, Dict] = {}
-            self._patterns: List[Tuple[re.Pattern, str, Optional[str]]] = []
+            self._pattern_defs: List[Tuple[str, str, Optional[str]]] = []
             self._alias_index: Dict[str, str] = {}
             self._categories: List[str] = []
         else:
-            self._load_database(db_path)
-
-        self._exact_cache: Dict[str, Optional[MerchantInfo]] = {}
+            artifact = load_artifact(db_path) if use_artifact else None
+            if artifact is not None:
+                self._load_artifact(artifact)
+            else:
+                self._load_database(db_path)
+
+        # Compiled lazily on first pattern lookup; see _ensure_pattern_index
+        self._compiled_patterns: Optional[List[Tuple[re.Pattern, str, Optional[str]]]] = None
+        self._pattern_index: Optional[re.Pattern] = None
+        self._pattern_groups: Dict[str, str] = {}
+        self._pattern_index_ready = False
+
+        # LRU of normalized descriptor -> lookup result. None values are cached
+        # too, so repeated unknown descriptors skip the fuzzy stage.
+        self._cache_size = cache_size if cache_size is not None else self.LOOKUP_CACHE_SIZE
+        self._lookup_cache: "OrderedDict[str, Optional[MerchantInfo]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_stats = {"hits": 0, "misses": 0}
+        # Bumped on invalidation so in-flight lookups don't store stale results
+        self._cache_generation = 0
 
         logger.info(
-            f"MerchantDatabase loaded: {len(self._merchants)} merchants, {len(self._patterns)} patterns"
+            f"MerchantDatabase loaded: {len(self._merchants)} merchants, {len(self._pattern_defs)} patterns"
         )
 
     def _load_database(self, db_path: str) -> None:
@@ -103,16 +239,7 @@ class MerchantDatabase:
 
         self._merchants = data.get("merchants", {})
         self._categories = data.get("categories", [])
-
-        # Compile regex patterns
-        self._patterns = []
-        for p in data.get("patterns", []):
-            try:
-                compiled = re.compile(p["regex"], re.IGNORECASE)
-                note = p.get("note")
-                self._patterns.append((compiled, p["merchant"], note))
-            except re.error as e:
-                logger.warning(f"Invalid regex pattern '{p['regex']}': {e}")
+        self._pattern_defs = self._validate_patterns(data.get("patterns", []))
 
         # Build alias index for fast lookup
         self._alias_index = {}
@@ -123,6 +250,88 @@ class MerchantDatabase:
             for alias in merchant.get("aliases", []):
                 self._alias_index[alias.lower()] = key
 
+    def _load_artifact(self, artifact: MerchantArtifact) -> None:
+        """Index the database through a memory-mapped artifact."""
+        self._artifact = artifact
+
+        def merchant(key: str) -> Optional[Dict]:
+            index = artifact.merchant_index(key)
+            return artifact.merchant(index) if index is not None else None
+
+        self._merchants = _ArtifactMapping(
+            lookup=merchant,
+            base_items=lambda: (
+                (artifact.merchant_key(i), artifact.merchant(i))
+                for i in range(artifact.merchant_count)
+            ),
+            base_keys=artifact.merchant_keys,
+            base_len=lambda: artifact.merchant_count,
+        )
+        self._alias_index = _ArtifactMapping(
+            lookup=artifact.alias_lookup,
+            base_items=artifact.alias_items,
+            base_keys=lambda: (alias for alias, _ in artifact.alias_items()),
+            base_len=lambda: artifact.alias_count,
+        )
+        self._categories = list(artifact.categories)
+        # Regexes were validated when the artifact was built
+        self._pattern_defs = [(p["regex"], p["merchant"], p["note"]) for p in artifact.patterns()]
+
+    @staticmethod
+    def _validate_patterns(
+        definitions: List[Dict[str, Any]],
+    ) -> List[Tuple[str, str, Optional[str]]]:
+        """Return (regex, merchant, note) for each definition, skipping invalid regexes."""
+        patterns = []
+        for p in definitions:
+            try:
+                re.compile(p["regex"], re.IGNORECASE)
+                patterns.append((p["regex"], p["merchant"], p.get("note")))
+            except re.error as e:
+                logger.warning(f"Invalid regex pattern '{p['regex']}': {e}")
+        return patterns
+
+    @property
+    def _patterns(self) -> List[Tuple[re.Pattern, str, Optional[str]]]:
+        """Individually compiled patterns, in priority order."""
+        if self._compiled_patterns is None:
+            self._compiled_patterns = [
+                (re.compile(regex, re.IGNORECASE), merchant, note)
+                for regex, merchant, note in self._pattern_defs
+            ]
+        return self._compiled_patterns
+
+    def _build_pattern_index(self) -> None:
+        """
+        Compile the merchant patterns into a single alternation.
+
+        Each pattern becomes a named group, in priority order. Regex
+        alternation tries branches left to right at the same position, so one
+        ``match`` call returns the same winner as testing the patterns in
+        sequence. Patterns whose merchant is not in the database can never
+        produce a result and are left out.
+        """
+        index: Optional[re.Pattern] = None
+        groups: Dict[str, str] = {}
+        branches = []
+        for i, (regex, merchant_key, _note) in enumerate(self._pattern_defs):
+            if merchant_key not in self._merchants:
+                continue
+            group = f"_p{i}"
+            branches.append(f"(?P<{group}>{regex})")
+            groups[group] = merchant_key
+
+        if branches:
+            try:
+                index = re.compile("|".join(branches), re.IGNORECASE)
+            except re.error as e:
+                # e.g. backreferences or inline flags that don't survive combination
+                logger.warning(f"Falling back to sequential pattern matching: {e}")
+                groups = {}
+
+        self._pattern_index, self._pattern_groups = index, groups
+        self._pattern_index_ready = True
+
     def lookup(self, raw_merchant: str) -> Optional[MerchantInfo]:
         """
         Find merchant info from a raw transaction description.
@@ -139,19 +348,39 @@ class MerchantDatabase:
         # Normalize the input
         normalized = self._normalize(raw_merchant)
 
+        with self._cache_lock:
+            if normalized in self._lookup_cache:
+                self._lookup_cache.move_to_end(normalized)
+                self._cache_stats["hits"] += 1
+                LOOKUP_CACHE_REQUESTS.labels(result="hit").inc()
+                return self._lookup_cache[normalized]
+            self._cache_stats["misses"] += 1
+            generation = self._cache_generation
+        LOOKUP_CACHE_REQUESTS.labels(result="miss").inc()
+
+        result = self._lookup_uncached(normalized)
+
+        with self._cache_lock:
+            if generation != self._cache_generation:
+                return result
+            self._lookup_cache[normalized] = result
+            self._lookup_cache.move_to_end(normalized)
+            while len(self._lookup_cache) > self._cache_size:
+                self._lookup_cache.popitem(last=False)
+
+        return result
+
+    def _lookup_uncached(self, normalized: str) -> Optional[MerchantInfo]:
+        """Run the lookup stages for a normalized descriptor."""
         # 1. Try exact alias match (fastest)
         result = self._lookup_exact(normalized)
         if result:
-            result.match_type = "exact"
-            result.match_score = 1.0
-            return result
+            return replace(result, match_type="exact", match_score=1.0)
 
         # 2. Try regex pattern match
         result = self._lookup_pattern(normalized)
         if result:
-            result.match_type = "pattern"
-            result.match_score = 0.95
-            return result
+            return replace(result, match_type="pattern", match_score=0.95)
 
         # 3. Try partial alias match
         result = self._lookup_partial(normalized)
@@ -168,19 +397,26 @@ class MerchantDatabase:
 
     def _lookup_exact(self, normalized: str) -> Optional[MerchantInfo]:
         """Look up by exact alias match."""
-        if normalized in self._exact_cache:
-            return self._exact_cache[normalized]
-
-        result = None
-        if normalized in self._alias_index:
-            key = self._alias_index[normalized]
-            result = self._build_merchant_info(key)
-
-        self._exact_cache[normalized] = result
-        return result
+        key = self._alias_index.get(normalized)
+        if key is None:
+            return None
+        return self._build_merchant_info(key)
 
     def _lookup_pattern(self, normalized: str) -> Optional[MerchantInfo]:
         """Look up by regex pattern match."""
+        if not self._pattern_index_ready:
+            self._build_pattern_index()
+
+        if self._pattern_index is not None:
+            match = self._pattern_index.match(normalized)
+            if match is None:
+                return None
+            return self._build_merchant_info(self._pattern_groups[match.lastgroup])
+
+        return self._lookup_pattern_sequential(normalized)
+
+    def _lookup_pattern_sequential(self, normalized: str) -> Optional[MerchantInfo]:
+        """Look up by testing each regex pattern in turn."""
         for pattern, merchant_key, note in self._patterns:
             if pattern.match(normalized):
                 if merchant_key in self._merchants:
@@ -198,9 +434,7 @@ class MerchantDatabase:
                 if normalized.startswith(alias) or alias in normalized:
                     info = self._build_merchant_info(key)
                     if info:
-                        info.match_type = "partial"
-                        info.match_score = 0.85
-                        return info
+                        return replace(info, match_type="partial", match_score=0.85)
         return None
 
     def _lookup_fuzzy(self, normalized: str, threshold: float = 0.80) -> Optional[MerchantInfo]:
@@ -229,26 +463,26 @@ class MerchantDatabase:
         if best_match:
             info = self._build_merchant_info(best_match)
             if info:
-                info.match_type = "fuzzy"
-                info.match_score = best_score
-                return info
+                return replace(info, match_type="fuzzy", match_score=best_score)
 
         return None
 
     def _build_merchant_info(self, key: str) -> Optional[MerchantInfo]:
         """Build a MerchantInfo object from database entry."""
-        if key not in self._merchants:
+        m = self._merchants.get(key)
+        if m is None:
             return None
 
-        m = self._merchants[key]
         return MerchantInfo(
             key=key,
             canonical_name=m.get("canonical_name", key.title()),
             category=m.get("category", "Other"),
             subcategory=m.get("subcategory"),
-            aliases=m.get("aliases", []),
+            aliases=tuple(m.get("aliases", [])),
             is_recurring=m.get("is_recurring", False),
-            typical_amounts=m.get("typical_amounts"),
+            typical_amounts=(
+                tuple(m["typical_amounts"]) if m.get("typical_amounts") is not None else None
+            ),
         )
 
     def _normalize(self, text: str) -> str:
@@ -264,32 +498,10 @@ class MerchantDatabase:
         if not text:
             return ""
 
-        # Convert to lowercase
         text = text.lower().strip()
-
-        # Remove common payment processor prefixes
-        text = re.sub(r"^(sq\s*\*|tst\s*\*|paypal\s*\*)", "", text)
-
-        # Remove reference codes like *AB12CD
-        text = re.sub(r"\*[a-z0-9]+", "", text, flags=re.I)
-
-        # Remove store/reference numbers (4+ digits at end)
-        text = re.sub(r"\s*#?\d{4,}.*$", "", text)
-
-        # Remove phone numbers
-        text = re.sub(r"\s*\d{3}[-.\s]?\d{3}[-.\s]?\d{4}", "", text)
-
-        # Remove city/state/zip patterns
-        text = re.sub(r"\s+[a-z]{2}\s+\d{5}(-\d{4})?$", "", text, flags=re.I)
-        text = re.sub(r"\s+[a-z]{2}$", "", text, flags=re.I)
-
-        # Remove company suffixes
-        text = re.sub(r"\s+(inc|llc|corp|ltd|co|company)\.?\s*$", "", text, flags=re.I)
-
-        # Clean up whitespace
-        text = re.sub(r"\s+", " ", text).strip()
-
-        return text
+        for pattern, replacement in _NORMALIZE_STEPS:
+            text = pattern.sub(replacement, text)
+        return text.strip()
 
     def get_category(self, raw_merchant: str) -> Optional[str]:
         """
@@ -333,18 +545,38 @@ class MerchantDatabase:
         for alias in aliases or []:
             self._alias_index[alias.lower()] = key
 
-        # Clear the exact match cache
-        self._exact_cache.clear()
+        # The new merchant may make previously unresolvable patterns usable
+        self._pattern_index_ready = False
+
+        # Any cached result (including misses) may now be stale
+        self.invalidate_cache()
 
         logger.info(f"Added merchant: {key} -> {category}")
 
-    def get_stats(self) -> Dict[str, int]:
+    def invalidate_cache(self) -> None:
+        """Drop all cached lookup results. Call after mutating merchant data."""
+        with self._cache_lock:
+            self._lookup_cache.clear()
+            self._cache_generation += 1
+
+    def get_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
+        with self._cache_lock:
+            hits = self._cache_stats["hits"]
+            misses = self._cache_stats["misses"]
+            cache_entries = len(self._lookup_cache)
+        total = hits + misses
         return {
             "total_merchants": len(self._merchants),
             "total_aliases": len(self._alias_index),
-            "total_patterns": len(self._patterns),
+            "total_patterns": len(self._pattern_defs),
             "total_categories": len(self._categories),
+            "storage": "artifact" if self._artifact is not None else "json",
+            "cache_entries": cache_entries,
+            "cache_max_entries": self._cache_size,
+            "cache_hits": hits,
+            "cache_misses": misses,
+            "cache_hit_rate": round(hits / total, 4) if total else 0.0,
         }
 
 
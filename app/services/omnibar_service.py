@@ -2158,8 +2158,7 @@ class OmniBarExecutor:
 
     async def _query_spending(self, result: IntentResult) -> OmniResponse:
         """Query spending data."""
-        from sqlalchemy import select, func, and_
-        from app.models.transaction import Transaction
+        from app.services.rollup_service import RollupService
 
         entities = result.entities
         category = entities.get("category")
@@ -2185,32 +2184,12 @@ class OmniBarExecutor:
         else:
             period_end = today
 
-        # Build query
-        conditions = [
-            Transaction.user_id == self.user_id,
-            Transaction.type == "EXPENSE",
-            Transaction.date >= period_start,
-            Transaction.date <= period_end,
-            Transaction.deleted_at.is_(None),
-        ]
-        if category:
-            conditions.append(Transaction.category == category)
-
-        # Total spending
-        total_stmt = select(func.sum(Transaction.amount)).where(and_(*conditions))
-        total_result = await self.db.execute(total_stmt)
-        total_amount = total_result.scalar() or 0
-
-        # Spending by category
-        cat_stmt = (
-            select(Transaction.category, func.sum(Transaction.amount).label("total"),
-                   func.count(Transaction.id).label("count"))
-            .where(and_(*conditions))
-            .group_by(Transaction.category)
-            .order_by(func.sum(Transaction.amount).desc())
+        # Spending by category (largest first)
+        aggregates = await RollupService(self.db).category_aggregates(
+            self.user_id, period_start, period_end, category=category or None
         )
-        cat_result = await self.db.execute(cat_stmt)
-        categories = cat_result.all()
+        categories = list(aggregates.items())
+        total_amount = sum(aggregate.total for aggregate in aggregates.values())
 
         # Build response
         period_label = f"{period_start.strftime('%b %d')} — {period_end.strftime('%b %d, %Y')}"
@@ -2221,15 +2200,15 @@ class OmniBarExecutor:
                 f"Total: **₹{float(total_amount):,.2f}**"
             )
             if categories:
-                count = categories[0].count
+                count = categories[0][1].count
                 msg += f"\n• {count} transaction{'s' if count != 1 else ''}"
         else:
             msg = f"📈 **Spending Summary** ({period_label})\n\nTotal: **₹{float(total_amount):,.2f}**\n"
             if categories:
                 msg += "\nBy category:\n"
-                for cat_row in categories[:10]:
-                    pct = (float(cat_row.total) / float(total_amount) * 100) if total_amount else 0
-                    msg += f"• {cat_row.category}: ₹{float(cat_row.total):,.2f} ({pct:.0f}%) — {cat_row.count} txns\n"
+                for cat_name, cat_agg in categories[:10]:
+                    pct = (float(cat_agg.total) / float(total_amount) * 100) if total_amount else 0
+                    msg += f"• {cat_name}: ₹{float(cat_agg.total):,.2f} ({pct:.0f}%) — {cat_agg.count} txns\n"
 
         return OmniResponse(
             success=True,
@@ -2241,8 +2220,8 @@ class OmniBarExecutor:
                 "period_end": period_end.isoformat(),
                 "category_filter": category,
                 "breakdown": [
-                    {"category": c.category, "total": float(c.total), "count": c.count}
-                    for c in categories
+                    {"category": name, "total": float(agg.total), "count": agg.count}
+                    for name, agg in categories
                 ],
             },
             confidence=result.confidence,
@@ -2360,37 +2339,16 @@ class OmniBarExecutor:
 
     async def _query_general(self, result: IntentResult) -> OmniResponse:
         """Handle general financial queries."""
-        from sqlalchemy import select, func, and_
-        from app.models.transaction import Transaction
+        from app.services.rollup_service import RollupService
 
         today = date.today()
         thirty_days_ago = today - timedelta(days=30)
+        rollup = RollupService(self.db)
 
-        # Get income
-        income_stmt = select(func.sum(Transaction.amount)).where(
-            and_(
-                Transaction.user_id == self.user_id,
-                Transaction.type == "INCOME",
-                Transaction.date >= thirty_days_ago,
-                Transaction.date <= today,
-                Transaction.deleted_at.is_(None),
-            )
+        total_income = float(
+            await rollup.total(self.user_id, thirty_days_ago, today, txn_type="INCOME")
         )
-        income_result = await self.db.execute(income_stmt)
-        total_income = float(income_result.scalar() or 0)
-
-        # Get expenses
-        expense_stmt = select(func.sum(Transaction.amount)).where(
-            and_(
-                Transaction.user_id == self.user_id,
-                Transaction.type == "EXPENSE",
-                Transaction.date >= thirty_days_ago,
-                Transaction.date <= today,
-                Transaction.deleted_at.is_(None),
-            )
-        )
-        expense_result = await self.db.execute(expense_stmt)
-        total_expenses = float(expense_result.scalar() or 0)
+        total_expenses = float(await rollup.total(self.user_id, thirty_days_ago, today))
 
         net_savings = total_income - total_expenses
         savings_rate = (net_savings / total_income * 100) if total_income > 0 else 0
@@ -2459,39 +2417,20 @@ class OmniBarExecutor:
 
     async def _build_context(self) -> Dict[str, Any]:
         """Build financial context for AI chat."""
-        from sqlalchemy import select, func, and_
-        from app.models.transaction import Transaction
+        from app.services.rollup_service import RollupService
 
         today = date.today()
         thirty_days_ago = today - timedelta(days=30)
+        rollup = RollupService(self.db)
 
         # Spending by category
-        stmt = (
-            select(Transaction.category, func.sum(Transaction.amount).label("total"))
-            .where(
-                and_(
-                    Transaction.user_id == self.user_id,
-                    Transaction.type == "EXPENSE",
-                    Transaction.date >= thirty_days_ago,
-                    Transaction.deleted_at.is_(None),
-                )
-            )
-            .group_by(Transaction.category)
-        )
-        result = await self.db.execute(stmt)
-        spending = {row.category: float(row.total) for row in result.all()}
+        totals = await rollup.category_totals(self.user_id, thirty_days_ago)
+        spending = {category: float(total) for category, total in totals.items()}
 
         # Income
-        income_stmt = select(func.sum(Transaction.amount)).where(
-            and_(
-                Transaction.user_id == self.user_id,
-                Transaction.type == "INCOME",
-                Transaction.date >= thirty_days_ago,
-                Transaction.deleted_at.is_(None),
-            )
+        monthly_income = float(
+            await rollup.total(self.user_id, thirty_days_ago, txn_type="INCOME")
         )
-        income_result = await self.db.execute(income_stmt)
-        monthly_income = float(income_result.scalar() or 0)
 
         return {
             "monthly_income": monthly_income,
@@ -0,0 +1,147 @@
+"""bcrypt hashing off the event loop, with bounded concurrency.
+
+A bcrypt hash or check takes hundreds of milliseconds of CPU. Running it
+inline in a route blocks every other request on the worker, so hashes go
+to a small process pool instead. At most max_workers run at once and
+max_pending more may wait; anything beyond that is refused with
+PasswordHasherBusy (HTTP 429) rather than queued behind a login burst.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+import bcrypt
+
+from app.config import settings
+from app.logging_config import get_logger
+from app.metrics.auth_metrics import password_hash_metrics
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    """Exception raised when the hashing queue is full."""
+
+    pass
+
+
+def _hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def _check(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+def hash_cost(hashed: str) -> Optional[int]:
+    """Work factor of a bcrypt hash ("$2b$12$..." -> 12), None if unparseable."""
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """Async bcrypt hashing on a bounded worker pool."""
+
+    def __init__(
+        self,
+        rounds: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        executor: Optional[str] = None,
+    ) -> None:
+        """Initialize password hasher.
+
+        Args:
+            rounds: bcrypt work factor for new hashes (defaults to BCRYPT_ROUNDS)
+            max_workers: Hashes computed at once (defaults to PASSWORD_HASH_WORKERS)
+            max_pending: Hashes allowed to wait for a worker
+                (defaults to PASSWORD_HASH_MAX_PENDING)
+            executor: "process" or "thread" (defaults to PASSWORD_HASH_EXECUTOR)
+        """
+        self.rounds = rounds or settings.bcrypt_rounds
+        self.max_workers = max_workers or settings.password_hash_workers
+        self.max_pending = (
+            settings.password_hash_max_pending if max_pending is None else max_pending
+        )
+        self.executor_kind = executor or settings.password_hash_executor
+        if self.executor_kind not in ("process", "thread"):
+            raise ValueError(f"Unknown password hash executor: {self.executor_kind}")
+
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+
+    def _get_executor(self) -> Executor:
+        # Created on first use so importing the app doesn't fork workers
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Hashes waiting for a free worker."""
+        return max(0, self._in_flight - self.max_workers)
+
+    def _update_gauges(self) -> None:
+        password_hash_metrics.in_flight.set(self._in_flight)
+        password_hash_metrics.queue_depth.set(self.queue_depth)
+
+    async def _run(self, operation: str, func: Callable[..., T], *args: Any) -> T:
+        if self._in_flight >= self.max_workers + self.max_pending:
+            password_hash_metrics.rejected_total.labels(operation=operation).inc()
+            logger.warning("Password hashing queue full", operation=operation)
+            raise PasswordHasherBusy("Too many authentication requests, try again shortly")
+
+        self._in_flight += 1
+        self._update_gauges()
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._in_flight -= 1
+            self._update_gauges()
+            password_hash_metrics.duration.labels(operation=operation).observe(
+                time.perf_counter() - start
+            )
+
+    async def hash(self, password: str) -> str:
+        """Hash a password at the configured work factor.
+
+        Raises:
+            PasswordHasherBusy: If the queue is full
+        """
+        hashed = await self._run("hash", _hash, password.encode("utf-8"), self.rounds)
+        return hashed.decode("utf-8")
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """Check a password against a bcrypt hash.
+
+        Raises:
+            PasswordHasherBusy: If the queue is full
+        """
+        return await self._run("verify", _check, password.encode("utf-8"), hashed.encode("utf-8"))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Whether a stored hash uses a different work factor than configured."""
+        return hash_cost(hashed) != self.rounds
+
+    def shutdown(self) -> None:
+        """Stop the worker pool; it is recreated on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global hasher instance
+password_hasher = PasswordHasher()
@@ -332,7 +332,7 @@ IMPORTANT GUIDELINES:
                 parts.append(f"  Subcategory: {context.merchant_info.subcategory}")
             parts.append(f"  Is Recurring: {context.merchant_info.is_recurring}")
             if context.merchant_info.typical_amounts:
-                parts.append(f"  Typical Amounts: {context.merchant_info.typical_amounts}")
+                parts.append(f"  Typical Amounts: {list(context.merchant_info.typical_amounts)}")
             parts.append(f"  Match Confidence: {context.merchant_info.match_score:.0%}")
             parts.append("")
 
@@ -1,18 +1,18 @@
 """Report service for generating financial reports and analytics."""
 
-from datetime import date as date_type
+from datetime import date as date_type, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import csv
 import io
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, or_, func, literal, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.transaction import Transaction
 from app.models.budget import Budget
+from app.services.rollup_service import RollupService
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -75,6 +75,20 @@ class FinancialReport:
     generated_at: date_type
 
 
+@dataclass
+class _ReportData:
+    """Aggregates fetched for one report."""
+
+    income: Dict[str, Decimal] = field(default_factory=dict)
+    income_counts: Dict[str, int] = field(default_factory=dict)
+    expenses: Dict[str, Decimal] = field(default_factory=dict)
+    expense_counts: Dict[str, int] = field(default_factory=dict)
+    previous_expenses: Dict[str, Decimal] = field(default_factory=dict)
+    budget_id: Optional[UUID] = None
+    budget_name: Optional[str] = None
+    budget_allocations: Dict[str, Any] = field(default_factory=dict)
+
+
 class ReportService:
     """Service for generating financial reports and analytics."""
 
@@ -115,11 +129,18 @@ class ReportService:
             end_date=str(end_date),
         )
 
+        previous_start = None
+        if compare_to_previous_period:
+            previous_start, _ = self._previous_period(start_date, end_date)
+
+        # Fetch every aggregate the report needs in one round-trip
+        data = await self._fetch_report_data(user_id, start_date, end_date, previous_start)
+
         # Generate income summary
-        income_summary = await self._generate_income_summary(user_id, start_date, end_date)
+        income_summary = self._generate_income_summary(data)
 
         # Generate expense summary
-        expense_summary = await self._generate_expense_summary(user_id, start_date, end_date)
+        expense_summary = self._generate_expense_summary(data)
 
         # Calculate savings rate
         savings_rate, net_savings = self._calculate_savings_rate(
@@ -127,12 +148,14 @@ class ReportService:
         )
 
         # Get budget adherence
-        budget_adherence = await self._analyze_budget_adherence(user_id, start_date, end_date)
+        budget_adherence = self._analyze_budget_adherence(data)
 
         # Detect spending pattern changes
         spending_changes = []
         if compare_to_previous_period:
-            spending_changes = await self._detect_spending_changes(user_id, start_date, end_date)
+            spending_changes = self._detect_spending_changes(
+                data.expenses, data.previous_expenses
+            )
 
         report = FinancialReport(
             user_id=user_id,
@@ -157,36 +180,130 @@ class ReportService:
 
         return report
 
-    async def _generate_income_summary(
-        self, user_id: UUID, start_date: date_type, end_date: date_type
-    ) -> IncomeSummary:
-        """Generate income summary for the period."""
-        # Get all income transactions
-        stmt = (
+    @staticmethod
+    def _previous_period(
+        start_date: date_type, end_date: date_type
+    ) -> tuple[date_type, date_type]:
+        """Get the period of equal length immediately before a date range."""
+        period_days = (end_date - start_date).days + 1
+        previous_end = start_date - timedelta(days=1)
+        previous_start = previous_end - timedelta(days=period_days - 1)
+        return previous_start, previous_end
+
+    async def _fetch_report_data(
+        self,
+        user_id: UUID,
+        start_date: date_type,
+        end_date: date_type,
+        previous_start: Optional[date_type] = None,
+    ) -> _ReportData:
+        """Fetch all report aggregates with a single query.
+
+        Daily spending rows are grouped by (type, category) once, with FILTER clauses
+        splitting the current period from the previous one. The covering
+        budget is joined in as a one-row subquery, and both are left-joined
+        to a constant row so the budget is returned even without transactions.
+
+        Args:
+            user_id: User ID
+            start_date: Report start date
+            end_date: Report end date
+            previous_start: Start of the comparison period, or None to skip it
+
+        Returns:
+            Aggregates for every report section
+        """
+        spending = RollupService(self.db).source()
+        in_current = spending.c.date >= start_date
+        period_filter = [spending.c.date >= start_date]
+        if previous_start is not None:
+            # Only expenses are compared against the previous period
+            period_filter = [
+                spending.c.date >= previous_start,
+                or_(in_current, spending.c.type == "EXPENSE"),
+            ]
+
+        totals = (
             select(
-                Transaction.category,
-                func.sum(Transaction.amount).label("total"),
-                func.count(Transaction.id).label("count"),
+                spending.c.type,
+                spending.c.category,
+                func.sum(spending.c.total).filter(in_current).label("total"),
+                func.sum(spending.c.count).filter(in_current).label("count"),
+                func.sum(spending.c.total).filter(~in_current).label("previous_total"),
             )
             .where(
                 and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == "INCOME",
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date,
-                    Transaction.deleted_at.is_(None),
+                    spending.c.user_id == user_id,
+                    spending.c.date <= end_date,
+                    *period_filter,
                 )
             )
-            .group_by(Transaction.category)
+            .group_by(spending.c.type, spending.c.category)
+            .subquery()
+        )
+
+        # Find budget that covers this period
+        budget = (
+            select(Budget.id, Budget.name, Budget.allocations)
+            .where(
+                and_(
+                    Budget.user_id == user_id,
+                    Budget.period_start <= start_date,
+                    Budget.period_end >= end_date,
+                )
+            )
+            .order_by(Budget.created_at.desc())
+            .limit(1)
+            .subquery()
+        )
+
+        anchor = select(literal(1).label("anchor")).subquery()
+        stmt = (
+            select(
+                totals.c.type,
+                totals.c.category,
+                totals.c.total,
+                totals.c.count,
+                totals.c.previous_total,
+                budget.c.id.label("budget_id"),
+                budget.c.name.label("budget_name"),
+                budget.c.allocations.label("budget_allocations"),
+            )
+            .select_from(anchor.outerjoin(totals, true()).outerjoin(budget, true()))
+            .order_by(totals.c.type, totals.c.category)
         )
 
         result = await self.db.execute(stmt)
         rows = result.all()
 
-        income_by_category = {row.category: Decimal(str(row.total)) for row in rows}
+        data = _ReportData()
+        first = rows[0]
+        if first.budget_id is not None:
+            data.budget_id = first.budget_id
+            data.budget_name = first.budget_name
+            data.budget_allocations = first.budget_allocations
+
+        for row in rows:
+            if row.type is None:  # Constant row with no transactions joined
+                continue
+            if row.type == "INCOME":
+                by_category, counts = data.income, data.income_counts
+            else:
+                by_category, counts = data.expenses, data.expense_counts
+                if row.previous_total is not None:
+                    data.previous_expenses[row.category] = Decimal(str(row.previous_total))
+            if row.count:
+                by_category[row.category] = Decimal(str(row.total))
+                counts[row.category] = int(row.count)
+
+        return data
+
+    def _generate_income_summary(self, data: _ReportData) -> IncomeSummary:
+        """Generate income summary for the period."""
+        income_by_category = dict(data.income)
 
         total_income = sum(income_by_category.values(), Decimal(0))
-        transaction_count = sum(row.count for row in rows)
+        transaction_count = sum(data.income_counts.values())
 
         return IncomeSummary(
             total_income=total_income,
@@ -194,36 +311,12 @@ class ReportService:
             transaction_count=transaction_count,
         )
 
-    async def _generate_expense_summary(
-        self, user_id: UUID, start_date: date_type, end_date: date_type
-    ) -> ExpenseSummary:
+    def _generate_expense_summary(self, data: _ReportData) -> ExpenseSummary:
         """Generate expense summary for the period."""
-        # Get all expense transactions
-        stmt = (
-            select(
-                Transaction.category,
-                func.sum(Transaction.amount).label("total"),
-                func.count(Transaction.id).label("count"),
-            )
-            .where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == "EXPENSE",
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date,
-                    Transaction.deleted_at.is_(None),
-                )
-            )
-            .group_by(Transaction.category)
-        )
-
-        result = await self.db.execute(stmt)
-        rows = result.all()
-
-        expenses_by_category = {row.category: Decimal(str(row.total)) for row in rows}
+        expenses_by_category = dict(data.expenses)
 
         total_expenses = sum(expenses_by_category.values(), Decimal(0))
-        transaction_count = sum(row.count for row in rows)
+        transaction_count = sum(data.expense_counts.values())
         average_transaction = (
             total_expenses / transaction_count if transaction_count > 0 else Decimal(0)
         )
@@ -256,53 +349,20 @@ class ReportService:
 
         return savings_rate, net_savings
 
-    async def _analyze_budget_adherence(
-        self, user_id: UUID, start_date: date_type, end_date: date_type
-    ) -> Optional[BudgetAdherence]:
+    def _analyze_budget_adherence(self, data: _ReportData) -> Optional[BudgetAdherence]:
         """Analyze budget adherence for the period."""
-        # Find budget that covers this period
-        stmt = (
-            select(Budget)
-            .where(
-                and_(
-                    Budget.user_id == user_id,
-                    Budget.period_start <= start_date,
-                    Budget.period_end >= end_date,
-                )
-            )
-            .order_by(Budget.created_at.desc())
-        )
-
-        result = await self.db.execute(stmt)
-        budget = result.scalars().first()
-
-        if not budget:
+        if data.budget_id is None:
             return None
 
-        # Get actual spending by category
-        stmt = (
-            select(Transaction.category, func.sum(Transaction.amount).label("total"))
-            .where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == "EXPENSE",
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date,
-                    Transaction.deleted_at.is_(None),
-                )
-            )
-            .group_by(Transaction.category)
-        )
-
-        result = await self.db.execute(stmt)
-        actual_spending = {row.category: Decimal(str(row.total)) for row in result.all()}
+        # Actual spending by category
+        actual_spending = data.expenses
 
         # Calculate adherence for each category
         categories = {}
         total_budgeted = Decimal(0)
         total_actual = Decimal(0)
 
-        for category, budgeted_float in budget.allocations.items():
+        for category, budgeted_float in data.budget_allocations.items():
             budgeted = Decimal(str(budgeted_float))
             actual = actual_spending.get(category, Decimal(0))
             variance = budgeted - actual
@@ -325,44 +385,26 @@ class ReportService:
         )
 
         return BudgetAdherence(
-            budget_id=budget.id,
-            budget_name=budget.name,
+            budget_id=data.budget_id,
+            budget_name=data.budget_name,
             categories=categories,
             overall_adherence=overall_adherence,
         )
 
-    async def _detect_spending_changes(
-        self, user_id: UUID, start_date: date_type, end_date: date_type
+    def _detect_spending_changes(
+        self, current_spending: Dict[str, Decimal], previous_spending: Dict[str, Decimal]
     ) -> List[SpendingChange]:
         """Detect significant spending pattern changes.
 
         Requirement 11.4: Highlight significant changes (>25%) in spending patterns
 
         Args:
-            user_id: User ID
-            start_date: Current period start date
-            end_date: Current period end date
+            current_spending: Spending by category for the report period
+            previous_spending: Spending by category for the previous period
 
         Returns:
             List of spending changes
         """
-        # Calculate period length
-        period_days = (end_date - start_date).days + 1
-
-        # Calculate previous period dates
-        from datetime import timedelta
-
-        previous_end = start_date - timedelta(days=1)
-        previous_start = previous_end - timedelta(days=period_days - 1)
-
-        # Get current period spending
-        current_spending = await self._get_spending_by_category(user_id, start_date, end_date)
-
-        # Get previous period spending
-        previous_spending = await self._get_spending_by_category(
-            user_id, previous_start, previous_end
-        )
-
         # Detect changes
         changes = []
         all_categories = set(current_spending.keys()) | set(previous_spending.keys())
@@ -404,28 +446,6 @@ class ReportService:
 
         return changes
 
-    async def _get_spending_by_category(
-        self, user_id: UUID, start_date: date_type, end_date: date_type
-    ) -> Dict[str, Decimal]:
-        """Get spending by category for a period."""
-        stmt = (
-            select(Transaction.category, func.sum(Transaction.amount).label("total"))
-            .where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == "EXPENSE",
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date,
-                    Transaction.deleted_at.is_(None),
-                )
-            )
-            .group_by(Transaction.category)
-        )
-
-        result = await self.db.execute(stmt)
-
-        return {row.category: Decimal(str(row.total)) for row in result.all()}
-
     def export_to_csv(self, report: FinancialReport) -> bytes:
         """Export report to CSV format.
 
@@ -0,0 +1,295 @@
+"""Spending aggregate queries backed by the daily rollup table."""
+
+from dataclasses import dataclass
+from datetime import date as date_type
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, cast
+from uuid import UUID
+
+from sqlalchemy import (
+    ColumnElement,
+    CursorResult,
+    Subquery,
+    Table,
+    delete,
+    func,
+    literal,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.logging_config import get_logger
+from app.models.spending_rollup import (
+    SpendingRollup,
+    rollup_insert_from_select,
+    rollup_lock,
+    rollup_select_from_transactions,
+)
+from app.models.transaction import Transaction
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SpendingAggregate:
+    """Aggregated transaction amounts for a group (category or day)."""
+
+    total: Decimal
+    count: int
+    sum_sq: Decimal
+    min_amount: Decimal
+    max_amount: Decimal
+
+    @property
+    def average(self) -> Decimal:
+        """Mean transaction amount."""
+        return self.total / self.count if self.count else Decimal(0)
+
+    @property
+    def stddev(self) -> Optional[Decimal]:
+        """Sample standard deviation of amounts, or None with fewer than two."""
+        if self.count < 2:
+            return None
+        variance = (self.sum_sq - self.total * self.total / self.count) / (self.count - 1)
+        return max(variance, Decimal(0)).sqrt()
+
+
+class RollupService:
+    """Query layer for per-category and per-day spending aggregates.
+
+    Every query runs over a source with one row per (user, date, category,
+    type): the spending_rollups table, or transactions projected to the same
+    columns when the rollup is disabled. Only day granularity is stored, so
+    callers needing per-transaction detail should query transactions directly.
+    """
+
+    def __init__(self, db: AsyncSession, use_rollup: Optional[bool] = None):
+        """Initialize rollup service.
+
+        Args:
+            db: Database session
+            use_rollup: Read from the rollup table (default: settings.use_spending_rollup)
+        """
+        self.db = db
+        self.use_rollup = settings.use_spending_rollup if use_rollup is None else use_rollup
+
+    def source(self) -> Subquery:
+        """Get the aggregate source as a subquery.
+
+        Columns: user_id, date, category, type, total, count, sum_sq,
+        min_amount, max_amount.
+        """
+        if self.use_rollup:
+            return select(SpendingRollup).subquery("spending")
+
+        return (
+            select(
+                Transaction.user_id,
+                Transaction.date,
+                Transaction.category,
+                Transaction.type,
+                Transaction.amount.label("total"),
+                literal(1).label("count"),
+                (Transaction.amount * Transaction.amount).label("sum_sq"),
+                Transaction.amount.label("min_amount"),
+                Transaction.amount.label("max_amount"),
+            )
+            .where(Transaction.deleted_at.is_(None))
+            .subquery("spending")
+        )
+
+    @staticmethod
+    def _conditions(
+        source: Subquery,
+        user_id: UUID,
+        start_date: Optional[date_type],
+        end_date: Optional[date_type],
+        txn_type: Optional[str],
+        category: Optional[str],
+    ) -> List[ColumnElement[bool]]:
+        """Build WHERE conditions over a source subquery."""
+        conditions = [source.c.user_id == user_id]
+        if txn_type is not None:
+            conditions.append(source.c.type == txn_type)
+        if start_date is not None:
+            conditions.append(source.c.date >= start_date)
+        if end_date is not None:
+            conditions.append(source.c.date <= end_date)
+        if category is not None:
+            conditions.append(source.c.category == category)
+        return conditions
+
+    @staticmethod
+    def _aggregate_columns(source: Subquery) -> List[ColumnElement[Any]]:
+        """Aggregate columns combining source rows."""
+        return [
+            func.sum(source.c.total).label("total"),
+            func.sum(source.c.count).label("count"),
+            func.sum(source.c.sum_sq).label("sum_sq"),
+            func.min(source.c.min_amount).label("min_amount"),
+            func.max(source.c.max_amount).label("max_amount"),
+        ]
+
+    @staticmethod
+    def _to_aggregate(row: Any) -> SpendingAggregate:
+        return SpendingAggregate(
+            total=Decimal(str(row.total)),
+            count=int(row.count),
+            sum_sq=Decimal(str(row.sum_sq)),
+            min_amount=Decimal(str(row.min_amount)),
+            max_amount=Decimal(str(row.max_amount)),
+        )
+
+    async def category_aggregates(
+        self,
+        user_id: UUID,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None,
+        txn_type: str = "EXPENSE",
+        category: Optional[str] = None,
+    ) -> Dict[str, SpendingAggregate]:
+        """Get aggregates per category, largest total first.
+
+        Args:
+            user_id: User ID
+            start_date: First date included (None for no lower bound)
+            end_date: Last date included (None for no upper bound)
+            txn_type: Transaction type (EXPENSE or INCOME)
+            category: Restrict to a single category
+
+        Returns:
+            Dictionary mapping category to SpendingAggregate
+        """
+        source = self.source()
+        conditions = self._conditions(source, user_id, start_date, end_date, txn_type, category)
+        stmt = (
+            select(source.c.category, *self._aggregate_columns(source))
+            .where(*conditions)
+            .group_by(source.c.category)
+            .order_by(func.sum(source.c.total).desc(), source.c.category)
+        )
+
+        result = await self.db.execute(stmt)
+        return {row.category: self._to_aggregate(row) for row in result.all()}
+
+    async def category_totals(
+        self,
+        user_id: UUID,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None,
+        txn_type: str = "EXPENSE",
+    ) -> Dict[str, Decimal]:
+        """Get total amount per category, largest first."""
+        aggregates = await self.category_aggregates(user_id, start_date, end_date, txn_type)
+        return {category: aggregate.total for category, aggregate in aggregates.items()}
+
+    async def total(
+        self,
+        user_id: UUID,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None,
+        txn_type: str = "EXPENSE",
+        category: Optional[str] = None,
+    ) -> Decimal:
+        """Get the total amount over a date range."""
+        source = self.source()
+        conditions = self._conditions(source, user_id, start_date, end_date, txn_type, category)
+        stmt = select(func.sum(source.c.total)).where(*conditions)
+
+        result = await self.db.execute(stmt)
+        total = result.scalar()
+        return Decimal(str(total)) if total is not None else Decimal(0)
+
+    async def count(
+        self,
+        user_id: UUID,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None,
+        txn_type: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> int:
+        """Get the number of transactions over a date range (both types by default)."""
+        source = self.source()
+        conditions = self._conditions(source, user_id, start_date, end_date, txn_type, category)
+        stmt = select(func.sum(source.c.count)).where(*conditions)
+
+        result = await self.db.execute(stmt)
+        return int(result.scalar() or 0)
+
+    async def daily_aggregates(
+        self,
+        user_id: UUID,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None,
+        txn_type: str = "EXPENSE",
+        category: Optional[str] = None,
+    ) -> Dict[date_type, SpendingAggregate]:
+        """Get aggregates per day, in date order (days without transactions omitted)."""
+        source = self.source()
+        conditions = self._conditions(source, user_id, start_date, end_date, txn_type, category)
+        stmt = (
+            select(source.c.date, *self._aggregate_columns(source))
+            .where(*conditions)
+            .group_by(source.c.date)
+            .order_by(source.c.date)
+        )
+
+        result = await self.db.execute(stmt)
+        return {row.date: self._to_aggregate(row) for row in result.all()}
+
+    async def categories(
+        self,
+        user_id: UUID,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None,
+        txn_type: str = "EXPENSE",
+    ) -> List[str]:
+        """Get the categories with transactions in a date range."""
+        source = self.source()
+        conditions = self._conditions(source, user_id, start_date, end_date, txn_type, None)
+        stmt = select(source.c.category).where(*conditions).distinct()
+
+        result = await self.db.execute(stmt)
+        return [row.category for row in result.all()]
+
+    async def rebuild(self, user_id: Optional[UUID] = None) -> int:
+        """Recompute rollup rows from transactions.
+
+        Used for backfills and to repair drift. Runs in the caller's
+        transaction; commit afterwards. Transaction writes are held off
+        until then: those of the user, through the rollup advisory lock,
+        or all of them (SHARE lock on transactions) for a full rebuild.
+
+        Args:
+            user_id: Rebuild one user's rows (default: all users)
+
+        Returns:
+            Number of rollup rows written
+        """
+        table = cast(Table, SpendingRollup.__table__)
+        clear = delete(table)
+        conditions = []
+        if user_id is not None:
+            clear = clear.where(table.c.user_id == user_id)
+            conditions.append(Transaction.user_id == user_id)
+            await self.db.execute(rollup_lock(user_id))
+        else:
+            await self.db.execute(text("LOCK TABLE transactions IN SHARE MODE"))
+
+        await self.db.execute(clear)
+        result = cast(
+            CursorResult[Any],
+            await self.db.execute(
+                rollup_insert_from_select(rollup_select_from_transactions(*conditions))
+            ),
+        )
+
+        logger.info(
+            "Spending rollups rebuilt",
+            user_id=str(user_id) if user_id else "all",
+            rows=result.rowcount,
+        )
+
+        return result.rowcount
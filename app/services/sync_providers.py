@@ -0,0 +1,140 @@
+"""Provider adapters for syncing bank connection transactions.
+
+A provider reports an account's transaction changes in pages, each ending
+with an opaque cursor. Asking again with that cursor returns only what
+changed since, so an account without new activity costs one call. Adapters
+normalize their API's transactions into ProviderTransaction: non-negative
+amounts with an INCOME or EXPENSE type, like the transactions table.
+
+FakeProvider keeps accounts in memory, for tests and local development.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class ProviderError(Exception):
+    """Exception raised when a provider can't return an account's changes."""
+
+    pass
+
+
+class ProviderAuthError(ProviderError):
+    """Exception raised when a connection's access token is no longer accepted."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class ProviderTransaction:
+    """A transaction as reported by a provider."""
+
+    external_id: str
+    amount: Decimal
+    date: date
+    description: str
+    type: str = "EXPENSE"
+
+
+@dataclass
+class SyncPage:
+    """One page of an account's changes after a cursor."""
+
+    added: List[ProviderTransaction] = field(default_factory=list)
+    modified: List[ProviderTransaction] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)  # external IDs
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the page holds no changes."""
+        return not (self.added or self.modified or self.removed)
+
+
+class SyncProvider:
+    """Interface of a transaction sync provider."""
+
+    name = "base"
+
+    async def fetch_changes(self, access_token: str, cursor: Optional[str], count: int) -> SyncPage:
+        """
+        Get an account's changes after a cursor.
+
+        Args:
+            access_token: Decrypted access token of the connection
+            cursor: Cursor returned with the previous page (None for full history)
+            count: Maximum changes to return
+
+        Returns:
+            SyncPage whose next_cursor resumes after it
+
+        Raises:
+            ProviderAuthError: If the access token is no longer valid
+            ProviderError: If the changes can't be fetched now
+        """
+        raise NotImplementedError
+
+
+class FakeProvider(SyncProvider):
+    """In-memory provider keeping each account's changes in order."""
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0):
+        """
+        Initialize the fake provider.
+
+        Args:
+            latency: Seconds each call waits, to simulate network round trips
+        """
+        self.latency = latency
+        self.calls = 0
+        self._changes: Dict[str, List[Tuple[str, object]]] = {}
+        self._revoked: set = set()
+
+    def add(self, access_token: str, *transactions: ProviderTransaction) -> None:
+        """Report new transactions on an account."""
+        self._log(access_token, "added", transactions)
+
+    def modify(self, access_token: str, *transactions: ProviderTransaction) -> None:
+        """Report changes to previously reported transactions."""
+        self._log(access_token, "modified", transactions)
+
+    def remove(self, access_token: str, *external_ids: str) -> None:
+        """Report transactions as removed (e.g. expired pending ones)."""
+        self._log(access_token, "removed", external_ids)
+
+    def revoke(self, access_token: str) -> None:
+        """Make calls with an access token fail authentication."""
+        self._revoked.add(access_token)
+
+    def _log(self, access_token: str, kind: str, items) -> None:
+        self._changes.setdefault(access_token, []).extend((kind, item) for item in items)
+
+    async def fetch_changes(self, access_token: str, cursor: Optional[str], count: int) -> SyncPage:
+        """Get an account's changes after a cursor (see SyncProvider)."""
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if access_token in self._revoked:
+            raise ProviderAuthError("Access token revoked")
+
+        changes = self._changes.get(access_token, [])
+        try:
+            start = int(cursor) if cursor else 0
+        except ValueError:
+            raise ProviderError(f"Invalid cursor: {cursor}")
+        end = min(start + count, len(changes))
+
+        page = SyncPage(next_cursor=str(end), has_more=end < len(changes))
+        for kind, item in changes[start:end]:
+            getattr(page, kind).append(item)
+        return page
@@ -0,0 +1,333 @@
+"""Incremental transaction sync for bank connections.
+
+ConnectionSyncService pulls each connection's changes from a provider
+adapter (see app.services.sync_providers), starting at the cursor saved by
+the previous sync. Connections sync concurrently, at most SYNC_CONCURRENCY
+at once and each in its own session; a connection's pages are applied in
+order.
+
+Each page commits together with the cursor that follows it, so an
+interrupted sync resumes where it stopped. Provider transactions are
+matched to rows by (connection, external ID) with one query per page. New
+ones are categorized in one batch and inserted together, and existing rows
+are only updated when the provider changed them. An account without new
+activity therefore costs one provider call and no writes. Removed
+transactions are soft-deleted; rows the user deleted stay deleted.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache import invalidate_user_cache
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.logging_config import get_logger
+from app.metrics.sync_metrics import sync_metrics
+from app.ml.categorization_engine import CategorizationEngine
+from app.models.connection import Connection
+from app.models.transaction import Transaction
+from app.services.encryption_service import encryption_service
+from app.services.sync_providers import (
+    ProviderAuthError,
+    ProviderTransaction,
+    SyncPage,
+    SyncProvider,
+)
+
+logger = get_logger(__name__)
+
+# Transaction fields a provider reports, compared to detect modifications
+_SYNCED_FIELDS = ("amount", "date", "description", "type")
+
+# External IDs looked up per query
+_LOOKUP_BATCH_SIZE = 1000
+
+
+@dataclass
+class SyncResult:
+    """Outcome of syncing one connection."""
+
+    connection_id: UUID
+    provider_calls: int = 0
+    added: int = 0
+    modified: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    duration_seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def changed(self) -> int:
+        """Number of transactions written."""
+        return self.added + self.modified + self.removed
+
+
+class ConnectionSyncService:
+    """Service syncing connections' transactions from a provider."""
+
+    def __init__(
+        self,
+        provider: SyncProvider,
+        categorization_engine: Optional[CategorizationEngine] = None,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        concurrency: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ):
+        """
+        Initialize the sync service.
+
+        Args:
+            provider: Adapter for the connections' provider
+            categorization_engine: Engine categorizing new transactions
+                (they're "Uncategorized" without one)
+            session_factory: Async session factory; each connection gets its own session
+            concurrency: Connections synced at once (defaults to SYNC_CONCURRENCY)
+            page_size: Changes per provider call (defaults to SYNC_PAGE_SIZE)
+        """
+        self.provider = provider
+        self.categorization_engine = categorization_engine
+        self.session_factory = session_factory
+        self.page_size = page_size or settings.sync_page_size
+        self._semaphore = asyncio.Semaphore(concurrency or settings.sync_concurrency)
+        self._syncing: set = set()
+
+    async def sync_all(self) -> List[SyncResult]:
+        """Sync every active connection."""
+        async with self.session_factory() as db:
+            result = await db.execute(select(Connection.id).where(Connection.status == "ACTIVE"))
+            connection_ids = list(result.scalars())
+        return await self.sync_connections(connection_ids)
+
+    async def sync_connections(self, connection_ids: Iterable[UUID]) -> List[SyncResult]:
+        """
+        Sync connections concurrently.
+
+        A failing connection doesn't stop the others; its result carries the error.
+
+        Args:
+            connection_ids: Connections to sync
+
+        Returns:
+            One SyncResult per connection, in the given order
+        """
+        # Tokens read more than once in the batch are decrypted once
+        with encryption_service.secret_cache():
+            return list(
+                await asyncio.gather(*(self.sync_connection(cid) for cid in connection_ids))
+            )
+
+    async def sync_connection(self, connection_id: UUID) -> SyncResult:
+        """
+        Sync one connection's changes since its last sync.
+
+        Args:
+            connection_id: Connection ID
+
+        Returns:
+            SyncResult with the provider calls made and transactions written
+        """
+        result = SyncResult(connection_id=connection_id)
+        if connection_id in self._syncing:
+            result.error = "Sync already in progress"
+            return result
+
+        self._syncing.add(connection_id)
+        outcome = "success"
+        try:
+            async with self._semaphore:
+                sync_metrics.in_flight.inc()
+                start = time.perf_counter()
+                try:
+                    await self._sync(connection_id, result)
+                except ProviderAuthError as e:
+                    outcome = "expired"
+                    result.error = str(e)
+                    logger.warning(
+                        "Connection access expired",
+                        connection_id=str(connection_id),
+                        error=str(e),
+                    )
+                except Exception as e:
+                    outcome = "error"
+                    result.error = str(e)
+                    logger.error(
+                        "Connection sync failed",
+                        connection_id=str(connection_id),
+                        provider=self.provider.name,
+                        error=str(e),
+                    )
+                finally:
+                    result.duration_seconds = time.perf_counter() - start
+                    sync_metrics.in_flight.dec()
+        finally:
+            self._syncing.discard(connection_id)
+
+        provider = self.provider.name
+        sync_metrics.duration.labels(provider=provider, outcome=outcome).observe(
+            result.duration_seconds
+        )
+        for change in ("added", "modified", "removed"):
+            count = getattr(result, change)
+            if count:
+                sync_metrics.transactions.labels(provider=provider, change=change).inc(count)
+
+        logger.info(
+            "Connection synced",
+            connection_id=str(connection_id),
+            outcome=outcome,
+            provider_calls=result.provider_calls,
+            added=result.added,
+            modified=result.modified,
+            removed=result.removed,
+            unchanged=result.unchanged,
+            duration_ms=round(result.duration_seconds * 1000, 1),
+        )
+        return result
+
+    async def _sync(self, connection_id: UUID, result: SyncResult) -> None:
+        async with self.session_factory() as db:
+            connection = await db.get(Connection, connection_id)
+            if connection is None or connection.status != "ACTIVE":
+                result.error = "Connection not found or not active"
+                return
+
+            user_id = connection.user_id
+            access_token = connection.access_token
+            cursor = connection.sync_cursor
+            while True:
+                try:
+                    page = await self.provider.fetch_changes(access_token, cursor, self.page_size)
+                except ProviderAuthError:
+                    connection.status = "EXPIRED"
+                    await db.commit()
+                    raise
+                result.provider_calls += 1
+                sync_metrics.provider_calls.labels(provider=self.provider.name).inc()
+
+                wrote = await self._apply_page(db, user_id, connection_id, page, result)
+                if wrote or page.next_cursor != cursor:
+                    connection.sync_cursor = page.next_cursor
+                    connection.last_sync = datetime.utcnow()
+                    await db.commit()
+
+                cursor = page.next_cursor
+                if not page.has_more:
+                    break
+
+    async def _apply_page(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        connection_id: UUID,
+        page: SyncPage,
+        result: SyncResult,
+    ) -> bool:
+        """Stage a page's changes and flush them; returns whether anything was written."""
+        removed = set(page.removed)
+        incoming: Dict[str, ProviderTransaction] = {}
+        for txn in page.added + page.modified:
+            # Duplicates within a page collapse to the latest report
+            if txn.external_id not in removed:
+                incoming[txn.external_id] = txn
+        if not incoming and not removed:
+            return False
+
+        existing = await self._existing(db, connection_id, [*incoming, *removed])
+        new_transactions = []
+        for external_id, txn in incoming.items():
+            row = existing.get(external_id)
+            if row is None:
+                new_transactions.append(txn)
+                continue
+
+            changes = {
+                name: getattr(txn, name)
+                for name in _SYNCED_FIELDS
+                if getattr(row, name) != getattr(txn, name)
+            }
+            if changes and row.deleted_at is None:
+                for name, value in changes.items():
+                    setattr(row, name, value)
+                result.modified += 1
+            else:
+                result.unchanged += 1
+
+        now = datetime.utcnow()
+        for external_id in removed:
+            row = existing.get(external_id)
+            if row is not None and row.deleted_at is None:
+                row.deleted_at = now
+                result.removed += 1
+
+        if new_transactions:
+            db.add_all(await self._new_rows(user_id, connection_id, new_transactions))
+            result.added += len(new_transactions)
+
+        if not (db.new or db.dirty):
+            return False
+        await db.flush()
+        invalidate_user_cache(db, user_id)
+        return True
+
+    async def _existing(
+        self, db: AsyncSession, connection_id: UUID, external_ids: List[str]
+    ) -> Dict[str, Transaction]:
+        """Load a connection's transactions with the given external IDs."""
+        found = {}
+        for start in range(0, len(external_ids), _LOOKUP_BATCH_SIZE):
+            stmt = select(Transaction).where(
+                Transaction.connection_id == connection_id,
+                Transaction.external_id.in_(external_ids[start : start + _LOOKUP_BATCH_SIZE]),
+            )
+            for row in (await db.execute(stmt)).scalars():
+                found[row.external_id] = row
+        return found
+
+    async def _new_rows(
+        self, user_id: UUID, connection_id: UUID, transactions: List[ProviderTransaction]
+    ) -> List[Transaction]:
+        """Build rows for new provider transactions, categorized in one batch."""
+        rows = [
+            Transaction(
+                user_id=user_id,
+                amount=txn.amount,
+                date=txn.date,
+                description=txn.description,
+                category="Uncategorized",
+                type=txn.type,
+                source="API",
+                connection_id=connection_id,
+                external_id=txn.external_id,
+            )
+            for txn in transactions
+        ]
+        if self.categorization_engine is None:
+            return rows
+
+        try:
+            predictions = await asyncio.to_thread(
+                self.categorization_engine.categorize_batch,
+                [txn.description for txn in transactions],
+                [txn.amount for txn in transactions],
+                str(user_id),
+            )
+        except Exception as e:
+            logger.warning(
+                "Synced transactions left uncategorized",
+                connection_id=str(connection_id),
+                count=len(rows),
+                error=str(e),
+            )
+            return rows
+
+        for row, prediction in zip(rows, predictions):
+            row.category = prediction.category
+            row.confidence_score = prediction.confidence
+        return rows
@@ -0,0 +1,200 @@
+"""Token blacklist with a process-local bloom filter in front of Redis.
+
+Blacklisted tokens live in Redis (blacklist:<token>) until they would have
+expired anyway. Each process keeps a bloom filter of them, built by scanning
+Redis and kept current through CacheManager's pub/sub invalidations. A
+token the filter has never seen is definitely not blacklisted, so the
+common case needs no network hop; possible hits are confirmed in Redis.
+
+The filter is only trusted while the invalidation subscription is up.
+Otherwise every check goes to Redis, as before.
+"""
+
+import asyncio
+import hashlib
+import math
+import time
+from typing import Iterator, List, Optional
+
+from app.cache import CacheManager, cache_manager
+from app.config import settings
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        """Initialize bloom filter.
+
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: False positive rate at capacity
+        """
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+
+class TokenBlacklist:
+    """Revoked JWTs, checked locally where possible."""
+
+    KEY_PREFIX = "blacklist:"
+
+    # False positive rate of the filter; each one costs a Redis GET
+    ERROR_RATE = 0.001
+
+    # Expired tokens stay in the filter until it is rebuilt
+    REBUILD_INTERVAL = 3600  # 1 hour
+    # Minimum gap between attempts while no filter is usable
+    RETRY_DELAY = 10.0  # seconds
+
+    def __init__(self, cache: CacheManager, capacity: Optional[int] = None) -> None:
+        """Initialize blacklist.
+
+        Args:
+            cache: Cache manager whose Redis holds the blacklist
+            capacity: Tokens the filter is sized for (defaults to the setting)
+        """
+        self.cache = cache
+        self.capacity = capacity or settings.token_blacklist_capacity
+        # None while the filter can't be trusted
+        self._bloom: Optional[BloomFilter] = None
+        self._building: Optional[BloomFilter] = None
+        self._built_at = 0.0
+        self._attempted_at = -math.inf
+        self._rebuild_task: Optional[asyncio.Task] = None
+        self._stats = {"local_negatives": 0, "redis_checks": 0, "rebuilds": 0}
+        cache.add_invalidation_listener(self._on_invalidation)
+
+    def _key(self, token: str) -> str:
+        return f"{self.KEY_PREFIX}{token}"
+
+    async def add(self, token: str, expires_in: int) -> None:
+        """Blacklist a token until it expires.
+
+        Args:
+            token: JWT to revoke
+            expires_in: Seconds until the token would expire anyway
+        """
+        await self.cache.set(self._key(token), "1", expire=expires_in)
+        # Other processes learn about it from the write's invalidation
+        for bloom in (self._bloom, self._building):
+            if bloom is not None:
+                bloom.add(token)
+
+    async def contains(self, token: str) -> bool:
+        """Check whether a token has been blacklisted.
+
+        Args:
+            token: JWT to check
+
+        Returns:
+            True if the token is blacklisted
+        """
+        bloom = self._bloom
+        if self.cache.tracking:
+            now = time.monotonic()
+            if bloom is None:
+                if now - self._attempted_at > self.RETRY_DELAY:
+                    self._schedule_rebuild()
+            elif now - self._built_at > self.REBUILD_INTERVAL or bloom.count > self.capacity:
+                self._schedule_rebuild()
+            if bloom is not None and token not in bloom:
+                self._stats["local_negatives"] += 1
+                return False
+
+        self._stats["redis_checks"] += 1
+        return await self.cache.get(self._key(token)) is not None
+
+    def _on_invalidation(self, keys: Optional[List[str]]) -> None:
+        if keys is None:
+            # Writes may have been missed; stop trusting the filter
+            self._bloom = None
+            self._building = None
+            if self.cache.tracking:
+                self._schedule_rebuild()
+            return
+
+        prefix = self.cache._make_key(self.KEY_PREFIX)
+        for key in keys:
+            if key.startswith(prefix):
+                for bloom in (self._bloom, self._building):
+                    if bloom is not None:
+                        bloom.add(key[len(prefix) :])
+
+    def _schedule_rebuild(self) -> None:
+        if self._rebuild_task is None or self._rebuild_task.done():
+            self._rebuild_task = asyncio.create_task(self.rebuild())
+
+    async def rebuild(self) -> bool:
+        """Rebuild the filter from the blacklist keys in Redis.
+
+        Tokens blacklisted while the scan runs are added from their
+        invalidations. The result is discarded if the subscription dropped
+        in the meantime.
+
+        Returns:
+            True if the filter is now in use
+        """
+        if not self.cache.redis or not self.cache.tracking:
+            return False
+
+        self._attempted_at = time.monotonic()
+        bloom = BloomFilter(self.capacity, self.ERROR_RATE)
+        self._building = bloom
+        prefix = self.cache._make_key(self.KEY_PREFIX)
+        try:
+            async for key in self.cache.redis.scan_iter(match=f"{prefix}*", count=1000):
+                if isinstance(key, bytes):
+                    key = key.decode()
+                bloom.add(key[len(prefix) :])
+        except Exception as e:
+            logger.error("Token blacklist filter rebuild failed", error=str(e))
+            return False
+        finally:
+            if self._building is bloom:
+                self._building = None
+            else:
+                # An invalidation reset the build while we were scanning
+                bloom = None
+
+        if bloom is None or not self.cache.tracking:
+            return False
+
+        self._bloom = bloom
+        self._built_at = time.monotonic()
+        self._stats["rebuilds"] += 1
+        logger.info("Token blacklist filter rebuilt", tokens=bloom.count)
+        return True
+
+    def get_stats(self) -> dict:
+        """Get blacklist check statistics."""
+        stats = self._stats.copy()
+        stats["filter_active"] = self._bloom is not None and self.cache.tracking
+        stats["filter_tokens"] = self._bloom.count if self._bloom is not None else 0
+        return stats
+
+
+# Global blacklist instance
+token_blacklist = TokenBlacklist(cache_manager)
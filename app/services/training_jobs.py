@@ -0,0 +1,529 @@
+"""Background training of user categorization models.
+
+Retraining a user model from all of its corrections takes seconds of CPU,
+too long for the request path. With a TrainingJobManager running, the
+categorization engine requests trainings from it instead. Jobs are queued
+per user and a newer request replaces a queued one (the job trains on
+every correction logged by the time it runs anyway). A bounded process
+pool runs them, away from the API worker's CPU. Each trained model is
+swapped into the engine in one step, then registered through
+MLModelService as the user's active version. Only the newest
+TRAINING_MODEL_VERSIONS model files of a user are kept; older versions
+stay in the registry without their files.
+
+The queue lives in process by default (TRAINING_QUEUE_BACKEND=memory). With
+the Redis backend it is shared by every worker: whichever is free takes a
+job, and the others are told over pub/sub to reload the model it trained.
+"""
+
+import asyncio
+import json
+import uuid
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncContextManager, Callable, Deque, Dict, List, Optional, Union
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.logging_config import get_logger
+from app.ml.categorization_engine import (
+    CategorizationEngine,
+    prune_user_model_versions,
+    train_user_model_version,
+)
+from app.services.ml_model_service import MLModelService
+
+logger = get_logger(__name__)
+
+
+class JobStatus(str, Enum):
+    """Training job states."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SUPERSEDED = "superseded"
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+@dataclass
+class TrainingJob:
+    """A request to retrain one user's categorization model."""
+
+    user_id: str
+    reason: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = JobStatus.QUEUED
+    enqueued_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    model_version: Optional[str] = None
+    accuracy: Optional[float] = None
+    training_samples: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def wait_seconds(self) -> Optional[float]:
+        """Time spent queued, None while still queued."""
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.enqueued_at).total_seconds()
+
+    @property
+    def run_seconds(self) -> Optional[float]:
+        """Time spent training, None until finished."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "reason": self.reason,
+            "status": self.status.value,
+            "enqueued_at": _isoformat(self.enqueued_at),
+            "started_at": _isoformat(self.started_at),
+            "finished_at": _isoformat(self.finished_at),
+            "wait_seconds": self.wait_seconds,
+            "run_seconds": self.run_seconds,
+            "model_version": self.model_version,
+            "accuracy": self.accuracy,
+            "training_samples": self.training_samples,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TrainingJob":
+        return cls(
+            user_id=data["user_id"],
+            reason=data["reason"],
+            id=data["id"],
+            status=JobStatus(data["status"]),
+            enqueued_at=datetime.fromisoformat(data["enqueued_at"]),
+            started_at=_parse_datetime(data.get("started_at")),
+            finished_at=_parse_datetime(data.get("finished_at")),
+            model_version=data.get("model_version"),
+            accuracy=data.get("accuracy"),
+            training_samples=data.get("training_samples"),
+            error=data.get("error"),
+        )
+
+
+class InMemoryJobQueue:
+    """Training job queue local to this process."""
+
+    def __init__(self, history: int = 200):
+        """
+        Initialize the queue.
+
+        Args:
+            history: Finished jobs to remember
+        """
+        # Insertion ordered; replacing a user's job keeps its place in line
+        self._queued: Dict[str, TrainingJob] = {}
+        self._running: Dict[str, TrainingJob] = {}
+        self._finished: Deque[TrainingJob] = deque(maxlen=history)
+        self._available = asyncio.Condition()
+
+    async def enqueue(self, job: TrainingJob) -> Optional[TrainingJob]:
+        """Queue a job; returns the queued job it replaced, if any."""
+        async with self._available:
+            previous = self._queued.get(job.user_id)
+            self._queued[job.user_id] = job
+            self._available.notify()
+        return previous
+
+    async def dequeue(self, timeout: float) -> Optional[TrainingJob]:
+        """Take the next job, waiting up to timeout seconds for one."""
+        async with self._available:
+            try:
+                await asyncio.wait_for(
+                    self._available.wait_for(lambda: bool(self._queued)), timeout
+                )
+            except asyncio.TimeoutError:
+                return None
+            user_id = next(iter(self._queued))
+            job = self._queued.pop(user_id)
+            self._running[job.id] = job
+        return job
+
+    async def finish(self, job: TrainingJob) -> None:
+        """Move a job to the finished history."""
+        self._running.pop(job.id, None)
+        self._finished.appendleft(job)
+
+    async def jobs(self) -> Dict[str, List[TrainingJob]]:
+        """Queued (in order), running and finished (newest first) jobs."""
+        return {
+            "queued": list(self._queued.values()),
+            "running": list(self._running.values()),
+            "finished": list(self._finished),
+        }
+
+
+class RedisJobQueue:
+    """Training job queue shared by all workers through Redis."""
+
+    PREFIX = "ml:training"
+
+    def __init__(self, redis: Redis, history: int = 200):
+        """
+        Initialize the queue.
+
+        Args:
+            redis: Redis client
+            history: Finished jobs to remember
+        """
+        self.redis = redis
+        self.history = history
+        # User IDs in queue order, and each user's latest queued job
+        self.order_key = f"{self.PREFIX}:order"
+        self.queued_key = f"{self.PREFIX}:queued"
+        self.running_key = f"{self.PREFIX}:running"
+        self.finished_key = f"{self.PREFIX}:finished"
+
+    @staticmethod
+    def _load(value: Union[str, bytes]) -> TrainingJob:
+        return TrainingJob.from_dict(json.loads(value))
+
+    async def enqueue(self, job: TrainingJob) -> Optional[TrainingJob]:
+        """Queue a job; returns the queued job it replaced, if any."""
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hget(self.queued_key, job.user_id)
+        pipe.hset(self.queued_key, job.user_id, json.dumps(job.to_dict()))
+        previous, added = await pipe.execute()
+        if added:
+            await self.redis.rpush(self.order_key, job.user_id)
+        return self._load(previous) if previous else None
+
+    async def dequeue(self, timeout: float) -> Optional[TrainingJob]:
+        """Take the next job, waiting up to timeout seconds for one."""
+        popped = await self.redis.blpop([self.order_key], timeout=max(1, int(timeout)))
+        if popped is None:
+            return None
+        user_id = popped[1]
+
+        # Atomically, so a replacement queued meanwhile isn't lost
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hget(self.queued_key, user_id)
+        pipe.hdel(self.queued_key, user_id)
+        value, _ = await pipe.execute()
+        if value is None:
+            return None
+        job = self._load(value)
+        await self.redis.hset(self.running_key, job.id, json.dumps(job.to_dict()))
+        return job
+
+    async def finish(self, job: TrainingJob) -> None:
+        """Move a job to the finished history."""
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hdel(self.running_key, job.id)
+        pipe.lpush(self.finished_key, json.dumps(job.to_dict()))
+        pipe.ltrim(self.finished_key, 0, self.history - 1)
+        await pipe.execute()
+
+    async def jobs(self) -> Dict[str, List[TrainingJob]]:
+        """Queued (in order), running and finished (newest first) jobs."""
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.lrange(self.order_key, 0, -1)
+        pipe.hgetall(self.queued_key)
+        pipe.hgetall(self.running_key)
+        pipe.lrange(self.finished_key, 0, -1)
+        order, queued, running, finished = await pipe.execute()
+        return {
+            "queued": [self._load(queued[user_id]) for user_id in order if user_id in queued],
+            "running": [self._load(value) for value in running.values()],
+            "finished": [self._load(value) for value in finished],
+        }
+
+
+JobQueue = Union[InMemoryJobQueue, RedisJobQueue]
+
+
+class TrainingJobManager:
+    """Runs queued user model trainings on a bounded worker pool."""
+
+    # Seconds a worker waits for a job before checking again
+    POLL_INTERVAL = 5.0
+
+    # Seconds to wait before resubscribing to MODELS_CHANNEL after an error
+    RESUBSCRIBE_DELAY = 1.0
+
+    # Redis channel announcing newly trained models to other workers
+    MODELS_CHANNEL = "ml:training:models"
+
+    def __init__(
+        self,
+        engine: CategorizationEngine,
+        queue: JobQueue,
+        session_factory: Callable[[], AsyncContextManager[AsyncSession]] = AsyncSessionLocal,
+        workers: Optional[int] = None,
+        executor: str = "process",
+        redis: Optional[Redis] = None,
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            engine: Engine whose user models are trained
+            queue: InMemoryJobQueue or RedisJobQueue
+            session_factory: Async session factory for registering models
+            workers: Trainings run at once (defaults to TRAINING_WORKERS)
+            executor: "process" or "thread"
+            redis: Client for announcing new models to other workers
+        """
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown training executor: {executor}")
+        self.engine = engine
+        self.queue = queue
+        self.session_factory = session_factory
+        self.workers = workers or settings.training_workers
+        self.executor_kind = executor
+        self.redis = redis
+        self.instance_id = uuid.uuid4().hex
+
+        self._executor: Optional[Executor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._pending_requests: set = set()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="categorizer-training"
+                )
+        return self._executor
+
+    def start(self) -> None:
+        """Start the workers and route the engine's trainings to the queue."""
+        self._loop = asyncio.get_running_loop()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        if self.redis is not None:
+            self._tasks.append(asyncio.create_task(self._listen(self.redis)))
+        self.engine.training_scheduler = self.request_training
+        logger.info("Training job workers started", workers=self.workers)
+
+    async def stop(self) -> None:
+        """Stop the workers; queued jobs stay queued."""
+        if self.engine.training_scheduler == self.request_training:
+            self.engine.training_scheduler = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def request_training(self, user_id: str, reason: str) -> None:
+        """Queue a training without waiting; callable from any thread."""
+        if self._loop is None:
+            raise RuntimeError("Training job manager is not running")
+        coroutine = self.enqueue(user_id, reason)
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            task = self._loop.create_task(coroutine)
+            self._pending_requests.add(task)
+            task.add_done_callback(self._pending_requests.discard)
+        else:
+            asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    async def enqueue(self, user_id: str, reason: str) -> TrainingJob:
+        """
+        Queue a training for a user, replacing one already queued.
+
+        Args:
+            user_id: User ID
+            reason: Why the model needs training ("threshold", "new_category", ...)
+
+        Returns:
+            The queued job
+        """
+        job = TrainingJob(user_id=user_id, reason=reason)
+        previous = await self.queue.enqueue(job)
+        if previous is not None:
+            previous.status = JobStatus.SUPERSEDED
+            previous.finished_at = job.enqueued_at
+            await self.queue.finish(previous)
+        logger.info("Training job queued", job_id=job.id, user_id=user_id, reason=reason)
+        return job
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                job = await self.queue.dequeue(self.POLL_INTERVAL)
+                if job is not None:
+                    await self.run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Training job worker error", error=str(e), exc_info=True)
+                await asyncio.sleep(self.POLL_INTERVAL)
+
+    async def run_job(self, job: TrainingJob) -> TrainingJob:
+        """Train, register and install a user model for a dequeued job."""
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        # The job ID tells apart versions trained in the same second
+        version = f"{job.started_at:%Y%m%d%H%M%S}-{job.id[:5]}"
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._get_executor(),
+                train_user_model_version,
+                self.engine.model_dir,
+                job.user_id,
+                version,
+                self.engine.USER_MODEL_FEATURES,
+            )
+            metrics = result["metrics"]
+            installed = await asyncio.to_thread(
+                self.engine.install_user_model,
+                job.user_id,
+                result["model_path"],
+                metrics,
+                result["seq"],
+            )
+            if not installed:
+                raise RuntimeError("User corrections were deleted during training")
+            # Only an installed model becomes the active version
+            await self._register(job.user_id, version, result["model_path"], metrics)
+            await self._announce(job.user_id)
+            await asyncio.to_thread(
+                prune_user_model_versions,
+                self.engine.model_dir,
+                job.user_id,
+                settings.training_model_versions,
+            )
+
+            job.status = JobStatus.SUCCEEDED
+            job.model_version = version
+            job.accuracy = metrics["accuracy"]
+            job.training_samples = metrics["training_samples"]
+        except Exception as e:
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+            logger.error("Training job failed", job_id=job.id, user_id=job.user_id, error=str(e))
+        finally:
+            job.finished_at = datetime.utcnow()
+            await self.queue.finish(job)
+
+        logger.info(
+            "Training job finished",
+            job_id=job.id,
+            user_id=job.user_id,
+            status=job.status.value,
+            run_seconds=job.run_seconds,
+        )
+        return job
+
+    async def _register(self, user_id: str, version: str, model_path: str, metrics: dict) -> None:
+        """Record the model as the user's active categorization model."""
+        async with self.session_factory() as session:
+            service = MLModelService(session)
+            model = await service.create_model_version(
+                model_type="CATEGORIZATION",
+                version=version,
+                model_path=model_path,
+                accuracy=metrics["accuracy"],
+                precision=metrics["precision"],
+                recall=metrics["recall"],
+                user_id=UUID(user_id),
+            )
+            await service.activate_model_version(model.id)
+            await session.commit()
+
+    async def _announce(self, user_id: str) -> None:
+        if self.redis is None:
+            return
+        message = json.dumps({"user_id": user_id, "sender": self.instance_id})
+        await self.redis.publish(self.MODELS_CHANNEL, message)
+
+    async def _listen(self, redis: Redis) -> None:
+        """Reload models trained by other workers.
+
+        Resubscribes after connection errors; announcements sent meanwhile
+        are missed.
+        """
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(self.MODELS_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        data = json.loads(message["data"])
+                    except ValueError:
+                        continue
+                    if data.get("sender") != self.instance_id:
+                        self.engine.reload_user_model(data["user_id"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Training model listener error", error=str(e))
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+            await asyncio.sleep(self.RESUBSCRIBE_DELAY)
+
+    async def list_jobs(self) -> Dict[str, List[TrainingJob]]:
+        """Queued, running and finished jobs."""
+        return await self.queue.jobs()
+
+
+# Global manager instance, set while the application runs
+_training_job_manager: Optional[TrainingJobManager] = None
+
+
+def get_training_job_manager() -> Optional[TrainingJobManager]:
+    """Get the running TrainingJobManager, None if background training is off."""
+    return _training_job_manager
+
+
+async def start_training_jobs(engine: CategorizationEngine, redis: Optional[Redis]) -> None:
+    """Start background training for an engine (on application startup)."""
+    global _training_job_manager
+    queue: JobQueue
+    if settings.training_queue_backend == "redis" and redis is not None:
+        queue = RedisJobQueue(redis, history=settings.training_job_history)
+    else:
+        if settings.training_queue_backend == "redis":
+            logger.warning("Redis unavailable, training jobs queued in process")
+        queue = InMemoryJobQueue(history=settings.training_job_history)
+        redis = None
+
+    _training_job_manager = TrainingJobManager(engine, queue, redis=redis)
+    _training_job_manager.start()
+
+
+async def stop_training_jobs() -> None:
+    """Stop background training (on application shutdown)."""
+    global _training_job_manager
+    if _training_job_manager is not None:
+        await _training_job_manager.stop()
+        _training_job_manager = None
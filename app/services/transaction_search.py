@@ -0,0 +1,166 @@
+"""Full-text search over transaction descriptions.
+
+On PostgreSQL, descriptions are matched through a GIN index on their
+words: to_tsvector('simple', ...) over the description with punctuation
+replaced by spaces, so "AMAZON.COM*MK1234" holds amazon, com and mk1234
+(the parser alone keeps hosts, URLs and e-mail addresses whole). Queries
+are split into words the same way. Every query word matches as a prefix,
+so results keep up while the user types, and hits are ranked with
+ts_rank_cd. Only the most recent RANK_WINDOW matches are ranked, so common
+terms cost about as much as rare ones; older matches follow them, newest
+first. Migration 005 also adds a trigram index where the server has
+the pg_trgm extension. When that index exists, descriptions similar
+enough to the query match as well, which tolerates typos; they rank below
+exact word matches.
+
+Other databases (SQLite in tests) get the same behavior in process: rows
+passing the other filters are scored in Python.
+"""
+
+import re
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Optional
+
+from sqlalchemy import ColumnElement, and_, case, func, literal_column, or_, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.transaction import Transaction
+
+# Text search configuration of the index; no stemming or stop words, which
+# suit merchant names
+SEARCH_CONFIG = "simple"
+
+# Query words used; the rest are ignored
+MAX_TERMS = 8
+
+# Similarity a word needs to count as a typo of a query word (in process;
+# PostgreSQL uses pg_trgm.word_similarity_threshold, 0.6 by default)
+TYPO_THRESHOLD = 0.6
+
+# Most recent matches ranked by relevance; older ones follow by date
+RANK_WINDOW = 1000
+
+TRIGRAM_INDEX = "idx_transactions_description_trgm"
+
+# Letters and digits; anything else separates words, as in the index
+_WORD = re.compile(r"[^\W_]+")
+
+# Whether the trigram index exists, per database URL
+_trigram_index: dict[str, bool] = {}
+
+
+@dataclass
+class SearchHit:
+    """A transaction matching a search, with its relevance and matched spans."""
+
+    transaction: Transaction
+    rank: float
+    # (start, end) character offsets of matched prefixes in the description
+    highlights: list[tuple[int, int]]
+
+
+def search_terms(query: str) -> list[str]:
+    """Split a search query into lowercase words."""
+    return _WORD.findall(query.lower())[:MAX_TERMS]
+
+
+def description_vector() -> ColumnElement:
+    """The indexed tsvector expression; queries must use it verbatim to hit the index.
+
+    Constants are rendered inline rather than bound, so the expression still
+    matches the index under generic plans of prepared statements.
+    """
+    words = func.regexp_replace(
+        Transaction.description,
+        literal_column("'[^[:alnum:]]+'"),
+        literal_column("' '"),
+        literal_column("'g'"),
+    )
+    return func.to_tsvector(literal_column(f"'{SEARCH_CONFIG}'"), words)
+
+
+def prefix_query(terms: list[str]) -> ColumnElement:
+    """tsquery matching descriptions with a word starting with each term."""
+    return func.to_tsquery(
+        literal_column(f"'{SEARCH_CONFIG}'"), " & ".join(f"{term}:*" for term in terms)
+    )
+
+
+def match_condition(terms: list[str], dialect: str) -> ColumnElement:
+    """Condition matching descriptions containing every term as a word prefix."""
+    if dialect == "postgresql":
+        return description_vector().op("@@")(prefix_query(terms))
+    # Substring match; a superset of the prefix match that needs no index
+    return and_(
+        *(func.lower(Transaction.description).contains(term, autoescape=True) for term in terms)
+    )
+
+
+def ranked_match(terms: list[str], trigram: bool) -> tuple[ColumnElement, ColumnElement]:
+    """
+    PostgreSQL match condition and relevance for a search.
+
+    Args:
+        terms: Query words
+        trigram: Whether to also match descriptions similar to the query
+
+    Returns:
+        Tuple of (condition, relevance): word matches score above 1, typo
+        matches their word similarity (below 1)
+    """
+    words = description_vector().op("@@")(prefix_query(terms))
+    rank = 1 + func.ts_rank_cd(description_vector(), prefix_query(terms), 1)
+    if not trigram:
+        return words, rank
+
+    phrase = " ".join(terms)
+    similar = Transaction.description.op("%>")(phrase)
+    relevance = case((words, rank), else_=func.word_similarity(phrase, Transaction.description))
+    return or_(words, similar), relevance
+
+
+async def has_trigram_index(db: AsyncSession) -> bool:
+    """Whether typo-tolerant matching is available (checked once per database)."""
+    url = str(db.bind.engine.url)
+    if url not in _trigram_index:
+        result = await db.execute(
+            text("SELECT 1 FROM pg_indexes WHERE indexname = :name"), {"name": TRIGRAM_INDEX}
+        )
+        _trigram_index[url] = result.scalar() is not None
+    return _trigram_index[url]
+
+
+def _similarity(term: str, word: str) -> float:
+    # Compare against the word's start, so typos in a prefix still match
+    return SequenceMatcher(None, term, word[: len(term) + 1]).ratio()
+
+
+def score(terms: list[str], description: str) -> Optional[float]:
+    """
+    In-process relevance of a description, None if it doesn't match.
+
+    Mirrors the PostgreSQL ranking: descriptions with every term as a word
+    prefix score above 1 (more for shorter descriptions), descriptions
+    whose words are all close to the terms score their mean similarity.
+    """
+    words = _WORD.findall(description.lower())
+    if not words:
+        return None
+    if all(any(word.startswith(term) for word in words) for term in terms):
+        return 1 + len(terms) / len(words)
+
+    similarities = [max(_similarity(term, word) for word in words) for term in terms]
+    similarity = sum(similarities) / len(similarities)
+    return similarity if similarity >= TYPO_THRESHOLD else None
+
+
+def highlight_spans(terms: list[str], description: str) -> list[tuple[int, int]]:
+    """Character spans of the description's words starting with a term."""
+    spans = []
+    for match in _WORD.finditer(description):
+        word = match.group().lower()
+        lengths = [len(term) for term in terms if word.startswith(term)]
+        if lengths:
+            spans.append((match.start(), match.start() + max(lengths)))
+    return spans
@@ -1,13 +1,19 @@
 """Transaction service for managing financial transactions."""
 
+import base64
+import binascii
+import json
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from datetime import date as date_type
 from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select, func, and_, desc
+from sqlalchemy import Select, select, func, and_, desc, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
 from app.models.transaction import Transaction
 from app.schemas.transaction import (
@@ -15,13 +21,92 @@ from app.schemas.transaction import (
     TransactionUpdate,
     TransactionFilters,
     Pagination,
+    CountMode,
 )
 from app.ml.categorization_engine import CategorizationEngine
+from app.cache import invalidate_user_cache
+from app.services.rollup_service import RollupService
+from app.services.transaction_search import (
+    RANK_WINDOW,
+    SearchHit,
+    has_trigram_index,
+    highlight_spans,
+    match_condition,
+    ranked_match,
+    score,
+    search_terms,
+)
 from app.logging_config import get_logger
 from app.config import settings
 
 logger = get_logger(__name__)
 
+# Listing order, newest first; id breaks ties so every row has a unique position
+LISTING_ORDER = (desc(Transaction.date), desc(Transaction.created_at), desc(Transaction.id))
+
+# Search totals are counted exactly up to this many matches, estimated beyond
+SEARCH_COUNT_LIMIT = 1000
+
+
+class InvalidCursorError(ValueError):
+    """Exception raised when a pagination cursor can't be decoded."""
+
+    pass
+
+
+def encode_cursor(transaction: Transaction) -> str:
+    """Encode a transaction's listing position as an opaque cursor."""
+    position = [
+        transaction.date.isoformat(),
+        transaction.created_at.isoformat(),
+        str(transaction.id),
+    ]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[date_type, datetime, UUID]:
+    """Decode a cursor into its (date, created_at, id) position.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        day, created_at, transaction_id = json.loads(base64.urlsafe_b64decode(padded))
+        return (
+            date_type.fromisoformat(day),
+            datetime.fromisoformat(created_at),
+            UUID(transaction_id),
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+@dataclass
+class TransactionPage:
+    """One page of a transaction listing."""
+
+    items: list[Transaction]
+    # None when not counted
+    total: Optional[int]
+    total_is_estimate: bool
+    # Cursor for the following page, None on the last page
+    next_cursor: Optional[str]
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, keeping its bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, stmt: Select):
+        self.stmt = stmt
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.stmt, **kw)
+
 
 class TransactionService:
     """Service for managing transactions with CRUD operations and duplicate detection."""
@@ -173,6 +258,7 @@ class TransactionService:
 
         self.db.add(transaction)
         await self.db.flush()
+        invalidate_user_cache(self.db, user_id)
         await self.db.refresh(transaction)
 
         logger.info(
@@ -247,6 +333,7 @@ class TransactionService:
 
         transaction.updated_at = datetime.utcnow()
         await self.db.flush()
+        invalidate_user_cache(self.db, user_id)
         await self.db.refresh(transaction)
 
         logger.info(
@@ -284,6 +371,7 @@ class TransactionService:
         # Soft delete
         transaction.deleted_at = datetime.utcnow()
         await self.db.flush()
+        invalidate_user_cache(self.db, user_id)
 
         logger.info(
             "Transaction deleted",
@@ -293,22 +381,10 @@ class TransactionService:
 
         return True
 
-    async def list_transactions(
-        self,
-        user_id: UUID,
-        filters: Optional[TransactionFilters] = None,
-        pagination: Optional[Pagination] = None,
-    ) -> tuple[list[Transaction], int]:
-        """List transactions with filtering and pagination.
-
-        Args:
-            user_id: User ID
-            filters: Optional filters
-            pagination: Optional pagination parameters
-
-        Returns:
-            Tuple of (transactions list, total count)
-        """
+    def _filtered_query(
+        self, user_id: UUID, filters: Optional[TransactionFilters] = None
+    ) -> Select:
+        """Select a user's live transactions matching the filters, unordered."""
         # Base query
         stmt = select(Transaction).where(
             and_(
@@ -331,19 +407,79 @@ class TransactionService:
                 stmt = stmt.where(Transaction.amount >= filters.min_amount)
             if filters.max_amount is not None:
                 stmt = stmt.where(Transaction.amount <= filters.max_amount)
-            if filters.search:
-                # Case-insensitive search in description
-                search_pattern = f"%{filters.search}%"
-                stmt = stmt.where(Transaction.description.ilike(search_pattern))
+            terms = search_terms(filters.search) if filters.search else []
+            if terms:
+                # Word prefix search in description (full-text index on PostgreSQL)
+                stmt = stmt.where(match_condition(terms, self.db.bind.dialect.name))
 
-        # Get total count before pagination
+        return stmt
+
+    async def _count(self, stmt: Select) -> int:
         # Optimize count query by avoiding subquery: SELECT count(*) FROM table WHERE ...
         count_stmt = stmt.with_only_columns(func.count()).order_by(None)
-        total_result = await self.db.execute(count_stmt)
-        total = total_result.scalar_one()
+        result = await self.db.execute(count_stmt)
+        return result.scalar_one()
+
+    async def _estimate_count(
+        self, user_id: UUID, filters: Optional[TransactionFilters], stmt: Select
+    ) -> tuple[int, bool]:
+        """Count cheaply: from the rollup table, else the planner's row estimate.
+
+        Returns:
+            Tuple of (count, whether it is an estimate)
+        """
+        filters = filters or TransactionFilters()
+        if (
+            settings.use_spending_rollup
+            and filters.min_amount is None
+            and filters.max_amount is None
+            and not filters.search
+        ):
+            total = await RollupService(self.db).count(
+                user_id,
+                start_date=filters.start_date,
+                end_date=filters.end_date,
+                txn_type=filters.type.value if filters.type else None,
+                category=filters.category,
+            )
+            return total, False
+
+        if self.db.bind.dialect.name != "postgresql":
+            return await self._count(stmt), False
+
+        return await self._planned_count(stmt), True
+
+    async def _planned_count(self, stmt: Select) -> int:
+        # The planner's row estimate for the statement (PostgreSQL only)
+        result = await self.db.execute(_Explain(stmt.order_by(None)))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def list_transactions(
+        self,
+        user_id: UUID,
+        filters: Optional[TransactionFilters] = None,
+        pagination: Optional[Pagination] = None,
+    ) -> tuple[list[Transaction], int]:
+        """List transactions with filtering and pagination.
+
+        Args:
+            user_id: User ID
+            filters: Optional filters
+            pagination: Optional pagination parameters
+
+        Returns:
+            Tuple of (transactions list, total count)
+        """
+        stmt = self._filtered_query(user_id, filters)
+
+        # Get total count before pagination
+        total = await self._count(stmt)
 
         # Sort by date descending (newest first) - Requirement 1.2
-        stmt = stmt.order_by(desc(Transaction.date), desc(Transaction.created_at))
+        stmt = stmt.order_by(*LISTING_ORDER)
 
         # Apply pagination
         if pagination:
@@ -362,6 +498,82 @@ class TransactionService:
 
         return transactions, total
 
+    async def list_transactions_page(
+        self,
+        user_id: UUID,
+        filters: Optional[TransactionFilters] = None,
+        pagination: Optional[Pagination] = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> TransactionPage:
+        """List one page of transactions, by cursor or by page number.
+
+        A cursor page seeks straight to its position through the keyset
+        index, so its cost doesn't grow with depth the way OFFSET does. The
+        total is computed according to count: exactly, cheaply (rollup
+        table or planner estimate), or not at all. It is free when the page
+        itself shows where the listing ends.
+
+        Args:
+            user_id: User ID
+            filters: Optional filters
+            pagination: Pagination parameters (first page of 50 by default)
+            count: How to compute the total
+
+        Returns:
+            Page of transactions
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        pagination = pagination or Pagination()
+        stmt = self._filtered_query(user_id, filters)
+
+        # One extra row tells whether another page follows
+        page_stmt = stmt.order_by(*LISTING_ORDER).limit(pagination.page_size + 1)
+        if pagination.cursor:
+            position = decode_cursor(pagination.cursor)
+            page_stmt = page_stmt.where(
+                tuple_(Transaction.date, Transaction.created_at, Transaction.id)
+                < tuple_(*position)
+            )
+            offset = None
+        else:
+            offset = pagination.offset
+            page_stmt = page_stmt.offset(offset)
+
+        result = await self.db.execute(page_stmt)
+        items = list(result.scalars().all())
+        has_more = len(items) > pagination.page_size
+        items = items[: pagination.page_size]
+
+        total, total_is_estimate = None, False
+        if count == CountMode.NONE:
+            pass
+        elif offset is not None and not has_more and (items or offset == 0):
+            total = offset + len(items)
+        elif count == CountMode.EXACT:
+            total = await self._count(stmt)
+        else:
+            total, total_is_estimate = await self._estimate_count(user_id, filters, stmt)
+            if offset is not None:
+                # Never report fewer rows than the page has shown to exist
+                total = max(total, offset + len(items) + int(has_more))
+
+        logger.debug(
+            "Transaction page listed",
+            user_id=str(user_id),
+            count=len(items),
+            total=total,
+            keyset=offset is None,
+        )
+
+        return TransactionPage(
+            items=items,
+            total=total,
+            total_is_estimate=total_is_estimate,
+            next_cursor=encode_cursor(items[-1]) if has_more else None,
+        )
+
     async def detect_duplicate(
         self,
         user_id: UUID,
@@ -418,19 +630,101 @@ class TransactionService:
         user_id: UUID,
         search_query: str,
         pagination: Optional[Pagination] = None,
-    ) -> tuple[list[Transaction], int]:
-        """Search transactions by description.
+        filters: Optional[TransactionFilters] = None,
+    ) -> tuple[list[SearchHit], int]:
+        """Search transactions by description, most relevant first.
+
+        Each query word matches as a word prefix; see
+        app.services.transaction_search for ranking and typo tolerance.
 
         Args:
             user_id: User ID
             search_query: Search query string
-            pagination: Optional pagination parameters
+            pagination: Optional pagination parameters (by page number)
+            filters: Optional filters to search within (their search is ignored)
 
         Returns:
-            Tuple of (matching transactions, total count)
+            Tuple of (hits for the page, total matches); beyond
+            SEARCH_COUNT_LIMIT matches the total is the planner's estimate
         """
-        filters = TransactionFilters(search=search_query)
-        return await self.list_transactions(user_id, filters, pagination)
+        terms = search_terms(search_query)
+        if not terms:
+            return [], 0
+
+        pagination = pagination or Pagination()
+        filters = (filters or TransactionFilters()).model_copy(update={"search": None})
+        stmt = self._filtered_query(user_id, filters)
+
+        if self.db.bind.dialect.name != "postgresql":
+            return await self._search_in_process(stmt, terms, pagination)
+
+        condition, relevance = ranked_match(terms, await has_trigram_index(self.db))
+        stmt = stmt.where(condition)
+        offset, size = pagination.offset, pagination.page_size
+
+        # Ranking recomputes each match's tsvector, so only the newest matches
+        # are ranked; the keyset index finds them without sorting the rest
+        newest = (
+            stmt.with_only_columns(Transaction.id)
+            .order_by(*LISTING_ORDER)
+            .limit(RANK_WINDOW)
+            .subquery()
+        )
+        ranked_stmt = (
+            select(Transaction, relevance.label("rank"))
+            .join(newest, Transaction.id == newest.c.id)
+            .order_by(desc("rank"), *LISTING_ORDER)
+            .offset(offset)
+            .limit(size)
+        )
+        rows = list((await self.db.execute(ranked_stmt)).all())
+        if len(rows) < size:
+            # Older matches follow, unranked, from the end of a full window;
+            # when the window isn't full there are none
+            older_stmt = (
+                stmt.order_by(*LISTING_ORDER)
+                .offset(max(offset + len(rows), RANK_WINDOW))
+                .limit(size - len(rows))
+            )
+            rows += [(transaction, 0) for transaction in (await self.db.scalars(older_stmt))]
+        hits = [
+            SearchHit(transaction, float(rank), highlight_spans(terms, transaction.description))
+            for transaction, rank in rows
+        ]
+
+        if offset == 0 and len(hits) < size:
+            total = len(hits)
+        else:
+            capped = stmt.with_only_columns(Transaction.id).limit(SEARCH_COUNT_LIMIT + 1)
+            total = await self.db.scalar(select(func.count()).select_from(capped.subquery()))
+            if total > SEARCH_COUNT_LIMIT:
+                # Too many to count on every page; never below what was counted
+                total = max(await self._planned_count(stmt), total)
+
+        logger.debug(
+            "Transactions searched", user_id=str(user_id), terms=len(terms), total=total
+        )
+        return hits, total
+
+    async def _search_in_process(
+        self, stmt: Select, terms: list[str], pagination: Pagination
+    ) -> tuple[list[SearchHit], int]:
+        """Score candidate rows in Python, for databases without full-text search."""
+        result = await self.db.execute(stmt.order_by(*LISTING_ORDER))
+        scored = []
+        for transaction in result.scalars():
+            rank = score(terms, transaction.description)
+            if rank is not None:
+                scored.append((rank if len(scored) < RANK_WINDOW else 0, transaction))
+        # Stable, so equal ranks stay in listing order
+        scored.sort(key=lambda item: item[0], reverse=True)
+
+        page = scored[pagination.offset : pagination.offset + pagination.page_size]
+        hits = [
+            SearchHit(transaction, rank, highlight_spans(terms, transaction.description))
+            for rank, transaction in page
+        ]
+        return hits, len(scored)
 
     async def count_transactions(self, user_id: UUID) -> int:
         """Count total transactions for a user.
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""Rebuild the spending_rollups table from transactions.
+
+Use after enabling USE_SPENDING_ROLLUP on an existing database or to repair
+drift after transactions were changed outside the ORM.
+
+Usage:
+  python scripts/backfill_spending_rollups.py              - Rebuild all users
+  python scripts/backfill_spending_rollups.py --user-id ID - Rebuild one user
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from uuid import UUID
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.database import AsyncSessionLocal, close_db  # noqa: E402
+from app.services.rollup_service import RollupService  # noqa: E402
+
+
+async def backfill(user_id: UUID | None) -> int:
+    async with AsyncSessionLocal() as session:
+        rows = await RollupService(session).rebuild(user_id)
+        await session.commit()
+    await close_db()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild spending rollups from transactions.")
+    parser.add_argument("--user-id", type=UUID, help="Only rebuild this user's rollups")
+    args = parser.parse_args()
+
+    rows = asyncio.run(backfill(args.user_id))
+    print(f"Wrote {rows} rollup rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Benchmark cache value serialization for representative cached payloads.
+
+Compares the old json.dumps(default=str) encoding with the CacheSerializer
+codecs on an advice list, a 10-category 90-day forecast and a financial
+report, reporting encode/decode time and bytes stored for each. orjson is
+included for reference when installed; it is fast but, like the old
+encoding, returns Decimals, dates and UUIDs as strings.
+
+Usage:
+    python scripts/benchmarks/bench_cache_codec.py [--rounds 2000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.cache_codec import MSGPACK_AVAILABLE, ZSTD_AVAILABLE, CacheSerializer  # noqa: E402
+from app.schemas.advice import AdviceResponse  # noqa: E402
+from app.schemas.prediction import AllForecastsResponse, ForecastResponse  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def money(rng: random.Random, high: int = 100000) -> Decimal:
+    return Decimal(rng.randint(100, high)) / 100
+
+
+def advice_payload(rng: random.Random) -> list:
+    """What the advice route caches: model_dump() of the dashboard advice."""
+    return [
+        AdviceResponse(
+            title=f"Budget Alert: Category {i}",
+            message=f"You've spent ${money(rng)} of your ${money(rng)} budget.",
+            explanation="Your spending in this category is close to its allocation.",
+            priority=rng.choice(["CRITICAL", "HIGH", "MEDIUM", "LOW"]),
+            category=f"Category {i}",
+            action_items=["Review recent purchases", "Adjust the allocation"],
+            related_id=uuid.uuid4(),
+        ).model_dump()
+        for i in range(5)
+    ]
+
+
+def forecast_payload(rng: random.Random) -> dict:
+    """All-category 90-day forecast, as returned by the prediction routes."""
+    start = date.today()
+    forecasts = {}
+    for i in range(10):
+        predictions = [money(rng, 20000) for _ in range(90)]
+        forecasts[f"Category {i}"] = ForecastResponse(
+            category=f"Category {i}",
+            predictions=predictions,
+            confidence_intervals=[(p * Decimal("0.8"), p * Decimal("1.2")) for p in predictions],
+            forecast_dates=[start + timedelta(days=d) for d in range(90)],
+            model_params={"p": 1, "d": 1, "q": 1},
+            accuracy_score=rng.random() * 100,
+        )
+    return AllForecastsResponse(forecasts=forecasts, total_categories=10).model_dump()
+
+
+def report_payload(rng: random.Random) -> dict:
+    """A financial report with the FinancialReportResponse shape."""
+    categories = [f"Category {i}" for i in range(20)]
+    return {
+        "report_id": uuid.uuid4(),
+        "user_id": uuid.uuid4(),
+        "start_date": date.today() - timedelta(days=90),
+        "end_date": date.today(),
+        "income_summary": {
+            "total_income": money(rng, 2000000),
+            "income_by_category": {c: money(rng) for c in categories[:3]},
+            "transaction_count": 12,
+        },
+        "expense_summary": {
+            "total_expenses": money(rng, 2000000),
+            "expenses_by_category": {c: money(rng) for c in categories},
+            "transaction_count": 340,
+            "top_expense_categories": [
+                {"category": c, "amount": money(rng), "percentage": rng.random() * 100}
+                for c in categories[:5]
+            ],
+        },
+        "net_savings": money(rng),
+        "savings_rate": rng.random() * 100,
+        "budget_adherence": {
+            c: {
+                "allocated": money(rng),
+                "spent": money(rng),
+                "remaining": money(rng),
+                "percentage_used": rng.random() * 100,
+                "status": "on_track",
+            }
+            for c in categories
+        },
+        "spending_changes": [
+            {
+                "category": c,
+                "previous_amount": money(rng),
+                "current_amount": money(rng),
+                "change_amount": money(rng),
+                "change_percentage": rng.random() * 100,
+            }
+            for c in categories
+        ],
+        "generated_at": datetime.utcnow().isoformat(),
+    }
+
+
+def best_us(func, rounds: int) -> float:
+    """Best-of-rounds time of one call, in microseconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e6
+
+
+def encoders() -> list:
+    """(label, dumps, loads) for each encoding under test."""
+    result = [
+        (
+            "json default=str",
+            lambda v: json.dumps(v, default=str).encode(),
+            json.loads,
+        ),
+    ]
+    if orjson is not None:
+        result.append(("orjson (lossy)", lambda v: orjson.dumps(v, default=str), orjson.loads))
+
+    configs = [("json", "zlib")]
+    if MSGPACK_AVAILABLE:
+        configs.append(("msgpack", "zlib"))
+        if ZSTD_AVAILABLE:
+            configs.append(("msgpack", "zstd"))
+    for codec, compression in configs:
+        raw = CacheSerializer(codec=codec, compress_min_bytes=0)
+        result.append((f"{codec}", raw.dumps, raw.loads))
+        packed = CacheSerializer(codec=codec, compress_min_bytes=1, compression=compression)
+        result.append((f"{codec}+{compression}", packed.dumps, packed.loads))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=2000, help="Timing rounds (best is kept)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the data")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    payloads = [
+        ("advice", advice_payload(rng)),
+        ("forecast", forecast_payload(rng)),
+        ("report", report_payload(rng)),
+    ]
+    if not MSGPACK_AVAILABLE:
+        print("msgpack not installed: only the JSON codec is measured")
+
+    for name, payload in payloads:
+        print(f"\n{name}")
+        print(f"{'encoding':<20}{'encode (us)':>13}{'decode (us)':>13}{'bytes':>9}")
+        for label, dumps, loads in encoders():
+            data = dumps(payload)
+            # Sanity check: the payload must survive the round trip
+            loads(data)
+            encode = best_us(lambda: dumps(payload), args.rounds)
+            decode = best_us(lambda: loads(data), args.rounds)
+            print(f"{label:<20}{encode:>13.1f}{decode:>13.1f}{len(data):>9}")
+
+
+if __name__ == "__main__":
+    main()
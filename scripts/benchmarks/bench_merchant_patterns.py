@@ -0,0 +1,124 @@
+"""
+Benchmark the MerchantDatabase pattern stage and normalizer.
+
+Compares the combined single-scan pattern index and precompiled normalizer
+against the previous implementation (per-pattern ``match`` loop and
+uncompiled ``re.sub`` calls) over a corpus of bank-style descriptors built
+from data/merchants.json.
+
+Usage:
+    python scripts/benchmarks/bench_merchant_patterns.py [--rounds 20]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.services.merchant_database import MerchantDatabase  # noqa: E402
+
+DESCRIPTOR_TEMPLATES = [
+    "{name} #{store} {city} {state}",
+    "{name} {store} {city} {state} {zip}",
+    "SQ *{name} {city} {state}",
+    "TST* {name} {city}",
+    "{name}*{ref} {phone} {state}",
+    "POS DEBIT {name} {store}",
+    "{name} INC",
+    "{name}",
+]
+CITIES = ["AUSTIN", "SEATTLE", "NEW YORK", "CHICAGO", "DENVER", "MIAMI"]
+STATES = ["TX", "WA", "NY", "IL", "CO", "FL"]
+
+
+def legacy_normalize(text: str) -> str:
+    """The normalizer as it was before the precompiled pipeline."""
+    if not text:
+        return ""
+    text = text.lower().strip()
+    text = re.sub(r"^(sq\s*\*|tst\s*\*|paypal\s*\*)", "", text)
+    text = re.sub(r"\*[a-z0-9]+", "", text, flags=re.I)
+    text = re.sub(r"\s*#?\d{4,}.*$", "", text)
+    text = re.sub(r"\s*\d{3}[-.\s]?\d{3}[-.\s]?\d{4}", "", text)
+    text = re.sub(r"\s+[a-z]{2}\s+\d{5}(-\d{4})?$", "", text, flags=re.I)
+    text = re.sub(r"\s+[a-z]{2}$", "", text, flags=re.I)
+    text = re.sub(r"\s+(inc|llc|corp|ltd|co|company)\.?\s*$", "", text, flags=re.I)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+def build_corpus(db: MerchantDatabase, size: int, seed: int = 7) -> list:
+    """Build bank-style descriptors from merchant keys, aliases and noise."""
+    rng = random.Random(seed)
+    names = []
+    for key, merchant in db._merchants.items():
+        names.append(key.upper())
+        names.extend(alias.upper() for alias in merchant.get("aliases", []))
+    names.extend(["ACME HARDWARE", "JOES DINER", "LOCAL PARKING", "CITY UTILITIES"])
+
+    corpus = []
+    for _ in range(size):
+        template = rng.choice(DESCRIPTOR_TEMPLATES)
+        corpus.append(
+            template.format(
+                name=rng.choice(names),
+                store=rng.randint(1000, 99999),
+                city=rng.choice(CITIES),
+                state=rng.choice(STATES),
+                zip=rng.randint(10000, 99999),
+                ref="".join(rng.choice("ABCDEFGHJK0123456789") for _ in range(6)),
+                phone=f"{rng.randint(200, 999)}-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+            )
+        )
+    return corpus
+
+
+def time_per_item(func, items, rounds: int) -> float:
+    """Return the best-of-rounds mean time per item in microseconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=5000, help="Corpus size")
+    parser.add_argument("--rounds", type=int, default=20, help="Timing rounds (best is kept)")
+    args = parser.parse_args()
+
+    db = MerchantDatabase()
+    corpus = build_corpus(db, args.size)
+    normalized = [db._normalize(raw) for raw in corpus]
+
+    # Sanity check: both implementations must agree before timing them
+    assert normalized == [legacy_normalize(raw) for raw in corpus]
+    for text in normalized:
+        assert db._lookup_pattern(text) == db._lookup_pattern_sequential(text), text
+
+    hits = sum(1 for text in normalized if db._lookup_pattern(text) is not None)
+    print(
+        f"Corpus: {len(corpus)} descriptors, {len(db._patterns)} patterns, "
+        f"{hits / len(corpus):.0%} pattern hit rate"
+    )
+    print(f"{'stage':<22}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+
+    rows = [
+        ("normalize", legacy_normalize, db._normalize, corpus),
+        ("pattern match", db._lookup_pattern_sequential, db._lookup_pattern, normalized),
+    ]
+    for label, before_fn, after_fn, items in rows:
+        before = time_per_item(before_fn, items, args.rounds)
+        after = time_per_item(after_fn, items, args.rounds)
+        print(f"{label:<22}{before:>14.2f}{after:>14.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+"""Re-encrypt stored secrets under the current encryption key.
+
+Run after setting ENCRYPTION_KEY to a new secret and moving the previous one
+to ENCRYPTION_OLD_KEYS. Once it completes, the old key can be removed from
+ENCRYPTION_OLD_KEYS.
+
+Usage:
+  python scripts/rotate_encryption_key.py
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.database import AsyncSessionLocal, close_db  # noqa: E402
+from app.services.encryption_service import (  # noqa: E402
+    encryption_service,
+    reencrypt_connection_tokens,
+)
+
+
+async def rotate(batch_size: int) -> int:
+    async with AsyncSessionLocal() as session:
+        rotated = await reencrypt_connection_tokens(session, batch_size=batch_size)
+        await session.commit()
+    await close_db()
+    return rotated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Re-encrypt stored secrets under the current encryption key."
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help="Connections per query")
+    args = parser.parse_args()
+
+    rotated = asyncio.run(rotate(args.batch_size))
+    print(f"Re-encrypted {rotated} connection tokens under key {encryption_service.key_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""Scan every user for budget and goal alerts (nightly notification run).
+
+Alerts are appended to a JSON-lines file one page at a time. Progress is
+checkpointed after each page, so rerunning the same command resumes an
+interrupted scan. Run one process per shard to split users by id range.
+
+Usage:
+  python scripts/scan_alerts.py --output alerts.jsonl
+  python scripts/scan_alerts.py --shard-index 0 --shard-count 4 --output alerts-0.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.database import AsyncSessionLocal, close_db  # noqa: E402
+from app.services.alert_scanner import AlertPage, BatchAlertScanner, ScanStats  # noqa: E402
+
+
+async def scan(args) -> ScanStats:
+    output = args.output.open("a")
+
+    async def write_page(page: AlertPage) -> None:
+        for user_id, budget_id, alert in page.budget_alerts:
+            record = {"kind": "budget", "user_id": user_id, "budget_id": budget_id, **asdict(alert)}
+            output.write(json.dumps(record, default=str) + "\n")
+        for user_id, alert in page.goal_alerts:
+            record = {"kind": "goal", "user_id": user_id, **asdict(alert)}
+            output.write(json.dumps(record, default=str) + "\n")
+        output.flush()
+
+    checkpoint = args.checkpoint or args.output.with_suffix(
+        f".shard{args.shard_index}of{args.shard_count}.checkpoint.json"
+    )
+    try:
+        async with AsyncSessionLocal() as session:
+            scanner = BatchAlertScanner(
+                session, page_size=args.page_size, goal_history_days=args.goal_history_days
+            )
+            return await scanner.run(
+                write_page,
+                shard_index=args.shard_index,
+                shard_count=args.shard_count,
+                checkpoint_path=checkpoint,
+            )
+    finally:
+        output.close()
+        await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scan all users for budget and goal alerts.")
+    parser.add_argument("--output", type=Path, required=True, help="JSON-lines file for alerts")
+    parser.add_argument("--checkpoint", type=Path, help="Checkpoint file (default: next to output)")
+    parser.add_argument("--shard-index", type=int, default=0, help="Zero-based shard to scan")
+    parser.add_argument("--shard-count", type=int, default=1, help="Total number of shards")
+    parser.add_argument("--page-size", type=int, default=500, help="Users per page")
+    parser.add_argument(
+        "--goal-history-days",
+        type=int,
+        help="Project category-linked goals from this many days of contributions",
+    )
+    args = parser.parse_args()
+
+    stats = asyncio.run(scan(args))
+    print(
+        f"Scanned {stats.users_scanned} users: {stats.budget_alerts} budget alerts, "
+        f"{stats.goal_alerts} goal alerts ({stats.users_per_second:.0f} users/sec)"
+    )
+
+
+if __name__ == "__main__":
+    main()
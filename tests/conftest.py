@@ -1,6 +1,7 @@
 """Pytest configuration and fixtures."""
 
 import asyncio
+import fnmatch
 import os
 from typing import AsyncGenerator, Generator
 
@@ -8,7 +9,7 @@ import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
-from app.database import Base, get_db
+from app.database import Base, get_db, get_session_factory
 from app.main import app
 
 # Test database URL - use environment variable or default to localhost
@@ -102,6 +103,8 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    # Services share the test session, which holds the uncommitted test data
+    app.dependency_overrides[get_session_factory] = lambda: None
 
     async with AsyncClient(app=app, base_url="http://test") as test_client:
         yield test_client
@@ -146,6 +149,8 @@ async def async_client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient,
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    # Services share the test session, which holds the uncommitted test data
+    app.dependency_overrides[get_session_factory] = lambda: None
 
     async with AsyncClient(app=app, base_url="http://test") as test_client:
         yield test_client
@@ -165,3 +170,87 @@ async def transaction_service(db_session: AsyncSession):
     from app.services.transaction_service import TransactionService
 
     return TransactionService(db_session)
+
+
+class InMemoryRedis:
+    """Async Redis stand-in for the commands CacheManager uses, with pub/sub.
+
+    One instance can back several CacheManagers to stand in for several
+    app processes.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.subscribers = []
+        self.reads = 0
+
+    async def get(self, key):
+        self.reads += 1
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        self.reads += 1
+        return [self.data.get(key) for key in keys]
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+    async def expire(self, key, ttl):
+        return key in self.data
+
+    async def scan_iter(self, match="*", count=None):
+        for key in list(self.data):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def publish(self, channel, message):
+        for queue in self.subscribers:
+            queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(self.subscribers)
+
+    def pipeline(self):
+        return InMemoryPipeline(self)
+
+    def pubsub(self):
+        return InMemoryPubSub(self)
+
+
+class InMemoryPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args) for name, args in self.commands]
+
+
+class InMemoryPubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.redis.subscribers.append(self.queue)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self):
+        self.redis.subscribers.remove(self.queue)
+
+
+@pytest.fixture
+def fake_redis() -> InMemoryRedis:
+    """In-memory Redis for cache tests."""
+    return InMemoryRedis()
@@ -1,10 +1,17 @@
 """Tests for advice generator service."""
 
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
 import pytest
 from datetime import datetime, timedelta, date
 from decimal import Decimal
 from uuid import uuid4
 
+from prometheus_client import REGISTRY
+from sqlalchemy import event, text
+
 from app.services.advice_generator import AdviceGenerator, AdvicePriority
 from app.models.transaction import Transaction
 from app.models.budget import Budget
@@ -498,3 +505,226 @@ class TestAdviceGenerator:
         # Should only have alert for budget1
         assert len(alerts) == 1
         assert alerts[0].related_id == budget1.id
+
+    async def test_spending_alerts_single_query(self, db_session, test_user):
+        """Test alerts for several budgets and categories use one grouped query."""
+        service = AdviceGenerator(db_session)
+
+        categories = [f"Category {i}" for i in range(10)]
+        for name in ("Budget A", "Budget B", "Budget C"):
+            db_session.add(
+                Budget(
+                    user_id=test_user.id,
+                    name=name,
+                    period_start=date.today() - timedelta(days=5),
+                    period_end=date.today() + timedelta(days=25),
+                    allocations={category: 100.0 for category in categories},
+                )
+            )
+        db_session.add_all(
+            Transaction(
+                user_id=test_user.id,
+                amount=Decimal("150.00"),
+                date=date.today(),
+                description="Purchase",
+                category=category,
+                type="EXPENSE",
+                source="MANUAL",
+            )
+            for category in categories[:4] + ["Unbudgeted"]
+        )
+        await db_session.commit()
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, *args):
+            if statement.startswith("SELECT"):  # Ignore the fixture's savepoints
+                statements.append(statement)
+
+        sync_engine = db_session.bind.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", count_statement)
+        try:
+            alerts = await service.check_spending_alerts(test_user.id)
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", count_statement)
+
+        assert len(statements) == 1
+        assert len(alerts) == 12
+        assert {alert.category for alert in alerts} == set(categories[:4])
+        assert all(alert.priority == AdvicePriority.CRITICAL for alert in alerts)
+
+    async def test_dashboard_advice_matches_individual_checks(self, db_session, test_user):
+        """Test the prefetched snapshot yields the same advice as the individual checks."""
+        service = AdviceGenerator(db_session)
+
+        db_session.add(
+            Budget(
+                user_id=test_user.id,
+                name="Monthly Budget",
+                period_start=date.today(),
+                period_end=date.today() + timedelta(days=30),
+                allocations={"Groceries": 100.0},
+            )
+        )
+        db_session.add(
+            Transaction(
+                user_id=test_user.id,
+                amount=Decimal("300.00"),
+                date=date.today(),
+                description="Grocery store",
+                category="Groceries",
+                type="EXPENSE",
+                source="MANUAL",
+            )
+        )
+        db_session.add(
+            FinancialGoal(
+                user_id=test_user.id,
+                name="Vacation",
+                target_amount=Decimal("1000.00"),
+                current_amount=Decimal("900.00"),
+                deadline=date.today() + timedelta(days=30),
+                status="ACTIVE",
+                created_at=datetime.utcnow() - timedelta(days=30),
+            )
+        )
+        await db_session.commit()
+
+        expected = (
+            await service.check_spending_alerts(test_user.id)
+            + await service._check_goal_progress(test_user.id)
+            + await service.suggest_savings_opportunities(test_user.id)
+            + await service._check_achievements(test_user.id)
+        )
+        advice_list = await service.generate_dashboard_advice(
+            test_user.id, max_recommendations=len(expected)
+        )
+
+        assert sorted(a.title for a in advice_list) == sorted(a.title for a in expected)
+
+    async def test_slow_stage_degrades_dashboard(self, db_session, test_user, monkeypatch):
+        """Test a stage past its timeout is skipped while the other stages' advice is kept."""
+        @asynccontextmanager
+        async def session_factory():
+            yield db_session
+
+        service = AdviceGenerator(db_session, session_factory=session_factory, stage_timeout=0.05)
+
+        db_session.add(
+            Budget(
+                user_id=test_user.id,
+                name="Monthly Budget",
+                period_start=date.today(),
+                period_end=date.today() + timedelta(days=30),
+                allocations={"Groceries": 100.0},
+            )
+        )
+        db_session.add(
+            Transaction(
+                user_id=test_user.id,
+                amount=Decimal("300.00"),
+                date=date.today(),
+                description="Grocery store",
+                category="Groceries",
+                type="EXPENSE",
+                source="MANUAL",
+            )
+        )
+        await db_session.commit()
+
+        async def slow_goals(self, user_id):
+            await asyncio.sleep(1)
+
+        async def broken_spending(self, user_id, lookback_months):
+            raise RuntimeError("connection lost")
+
+        monkeypatch.setattr(AdviceGenerator, "_fetch_goals", slow_goals)
+        monkeypatch.setattr(AdviceGenerator, "_fetch_category_spending", broken_spending)
+
+        def timeouts():
+            return REGISTRY.get_sample_value(
+                "advice_stage_duration_seconds_count", {"stage": "goals", "outcome": "timeout"}
+            ) or 0
+
+        before = timeouts()
+        snapshot = await service.fetch_snapshot(test_user.id)
+        assert sorted(snapshot.degraded) == ["goals", "spending"]
+        assert (snapshot.active_goals, snapshot.category_spending) == ([], {})
+        assert timeouts() == before + 1
+
+        advice_list = await service.generate_dashboard_advice(test_user.id, max_recommendations=1)
+        assert advice_list[0].priority == AdvicePriority.CRITICAL
+        assert advice_list[0].category == "Groceries"
+
+    async def test_stages_run_concurrently_on_own_sessions(
+        self, db_session, test_user, monkeypatch
+    ):
+        """Test that with a session factory each stage gets a session and they overlap."""
+        sessions = []
+
+        @asynccontextmanager
+        async def session_factory():
+            sessions.append(db_session)
+            yield db_session
+
+        async def fetch(result):
+            await asyncio.sleep(0.2)
+            return result
+
+        monkeypatch.setattr(
+            AdviceGenerator, "_fetch_budget_spending", lambda self, user_id: fetch([])
+        )
+        monkeypatch.setattr(AdviceGenerator, "_fetch_goals", lambda self, user_id: fetch(([], [])))
+        monkeypatch.setattr(
+            AdviceGenerator,
+            "_fetch_category_spending",
+            lambda self, user_id, months: fetch({"Dining": Decimal("10")}),
+        )
+        service = AdviceGenerator(db_session, session_factory=session_factory)
+
+        start = time.perf_counter()
+        snapshot = await service.fetch_snapshot(test_user.id)
+        elapsed = time.perf_counter() - start
+
+        assert len(sessions) == 3
+        assert elapsed < 0.4
+        assert snapshot.degraded == []
+        assert snapshot.category_spending == {"Dining": Decimal("10")}
+
+    async def test_failed_stage_keeps_shared_session_usable(
+        self, db_session, test_user, monkeypatch
+    ):
+        """Test a stage failing on the generator's session doesn't break later stages."""
+        service = AdviceGenerator(db_session)
+        db_session.add(
+            Budget(
+                user_id=test_user.id,
+                name="Monthly Budget",
+                period_start=date.today(),
+                period_end=date.today() + timedelta(days=30),
+                allocations={"Groceries": 100.0},
+            )
+        )
+        db_session.add(
+            Transaction(
+                user_id=test_user.id,
+                amount=Decimal("300.00"),
+                date=date.today(),
+                description="Grocery store",
+                category="Groceries",
+                type="EXPENSE",
+                source="MANUAL",
+            )
+        )
+        await db_session.commit()
+
+        async def failing_goals(user_id):
+            await db_session.execute(text("SELECT 1 / 0"))
+
+        monkeypatch.setattr(service, "_fetch_goals", failing_goals)
+
+        advice_list, degraded = await service.dashboard(test_user.id, max_recommendations=1)
+
+        assert degraded == ["goals"]
+        assert advice_list[0].category == "Groceries"
+        assert (await db_session.execute(text("SELECT 1"))).scalar() == 1
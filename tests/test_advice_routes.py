@@ -5,8 +5,10 @@ from datetime import timedelta, date
 from decimal import Decimal
 from httpx import AsyncClient
 
+from app.cache import cache_manager
 from app.models.transaction import Transaction
 from app.models.budget import Budget
+from app.services.advice_generator import AdviceGenerator
 
 
 @pytest.mark.asyncio
@@ -337,3 +339,25 @@ class TestAdviceRoutes:
             current_priority = priority_order[data[i]["priority"]]
             next_priority = priority_order[data[i + 1]["priority"]]
             assert current_priority <= next_priority
+
+
+@pytest.mark.asyncio
+async def test_degraded_dashboard_is_not_cached(
+    client: AsyncClient, auth_headers, test_user, monkeypatch, fake_redis
+):
+    """Test advice missing a failed stage isn't cached, so the next request retries it."""
+    monkeypatch.setattr(cache_manager, "redis", fake_redis)
+    cache_key = await cache_manager.user_key(test_user.id, "advice:3")
+
+    async def broken_goals(self, user_id):
+        raise RuntimeError("connection lost")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(AdviceGenerator, "_fetch_goals", broken_goals)
+        response = await client.get("/api/advice", headers=auth_headers)
+    assert response.status_code == 200
+    assert await cache_manager.get(cache_key) is None
+
+    response = await client.get("/api/advice", headers=auth_headers)
+    assert response.status_code == 200
+    assert await cache_manager.get(cache_key) == response.json()
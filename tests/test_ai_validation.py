@@ -0,0 +1,136 @@
+"""Tests for AI vs ML category cross-validation."""
+
+import pytest
+
+from app.ml.categorization_engine import CategoryPrediction
+from app.services.ai_validation import AgreementLevel, AIMLCrossValidator
+
+
+class AsyncMLService:
+    """ML service with async single and batch categorization."""
+
+    def __init__(self, categories):
+        self.categories = categories
+        self.batches = []
+        self.single_calls = 0
+
+    async def categorize(self, description):
+        self.single_calls += 1
+        return {"category": self.categories[description], "confidence": 0.9}
+
+    async def categorize_batch(self, descriptions):
+        self.batches.append(list(descriptions))
+        return [{"category": self.categories[d], "confidence": 0.9} for d in descriptions]
+
+
+class SyncEngine:
+    """CategorizationEngine-like service with a synchronous batch method."""
+
+    def categorize_batch(self, descriptions):
+        return [CategoryPrediction("Groceries", 0.95, "GLOBAL") for _ in descriptions]
+
+
+ML_CATEGORIES = {
+    "Whole Foods": "Groceries",
+    "Uber": "Rideshare",
+    "Venmo": "Groceries",
+    "Netflix": "Streaming",
+}
+
+
+async def test_batch_matches_single_results_with_one_ml_call():
+    """Test the batch predicts missing ML categories in one call, in order."""
+    ml_service = AsyncMLService(ML_CATEGORIES)
+    validator = AIMLCrossValidator(ml_service)
+    descriptions = ["Whole Foods", "Uber", "Venmo", "Netflix"]
+    ai_categories = ["Groceries", "Gas & Fuel", "Transfers", "Entertainment"]
+
+    results = await validator.cross_validate_batch(
+        descriptions,
+        ai_categories,
+        0.7,
+        ml_categories=[None, None, None, "Movies"],
+        ml_confidences=[None, None, None, 0.6],
+    )
+
+    assert ml_service.batches == [["Whole Foods", "Uber", "Venmo"]]
+    assert ml_service.single_calls == 0
+    expected = [
+        await validator.cross_validate(d, ai, 0.7, ml, conf)
+        for d, ai, ml, conf in zip(
+            descriptions,
+            ai_categories,
+            [r.ml_category for r in results],
+            [r.ml_confidence for r in results],
+        )
+    ]
+    assert [r.to_dict() for r in results] == [r.to_dict() for r in expected]
+    assert [r.agreement for r in results] == [
+        AgreementLevel.FULL,
+        AgreementLevel.PARTIAL,
+        AgreementLevel.NONE,
+        AgreementLevel.PARTIAL,
+    ]
+
+
+async def test_batch_uses_synchronous_engine():
+    """Test a synchronous categorize_batch (CategorizationEngine) is supported."""
+    validator = AIMLCrossValidator(SyncEngine())
+
+    results = await validator.cross_validate_batch(
+        ["A", "B"], ["Shopping", "Groceries"], [0.5, 0.9]
+    )
+
+    assert [r.final_category for r in results] == ["Groceries", "Groceries"]
+    assert results[0].used_ml_override
+    assert results[0].ml_confidence == 0.95
+
+
+async def test_batch_survives_ml_failure():
+    """Test ML failures leave items without an ML category."""
+
+    class FailingService:
+        def categorize_batch(self, descriptions):
+            raise RuntimeError("model not loaded")
+
+    validator = AIMLCrossValidator(FailingService())
+
+    results = await validator.cross_validate_batch(["A"], ["Income"], 0.9)
+
+    assert results[0].ml_category == ""
+    assert results[0].final_category == "Income"
+
+
+async def test_batch_rejects_mismatched_lengths():
+    """Test inputs of different lengths are rejected."""
+    with pytest.raises(ValueError, match="same length"):
+        await AIMLCrossValidator().cross_validate_batch(["A", "B"], ["Income"], 0.9)
+
+
+def test_parent_and_child_categories_agree_partially():
+    """Test a parent category partially agrees with its children, in any case."""
+    validator = AIMLCrossValidator()
+
+    assert validator._check_agreement("Food & Dining", "groceries") == AgreementLevel.PARTIAL
+    assert validator._check_agreement("Rideshare", "Transportation") == AgreementLevel.PARTIAL
+    assert validator._check_agreement("Streaming", "Groceries") == AgreementLevel.NONE
+
+
+async def test_agreement_report():
+    """Test the report counts agreement levels, overrides and frequent disagreements."""
+    validator = AIMLCrossValidator(AsyncMLService(ML_CATEGORIES))
+    results = await validator.cross_validate_batch(
+        ["Whole Foods", "Uber", "Venmo", "Venmo", "Netflix"],
+        ["Groceries", "Gas & Fuel", "Transfers", "Transfers", "Income"],
+        0.7,
+        ml_categories=[None, None, None, None, ""],
+        ml_confidences=[None, None, None, None, 0.0],
+    )
+
+    report = AIMLCrossValidator.agreement_report(results)
+
+    assert (report.total, report.full, report.partial, report.none) == (5, 1, 1, 3)
+    assert report.ml_missing == 1
+    assert report.agreement_rate == 0.5
+    assert report.top_disagreements == [("Transfers", "Groceries", 2)]
+    assert report.to_dict()["override_rate"] == report.override_rate
@@ -0,0 +1,193 @@
+"""Tests for the batch alert scanner."""
+
+import pytest
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+from app.models.budget import Budget
+from app.models.financial_goal import FinancialGoal
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.alert_scanner import BatchAlertScanner, ScanCheckpoint, shard_bounds
+from app.services.budget_service import BudgetService
+from app.services.goal_service import GoalService
+
+
+async def create_user(db_session, spend: dict, allocations: dict, goals: list) -> User:
+    """Create a user with an active budget, current spending and goals."""
+    user = User(id=uuid4(), email=f"{uuid4()}@example.com", password_hash="hashed")
+    db_session.add(user)
+    await db_session.flush()
+
+    db_session.add(
+        Budget(
+            user_id=user.id,
+            name="Monthly",
+            period_start=date.today() - timedelta(days=10),
+            period_end=date.today() + timedelta(days=20),
+            allocations=allocations,
+        )
+    )
+    for category, amount in spend.items():
+        db_session.add(
+            Transaction(
+                user_id=user.id,
+                amount=Decimal(amount),
+                date=date.today(),
+                description="Purchase",
+                category=category,
+                type="EXPENSE",
+                source="MANUAL",
+            )
+        )
+    for current, days_left, age in goals:
+        db_session.add(
+            FinancialGoal(
+                user_id=user.id,
+                name=f"Goal {current}",
+                target_amount=Decimal("1000.00"),
+                current_amount=Decimal(current),
+                deadline=date.today() + timedelta(days=days_left),
+                created_at=datetime.utcnow() - timedelta(days=age),
+            )
+        )
+    await db_session.flush()
+    return user
+
+
+@pytest.fixture
+async def users(db_session):
+    return [
+        await create_user(
+            db_session,
+            spend={"Groceries": "80.00", "Dining": "250.00", "Travel": "10.00"},
+            allocations={"Groceries": 100.0, "Dining": 200.0, "Travel": 500.0},
+            goals=[("100.00", 20, 100), ("900.00", 60, 10)],
+        ),
+        await create_user(
+            db_session,
+            spend={"Groceries": "79.99"},
+            allocations={"Groceries": 100.0},
+            goals=[("50.00", 90, 30)],
+        ),
+        await create_user(
+            db_session,
+            spend={"Rent": "1000.00"},
+            allocations={"Rent": 999.99, "Fun": 0.01},
+            goals=[],
+        ),
+    ]
+
+
+async def expected_alerts(db_session, user_ids):
+    budget_service = BudgetService(db_session)
+    goal_service = GoalService(db_session)
+
+    budget_alerts, goal_alerts = [], []
+    for user_id in user_ids:
+        for budget in await budget_service.list_budgets(user_id):
+            for alert in await budget_service.check_budget_alerts(user_id, budget.id):
+                budget_alerts.append((user_id, budget.id, alert))
+        for alert in await goal_service.check_goal_risks(user_id):
+            goal_alerts.append((user_id, alert))
+    return budget_alerts, goal_alerts
+
+
+def sort_key(alert):
+    return str(alert)
+
+
+@pytest.mark.asyncio
+async def test_scan_page_matches_per_user_services(db_session, users):
+    """Test batch evaluation produces the same alerts as the per-user services."""
+    user_ids = [user.id for user in users]
+    scanner = BatchAlertScanner(db_session)
+
+    page = await scanner.scan_page(user_ids)
+    budget_alerts, goal_alerts = await expected_alerts(db_session, user_ids)
+
+    assert sorted(page.budget_alerts, key=sort_key) == sorted(budget_alerts, key=sort_key)
+    assert sorted(page.goal_alerts, key=sort_key) == sorted(goal_alerts, key=sort_key)
+    assert {alert.severity for _, _, alert in page.budget_alerts} == {"WARNING", "CRITICAL"}
+    assert len(page.goal_alerts) == 2
+
+
+@pytest.mark.asyncio
+async def test_run_pages_through_all_users(db_session, users):
+    """Test keyset pagination visits each user once and collects all alerts."""
+    pages = []
+
+    async def sink(page):
+        pages.append(page)
+
+    stats = await BatchAlertScanner(db_session, page_size=2).run(sink)
+
+    scanned = [user_id for page in pages for user_id in page.user_ids]
+    assert len(scanned) == len(set(scanned))
+    assert {user.id for user in users} <= set(scanned)
+    assert scanned == sorted(scanned)
+    assert stats.users_scanned == len(scanned)
+    assert stats.budget_alerts == sum(len(page.budget_alerts) for page in pages)
+
+
+def test_shard_bounds_partition_uuid_space():
+    """Test shards are contiguous, disjoint and cover every user id."""
+    bounds = [shard_bounds(i, 4) for i in range(4)]
+
+    assert bounds[0][0] == UUID(int=0)
+    assert bounds[-1][1] is None
+    for (_, upper), (lower, _) in zip(bounds, bounds[1:]):
+        assert upper == lower
+
+    with pytest.raises(ValueError):
+        shard_bounds(4, 4)
+
+
+@pytest.mark.asyncio
+async def test_shards_scan_disjoint_users(db_session, users):
+    """Test shards together scan every user exactly once."""
+    scanned = []
+
+    async def sink(page):
+        scanned.extend(page.user_ids)
+
+    for shard in range(3):
+        await BatchAlertScanner(db_session).run(sink, shard_index=shard, shard_count=3)
+
+    assert len(scanned) == len(set(scanned))
+    assert {user.id for user in users} <= set(scanned)
+
+
+@pytest.mark.asyncio
+async def test_run_resumes_from_checkpoint(db_session, users, tmp_path):
+    """Test an interrupted scan resumes after the last delivered page."""
+    checkpoint_path = tmp_path / "scan.json"
+    delivered = []
+
+    async def failing_sink(page):
+        if delivered:
+            raise RuntimeError("notification queue down")
+        delivered.extend(page.user_ids)
+
+    with pytest.raises(RuntimeError):
+        await BatchAlertScanner(db_session, page_size=1).run(
+            failing_sink, checkpoint_path=checkpoint_path
+        )
+
+    checkpoint = ScanCheckpoint.load(checkpoint_path)
+    assert checkpoint.last_user_id == delivered[0]
+    assert not checkpoint.completed
+
+    async def sink(page):
+        delivered.extend(page.user_ids)
+
+    stats = await BatchAlertScanner(db_session, page_size=1).run(
+        sink, checkpoint_path=checkpoint_path
+    )
+
+    assert len(delivered) == len(set(delivered))
+    assert {user.id for user in users} <= set(delivered)
+    assert stats.users_scanned == len(delivered)
+    assert stats.users_this_run == len(delivered) - 1
+    assert ScanCheckpoint.load(checkpoint_path).completed
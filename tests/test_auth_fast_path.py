@@ -0,0 +1,205 @@
+"""Tests for cached token verification, principals and the blacklist filter."""
+
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+import app.services.auth_service as auth_module
+from app.cache import CacheManager, cache_manager, wait_for_invalidations
+from app.dependencies import get_current_principal, get_current_user_id
+from app.services.auth_service import AuthService, Principal
+from app.services.token_blacklist import BloomFilter, TokenBlacklist
+
+
+async def settle():
+    """Let listener and rebuild tasks run."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@contextmanager
+def count_selects(db_session):
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        if statement.startswith("SELECT"):  # Ignore the fixture's savepoints
+            statements.append(statement)
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", count_statement)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count_statement)
+
+
+@pytest.fixture
+def redis(monkeypatch, fake_redis):
+    monkeypatch.setattr(cache_manager, "redis", fake_redis)
+    return fake_redis
+
+
+@pytest.fixture
+async def blacklists(fake_redis):
+    """Blacklists in two processes sharing one Redis."""
+    managers = []
+    for _ in range(2):
+        manager = CacheManager()
+        manager.redis = fake_redis
+        manager.start_listener()
+        managers.append(manager)
+    blacklists = [TokenBlacklist(manager, capacity=1000) for manager in managers]
+    await settle()
+    yield blacklists
+    for manager in managers:
+        await manager.stop_listener()
+
+
+class TestBloomFilter:
+    """Tests for the bloom filter."""
+
+    def test_no_false_negatives(self):
+        """Test every added item is reported present."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f"token-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+
+    def test_false_positive_rate(self):
+        """Test the false positive rate stays near its target at capacity."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"token-{i}")
+
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+
+class TestTokenBlacklist:
+    """Tests for the filtered token blacklist."""
+
+    async def test_unseen_tokens_skip_redis(self, blacklists, fake_redis):
+        """Test tokens absent from the filter are answered without Redis."""
+        blacklist, _ = blacklists
+        reads = fake_redis.reads
+
+        assert not await blacklist.contains("never-revoked")
+        assert fake_redis.reads == reads
+        assert blacklist.get_stats()["local_negatives"] == 1
+
+    async def test_revocations_reach_other_processes(self, blacklists):
+        """Test a token revoked in one process is rejected in another."""
+        first, second = blacklists
+
+        await second.add("revoked", expires_in=60)
+        await settle()
+
+        assert await first.contains("revoked")
+        assert await second.contains("revoked")
+
+    async def test_rebuild_loads_existing_revocations(self, fake_redis):
+        """Test a new process picks up tokens revoked before it started."""
+        manager = CacheManager()
+        manager.redis = fake_redis
+        await manager.set("blacklist:old-token", "1")
+
+        blacklist = TokenBlacklist(manager, capacity=1000)
+        manager.start_listener()
+        await settle()
+        try:
+            assert blacklist.get_stats()["filter_tokens"] == 1
+            assert await blacklist.contains("old-token")
+            assert not await blacklist.contains("other-token")
+            assert blacklist.get_stats()["local_negatives"] == 1
+        finally:
+            await manager.stop_listener()
+
+    async def test_filter_unused_without_subscription(self, fake_redis):
+        """Test every check goes to Redis when invalidations can't be received."""
+        manager = CacheManager()
+        manager.redis = fake_redis
+        blacklist = TokenBlacklist(manager, capacity=1000)
+
+        assert not await blacklist.contains("token")
+        await manager.set("blacklist:token", "1")
+        assert await blacklist.contains("token")
+        assert blacklist.get_stats()["redis_checks"] == 2
+
+
+class TestClaimsCache:
+    """Tests for cached JWT decoding."""
+
+    async def test_token_decoded_once(self, db_session, test_user, monkeypatch):
+        """Test repeated verification of a token reuses the decoded claims."""
+        auth_service = AuthService(db_session)
+        token = auth_service.create_access_token(test_user.id)
+        decode = auth_module.jwt.decode
+        calls = []
+
+        def counting_decode(*args, **kwargs):
+            calls.append(args)
+            return decode(*args, **kwargs)
+
+        monkeypatch.setattr(auth_module.jwt, "decode", counting_decode)
+
+        for _ in range(3):
+            assert auth_service.verify_token(token) == test_user.id
+        assert len(calls) == 1
+
+    async def test_cached_claims_still_check_type(self, db_session, test_user):
+        """Test a cached refresh token is still rejected as an access token."""
+        auth_service = AuthService(db_session)
+        token = auth_service.create_refresh_token(test_user.id)
+        auth_service.verify_token(token, token_type="refresh")
+
+        with pytest.raises(auth_module.TokenError):
+            auth_service.verify_token(token, token_type="access")
+
+
+class TestPrincipal:
+    """Tests for cached principals and the auth dependencies."""
+
+    async def test_principal_cached_between_requests(self, redis, db_session, test_user):
+        """Test only the first request for a user queries the database."""
+        token = AuthService(db_session).create_access_token(test_user.id)
+
+        with count_selects(db_session) as statements:
+            for _ in range(3):
+                user_id = await get_current_user_id(await get_current_principal(token, db_session))
+
+        assert user_id == test_user.id
+        assert len(statements) == 1
+
+    async def test_deactivation_takes_effect_after_commit(self, redis, db_session, test_user):
+        """Test a deactivated user's cached principal is dropped on commit."""
+        user_id = test_user.id
+        auth_service = AuthService(db_session)
+        token = auth_service.create_access_token(user_id)
+        assert await auth_service.get_principal(token) == Principal(user_id, True)
+
+        await auth_service.deactivate_user(user_id)
+        await db_session.commit()
+        await wait_for_invalidations()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_principal(token, db_session)
+        assert exc_info.value.status_code == 403
+
+    async def test_logout_revokes_token(self, redis, db_session, test_user):
+        """Test a logged out token is rejected and its principal dropped."""
+        user_id = test_user.id
+        auth_service = AuthService(db_session)
+        token = auth_service.create_access_token(user_id)
+        await auth_service.get_principal(token)
+
+        await auth_service.logout(token)
+
+        assert await cache_manager.get(f"principal:{user_id}") is None
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_principal(token, db_session)
+        assert exc_info.value.status_code == 401
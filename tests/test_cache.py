@@ -0,0 +1,199 @@
+"""Tests for the two-tier cache and its stampede protection."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.cache import _MISSING, CacheManager, LocalCache
+
+
+async def settle():
+    """Let listener tasks process queued messages."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+async def managers(fake_redis):
+    """Two cache managers standing in for two app processes."""
+    started = []
+    for _ in range(2):
+        manager = CacheManager()
+        manager.redis = fake_redis
+        manager.start_listener()
+        started.append(manager)
+    await settle()
+    yield started
+    for manager in started:
+        await manager.stop_listener()
+
+
+def test_local_cache_evicts_least_recently_used():
+    """Test the local tier stays bounded and keeps recently used entries."""
+    local = LocalCache(max_entries=2, ttl=60)
+    local.set("a", 1)
+    local.set("b", 2)
+    local.get("a")
+    local.set("c", 3)
+
+    assert local.get("b") is _MISSING
+    assert local.get("a") == 1
+    assert local.get("c") == 3
+    assert local.get_stats()["evictions"] == 1
+
+
+def test_local_cache_expires_entries(monkeypatch):
+    """Test entries expire after the shorter of their TTL and the tier TTL."""
+    local = LocalCache(max_entries=10, ttl=5)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    local.set("short", 1, ttl=1)
+    local.set("long", 2, ttl=3600)
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 2)
+    assert local.get("short") is _MISSING
+    assert local.get("long") == 2
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+    assert local.get("long") is _MISSING
+
+
+@pytest.mark.asyncio
+async def test_local_tier_serves_repeated_reads(managers, fake_redis):
+    """Test repeated gets are answered in-process after the first Redis read."""
+    first, _ = managers
+    await first.set("report:1", {"total": "10.00"})
+
+    for _ in range(3):
+        assert await first.get("report:1") == {"total": "10.00"}
+    assert await first.get("missing") is None
+    assert await first.get("missing") is None
+
+    assert fake_redis.reads == 1
+    stats = await first.get_stats()
+    assert stats["tiers"]["local"]["hits"] == 4
+    assert stats["tiers"]["redis"]["misses"] == 1
+    assert stats["hits"] == 3 and stats["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_other_processes(managers):
+    """Test a write in one process evicts local copies in the others."""
+    first, second = managers
+    token_key = "blacklist:token"
+
+    # A known miss is cached locally, like the blacklist check on each request
+    assert await first.get(token_key) is None
+    await second.set(token_key, "1")
+    await settle()
+    assert await first.get(token_key) == "1"
+
+    await second.delete(token_key)
+    await settle()
+    assert await first.get(token_key) is None
+    assert (await first.get_stats())["tiers"]["local"]["invalidations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_generation_bump_reaches_other_processes(managers):
+    """Test user keys change everywhere once any process bumps a generation."""
+    first, second = managers
+    key = await first.user_key("user-1", "advice:3")
+    assert await first.user_key("user-1", "advice:3") == key
+
+    await second.bump_generation("user-1")
+    await settle()
+
+    assert await first.user_key("user-1", "advice:3") != key
+
+
+@pytest.mark.asyncio
+async def test_local_tier_bypassed_without_subscription(fake_redis):
+    """Test the local tier is unused while invalidations can't be received."""
+    manager = CacheManager()
+    manager.redis = fake_redis
+    await manager.set("k", 1)
+
+    assert await manager.get("k") == 1
+    assert await manager.get("k") == 1
+    assert fake_redis.reads == 2
+    assert (await manager.get_stats())["tiers"]["local"]["enabled"] is False
+
+
+@pytest.mark.asyncio
+async def test_read_racing_invalidation_is_not_cached(managers, fake_redis):
+    """Test a Redis read overtaken by an invalidation isn't kept locally."""
+    first, second = managers
+    await second.set("k", "old")
+    original_get = fake_redis.get
+
+    async def racing_get(key):
+        value = await original_get(key)
+        await second.set("k", "new")
+        await settle()
+        return value
+
+    fake_redis.get = racing_get
+    assert await first.get("k") == "old"
+    fake_redis.get = original_get
+
+    assert await first.get("k") == "new"
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_coalesces_concurrent_misses(managers):
+    """Test concurrent misses for one key share a single loader call."""
+    manager, _ = managers
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"forecast": [1, 2, 3]}
+
+    results = await asyncio.gather(*(manager.get_or_set("forecast", loader) for _ in range(10)))
+
+    assert calls == 1
+    assert all(result == {"forecast": [1, 2, 3]} for result in results)
+    assert (await manager.get_stats())["coalesced"] == 9
+    assert await manager.get_or_set("forecast", loader) == {"forecast": [1, 2, 3]}
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_refreshes_before_expiry(managers, monkeypatch):
+    """Test entries close to expiry are recomputed while still being served."""
+    manager, _ = managers
+    values = iter(["first", "second"])
+
+    async def loader():
+        return next(values)
+
+    assert await manager.get_or_set("k", loader, expire=60) == "first"
+
+    # Fresh entries are served from cache
+    monkeypatch.setattr(manager, "EARLY_REFRESH_BETA", 0)
+    assert await manager.get_or_set("k", loader, expire=60) == "first"
+
+    # A huge beta makes the refresh certain however far off expiry is
+    monkeypatch.setattr(manager, "EARLY_REFRESH_BETA", 1e12)
+    assert await manager.get_or_set("k", loader, expire=60) == "second"
+    assert (await manager.get_stats())["early_refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_does_not_cache_none(managers):
+    """Test None results are recomputed on every call."""
+    manager, _ = managers
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        return None
+
+    assert await manager.get_or_set("k", loader) is None
+    assert await manager.get_or_set("k", loader) is None
+    assert calls == 2
@@ -0,0 +1,146 @@
+"""Tests for cached value serialization."""
+
+import json
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from uuid import uuid4
+
+import pytest
+
+from app.cache import CacheManager
+from app.cache_codec import (
+    COMPRESSION_NONE,
+    COMPRESSION_ZLIB,
+    FORMAT_VERSION,
+    MSGPACK_AVAILABLE,
+    CacheSerializer,
+    CodecError,
+    register_dataclass,
+    register_type,
+)
+
+CODECS = [
+    pytest.param(
+        "msgpack",
+        marks=pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack not installed"),
+    ),
+    "json",
+]
+
+
+@register_dataclass(100)
+@dataclass
+class ForecastPoint:
+    day: date
+    amount: Decimal
+
+
+class Priority(str, Enum):
+    HIGH = "high"
+
+
+def sample_value():
+    return {
+        "id": uuid4(),
+        "amount": Decimal("1234.50"),
+        "generated_at": datetime(2026, 1, 2, 3, 4, 5, 678),
+        "points": [ForecastPoint(date(2026, 1, d), Decimal(d) / 4) for d in range(1, 4)],
+        "priority": Priority.HIGH,
+        "nested": {"values": [1, 2.5, None, True, "text"]},
+    }
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_round_trip_preserves_types(codec):
+    """Test Decimal, UUID, dates and registered dataclasses come back typed."""
+    serializer = CacheSerializer(codec=codec, compress_min_bytes=0)
+    value = sample_value()
+
+    decoded = serializer.loads(serializer.dumps(value))
+
+    assert decoded["id"] == value["id"]
+    assert decoded["amount"] == Decimal("1234.50")
+    assert str(decoded["amount"]) == "1234.50"
+    assert decoded["generated_at"] == value["generated_at"]
+    assert decoded["points"] == value["points"]
+    assert decoded["priority"] == "high"
+    assert decoded["nested"] == value["nested"]
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_large_values_are_compressed(codec):
+    """Test only values over the threshold are compressed."""
+    serializer = CacheSerializer(codec=codec, compress_min_bytes=256, compression="zlib")
+    small = serializer.dumps({"a": 1})
+    large_value = [{"category": "Groceries", "amount": Decimal("12.34")}] * 200
+    large = serializer.dumps(large_value)
+
+    assert small[0] == FORMAT_VERSION and small[2] == COMPRESSION_NONE
+    assert large[2] == COMPRESSION_ZLIB
+    assert len(large) < len(serializer.codec.encode(large_value))
+    assert serializer.loads(large) == large_value
+
+
+def test_reads_entries_from_other_codec():
+    """Test a process reads entries whichever codec wrote them."""
+    value = {"amount": Decimal("5.00")}
+    written = CacheSerializer(codec="json").dumps(value)
+
+    assert CacheSerializer(codec="msgpack").loads(written) == value
+
+
+def test_reads_legacy_json_entries():
+    """Test entries written before the header existed still decode."""
+    serializer = CacheSerializer()
+    legacy = json.dumps({"total": "10.00", "items": [1, 2]}, default=str)
+
+    assert serializer.loads(legacy.encode()) == {"total": "10.00", "items": [1, 2]}
+    assert serializer.loads(b'"1"') == "1"
+
+
+def test_rejects_unknown_versions_and_corrupt_entries():
+    """Test unreadable entries raise CodecError rather than garbage."""
+    serializer = CacheSerializer(codec="json")
+    entry = serializer.dumps({"a": 1})
+
+    with pytest.raises(CodecError):
+        serializer.loads(bytes([FORMAT_VERSION + 1]) + entry[1:])
+    with pytest.raises(CodecError):
+        serializer.loads(entry[:3] + zlib.compress(b"x"))
+    with pytest.raises(CodecError):
+        serializer.loads(b"{not json")
+
+
+def test_register_type_rejects_duplicate_codes():
+    """Test a hook code can't be claimed by two types."""
+    with pytest.raises(ValueError):
+        register_type(complex, 1, str, complex)
+    with pytest.raises(ValueError):
+        register_type(complex, 200, str, complex)
+
+
+@pytest.mark.asyncio
+async def test_cache_manager_round_trips_types(fake_redis):
+    """Test values read back through CacheManager keep their types."""
+    manager = CacheManager()
+    manager.redis = fake_redis
+    value = sample_value()
+
+    await manager.set("forecast", value)
+    stored = manager.redis.data[manager._make_key("forecast")]
+
+    assert isinstance(stored, bytes) and stored[0] == FORMAT_VERSION
+    assert (await manager.get("forecast"))["amount"] == Decimal("1234.50")
+
+
+@pytest.mark.asyncio
+async def test_cache_manager_treats_unreadable_entries_as_misses(fake_redis):
+    """Test entries from an unknown future format read as misses."""
+    manager = CacheManager()
+    manager.redis = fake_redis
+    manager.redis.data[manager._make_key("k")] = bytes([FORMAT_VERSION + 1, 1, 0]) + b"x"
+
+    assert await manager.get("k") is None
@@ -0,0 +1,129 @@
+"""Tests for per-user cache generations and write-triggered invalidation."""
+
+import asyncio
+import pytest
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import cache_manager, invalidate_user_cache, wait_for_invalidations
+from app.schemas.transaction import TransactionCreate, TransactionSource, TransactionType
+from app.services.budget_service import BudgetService
+from app.services.transaction_service import TransactionService
+
+
+@pytest.fixture
+def redis(monkeypatch, fake_redis):
+    monkeypatch.setattr(cache_manager, "redis", fake_redis)
+    return fake_redis
+
+
+def transaction_data(amount="10.00"):
+    return TransactionCreate(
+        amount=Decimal(amount),
+        date=date.today(),
+        description="Coffee",
+        category="Dining",
+        type=TransactionType.EXPENSE,
+        source=TransactionSource.MANUAL,
+    )
+
+
+@pytest.mark.asyncio
+async def test_bump_generation_changes_user_keys(redis, test_user):
+    """Test bumping a generation hides values cached under the old one."""
+    key = await cache_manager.user_key(test_user.id, "advice:3")
+    await cache_manager.set(key, ["cached"])
+    assert await cache_manager.get(await cache_manager.user_key(test_user.id, "advice:3"))
+
+    await cache_manager.bump_generation(test_user.id)
+
+    new_key = await cache_manager.user_key(test_user.id, "advice:3")
+    assert new_key != key
+    assert await cache_manager.get(new_key) is None
+    assert await cache_manager.get_generation(test_user.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_generation_without_redis(monkeypatch, test_user):
+    """Test user keys still work when Redis is unavailable."""
+    monkeypatch.setattr(cache_manager, "redis", None)
+
+    assert await cache_manager.user_key(test_user.id, "k") == f"user:{test_user.id}:g0:k"
+    assert not await cache_manager.bump_generation(test_user.id)
+
+
+@pytest.mark.asyncio
+async def test_service_write_bumps_after_commit(redis, db_session, test_user):
+    """Test a service write invalidates the user's cache only once committed."""
+    service = TransactionService(db_session)
+
+    await service.create_transaction(test_user.id, transaction_data())
+    await wait_for_invalidations()
+    assert await cache_manager.get_generation(test_user.id) == 0
+
+    await db_session.commit()
+    await wait_for_invalidations()
+    assert await cache_manager.get_generation(test_user.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_session_waits_only_for_its_own_invalidations(
+    redis, db_session, test_user, monkeypatch
+):
+    """Test a session's wait isn't held up by another session's slow invalidation."""
+    other_user, release = uuid4(), asyncio.Event()
+    bump_generation = cache_manager.bump_generation
+
+    async def slow_bump_generation(*user_ids):
+        if other_user in user_ids:
+            await release.wait()
+        return await bump_generation(*user_ids)
+
+    monkeypatch.setattr(cache_manager, "bump_generation", slow_bump_generation)
+    async with AsyncSession(db_session.bind.engine) as other:
+        invalidate_user_cache(other, other_user)
+        await other.commit()
+    invalidate_user_cache(db_session, test_user.id)
+    await db_session.commit()
+
+    await asyncio.wait_for(wait_for_invalidations(db_session), timeout=1)
+    assert await cache_manager.get_generation(test_user.id) == 1
+    assert await cache_manager.get_generation(other_user) == 0
+
+    release.set()
+    await wait_for_invalidations()
+    assert await cache_manager.get_generation(other_user) == 1
+
+
+@pytest.mark.asyncio
+async def test_writes_in_one_commit_bump_once(redis, db_session, test_user):
+    """Test several writes by the same user share one bump per commit."""
+    await TransactionService(db_session).create_transaction(test_user.id, transaction_data())
+    await BudgetService(db_session).create_budget(
+        user_id=test_user.id,
+        name="Monthly",
+        period_start=date.today(),
+        period_end=date.today(),
+        allocations={"Dining": Decimal("100")},
+    )
+
+    await db_session.commit()
+    await wait_for_invalidations()
+
+    assert await cache_manager.get_generation(test_user.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_rollback_discards_invalidation(redis, db_session, test_user):
+    """Test rolled back writes leave the cache generation alone."""
+    user_id = test_user.id
+    invalidate_user_cache(db_session, user_id)
+
+    await db_session.rollback()
+    await wait_for_invalidations()
+
+    assert not db_session.sync_session.info.get("stale_cache_users")
+    assert await cache_manager.get_generation(user_id) == 0
@@ -3,6 +3,7 @@
 import pytest
 import os
 import glob
+import json
 from decimal import Decimal
 
 from app.ml.categorization_engine import CategorizationEngine, CategoryPrediction
@@ -81,7 +82,10 @@ def categorization_engine() -> CategorizationEngine:
             pass
     
     yield engine
-    
+
+    # Finish pending saves so they can't recreate files after cleanup
+    engine.close()
+
     # Clean up any test user files after test
     test_files = glob.glob(os.path.join(engine.model_dir, "user_test_*"))
     for file in test_files:
@@ -494,3 +498,108 @@ class TestCategorizationEngine:
 
         # Check empty batch
         assert categorization_engine.categorize_batch([]) == []
+
+
+class TestIncrementalLearning:
+    """Tests for incremental user model updates."""
+
+    def train(self, engine, user_id):
+        """Accumulate enough corrections to train a user model."""
+        for i in range(50):
+            category = "Dining" if i % 2 == 0 else "Transportation"
+            description = f"Coffee shop {i}" if i % 2 == 0 else f"Uber ride {i}"
+            engine.learn_from_correction(user_id, description, category)
+        assert engine.has_user_model(user_id)
+
+    def test_corrections_update_without_retraining(self, categorization_engine, monkeypatch):
+        """Test corrections after training are learned without a full fit."""
+        engine = categorization_engine
+        user_id = "test_user_incremental"
+        self.train(engine, user_id)
+
+        def fail_fit(corrections):
+            raise AssertionError("full retraining not expected")
+
+        monkeypatch.setattr(engine, "_fit_user_model", fail_fit)
+        for i in range(5):
+            assert engine.learn_from_correction(user_id, f"Lyft trip {i}", "Transportation")
+
+        result = engine._categorize_sync("Lyft trip downtown", user_id=user_id)
+        assert result.category == "Transportation"
+        assert result.model_type == "USER_SPECIFIC"
+        assert engine.user_metrics[user_id]["training_samples"] == 55
+
+    def test_updates_are_saved_after_delay(self, categorization_engine):
+        """Test incremental updates are held in memory until flushed."""
+        engine = categorization_engine
+        user_id = "test_user_debounce"
+        self.train(engine, user_id)
+        model_path = os.path.join(engine.model_dir, f"user_{user_id}_categorization_model.pkl")
+        saved_at = os.path.getmtime(model_path)
+
+        for i in range(3):
+            engine.learn_from_correction(user_id, f"Espresso bar {i}", "Dining")
+        assert os.path.getmtime(model_path) == saved_at
+        assert user_id in engine._dirty
+
+        engine.flush()
+
+        new_engine = CategorizationEngine(model_dir=engine.model_dir)
+        assert new_engine._load_user_metrics_sync(user_id)["training_samples"] == 53
+        assert new_engine._categorize_sync("Espresso bar", user_id=user_id).category == "Dining"
+
+    def test_new_category_retrains(self, categorization_engine):
+        """Test a correction to an unseen category retrains the model."""
+        engine = categorization_engine
+        user_id = "test_user_new_category"
+        self.train(engine, user_id)
+
+        assert engine.learn_from_correction(user_id, "Netflix monthly", "Entertainment")
+
+        assert "Entertainment" in engine.user_models[user_id].classes_
+        assert user_id not in engine._dirty
+
+    def test_periodic_rebuild(self, categorization_engine, monkeypatch):
+        """Test a full rebuild runs in the background after enough updates."""
+        engine = categorization_engine
+        user_id = "test_user_rebuild"
+        self.train(engine, user_id)
+        monkeypatch.setattr(engine, "REBUILD_EVERY", 3)
+
+        for i in range(3):
+            engine.learn_from_correction(user_id, f"Bistro {i}", "Dining")
+        engine.close()
+
+        metrics = engine.user_metrics[user_id]
+        assert metrics["training_samples"] == 53
+        assert "online_updates" not in metrics
+        assert engine._updates_since_rebuild[user_id] == 0
+
+    def test_forget_cancels_pending_save(self, categorization_engine):
+        """Test a forgotten model isn't written back by a pending save."""
+        engine = categorization_engine
+        user_id = "test_user_forget"
+        self.train(engine, user_id)
+        engine.learn_from_correction(user_id, "Cafe latte", "Dining")
+        model_path = os.path.join(engine.model_dir, f"user_{user_id}_categorization_model.pkl")
+
+        engine.forget_user_model(user_id)
+        os.remove(model_path)
+        engine.flush()
+
+        assert not os.path.exists(model_path)
+        assert not engine.has_user_model(user_id)
+
+    def test_migrates_legacy_corrections(self, categorization_engine):
+        """Test corrections saved as a JSON array move into the log."""
+        engine = categorization_engine
+        user_id = "test_user_legacy"
+        legacy_path = os.path.join(engine.model_dir, f"user_{user_id}_corrections.json")
+        with open(legacy_path, "w") as f:
+            json.dump([{"description": "Coffee shop", "category": "Dining"}] * 3, f)
+
+        engine.learn_from_correction(user_id, "Uber ride", "Transportation")
+
+        assert not os.path.exists(legacy_path)
+        assert engine.get_correction_count(user_id) == 4
+        assert engine._load_user_corrections(user_id)[-1] == ("Uber ride", "Transportation")
@@ -2,8 +2,10 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.config import settings
 from app.models.connection import Connection
 from app.models.user import User
+from app.services.encryption_service import EncryptionService, reencrypt_connection_tokens
 
 
 class TestConnectionEncryption:
@@ -161,3 +163,34 @@ class TestConnectionEncryption:
         reloaded = result.scalar_one()
         assert reloaded.access_token == long_token
         assert len(reloaded.access_token) == 5000
+
+    async def test_reencrypt_tokens_under_new_key(
+        self, db_session: AsyncSession, test_user: User, monkeypatch
+    ):
+        """Test stored tokens are re-encrypted under the current key."""
+        connections = []
+        for i in range(3):
+            connection = Connection(
+                user_id=test_user.id,
+                institution_id=f"ins_rotate_{i}",
+                institution_name="Rotating Bank",
+                status="ACTIVE",
+            )
+            connection.access_token = f"token-{i}"
+            connections.append(connection)
+        db_session.add_all(connections)
+        await db_session.commit()
+
+        rotated = EncryptionService(key="rotated-key", old_keys=[settings.encryption_key])
+        monkeypatch.setattr("app.services.encryption_service.encryption_service", rotated)
+
+        assert await reencrypt_connection_tokens(db_session, batch_size=2) == 3
+        assert await reencrypt_connection_tokens(db_session) == 0
+
+        db_session.expire_all()
+        result = await db_session.execute(
+            select(Connection).where(Connection.institution_name == "Rotating Bank")
+        )
+        for connection in result.scalars():
+            assert not rotated.needs_rotation(connection._access_token_encrypted)
+            assert connection.access_token.startswith("token-")
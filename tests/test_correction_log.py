@@ -0,0 +1,68 @@
+"""Tests for the append-only correction log."""
+
+import json
+
+from app.ml.correction_log import CorrectionLog
+
+
+def test_append_assigns_sequence_numbers(tmp_path):
+    """Test appends are numbered and survive reopening."""
+    path = str(tmp_path / "corrections.jsonl")
+    log = CorrectionLog(path)
+
+    assert log.append({"category": "Dining"}) == 1
+    assert log.append({"category": "Travel"}) == 2
+    log.sync()
+
+    reopened = CorrectionLog(path)
+    assert reopened.count == 2
+    assert reopened.last_seq == 2
+    assert [r["category"] for r in reopened.read()] == ["Dining", "Travel"]
+    assert reopened.append({"category": "Housing"}) == 3
+
+
+def test_recovers_from_torn_record(tmp_path):
+    """Test a half-written final line is cut off on open."""
+    path = tmp_path / "corrections.jsonl"
+    path.write_text(json.dumps({"seq": 1, "category": "Dining"}) + '\n{"seq": 2, "cat')
+
+    log = CorrectionLog(str(path))
+
+    assert log.count == 1
+    assert log.append({"category": "Travel"}) == 2
+    assert [r["seq"] for r in log.read()] == [1, 2]
+
+
+def test_compact_keeps_newest(tmp_path):
+    """Test compaction drops the oldest records but not their numbering."""
+    log = CorrectionLog(str(tmp_path / "corrections.jsonl"))
+    for i in range(5):
+        log.append({"n": i})
+
+    assert log.compact(keep=2) == 3
+    assert [r["n"] for r in log.read()] == [3, 4]
+    assert log.count == 2
+    assert log.append({"n": 5}) == 6
+
+
+def test_rewrite_numbers_new_records(tmp_path):
+    """Test rewritten records without a sequence number get fresh ones."""
+    log = CorrectionLog(str(tmp_path / "corrections.jsonl"))
+
+    log.rewrite([{"n": 0}, {"n": 1}])
+
+    assert [r["seq"] for r in log.read()] == [1, 2]
+    assert log.last_seq == 2
+
+
+def test_delete(tmp_path):
+    """Test a deleted log isn't recreated by a pending sync."""
+    path = tmp_path / "corrections.jsonl"
+    log = CorrectionLog(str(path))
+    log.append({"n": 0})
+
+    log.delete()
+    log.sync()
+
+    assert not path.exists()
+    assert log.count == 0
@@ -1,7 +1,10 @@
 """Tests for encryption service."""
 
 import pytest
-from app.services.encryption_service import EncryptionService, encryption_service
+from cryptography.fernet import Fernet
+
+from app.config import settings
+from app.services.encryption_service import EncryptionService, derive_key, encryption_service
 
 
 class TestEncryptionService:
@@ -102,3 +105,69 @@ class TestEncryptionService:
         decrypted = service2.decrypt(encrypted)
 
         assert decrypted == plaintext
+
+
+class TestKeyManagement:
+    """Test suite for key derivation, rotation and the secret cache."""
+
+    def test_keys_are_derived_once_on_first_use(self):
+        """Test building services is free and each secret is derived once."""
+        derive_key.cache_clear()
+
+        service = EncryptionService(key="lazy-key")
+        assert derive_key.cache_info().currsize == 0
+
+        service.encrypt("token")
+        EncryptionService(key="lazy-key").encrypt("token")
+        assert derive_key.cache_info().misses == 1
+
+    def test_ciphertext_names_its_key(self):
+        """Test ciphertexts are prefixed with the current key id."""
+        service = EncryptionService()
+
+        encrypted = service.encrypt("token")
+
+        assert encrypted.startswith(f"{service.key_id}:")
+        assert service.key_id != EncryptionService(key="other-key").key_id
+
+    def test_old_keys_decrypt_until_rotated(self):
+        """Test values under a retired key decrypt and rotate to the new key."""
+        old = EncryptionService(key="old-key", old_keys=[])
+        new = EncryptionService(key="new-key", old_keys=["old-key"])
+        encrypted = old.encrypt("token")
+
+        assert new.decrypt(encrypted) == "token"
+        assert new.needs_rotation(encrypted)
+
+        rotated = new.rotate(encrypted)
+        assert not new.needs_rotation(rotated)
+        assert new.rotate(rotated) == rotated
+        assert EncryptionService(key="new-key", old_keys=[]).decrypt(rotated) == "token"
+        with pytest.raises(ValueError, match="unknown key id"):
+            EncryptionService(key="new-key", old_keys=[]).decrypt(encrypted)
+
+    def test_values_without_key_id_still_decrypt(self):
+        """Test values written before key ids are decrypted and rotated."""
+        service = EncryptionService()
+        legacy = Fernet(derive_key(settings.encryption_key)).encrypt(b"token").decode()
+
+        assert service.decrypt(legacy) == "token"
+        assert service.needs_rotation(legacy)
+        assert service.rotate(legacy).startswith(f"{service.key_id}:")
+
+    def test_secret_cache_is_scoped_to_the_block(self):
+        """Test repeated reads in a block decrypt once and nothing outlives it."""
+        service = EncryptionService()
+        encrypted = service.encrypt("token")
+
+        with service.secret_cache() as cache:
+            assert service.decrypt(encrypted) == "token"
+            with service.secret_cache() as inner:
+                assert inner is cache
+                assert service.decrypt(encrypted) == "token"
+            assert (cache.misses, cache.hits) == (1, 1)
+
+        assert len(cache) == 0
+        with service.secret_cache() as fresh:
+            service.decrypt(encrypted)
+            assert fresh.misses == 1
@@ -0,0 +1,234 @@
+"""Tests for the vectorized goal engine."""
+
+import pytest
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy import event
+
+from app.models.financial_goal import FinancialGoal
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.goal_engine import GoalEngine
+
+TODAY = date(2024, 6, 1)
+
+
+def reference_projection(goal):
+    """Exact per-goal Decimal projection the engine must reproduce."""
+    progress_percent = float(goal.current_amount / goal.target_amount * 100)
+    days_remaining = (goal.deadline - TODAY).days if goal.deadline else None
+    estimated, risk_reason = None, None
+    days_since_creation = (TODAY - goal.created_at.date()).days
+    if goal.deadline and goal.current_amount > 0 and days_since_creation > 0:
+        remaining = goal.target_amount - goal.current_amount
+        estimated = TODAY + timedelta(
+            days=int(remaining * days_since_creation / goal.current_amount)
+        )
+        if estimated > goal.deadline:
+            risk_reason = (
+                f"Projected to miss deadline by {(estimated - goal.deadline).days} days "
+                f"at current rate"
+            )
+    return progress_percent, days_remaining, estimated, risk_reason
+
+
+def goal_row(current, target="1000.00", days_left=None, age=100, category=None):
+    return SimpleNamespace(
+        id=uuid4(),
+        name="Goal",
+        target_amount=Decimal(target),
+        current_amount=Decimal(current),
+        deadline=TODAY + timedelta(days=days_left) if days_left is not None else None,
+        category=category,
+        created_at=datetime(2024, 6, 1, 9, 30) - timedelta(days=age),
+    )
+
+
+async def create_user(db_session):
+    user = User(id=uuid4(), email=f"{uuid4()}@example.com", password_hash="hashed")
+    db_session.add(user)
+    await db_session.flush()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_projection_matches_per_goal_arithmetic():
+    """Test the vectorized pass reproduces per-goal Decimal projections."""
+    goals = [
+        goal_row("100.00", days_left=20, age=100),
+        goal_row("900.00", days_left=60, age=10),
+        goal_row("333.33", target="999.99", days_left=400, age=200),
+        goal_row("1200.00", days_left=5, age=30),  # past its target
+        goal_row("0.00", days_left=30, age=50),  # nothing saved yet
+        goal_row("10.00", days_left=30, age=0),  # created today
+        goal_row("10.00", days_left=-3, age=90),  # deadline passed
+        goal_row("250.00", age=40),  # no deadline
+    ]
+    engine = GoalEngine(db=None, today=TODAY)
+
+    progress = await engine.progress(goals)
+
+    for goal, result in zip(goals, progress):
+        percent, days_remaining, estimated, risk_reason = reference_projection(goal)
+        assert result.progress_percent == pytest.approx(percent)
+        assert result.remaining_amount == goal.target_amount - goal.current_amount
+        assert result.days_remaining == days_remaining
+        assert result.estimated_completion_date == estimated
+        assert result.risk_reason == risk_reason
+        assert result.is_at_risk == (risk_reason is not None)
+
+
+@pytest.mark.asyncio
+async def test_projection_is_exact_where_rounded_rate_falls_short():
+    """Test whole-day quotients aren't cut short as the old per-goal rate division was."""
+    goal = goal_row("3.84", target="6.72", days_left=365, age=36)
+    remaining = goal.target_amount - goal.current_amount
+    # 2.88 / (3.84 / 36) with the rate rounded up to 28 digits
+    assert int(remaining / (goal.current_amount / 36)) == 26
+
+    (result,) = await GoalEngine(db=None, today=TODAY).progress([goal])
+
+    assert result.estimated_completion_date == TODAY + timedelta(days=27)
+
+
+@pytest.mark.asyncio
+async def test_user_progress_loads_all_users_in_one_query(db_session):
+    """Test goals of many users are loaded with a single statement."""
+    users = [await create_user(db_session) for _ in range(3)]
+    for user in users:
+        for current in ("100.00", "500.00"):
+            db_session.add(
+                FinancialGoal(
+                    user_id=user.id,
+                    name=f"Goal {current}",
+                    target_amount=Decimal("1000.00"),
+                    current_amount=Decimal(current),
+                    deadline=date.today() + timedelta(days=60),
+                    created_at=datetime.utcnow() - timedelta(days=90),
+                )
+            )
+    await db_session.flush()
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        if statement.startswith("SELECT"):  # Ignore the fixture's savepoints
+            statements.append(statement)
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", count_statement)
+    try:
+        by_user = await GoalEngine(db_session).user_progress([user.id for user in users])
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count_statement)
+
+    assert len(statements) == 1
+    assert set(by_user) == {user.id for user in users}
+    assert all(len(progress) == 2 for progress in by_user.values())
+
+
+@pytest.mark.asyncio
+async def test_history_projects_from_recent_contributions(db_session):
+    """Test category-linked goals are projected at their recent contribution pace."""
+    user = await create_user(db_session)
+    created = datetime.utcnow() - timedelta(days=300)
+    deadline = date.today() + timedelta(days=100)
+    speeding_up = FinancialGoal(
+        user_id=user.id,
+        name="Savings",
+        target_amount=Decimal("10000.00"),
+        current_amount=Decimal("4000.00"),
+        deadline=deadline,
+        category="Savings",
+        created_at=created,
+    )
+    stalled = FinancialGoal(
+        user_id=user.id,
+        name="Emergency fund",
+        target_amount=Decimal("10000.00"),
+        current_amount=Decimal("9000.00"),
+        deadline=deadline,
+        category="Emergency",
+        created_at=created,
+    )
+    db_session.add_all([speeding_up, stalled])
+    for days_ago in range(30):
+        db_session.add(
+            Transaction(
+                user_id=user.id,
+                amount=Decimal("100.00"),
+                date=date.today() - timedelta(days=days_ago),
+                description="Transfer to savings",
+                category="Savings",
+                type="EXPENSE",
+                source="MANUAL",
+            )
+        )
+    await db_session.flush()
+
+    straight_line = (await GoalEngine(db_session).user_progress([user.id]))[user.id]
+    recent = (await GoalEngine(db_session, history_days=30).user_progress([user.id]))[user.id]
+
+    by_name = {progress.name: progress for progress in straight_line}
+    assert by_name["Savings"].is_at_risk
+    assert not by_name["Emergency fund"].is_at_risk
+
+    # 3000.00 over 30 days leaves 60 days for the remaining 6000.00
+    by_name = {progress.name: progress for progress in recent}
+    assert not by_name["Savings"].is_at_risk
+    assert by_name["Savings"].estimated_completion_date == date.today() + timedelta(days=60)
+    assert by_name["Emergency fund"].is_at_risk
+    assert by_name["Emergency fund"].risk_reason == "No contributions in the last 30 days"
+
+    alerts = await GoalEngine(db_session, history_days=30).risk_alerts([user.id])
+    assert [(user_id, alert.goal_id) for user_id, alert in alerts] == [(user.id, stalled.id)]
+
+
+@pytest.mark.asyncio
+async def test_apply_contributions_updates_goals_with_one_statement(db_session):
+    """Test contributions to several goals are applied by one UPDATE."""
+    user = await create_user(db_session)
+    goals = [
+        FinancialGoal(
+            user_id=user.id,
+            name=name,
+            target_amount=Decimal("1000.00"),
+            current_amount=Decimal(current),
+            category=category,
+        )
+        for name, current, category in [
+            ("Car", "100.00", "Savings"),
+            ("House", "950.00", "Savings"),
+            ("Trip", "10.00", "Travel"),
+            ("Other", "10.00", "Groceries"),
+        ]
+    ]
+    db_session.add_all(goals)
+    await db_session.flush()
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement.split()[0])
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", count_statement)
+    try:
+        updated = await GoalEngine(db_session).apply_contributions(
+            user.id, {"Savings": Decimal("50.00"), "Travel": Decimal("5.50")}
+        )
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count_statement)
+
+    assert statements == ["UPDATE"]
+    assert sorted((goal.name, goal.current_amount, goal.status) for goal in updated) == [
+        ("Car", Decimal("150.00"), "ACTIVE"),
+        ("House", Decimal("1000.00"), "ACHIEVED"),
+        ("Trip", Decimal("15.50"), "ACTIVE"),
+    ]
+    # Goals already in the session are refreshed
+    assert goals[1].status == "ACHIEVED"
+    assert goals[3].current_amount == Decimal("10.00")
@@ -0,0 +1,109 @@
+"""Tests for off-loop password hashing and its load shedding."""
+
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+
+import app.routes.auth as auth_routes
+import app.services.auth_service as auth_module
+import app.services.password_hasher as hasher_module
+from app.metrics.auth_metrics import password_hash_metrics
+from app.services.auth_service import AuthService
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusy, hash_cost
+
+PASSWORD = "TestPassword123!@#"
+
+
+@pytest.fixture
+def hasher(monkeypatch):
+    """A cheap thread-backed hasher in place of the global one."""
+    hasher = PasswordHasher(rounds=5, max_workers=1, max_pending=0, executor="thread")
+    monkeypatch.setattr(auth_module, "password_hasher", hasher)
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.fixture
+def blocked(monkeypatch):
+    """Make hashes wait until the returned event is set."""
+    release = threading.Event()
+    original = hasher_module._hash
+
+    def slow_hash(password, rounds):
+        release.wait(5)
+        return original(password, rounds)
+
+    monkeypatch.setattr(hasher_module, "_hash", slow_hash)
+    yield release
+    release.set()
+
+
+async def test_hash_and_verify(hasher):
+    """Test hashes use the configured work factor and verify."""
+    hashed = await hasher.hash(PASSWORD)
+
+    assert hash_cost(hashed) == 5
+    assert await hasher.verify(PASSWORD, hashed)
+    assert not await hasher.verify("WrongPassword123!@#", hashed)
+
+
+async def test_process_pool_hashes():
+    """Test the default process pool produces usable hashes."""
+    hasher = PasswordHasher(rounds=4, max_workers=1, executor="process")
+    try:
+        assert await hasher.verify(PASSWORD, await hasher.hash(PASSWORD))
+    finally:
+        hasher.shutdown()
+
+
+async def test_sheds_load_when_queue_full(hasher, blocked):
+    """Test requests beyond workers plus pending are refused, not queued."""
+    rejected = password_hash_metrics.rejected_total.labels(operation="hash")
+    before = rejected._value.get()
+
+    first = asyncio.create_task(hasher.hash(PASSWORD))
+    await asyncio.sleep(0)
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.hash(PASSWORD)
+
+    assert rejected._value.get() == before + 1
+    blocked.set()
+    assert hash_cost(await first) == 5
+    assert hasher.queue_depth == 0
+
+
+def test_needs_rehash(hasher):
+    """Test hashes at other work factors are flagged for rehashing."""
+    assert hasher.needs_rehash(bcrypt.hashpw(b"x", bcrypt.gensalt(rounds=4)).decode())
+    assert not hasher.needs_rehash(bcrypt.hashpw(b"x", bcrypt.gensalt(rounds=5)).decode())
+    assert hasher.needs_rehash("not-a-bcrypt-hash")
+
+
+async def test_login_rehashes_old_work_factor(hasher, db_session, test_user):
+    """Test a successful login upgrades a hash made at an old work factor."""
+    test_user.password_hash = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=4)).decode()
+    await db_session.flush()
+    rehashed = password_hash_metrics.rehash_total._value.get()
+
+    user = await AuthService(db_session).authenticate_user(test_user.email, PASSWORD)
+
+    assert hash_cost(user.password_hash) == 5
+    assert bcrypt.checkpw(PASSWORD.encode(), user.password_hash.encode())
+    assert password_hash_metrics.rehash_total._value.get() == rehashed + 1
+
+
+async def test_login_returns_429_when_busy(hasher, blocked, client, test_user):
+    """Test logins shed by the hasher get 429 with Retry-After."""
+    first = asyncio.create_task(hasher.hash(PASSWORD))
+    await asyncio.sleep(0)
+
+    response = await client.post(
+        "/api/auth/login", json={"email": test_user.email, "password": PASSWORD}
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(auth_routes.HASHER_RETRY_AFTER)
+    blocked.set()
+    await first
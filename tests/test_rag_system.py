@@ -13,6 +13,11 @@ import json
 from unittest.mock import patch, MagicMock
 
 # Import the RAG components
+from app.services.merchant_artifact import (
+    MerchantArtifact,
+    build_artifact,
+    load_artifact,
+)
 from app.services.merchant_database import (
     MerchantDatabase,
     MerchantInfo,
@@ -24,6 +29,7 @@ from app.services.rag_context import (
     RAGContextBuilder,
 )
 from app.services.feedback_collector import (
+    CategoryCorrection,
     FeedbackCollector,
 )
 
@@ -215,6 +221,187 @@ class TestMerchantDatabase:
         assert info is not None
         assert info.is_recurring is False
 
+    def test_lookup_cache_hit(self, sample_merchant_data):
+        """Test repeated lookups are served from the cache."""
+        db = MerchantDatabase(sample_merchant_data)
+
+        first = db.lookup("WHOLEFDS 12345 AUSTIN TX")
+        second = db.lookup("WHOLEFDS 99999 AUSTIN TX")  # Same normalized key
+
+        assert first is second
+        stats = db.get_stats()
+        assert stats["cache_hits"] == 1
+        assert stats["cache_misses"] == 1
+
+    def test_lookup_cache_negative(self, sample_merchant_data):
+        """Test not-found results are cached too."""
+        db = MerchantDatabase(sample_merchant_data)
+
+        assert db.lookup("completely unknown merchant xyz") is None
+        with patch.object(db, "_lookup_fuzzy") as fuzzy:
+            assert db.lookup("completely unknown merchant xyz") is None
+            fuzzy.assert_not_called()
+
+    def test_lookup_cache_bounded(self, sample_merchant_data):
+        """Test the cache evicts least recently used entries."""
+        db = MerchantDatabase(sample_merchant_data, cache_size=2)
+
+        db.lookup("netflix")
+        db.lookup("mcdonalds")
+        db.lookup("netflix")  # Refresh netflix
+        db.lookup("whole foods")  # Evicts mcdonalds
+
+        assert db.get_stats()["cache_entries"] == 2
+        assert "mcdonalds" not in db._lookup_cache
+        assert "netflix" in db._lookup_cache
+
+    def test_lookup_cache_invalidated_on_add(self, sample_merchant_data):
+        """Test adding a merchant drops cached misses."""
+        db = MerchantDatabase(sample_merchant_data)
+
+        assert db.lookup("brand new shop") is None
+        db.add_merchant(key="brand new shop", canonical_name="Brand New", category="Shopping")
+
+        info = db.lookup("brand new shop")
+        assert info is not None
+        assert info.category == "Shopping"
+
+    def test_pattern_index_matches_sequential(self):
+        """Test the combined pattern regex picks the same merchant as a sequential scan."""
+        db = MerchantDatabase()  # Real data/merchants.json
+
+        descriptors = [
+            "amzn mktp us",
+            "amazon prime video",
+            "uber eats order",
+            "uber trip",
+            "dd donuts",
+            "sq *blue bottle",
+            "atm withdrawal",
+            "payroll deposit acme",
+            "shell oil 123",
+            "unknown store",
+        ]
+        for text in descriptors:
+            assert db._lookup_pattern(text) == db._lookup_pattern_sequential(text), text
+
+    def test_pattern_enabled_by_add_merchant(self, sample_merchant_data):
+        """Test a pattern for a missing merchant starts matching once it is added."""
+        db = MerchantDatabase(sample_merchant_data)
+        assert db._lookup_pattern("amzn mktp us") is None
+
+        db.add_merchant(key="amazon", canonical_name="Amazon", category="Shopping")
+
+        info = db._lookup_pattern("amzn mktp us")
+        assert info is not None
+        assert info.key == "amazon"
+
+    def test_lookup_result_immutable(self, sample_merchant_data):
+        """Test cached results cannot be mutated by callers."""
+        import dataclasses
+
+        db = MerchantDatabase(sample_merchant_data)
+        info = db.lookup("mcdonalds 1234")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            info.match_score = 0.1
+
+
+# ============================================================================
+# MERCHANT ARTIFACT TESTS
+# ============================================================================
+
+
+class TestMerchantArtifact:
+    """Tests for the precompiled, memory-mapped merchant artifact."""
+
+    @pytest.fixture
+    def merchants_json(self, tmp_path):
+        """Create a merchants.json file with aliases, amounts and patterns."""
+        data = {
+            "categories": ["Groceries", "Subscriptions"],
+            "merchants": {
+                "whole foods": {
+                    "canonical_name": "Whole Foods Market",
+                    "category": "Groceries",
+                    "subcategory": None,
+                    "aliases": ["wholefds", "wfm"],
+                    "is_recurring": False,
+                    "typical_amounts": [50, 100.5],
+                },
+                "netflix": {
+                    "canonical_name": "Netflix",
+                    "category": "Subscriptions",
+                    "aliases": ["netflix.com"],
+                    "is_recurring": True,
+                },
+            },
+            "patterns": [
+                {"regex": "^wholefds", "merchant": "whole foods"},
+                {"regex": "([", "merchant": "netflix"},  # Invalid, skipped
+                {"regex": "^sq\\s*\\*", "merchant": "square", "note": "Square"},
+            ],
+        }
+        path = tmp_path / "merchants.json"
+        path.write_text(json.dumps(data))
+        return str(path)
+
+    def test_round_trip(self, merchants_json):
+        """Test records decoded from the artifact match the JSON."""
+        artifact = MerchantArtifact(build_artifact(merchants_json))
+        source = json.loads(open(merchants_json).read())
+
+        assert artifact.categories == ["Groceries", "Subscriptions"]
+        assert list(artifact.merchant_keys()) == ["whole foods", "netflix"]
+        whole_foods = artifact.merchant(artifact.merchant_index("whole foods"))
+        assert whole_foods == source["merchants"]["whole foods"]
+        assert artifact.alias_lookup("wfm") == "whole foods"
+        assert artifact.alias_lookup("unknown") is None
+        assert [p["regex"] for p in artifact.patterns()] == ["^wholefds", "^sq\\s*\\*"]
+
+    def test_rebuilds_when_json_changes(self, merchants_json):
+        """Test a stale artifact is rebuilt from the changed JSON."""
+        first = load_artifact(merchants_json)
+        assert first.alias_lookup("spotify") is None
+
+        data = json.loads(open(merchants_json).read())
+        data["merchants"]["spotify"] = {"category": "Subscriptions", "aliases": []}
+        with open(merchants_json, "w") as f:
+            json.dump(data, f)
+
+        second = load_artifact(merchants_json)
+        assert second.source_hash != first.source_hash
+        assert second.alias_lookup("spotify") == "spotify"
+
+    def test_corrupt_artifact_is_rebuilt(self, merchants_json, tmp_path):
+        """Test a truncated artifact file is replaced."""
+        (tmp_path / "merchants.bin").write_bytes(b"garbage")
+
+        artifact = load_artifact(merchants_json)
+        assert artifact is not None
+        assert artifact.alias_lookup("wholefds") == "whole foods"
+
+    def test_database_matches_json_backend(self, merchants_json):
+        """Test lookups agree between the artifact and plain JSON backends."""
+        from_artifact = MerchantDatabase(merchants_json)
+        from_json = MerchantDatabase(merchants_json, use_artifact=False)
+
+        assert from_artifact.get_stats()["storage"] == "artifact"
+        assert from_json.get_stats()["storage"] == "json"
+        for text in ["WHOLEFDS 1234 AUSTIN TX", "wfm", "netflix.com", "wholefoods", "nope"]:
+            assert from_artifact.lookup(text) == from_json.lookup(text), text
+        assert list(from_artifact._alias_index.items()) == list(from_json._alias_index.items())
+        assert from_artifact.get_stats()["total_patterns"] == 2
+
+    def test_add_merchant_overlays_artifact(self, merchants_json):
+        """Test runtime merchants layer on top of the read-only artifact."""
+        db = MerchantDatabase(merchants_json)
+        db.add_merchant(key="corner shop", canonical_name="Corner", category="Groceries")
+
+        assert db.lookup("corner shop").category == "Groceries"
+        assert len(db._merchants) == 3
+        assert list(db._merchants)[-1] == "corner shop"
+
 
 # ============================================================================
 # MERCHANT NORMALIZER TESTS
@@ -493,6 +680,63 @@ class TestFeedbackCollector:
         stats = await collector2.get_stats()
         assert stats["total_corrections"] >= 1
 
+    @pytest.mark.asyncio
+    async def test_replays_log_after_snapshot(self, tmp_path):
+        """Test corrections logged after the last snapshot survive a restart."""
+        paths = {
+            "corrections_path": str(tmp_path / "corrections.json"),
+            "aggregates_path": str(tmp_path / "aggregates.json"),
+        }
+        collector1 = FeedbackCollector(**paths, auto_update_merchant_db=False)
+        await collector1.record_correction("user1", "tx1", "SHOP A", "A", "B")
+        await collector1._save_data()
+        await collector1.record_correction("user1", "tx2", "SHOP A", "A", "B")
+        await collector1.record_correction("user1", "tx3", "SHOP B", "A", "C")
+
+        collector2 = FeedbackCollector(**paths, auto_update_merchant_db=False)
+
+        stats = await collector2.get_stats()
+        assert stats["total_corrections"] == 3
+        assert stats["unique_merchants_corrected"] == 2
+        assert len(await collector2.get_corrections_for_merchant("SHOP A")) == 2
+
+    @pytest.mark.asyncio
+    async def test_migrates_legacy_corrections(self, tmp_path):
+        """Test corrections saved as a JSON array move into the log once."""
+        corrections_path = tmp_path / "corrections.json"
+        aggregates_path = tmp_path / "aggregates.json"
+        correction = CategoryCorrection(
+            user_id="user1",
+            transaction_id="tx1",
+            merchant_raw="OLD SHOP",
+            merchant_normalized=None,
+            original_category="A",
+            corrected_category="B",
+        )
+        stats = {"total_corrections": 1, "unique_merchants_corrected": 1}
+        corrections_path.write_text(
+            json.dumps({"corrections": [correction.to_dict()], "stats": stats})
+        )
+        aggregates_path.write_text(
+            json.dumps({
+                "aggregates": {
+                    "old shop": {"corrections": {"B": 1}, "total_corrections": 1}
+                }
+            })
+        )
+        paths = {
+            "corrections_path": str(corrections_path),
+            "aggregates_path": str(aggregates_path),
+        }
+
+        FeedbackCollector(**paths, auto_update_merchant_db=False)
+        collector = FeedbackCollector(**paths, auto_update_merchant_db=False)
+
+        assert not corrections_path.exists()
+        assert (tmp_path / "corrections.jsonl").exists()
+        assert (await collector.get_stats())["total_corrections"] == 1
+        assert len(await collector.get_corrections_for_merchant("OLD SHOP")) == 1
+
 
 # ============================================================================
 # INTEGRATION TESTS
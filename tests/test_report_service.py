@@ -3,6 +3,7 @@
 import pytest
 from datetime import date
 from decimal import Decimal
+from sqlalchemy import event
 
 from app.services.report_service import ReportService
 from app.services.transaction_service import TransactionService
@@ -994,3 +995,97 @@ async def test_pdf_generation_success(db_session, test_user):
         assert len(pdf_bytes) > 0
     except Exception as e:
         pytest.fail(f"PDF generation failed with exception: {e}")
+
+
+@pytest.mark.asyncio
+async def test_generate_report_single_query(db_session, test_user):
+    """Test the whole report is built from a single database round-trip."""
+    report_service = ReportService(db_session)
+    transaction_service = TransactionService(db_session)
+    budget_service = BudgetService(db_session)
+
+    start_date = date(2024, 5, 1)
+    end_date = date(2024, 5, 31)
+
+    await budget_service.create_budget(
+        user_id=test_user.id,
+        name="May Budget",
+        period_start=start_date,
+        period_end=end_date,
+        allocations={"Groceries": Decimal("400.00"), "Dining": Decimal("100.00")},
+    )
+
+    for amount, day, category, txn_type in [
+        ("3000.00", date(2024, 5, 1), "Salary", TransactionType.INCOME),
+        ("2500.00", date(2024, 4, 1), "Salary", TransactionType.INCOME),  # Previous period
+        ("120.00", date(2024, 5, 3), "Groceries", TransactionType.EXPENSE),
+        ("80.00", date(2024, 5, 20), "Groceries", TransactionType.EXPENSE),
+        ("300.00", date(2024, 4, 15), "Groceries", TransactionType.EXPENSE),
+        ("60.00", date(2024, 4, 20), "Travel", TransactionType.EXPENSE),
+    ]:
+        await transaction_service.create_transaction(
+            user_id=test_user.id,
+            transaction_data=TransactionCreate(
+                amount=Decimal(amount),
+                date=day,
+                description="Test",
+                category=category,
+                type=txn_type,
+                source=TransactionSource.MANUAL,
+            ),
+        )
+
+    await db_session.commit()
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        if statement.startswith("SELECT"):  # Ignore the fixture's savepoints
+            statements.append(statement)
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", count_statement)
+    try:
+        report = await report_service.generate_report(
+            user_id=test_user.id, start_date=start_date, end_date=end_date
+        )
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count_statement)
+
+    assert len(statements) == 1
+
+    assert report.income_summary.income_by_category == {"Salary": Decimal("3000.00")}
+    assert report.expense_summary.expenses_by_category == {"Groceries": Decimal("200.00")}
+    assert report.expense_summary.transaction_count == 2
+    assert report.budget_adherence.categories["Groceries"]["actual"] == Decimal("200.00")
+    assert report.budget_adherence.categories["Dining"]["actual"] == Decimal(0)
+
+    changes = {change.category: change for change in report.spending_changes}
+    assert set(changes) == {"Groceries", "Travel"}
+    assert changes["Groceries"].previous_amount == Decimal("300.00")
+    assert changes["Travel"].current_amount == Decimal(0)
+    assert changes["Travel"].change_percent == -100.0
+
+
+@pytest.mark.asyncio
+async def test_generate_report_budget_without_transactions(db_session, test_user):
+    """Test budget adherence is reported when the period has no transactions."""
+    report_service = ReportService(db_session)
+    budget_service = BudgetService(db_session)
+
+    await budget_service.create_budget(
+        user_id=test_user.id,
+        name="Empty Budget",
+        period_start=date(2024, 6, 1),
+        period_end=date(2024, 6, 30),
+        allocations={"Groceries": Decimal("400.00")},
+    )
+    await db_session.commit()
+
+    report = await report_service.generate_report(
+        user_id=test_user.id, start_date=date(2024, 6, 1), end_date=date(2024, 6, 30)
+    )
+
+    assert report.budget_adherence.budget_name == "Empty Budget"
+    assert report.budget_adherence.overall_adherence == 0.0
+    assert report.spending_changes == []
@@ -0,0 +1,213 @@
+"""Tests for the spending rollup table and its query layer."""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.spending_rollup import SpendingRollup
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.rollup_service import RollupService
+from app.services.transaction_service import TransactionService
+from app.schemas.transaction import (
+    TransactionCreate,
+    TransactionSource,
+    TransactionType,
+    TransactionUpdate,
+)
+
+
+async def create(service, user, amount, day, category="Groceries", txn_type=None):
+    return await service.create_transaction(
+        user_id=user.id,
+        transaction_data=TransactionCreate(
+            amount=Decimal(amount),
+            date=day,
+            description="Test",
+            category=category,
+            type=txn_type or TransactionType.EXPENSE,
+            source=TransactionSource.MANUAL,
+        ),
+    )
+
+
+async def rollup_rows(db_session, user_id):
+    result = await db_session.execute(
+        select(SpendingRollup)
+        .where(SpendingRollup.user_id == user_id)
+        .order_by(SpendingRollup.date, SpendingRollup.category, SpendingRollup.type)
+    )
+    return [
+        (r.date, r.category, r.type, r.total, r.count, r.sum_sq, r.min_amount, r.max_amount)
+        for r in result.scalars().all()
+    ]
+
+
+async def assert_matches_rebuild(db_session, user_id):
+    """Incrementally maintained rows must equal a rebuild from transactions."""
+    maintained = await rollup_rows(db_session, user_id)
+    await RollupService(db_session).rebuild(user_id)
+    db_session.expire_all()
+    assert maintained == await rollup_rows(db_session, user_id)
+
+
+@pytest.mark.asyncio
+async def test_rollup_tracks_inserts(db_session, test_user):
+    """Test new transactions are added to their daily rollup row."""
+    service = TransactionService(db_session)
+    await create(service, test_user, "10.00", date(2024, 3, 1))
+    await create(service, test_user, "30.00", date(2024, 3, 1))
+    await create(service, test_user, "5.00", date(2024, 3, 2), "Dining")
+    await create(service, test_user, "1000.00", date(2024, 3, 1), "Salary", TransactionType.INCOME)
+
+    rows = await rollup_rows(db_session, test_user.id)
+
+    assert rows[0] == (
+        date(2024, 3, 1),
+        "Groceries",
+        "EXPENSE",
+        Decimal("40.00"),
+        2,
+        Decimal("1000.0000"),
+        Decimal("10.00"),
+        Decimal("30.00"),
+    )
+    assert len(rows) == 3
+    await assert_matches_rebuild(db_session, test_user.id)
+
+
+@pytest.mark.asyncio
+async def test_rollup_tracks_updates_and_deletes(db_session, test_user):
+    """Test updates move amounts between rows and deletes remove them."""
+    service = TransactionService(db_session)
+    small = await create(service, test_user, "10.00", date(2024, 3, 1))
+    large = await create(service, test_user, "90.00", date(2024, 3, 1))
+    moved = await create(service, test_user, "25.00", date(2024, 3, 1))
+
+    await service.update_transaction(
+        moved.id, test_user.id, TransactionUpdate(category="Dining", date=date(2024, 3, 5))
+    )
+    await service.update_transaction(
+        large.id, test_user.id, TransactionUpdate(amount=Decimal("50"))
+    )
+    await service.delete_transaction(small.id, test_user.id)
+
+    rows = await rollup_rows(db_session, test_user.id)
+    assert rows == [
+        (
+            date(2024, 3, 1),
+            "Groceries",
+            "EXPENSE",
+            Decimal("50.00"),
+            1,
+            Decimal("2500.0000"),
+            Decimal("50.00"),
+            Decimal("50.00"),
+        ),
+        (
+            date(2024, 3, 5),
+            "Dining",
+            "EXPENSE",
+            Decimal("25.00"),
+            1,
+            Decimal("625.0000"),
+            Decimal("25.00"),
+            Decimal("25.00"),
+        ),
+    ]
+    await assert_matches_rebuild(db_session, test_user.id)
+
+
+@pytest.mark.asyncio
+async def test_rollup_row_removed_when_empty(db_session, test_user):
+    """Test hard-deleting the last transaction of a day removes its row."""
+    service = TransactionService(db_session)
+    transaction = await create(service, test_user, "10.00", date(2024, 3, 1))
+
+    await db_session.delete(await db_session.get(Transaction, transaction.id))
+    await db_session.flush()
+
+    assert await rollup_rows(db_session, test_user.id) == []
+
+
+@pytest.mark.asyncio
+async def test_query_layer_matches_transactions(db_session, test_user):
+    """Test rollup-backed queries equal the same queries over raw transactions."""
+    service = TransactionService(db_session)
+    for amount, day, category in [
+        ("12.50", date(2024, 4, 1), "Groceries"),
+        ("7.25", date(2024, 4, 1), "Groceries"),
+        ("40.00", date(2024, 4, 3), "Groceries"),
+        ("15.00", date(2024, 4, 2), "Dining"),
+        ("99.99", date(2024, 5, 1), "Dining"),
+    ]:
+        await create(service, test_user, amount, day, category)
+
+    rollup = RollupService(db_session, use_rollup=True)
+    raw = RollupService(db_session, use_rollup=False)
+    start, end = date(2024, 4, 1), date(2024, 4, 30)
+
+    assert await rollup.category_aggregates(test_user.id, start, end) == (
+        await raw.category_aggregates(test_user.id, start, end)
+    )
+    assert await rollup.daily_aggregates(test_user.id, start, end, category="Groceries") == (
+        await raw.daily_aggregates(test_user.id, start, end, category="Groceries")
+    )
+    assert await rollup.total(test_user.id, start, end) == Decimal("74.75")
+    assert sorted(await rollup.categories(test_user.id)) == ["Dining", "Groceries"]
+
+    groceries = (await rollup.category_aggregates(test_user.id, start, end))["Groceries"]
+    assert groceries.count == 3
+    assert groceries.min_amount == Decimal("7.25")
+    assert groceries.max_amount == Decimal("40.00")
+    assert round(groceries.stddev, 6) == Decimal("17.589651")
+
+
+@pytest.mark.asyncio
+async def test_rebuild_waits_for_open_writes(db_session, test_user):
+    """Test a user's rebuild can't run while another transaction writes their rollups."""
+    service = TransactionService(db_session)
+    await create(service, test_user, "10.00", date(2024, 3, 1))
+
+    async with db_session.bind.engine.connect() as connection:
+        other = AsyncSession(bind=connection)
+        await other.execute(text("SET LOCAL lock_timeout = '100ms'"))
+
+        # Other users' rollups stay available
+        await RollupService(other).rebuild(uuid4())
+        with pytest.raises(DBAPIError, match="lock timeout"):
+            await RollupService(other).rebuild(test_user.id)
+        await other.rollback()
+
+
+def test_flush_on_other_databases_skips_rollups():
+    """Test transaction writes on SQLite aren't broken by the PostgreSQL-only hook."""
+    engine = create_engine("sqlite://")
+    tables = [User.__table__, Transaction.__table__, SpendingRollup.__table__]
+    User.metadata.create_all(engine, tables=tables)
+
+    with Session(engine) as session:
+        user = User(email="sqlite@example.com", password_hash="hashed")
+        session.add(user)
+        session.flush()
+        session.add(
+            Transaction(
+                user_id=user.id,
+                amount=Decimal("10.00"),
+                date=date(2024, 3, 1),
+                description="Test",
+                category="Groceries",
+                type="EXPENSE",
+                source="MANUAL",
+            )
+        )
+        session.flush()
+
+        assert session.scalar(select(func.count()).select_from(Transaction)) == 1
+        assert session.scalar(select(func.count()).select_from(SpendingRollup)) == 0
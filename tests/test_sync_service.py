@@ -0,0 +1,187 @@
+"""Tests for incremental bank connection sync."""
+
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, select
+
+from app.ml.categorization_engine import CategoryPrediction
+from app.models.connection import Connection
+from app.models.transaction import Transaction
+from app.services.rollup_service import RollupService
+from app.services.sync_providers import FakeProvider, ProviderError, ProviderTransaction
+from app.services.sync_service import ConnectionSyncService
+
+
+class StubEngine:
+    """Categorizes everything as Dining and records batch sizes."""
+
+    def __init__(self):
+        self.batches = []
+
+    def categorize_batch(self, descriptions, amounts=None, user_id=None):
+        self.batches.append(len(descriptions))
+        return [CategoryPrediction("Dining", 0.9, "GLOBAL") for _ in descriptions]
+
+
+def txn(external_id, amount="10.00", description=None):
+    return ProviderTransaction(
+        external_id=external_id,
+        amount=Decimal(amount),
+        date=date(2024, 5, 1),
+        description=description or f"Coffee {external_id}",
+    )
+
+
+@pytest.fixture
+def provider():
+    return FakeProvider()
+
+
+@pytest.fixture
+def engine():
+    return StubEngine()
+
+
+@pytest.fixture
+def service(db_session, provider, engine):
+    @asynccontextmanager
+    async def session_factory():
+        yield db_session
+
+    return ConnectionSyncService(
+        provider, engine, session_factory=session_factory, concurrency=2, page_size=2
+    )
+
+
+async def make_connection(db_session, user, token):
+    connection = Connection(
+        user_id=user.id, institution_id="ins_1", institution_name="Test Bank", status="ACTIVE"
+    )
+    connection.access_token = token
+    db_session.add(connection)
+    await db_session.commit()
+    return connection
+
+
+async def synced_rows(db_session, connection):
+    result = await db_session.execute(
+        select(Transaction)
+        .where(Transaction.connection_id == connection.id)
+        .order_by(Transaction.external_id)
+    )
+    return list(result.scalars())
+
+
+async def test_initial_sync_pages_through_history(service, provider, engine, db_session, test_user):
+    """Test the first sync inserts every transaction, categorized per page."""
+    connection = await make_connection(db_session, test_user, "token-a")
+    provider.add("token-a", *(txn(f"t{i}") for i in range(5)))
+
+    result = await service.sync_connection(connection.id)
+
+    assert result.error is None
+    assert (result.provider_calls, result.added) == (3, 5)
+    assert engine.batches == [2, 2, 1]
+    rows = await synced_rows(db_session, connection)
+    assert [row.external_id for row in rows] == ["t0", "t1", "t2", "t3", "t4"]
+    assert {(row.source, row.category, row.confidence_score) for row in rows} == {
+        ("API", "Dining", 0.9)
+    }
+    assert connection.sync_cursor == "5"
+    assert connection.last_sync is not None
+    rollups = RollupService(db_session, use_rollup=True)
+    assert await rollups.total(test_user.id) == Decimal("50.00")
+
+
+async def test_resync_without_changes_makes_one_call_and_no_writes(
+    service, provider, db_session, test_user
+):
+    """Test an unchanged account costs one provider call and writes nothing."""
+    connection = await make_connection(db_session, test_user, "token-a")
+    provider.add("token-a", txn("t0"), txn("t1"))
+    await service.sync_connection(connection.id)
+    last_sync = connection.last_sync
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        result = await service.sync_connection(connection.id)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+
+    assert (result.provider_calls, result.changed) == (1, 0)
+    assert not {"INSERT", "UPDATE", "DELETE"} & set(statements)
+    assert connection.last_sync == last_sync
+
+
+async def test_modifications_and_removals(service, provider, db_session, test_user):
+    """Test changed rows are updated, re-reported ones skipped and removed ones deleted."""
+    connection = await make_connection(db_session, test_user, "token-a")
+    provider.add("token-a", txn("t0"), txn("t1"), txn("t2"))
+    await service.sync_connection(connection.id)
+
+    provider.modify("token-a", txn("t0", amount="12.50"), txn("t1"))
+    provider.remove("token-a", "t2")
+    # Added and removed within a page (an expired pending transaction)
+    provider.add("token-a", txn("t3"))
+    provider.remove("token-a", "t3")
+    service.page_size = 10
+    result = await service.sync_connection(connection.id)
+
+    assert (result.added, result.modified, result.unchanged, result.removed) == (0, 1, 1, 1)
+    rows = {row.external_id: row for row in await synced_rows(db_session, connection)}
+    assert set(rows) == {"t0", "t1", "t2"}
+    assert rows["t0"].amount == Decimal("12.50")
+    assert rows["t2"].deleted_at is not None
+    rollups = RollupService(db_session, use_rollup=True)
+    assert await rollups.total(test_user.id) == Decimal("22.50")
+
+
+async def test_revoked_token_expires_connection(service, provider, db_session, test_user):
+    """Test an authentication failure marks the connection expired."""
+    connection = await make_connection(db_session, test_user, "token-a")
+    provider.revoke("token-a")
+
+    result = await service.sync_connection(connection.id)
+
+    assert result.error == "Access token revoked"
+    assert connection.status == "EXPIRED"
+    assert (await service.sync_connection(connection.id)).provider_calls == 0
+
+
+async def test_connections_sync_concurrently_up_to_the_limit(service, db_session, test_user):
+    """Test connections share the concurrency limit and failures stay isolated."""
+
+    class TrackingProvider(FakeProvider):
+        in_flight = peak = 0
+
+        async def fetch_changes(self, access_token, cursor, count):
+            TrackingProvider.in_flight += 1
+            TrackingProvider.peak = max(TrackingProvider.peak, TrackingProvider.in_flight)
+            try:
+                page = await super().fetch_changes(access_token, cursor, count)
+            finally:
+                TrackingProvider.in_flight -= 1
+            if access_token == "token-3":
+                raise ProviderError("Institution unavailable")
+            return page
+
+    service.provider = TrackingProvider(latency=0.05)
+    connections = [await make_connection(db_session, test_user, f"token-{i}") for i in range(5)]
+    # Already synced and empty, so the syncs don't use the shared test session at once
+    for connection in connections:
+        connection.sync_cursor = "0"
+
+    results = await service.sync_connections(c.id for c in connections)
+
+    assert TrackingProvider.peak == 2
+    assert [r.error for r in results] == [None, None, None, "Institution unavailable", None]
+    assert connections[3].status == "ACTIVE"
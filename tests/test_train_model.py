@@ -0,0 +1,58 @@
+"""Tests for the categorization model training harness."""
+
+import json
+import os
+import tempfile
+
+from sklearn.naive_bayes import ComplementNB, MultinomialNB
+
+from app.ml.train_model import save_leaderboard, search_hyperparameters
+from app.ml.training_data import prepare_training_data
+
+PARAM_GRID = [
+    {
+        "tfidf__ngram_range": [(1, 1), (1, 2)],
+        "classifier": [MultinomialNB(), ComplementNB()],
+        "classifier__alpha": [0.1, 1.0],
+    }
+]
+
+
+def test_search_ranks_candidates(tmp_path):
+    """Test every candidate is measured and the best cross-validated one wins."""
+    descriptions, categories = prepare_training_data()
+
+    model, metrics, leaderboard = search_hyperparameters(
+        descriptions, categories, param_grid=PARAM_GRID, cv=3, n_jobs=1
+    )
+
+    assert len(leaderboard) == 8
+    assert [entry["rank"] for entry in leaderboard] == list(range(1, 9))
+    scores = [round(entry["cv_accuracy"], 4) for entry in leaderboard]
+    assert scores == sorted(scores, reverse=True)
+    for entry in leaderboard:
+        assert entry["latency_ms"] > 0 and entry["model_bytes"] > 0
+        assert 0 <= entry["test_accuracy"] <= 1
+
+    best = leaderboard[0]["params"]
+    assert metrics["params"] == best
+    assert type(model.named_steps["classifier"]).__name__ == best["classifier"]
+    assert model.named_steps["classifier"].alpha == best["classifier__alpha"]
+    assert model.memory is None
+
+    path = save_leaderboard(leaderboard, str(tmp_path))
+    with open(path) as f:
+        assert json.load(f)[0]["params"]["tfidf__ngram_range"] in ([1, 1], [1, 2])
+
+
+def test_random_search_samples_candidates(tmp_path, monkeypatch):
+    """Test random search tries n_iter candidates and removes its cache."""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    descriptions, categories = prepare_training_data()
+
+    _, _, leaderboard = search_hyperparameters(
+        descriptions, categories, param_grid=PARAM_GRID, n_iter=3, cv=2, n_jobs=1
+    )
+
+    assert len(leaderboard) == 3
+    assert os.listdir(tmp_path) == []
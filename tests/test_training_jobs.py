@@ -0,0 +1,273 @@
+"""Tests for background training of user categorization models."""
+
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+
+import pytest
+
+import app.services.training_jobs as training_jobs
+from app.config import settings
+from app.ml.categorization_engine import CategorizationEngine, train_user_model_version
+from app.services.ml_model_service import MLModelService
+from app.services.training_jobs import (
+    InMemoryJobQueue,
+    JobStatus,
+    TrainingJob,
+    TrainingJobManager,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine with its own model directory."""
+    engine = CategorizationEngine(model_dir=str(tmp_path))
+    yield engine
+    engine.close()
+
+
+@pytest.fixture
+def requests(engine):
+    """Record training requests instead of training inline."""
+    requested = []
+    engine.training_scheduler = lambda user_id, reason: requested.append((user_id, reason))
+    return requested
+
+
+def add_corrections(engine, user_id, count):
+    for i in range(count):
+        category = "Dining" if i % 2 == 0 else "Transportation"
+        description = f"Coffee shop {i}" if i % 2 == 0 else f"Uber ride {i}"
+        engine.learn_from_correction(user_id, description, category)
+
+
+async def test_queue_keeps_latest_job_per_user():
+    """Test a newer job replaces a queued one for the same user in place."""
+    queue = InMemoryJobQueue()
+    first = TrainingJob(user_id="a", reason="threshold")
+    await queue.enqueue(first)
+    await queue.enqueue(TrainingJob(user_id="b", reason="threshold"))
+
+    replaced = await queue.enqueue(TrainingJob(user_id="a", reason="rebuild"))
+
+    assert replaced is first
+    job = await queue.dequeue(timeout=0.1)
+    assert (job.user_id, job.reason) == ("a", "rebuild")
+    assert [j.user_id for j in (await queue.jobs())["queued"]] == ["b"]
+    assert (await queue.jobs())["running"] == [job]
+
+
+async def test_dequeue_times_out():
+    """Test an empty queue returns None after the timeout."""
+    assert await InMemoryJobQueue().dequeue(timeout=0.01) is None
+
+
+async def test_manager_marks_replaced_jobs_superseded(engine):
+    """Test superseded jobs are reported among finished jobs."""
+    manager = TrainingJobManager(engine, InMemoryJobQueue(), workers=1, executor="thread")
+
+    first = await manager.enqueue("a", "threshold")
+    await manager.enqueue("a", "rebuild")
+
+    jobs = await manager.list_jobs()
+    assert len(jobs["queued"]) == 1
+    assert jobs["finished"][0].id == first.id
+    assert jobs["finished"][0].status == JobStatus.SUPERSEDED
+
+
+def test_engine_requests_training_instead_of_training(engine, requests):
+    """Test a scheduler receives trainings the engine would run inline."""
+    add_corrections(engine, "test_user_scheduled", 50)
+
+    assert ("test_user_scheduled", "threshold") in requests
+    assert not engine.has_user_model("test_user_scheduled")
+
+
+def test_install_catches_up_with_new_corrections(engine, requests):
+    """Test corrections logged after the training data are folded in on install."""
+    user_id = "test_user_catch_up"
+    add_corrections(engine, user_id, 50)
+    result = train_user_model_version(engine.model_dir, user_id, "v1", engine.USER_MODEL_FEATURES)
+    engine.learn_from_correction(user_id, "Espresso bar", "Dining")
+
+    assert engine.install_user_model(user_id, result["model_path"], result["metrics"], 50)
+
+    assert engine.user_metrics[user_id]["training_samples"] == 51
+    assert engine._categorize_sync("Espresso bar", user_id=user_id).model_type == "USER_SPECIFIC"
+
+
+async def test_run_job_registers_and_installs_model(engine, requests, db_session, test_user):
+    """Test a job trains in a worker process, registers the version and swaps it in."""
+    user_id = str(test_user.id)
+    add_corrections(engine, user_id, 50)
+
+    @asynccontextmanager
+    async def session_factory():
+        yield db_session
+
+    manager = TrainingJobManager(
+        engine, InMemoryJobQueue(), session_factory=session_factory, workers=1
+    )
+    try:
+        await manager.enqueue(user_id, "threshold")
+        job = await manager.queue.dequeue(timeout=0.1)
+        job = await manager.run_job(job)
+    finally:
+        await manager.stop()
+
+    assert job.status == JobStatus.SUCCEEDED, job.error
+    assert job.run_seconds is not None and job.training_samples == 50
+    assert engine.has_user_model(user_id)
+
+    active = await MLModelService(db_session).get_active_model("CATEGORIZATION", test_user.id)
+    assert active.version == job.model_version
+    assert os.path.exists(active.model_path)
+    assert (await manager.list_jobs())["finished"][0] is job
+
+
+async def test_run_job_versions_are_unique_and_pruned(
+    engine, requests, db_session, test_user, monkeypatch
+):
+    """Test jobs in the same second get their own versions and old files are deleted."""
+    monkeypatch.setattr(settings, "training_model_versions", 2)
+    user_id = str(test_user.id)
+    add_corrections(engine, user_id, 50)
+
+    @asynccontextmanager
+    async def session_factory():
+        yield db_session
+
+    manager = TrainingJobManager(
+        engine, InMemoryJobQueue(), session_factory=session_factory, executor="thread"
+    )
+    jobs = []
+    for _ in range(3):
+        jobs.append(await manager.run_job(TrainingJob(user_id=user_id, reason="rebuild")))
+    await manager.stop()
+
+    assert all(job.status == JobStatus.SUCCEEDED for job in jobs), [job.error for job in jobs]
+    assert len({job.model_version for job in jobs}) == 3
+    versions = sorted(
+        name
+        for name in os.listdir(engine.model_dir)
+        if name.startswith(f"user_{user_id}_categorization_model_")
+    )
+    assert len(versions) == 2
+    active = await MLModelService(db_session).get_active_model("CATEGORIZATION", test_user.id)
+    assert os.path.exists(active.model_path)
+
+
+async def test_model_not_installed_is_not_registered(
+    engine, requests, db_session, test_user, monkeypatch
+):
+    """Test a model the engine refuses to install never becomes the active version."""
+    user_id = str(test_user.id)
+    add_corrections(engine, user_id, 50)
+    monkeypatch.setattr(engine, "install_user_model", lambda *args: False)
+
+    @asynccontextmanager
+    async def session_factory():
+        yield db_session
+
+    manager = TrainingJobManager(
+        engine, InMemoryJobQueue(), session_factory=session_factory, executor="thread"
+    )
+    job = await manager.run_job(TrainingJob(user_id=user_id, reason="rebuild"))
+    await manager.stop()
+
+    assert job.status == JobStatus.FAILED
+    assert job.model_version is None
+    assert await MLModelService(db_session).get_active_model("CATEGORIZATION", test_user.id) is None
+
+
+async def test_listener_resubscribes_after_errors(engine, fake_redis, monkeypatch):
+    """Test announcements are received again once a lost subscription is back."""
+    pubsub_class = type(fake_redis.pubsub())
+    subscribe = pubsub_class.subscribe
+    failures = []
+
+    async def flaky_subscribe(self, channel):
+        if not failures:
+            failures.append(channel)
+            raise ConnectionError("Connection reset by peer")
+        await subscribe(self, channel)
+
+    monkeypatch.setattr(pubsub_class, "subscribe", flaky_subscribe)
+    reloaded = []
+    monkeypatch.setattr(engine, "reload_user_model", reloaded.append)
+    manager = TrainingJobManager(engine, InMemoryJobQueue(), workers=1, redis=fake_redis)
+    manager.RESUBSCRIBE_DELAY = 0
+    manager.start()
+    try:
+        for _ in range(100):
+            if fake_redis.subscribers:
+                break
+            await asyncio.sleep(0.01)
+        await fake_redis.publish(
+            manager.MODELS_CHANNEL, json.dumps({"user_id": "other", "sender": "worker-2"})
+        )
+        for _ in range(100):
+            if reloaded:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await manager.stop()
+
+    assert failures == [manager.MODELS_CHANNEL]
+    assert reloaded == ["other"]
+
+
+async def test_failed_job_is_reported(engine, requests):
+    """Test a job without enough category diversity fails without installing."""
+    user_id = "test_user_one_category"
+    for i in range(50):
+        engine.learn_from_correction(user_id, f"Coffee {i}", "Dining")
+    manager = TrainingJobManager(engine, InMemoryJobQueue(), workers=1, executor="thread")
+
+    job = await manager.run_job(TrainingJob(user_id=user_id, reason="threshold"))
+    await manager.stop()
+
+    assert job.status == JobStatus.FAILED
+    assert "diversity" in job.error
+    assert not engine.has_user_model(user_id)
+
+
+async def test_workers_run_requests_from_other_threads(engine):
+    """Test trainings requested off the event loop are queued and run."""
+    user_id = "test_user_threaded"
+    engine.learn_from_correction(user_id, "Coffee", "Dining")
+    manager = TrainingJobManager(engine, InMemoryJobQueue(), workers=1, executor="thread")
+    manager.start()
+    try:
+        assert engine.training_scheduler == manager.request_training
+        await asyncio.to_thread(manager.request_training, user_id, "manual")
+        for _ in range(100):
+            finished = (await manager.list_jobs())["finished"]
+            if finished:
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        await manager.stop()
+
+    # One correction isn't enough to train on, but the job ran
+    assert finished[0].user_id == user_id
+    assert finished[0].status == JobStatus.FAILED
+    assert engine.training_scheduler is None
+
+
+async def test_jobs_endpoint_requires_admin(client, auth_headers, test_user, engine, monkeypatch):
+    """Test only admins can list training jobs."""
+    manager = TrainingJobManager(engine, InMemoryJobQueue(), workers=1, executor="thread")
+    await manager.enqueue(str(test_user.id), "manual")
+    monkeypatch.setattr(training_jobs, "_training_job_manager", manager)
+
+    monkeypatch.setattr(settings, "admin_emails", [])
+    response = await client.get("/api/ml/training/jobs", headers=auth_headers)
+    assert response.status_code == 403
+
+    monkeypatch.setattr(settings, "admin_emails", [test_user.email.upper()])
+    response = await client.get("/api/ml/training/jobs", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["queued"][0]["reason"] == "manual"
+    assert response.json()["running"] == []
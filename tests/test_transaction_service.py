@@ -6,16 +6,20 @@ from datetime import date as date_type
 from decimal import Decimal
 from uuid import uuid4
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
+from app.models.transaction import Transaction
 from app.models.user import User
-from app.services.transaction_service import TransactionService
+from app.services.transaction_service import InvalidCursorError, TransactionService
+from app.services.transaction_search import match_condition
 from app.ml.categorization_engine import CategorizationEngine
 from app.schemas.transaction import (
     TransactionCreate,
     TransactionUpdate,
     TransactionFilters,
     Pagination,
+    CountMode,
     TransactionType,
     TransactionSource,
 )
@@ -670,6 +674,151 @@ class TestListTransactions:
         assert "Walmart" in transactions[0].description
 
 
+class TestKeysetPagination:
+    """Tests for cursor pagination and cheap counts."""
+
+    async def create_transactions(self, transaction_service, db_session, user, count):
+        """Create transactions, several per day so the order needs its tiebreakers."""
+        for i in range(count):
+            await transaction_service.create_transaction(
+                user_id=user.id,
+                transaction_data=TransactionCreate(
+                    amount=Decimal(f"{10 + i}.00"),
+                    date=date_type.today() - timedelta(days=i // 3),
+                    description=f"Transaction {i}",
+                    type=TransactionType.EXPENSE,
+                    source=TransactionSource.MANUAL,
+                ),
+                category="Shopping",
+            )
+        await db_session.commit()
+
+    async def test_cursor_pages_follow_listing_order(
+        self,
+        transaction_service: TransactionService,
+        test_user: User,
+        db_session: AsyncSession,
+    ):
+        """Test walking by cursor visits every transaction once, in listing order."""
+        await self.create_transactions(transaction_service, db_session, test_user, 8)
+        expected, _ = await transaction_service.list_transactions(user_id=test_user.id)
+
+        seen = []
+        cursor = None
+        while True:
+            page = await transaction_service.list_transactions_page(
+                user_id=test_user.id,
+                pagination=Pagination(page_size=3, cursor=cursor),
+                count=CountMode.NONE,
+            )
+            seen.extend(page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert [t.id for t in seen] == [t.id for t in expected]
+        assert page.total is None
+
+    async def test_offset_and_cursor_pages_agree(
+        self,
+        transaction_service: TransactionService,
+        test_user: User,
+        db_session: AsyncSession,
+    ):
+        """Test a cursor page matches the offset page in the same position."""
+        await self.create_transactions(transaction_service, db_session, test_user, 8)
+
+        first = await transaction_service.list_transactions_page(
+            user_id=test_user.id, pagination=Pagination(page=1, page_size=3)
+        )
+        by_offset = await transaction_service.list_transactions_page(
+            user_id=test_user.id, pagination=Pagination(page=2, page_size=3)
+        )
+        by_cursor = await transaction_service.list_transactions_page(
+            user_id=test_user.id, pagination=Pagination(page_size=3, cursor=first.next_cursor)
+        )
+
+        assert [t.id for t in by_cursor.items] == [t.id for t in by_offset.items]
+        assert first.total == 8 and not first.total_is_estimate
+
+    async def test_invalid_cursor_rejected(
+        self,
+        transaction_service: TransactionService,
+        test_user: User,
+    ):
+        """Test malformed cursors raise InvalidCursorError."""
+        for cursor in ["not-a-cursor", "e30", "WyJ4IiwgInkiLCAieiJd"]:
+            with pytest.raises(InvalidCursorError):
+                await transaction_service.list_transactions_page(
+                    user_id=test_user.id, pagination=Pagination(cursor=cursor)
+                )
+
+    async def test_estimated_count_uses_rollup(
+        self,
+        transaction_service: TransactionService,
+        test_user: User,
+        db_session: AsyncSession,
+    ):
+        """Test estimated counts with rollup-compatible filters are exact."""
+        await self.create_transactions(transaction_service, db_session, test_user, 8)
+
+        page = await transaction_service.list_transactions_page(
+            user_id=test_user.id,
+            filters=TransactionFilters(category="Shopping", type=TransactionType.EXPENSE),
+            pagination=Pagination(page_size=3),
+            count=CountMode.ESTIMATE,
+        )
+
+        assert page.total == 8
+        assert not page.total_is_estimate
+
+    async def test_estimated_count_uses_planner(
+        self,
+        transaction_service: TransactionService,
+        test_user: User,
+        db_session: AsyncSession,
+    ):
+        """Test filters the rollup can't answer get a planner estimate."""
+        await self.create_transactions(transaction_service, db_session, test_user, 8)
+
+        page = await transaction_service.list_transactions_page(
+            user_id=test_user.id,
+            filters=TransactionFilters(min_amount=Decimal("11.00")),
+            pagination=Pagination(page_size=3),
+            count=CountMode.ESTIMATE,
+        )
+
+        assert page.total_is_estimate
+        # At least the rows this page has shown to exist
+        assert page.total >= 4
+
+    async def test_last_page_skips_count_query(
+        self,
+        transaction_service: TransactionService,
+        test_user: User,
+        db_session: AsyncSession,
+    ):
+        """Test a page that reaches the end of the listing knows its total."""
+        await self.create_transactions(transaction_service, db_session, test_user, 5)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        sync_engine = db_session.bind.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", record)
+        try:
+            page = await transaction_service.list_transactions_page(
+                user_id=test_user.id, pagination=Pagination(page=2, page_size=3)
+            )
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", record)
+
+        assert page.total == 5
+        assert page.next_cursor is None
+        assert not any("count(" in statement for statement in statements)
+
+
 class TestDuplicateDetection:
     """Tests for duplicate transaction detection."""
 
@@ -1112,3 +1261,224 @@ class TestAutoCategorization:
                 f"Expected {expected_category} for '{description}', got {transaction.category}"
             )
             assert transaction.confidence_score is not None
+
+
+class TestDescriptionSearch:
+    """Tests for ranked, prefix-matching description search."""
+
+    DESCRIPTIONS = [
+        "Starbucks Coffee",
+        "Coffee Bean & Tea Leaf downtown store 1123",
+        "Shell Gas Station",
+    ]
+
+    async def create_transactions(self, transaction_service, db_session, user):
+        for description in self.DESCRIPTIONS:
+            await transaction_service.create_transaction(
+                user_id=user.id,
+                transaction_data=TransactionCreate(
+                    amount=Decimal("5.00"),
+                    date=date_type.today(),
+                    description=description,
+                    type=TransactionType.EXPENSE,
+                    source=TransactionSource.MANUAL,
+                ),
+                category="Dining",
+            )
+        await db_session.commit()
+
+    async def test_prefix_search_ranks_hits(
+        self,
+        transaction_service: TransactionService,
+        test_user: User,
+        db_session: AsyncSession,
+    ):
+        """Test partial words match and closer matches rank first."""
+        await self.create_transactions(transaction_service, db_session, test_user)
+
+        hits, total = await transaction_service.search_transactions(test_user.id, "coff")
+
+        assert total == 2
+        assert [hit.transaction.description for hit in hits] == self.DESCRIPTIONS[:2]
+        assert hits[0].rank > hits[1].rank > 1
+        assert hits[0].highlights == [(10, 14)]
+
+        hits, total = await transaction_service.search_transactions(test_user.id, "STAR cof")
+        assert total == 1
+        assert hits[0].highlights == [(0, 4), (10, 13)]
+
+    async def test_search_uses_full_text_index(
+        self,
+        transaction_service: TransactionService,
+        test_user: User,
+        db_session: AsyncSession,
+    ):
+        """Test the search condition matches the indexed expression."""
+        await db_session.execute(text("SET LOCAL enable_seqscan = off"))
+        stmt = select(Transaction.id).where(match_condition(["coffee"], "postgresql"))
+
+        result = await db_session.execute(text("EXPLAIN " + str(
+            stmt.compile(db_session.bind, compile_kwargs={"literal_binds": True})
+        )))
+
+        assert "idx_transactions_description_words" in "\n".join(row[0] for row in result)
+
+    async def test_search_matches_words_of_dotted_merchants(
+        self,
+        transaction_service: TransactionService,
+        test_user: User,
+        db_session: AsyncSession,
+    ):
+        """Test words inside hosts and card descriptors match, as ILIKE did."""
+        for description in ["AMAZON.COM*MK1234", "WWW.STARBUCKS.COM", "Shell Gas Station"]:
+            await transaction_service.create_transaction(
+                user_id=test_user.id,
+                transaction_data=TransactionCreate(
+                    amount=Decimal("5.00"),
+                    date=date_type.today(),
+                    description=description,
+                    type=TransactionType.EXPENSE,
+                    source=TransactionSource.MANUAL,
+                ),
+                category="Shopping",
+            )
+        await db_session.commit()
+
+        expected = {
+            "amazon.com": ["AMAZON.COM*MK1234"],
+            "starbucks": ["WWW.STARBUCKS.COM"],
+            "com": ["AMAZON.COM*MK1234", "WWW.STARBUCKS.COM"],
+            "mk12": ["AMAZON.COM*MK1234"],
+        }
+        for query, descriptions in expected.items():
+            hits, total = await transaction_service.search_transactions(test_user.id, query)
+            assert sorted(hit.transaction.description for hit in hits) == descriptions, query
+
+            listed, total = await transaction_service.list_transactions(
+                test_user.id, TransactionFilters(search=query)
+            )
+            assert sorted(t.description for t in listed) == descriptions, query
+
+    async def test_search_ranks_only_newest_matches(
+        self,
+        transaction_service: TransactionService,
+        test_user: User,
+        db_session: AsyncSession,
+        monkeypatch,
+    ):
+        """Test older matches follow the ranked window by date, across pages."""
+        monkeypatch.setattr("app.services.transaction_service.RANK_WINDOW", 3)
+        monkeypatch.setattr("app.services.transaction_service.SEARCH_COUNT_LIMIT", 4)
+        # Newest first; the best matches are the oldest ones
+        descriptions = [
+            "Coffee shop and bakery",
+            "Coffee and bagels",
+            "Coffee Coffee",
+            "Coffee Coffee Coffee",
+            "Coffee",
+            "Tea house",
+        ]
+        for days_ago, description in enumerate(descriptions):
+            await transaction_service.create_transaction(
+                user_id=test_user.id,
+                transaction_data=TransactionCreate(
+                    amount=Decimal("5.00"),
+                    date=date_type.today() - timedelta(days=days_ago),
+                    description=description,
+                    type=TransactionType.EXPENSE,
+                    source=TransactionSource.MANUAL,
+                ),
+                category="Dining",
+            )
+        await db_session.commit()
+
+        pages = [
+            await transaction_service.search_transactions(
+                test_user.id, "coffee", Pagination(page=page, page_size=2)
+            )
+            for page in (1, 2, 3)
+        ]
+
+        found = [hit.transaction.description for hits, _ in pages for hit in hits]
+        assert found == [
+            "Coffee Coffee",
+            "Coffee and bagels",
+            "Coffee shop and bakery",
+            "Coffee Coffee Coffee",
+            "Coffee",
+        ]
+        ranks = [hit.rank for hits, _ in pages for hit in hits]
+        assert all(rank > 1 for rank in ranks[:3]) and ranks[3:] == [0, 0]
+        # Five matches pass the count limit of four, so the total is estimated
+        assert all(total >= 5 for _, total in pages[:2])
+
+    async def test_in_process_search_tolerates_typos(
+        self,
+        transaction_service: TransactionService,
+        test_user: User,
+        db_session: AsyncSession,
+    ):
+        """Test the in-process fallback matches misspellings below word matches."""
+        await self.create_transactions(transaction_service, db_session, test_user)
+        stmt = transaction_service._filtered_query(test_user.id)
+
+        hits, total = await transaction_service._search_in_process(
+            stmt, ["starbuks"], Pagination()
+        )
+
+        assert total == 1
+        assert hits[0].transaction.description == "Starbucks Coffee"
+        assert hits[0].rank < 1
+
+        hits, total = await transaction_service._search_in_process(
+            stmt, ["coff"], Pagination()
+        )
+        assert [hit.transaction.description for hit in hits] == self.DESCRIPTIONS[:2]
+        assert hits[0].highlights == [(10, 14)]
+
+    async def test_search_falls_back_in_process_on_sqlite(self):
+        """Test search works end to end on databases without full-text search."""
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                User.metadata.create_all, tables=[User.__table__, Transaction.__table__]
+            )
+
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                user = User(email="sqlite@example.com", password_hash="hashed")
+                session.add(user)
+                await session.flush()
+                for days_ago, description in enumerate(self.DESCRIPTIONS):
+                    session.add(
+                        Transaction(
+                            user_id=user.id,
+                            amount=Decimal("5.00"),
+                            date=date_type.today() - timedelta(days=days_ago),
+                            description=description,
+                            category="Dining",
+                            type="EXPENSE",
+                            source="MANUAL",
+                        )
+                    )
+                await session.commit()
+
+                service = TransactionService(session, CategorizationEngine())
+                hits, total = await service.search_transactions(user.id, "coff")
+                assert total == 2
+                assert [hit.transaction.description for hit in hits] == self.DESCRIPTIONS[:2]
+                assert hits[0].highlights == [(10, 14)]
+
+                hits, total = await service.search_transactions(user.id, "starbuks")
+                assert total == 1
+                assert hits[0].transaction.description == "Starbucks Coffee"
+        finally:
+            await engine.dispose()
+
+    async def test_search_without_words_matches_nothing(
+        self,
+        transaction_service: TransactionService,
+        test_user: User,
+    ):
+        """Test punctuation-only queries return no hits instead of an error."""
+        assert await transaction_service.search_transactions(test_user.id, "&!:*") == ([], 0)